@@ -0,0 +1,48 @@
+using System.Text.Json;
+using System.Text.Json.Serialization;
+
+namespace ViceMCP.Benchmarks;
+
+/// <summary>
+/// Machine readable result of a benchmark run, written as JSON.
+/// </summary>
+public sealed record BenchmarkReport(
+    [property: JsonPropertyName("timestamp")] DateTimeOffset Timestamp,
+    [property: JsonPropertyName("os")] string OperatingSystem,
+    [property: JsonPropertyName("runtime")] string Runtime,
+    [property: JsonPropertyName("processor_count")] int ProcessorCount,
+    [property: JsonPropertyName("quick")] bool Quick,
+    [property: JsonPropertyName("latency_us")] int LatencyMicroseconds,
+    [property: JsonPropertyName("bandwidth_bytes_per_second")] long BytesPerSecond,
+    [property: JsonPropertyName("scenarios")] IReadOnlyList<ScenarioResult> Scenarios)
+{
+    private static readonly JsonSerializerOptions SerializerOptions = new() { WriteIndented = true };
+
+    public async Task WriteAsync(string path)
+    {
+        await using var stream = File.Create(path);
+        await JsonSerializer.SerializeAsync(stream, this, SerializerOptions);
+    }
+
+    public static async Task<BenchmarkReport> ReadAsync(string path)
+    {
+        await using var stream = File.OpenRead(path);
+        return await JsonSerializer.DeserializeAsync<BenchmarkReport>(stream, SerializerOptions)
+            ?? throw new InvalidOperationException($"Empty benchmark report {path}");
+    }
+}
+
+/// <summary>
+/// One scenario. Latencies are per operation, allocations are bytes allocated by the client process per operation.
+/// </summary>
+public sealed record ScenarioResult(
+    [property: JsonPropertyName("name")] string Name,
+    [property: JsonPropertyName("operations")] int Operations,
+    [property: JsonPropertyName("window")] int Window,
+    [property: JsonPropertyName("p50_us")] long P50Microseconds,
+    [property: JsonPropertyName("p99_us")] long P99Microseconds,
+    [property: JsonPropertyName("max_us")] long MaxMicroseconds,
+    [property: JsonPropertyName("mean_us")] double MeanMicroseconds,
+    [property: JsonPropertyName("operations_per_second")] double OperationsPerSecond,
+    [property: JsonPropertyName("mb_per_second")] double MegabytesPerSecond,
+    [property: JsonPropertyName("allocated_bytes_per_operation")] long AllocatedBytesPerOperation);
@@ -0,0 +1,194 @@
+using System.Diagnostics;
+using System.Text.Json;
+using Microsoft.Extensions.Logging.Abstractions;
+using ViceMCP.ViceBridge;
+using ViceMCP.ViceBridge.Commands;
+using ViceMCP.ViceBridge.Responses;
+using ViceMCP.ViceBridge.Services.Implementation;
+
+namespace ViceMCP.Benchmarks;
+
+/// <summary>
+/// Runs the scenarios against a monitor listening on a port.
+/// </summary>
+public sealed class BenchmarkRunner
+{
+    /// <summary>
+    /// Payload sizes for the memory scenarios. 65535 is the largest read whose length fits VICE's 16 bit field.
+    /// </summary>
+    public static readonly int[] PayloadSizes = [1, 64, 1024, 16384, 65535];
+    private const int PipelineWindow = 16;
+    private const string SearchPattern = "20 D2 FF";
+
+    private readonly int _port;
+    private readonly BenchmarkOptions _options;
+
+    public BenchmarkRunner(int port, BenchmarkOptions options)
+    {
+        _port = port;
+        _options = options;
+    }
+
+    public async Task<BenchmarkReport> RunAsync()
+    {
+        var config = new ViceConfiguration { BinaryMonitorPort = _port };
+        await using var bridge = new ViceBridge.Services.Implementation.ViceBridge(
+            NullLogger<ViceBridge.Services.Implementation.ViceBridge>.Instance,
+            new ResponseBuilder(NullLogger<ResponseBuilder>.Instance),
+            new PerformanceProfiler(),
+            new MessagesHistory(),
+            config);
+        bridge.Start(_port);
+        using (var timeout = new CancellationTokenSource(TimeSpan.FromSeconds(10)))
+        {
+            await bridge.WaitForReadyAsync(timeout.Token);
+        }
+        var tools = new ViceTools(bridge, config);
+        var scenarios = new List<ScenarioResult>();
+
+        // Before anything else has run, so it includes the one-time cost of batch dispatch and JSON metadata
+        scenarios.Add(await MeasureFirstCallAsync("batch_first_call", async () =>
+        {
+            await tools.ExecuteBatch("""[{ "command": "ping", "parameters": {} }, { "command": "read_memory", "parameters": { "startHex": "0400", "endHex": "0400" } }]""");
+        }));
+
+        scenarios.Add(await MeasureAsync("ping", Scale(2000), 1, async () =>
+        {
+            await bridge.EnqueueCommand(new PingCommand()).Response;
+            return 0;
+        }));
+
+        foreach (var size in PayloadSizes)
+        {
+            int operations = Scale(Math.Clamp(8 * 1024 * 1024 / size, 50, 2000));
+            var data = new byte[size];
+            Random.Shared.NextBytes(data);
+            foreach (var window in new[] { 1, PipelineWindow })
+            {
+                var suffix = window == 1 ? "" : "_pipelined";
+                scenarios.Add(await MeasureAsync($"memory_set_{size}{suffix}", operations, window, async () =>
+                {
+                    var buffer = BufferManager.GetBuffer((uint)size);
+                    data.CopyTo(buffer.Data, 0);
+                    using var command = new MemorySetCommand(0, 0, MemSpace.MainMemory, 0, buffer);
+                    var result = await bridge.EnqueueCommand(command).Response;
+                    EnsureSuccess(result.ErrorCode);
+                    return size;
+                }));
+                scenarios.Add(await MeasureAsync($"memory_get_{size}{suffix}", operations, window, async () =>
+                {
+                    var result = await bridge.EnqueueCommand(new MemoryGetCommand(0, 0, (ushort)(size - 1), MemSpace.MainMemory, 0)).Response;
+                    EnsureSuccess(result.ErrorCode);
+                    result.Response?.Dispose();
+                    return size;
+                }));
+            }
+        }
+
+        foreach (var file in Directory.EnumerateFiles(Path.Combine(AppContext.BaseDirectory, "batch_examples"), "*.json").Order())
+        {
+            var json = await File.ReadAllTextAsync(file);
+            scenarios.Add(await MeasureAsync($"batch_{Path.GetFileNameWithoutExtension(file)}", Scale(100), 1, async () =>
+            {
+                var result = await tools.ExecuteBatch(json);
+                using var document = JsonDocument.Parse(result);
+                if (document.RootElement.GetProperty("failed_commands").GetInt32() > 0)
+                {
+                    throw new InvalidOperationException($"Batch {file} failed: {result}");
+                }
+                return json.Length;
+            }));
+        }
+
+        scenarios.Add(await MeasureAsync("search_memory_full_range", Scale(50), 1, async () =>
+        {
+            await tools.SearchMemory("0000", "FFFF", SearchPattern);
+            return 0x10000;
+        }));
+
+        return new BenchmarkReport(DateTimeOffset.UtcNow, Environment.OSVersion.ToString(), Environment.Version.ToString(),
+            Environment.ProcessorCount, _options.Quick, _options.LatencyMicroseconds, _options.BytesPerSecond, scenarios);
+    }
+
+    /// <summary>
+    /// Runs <paramref name="operation"/> with up to <paramref name="window"/> in flight, after a warm-up of a tenth
+    /// of the operations.
+    /// </summary>
+    /// <param name="operation">One operation, returns the payload bytes it moved.</param>
+    private static async Task<ScenarioResult> MeasureAsync(string name, int operations, int window, Func<Task<int>> operation)
+    {
+        await RunAsync(Math.Max(1, operations / 10), window, operation, null);
+
+        var histogram = new LatencyHistogram();
+        GC.Collect();
+        GC.WaitForPendingFinalizers();
+        long allocatedBefore = GC.GetTotalAllocatedBytes(precise: true);
+        var stopwatch = Stopwatch.StartNew();
+        long bytes = await RunAsync(operations, window, operation, histogram);
+        stopwatch.Stop();
+        long allocated = GC.GetTotalAllocatedBytes(precise: true) - allocatedBefore;
+
+        var seconds = stopwatch.Elapsed.TotalSeconds;
+        var result = new ScenarioResult(name, operations, window,
+            histogram.GetValueAtPercentile(50), histogram.GetValueAtPercentile(99), histogram.Max, histogram.Mean,
+            operations / seconds, bytes / seconds / (1024 * 1024), allocated / operations);
+        Console.WriteLine($"{name,-36} p50 {result.P50Microseconds,7} us  p99 {result.P99Microseconds,7} us  " +
+            $"{result.OperationsPerSecond,9:F0} op/s  {result.MegabytesPerSecond,8:F2} MB/s  {result.AllocatedBytesPerOperation,8} B/op");
+        return result;
+    }
+
+    /// <summary>
+    /// Times a single cold run of <paramref name="operation"/>, reported as one operation.
+    /// </summary>
+    private static async Task<ScenarioResult> MeasureFirstCallAsync(string name, Func<Task> operation)
+    {
+        long allocatedBefore = GC.GetTotalAllocatedBytes(precise: true);
+        long start = Stopwatch.GetTimestamp();
+        await operation();
+        var elapsed = Stopwatch.GetElapsedTime(start);
+        long allocated = GC.GetTotalAllocatedBytes(precise: true) - allocatedBefore;
+
+        long microseconds = (long)elapsed.TotalMicroseconds;
+        var result = new ScenarioResult(name, 1, 1, microseconds, microseconds, microseconds, microseconds,
+            1 / elapsed.TotalSeconds, 0, allocated);
+        Console.WriteLine($"{name,-36} {microseconds,7} us  {allocated,8} B");
+        return result;
+    }
+
+    private static async Task<long> RunAsync(int operations, int window, Func<Task<int>> operation, LatencyHistogram? histogram)
+    {
+        long bytes = 0;
+        var inFlight = new Queue<Task<int>>(window);
+        for (int i = 0; i < operations; i++)
+        {
+            if (inFlight.Count == window)
+            {
+                bytes += await inFlight.Dequeue();
+            }
+            inFlight.Enqueue(TimeAsync(operation, histogram));
+        }
+        while (inFlight.Count > 0)
+        {
+            bytes += await inFlight.Dequeue();
+        }
+        return bytes;
+    }
+
+    private static async Task<int> TimeAsync(Func<Task<int>> operation, LatencyHistogram? histogram)
+    {
+        long start = Stopwatch.GetTimestamp();
+        int bytes = await operation();
+        histogram?.Record((long)Stopwatch.GetElapsedTime(start).TotalMicroseconds);
+        return bytes;
+    }
+
+    private int Scale(int operations) => _options.Quick ? Math.Max(10, operations / 10) : operations;
+
+    private static void EnsureSuccess(ErrorCode errorCode)
+    {
+        if (errorCode != ErrorCode.OK)
+        {
+            throw new InvalidOperationException($"Command failed: {errorCode}");
+        }
+    }
+}
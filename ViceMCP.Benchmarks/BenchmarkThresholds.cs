@@ -0,0 +1,82 @@
+using System.Text.Json;
+using System.Text.Json.Serialization;
+
+namespace ViceMCP.Benchmarks;
+
+/// <summary>
+/// Absolute limits per scenario, loaded from <c>benchmark-thresholds.json</c>.
+/// </summary>
+/// <remarks>
+/// A scenario without an entry uses <see cref="Defaults"/>. Limits are deliberately loose so shared CI runners
+/// pass; comparing against a baseline report from the same machine catches smaller regressions.
+/// </remarks>
+public sealed class BenchmarkThresholds
+{
+    [JsonPropertyName("defaults")]
+    public ScenarioThreshold Defaults { get; set; } = new();
+
+    [JsonPropertyName("scenarios")]
+    public Dictionary<string, ScenarioThreshold> Scenarios { get; set; } = new();
+
+    public static BenchmarkThresholds Load(string path)
+    {
+        return JsonSerializer.Deserialize<BenchmarkThresholds>(File.ReadAllText(path))
+            ?? throw new InvalidOperationException($"Empty thresholds file {path}");
+    }
+
+    /// <summary>
+    /// Returns a description of each limit the report exceeds.
+    /// </summary>
+    public IEnumerable<string> Check(BenchmarkReport report)
+    {
+        foreach (var scenario in report.Scenarios)
+        {
+            var threshold = Scenarios.GetValueOrDefault(scenario.Name, Defaults);
+            var maxP99 = threshold.MaxP99Microseconds ?? Defaults.MaxP99Microseconds;
+            var maxAllocated = threshold.MaxAllocatedBytesPerOperation ?? Defaults.MaxAllocatedBytesPerOperation;
+            if (scenario.P99Microseconds > maxP99)
+            {
+                yield return $"{scenario.Name}: p99 {scenario.P99Microseconds} us exceeds {maxP99} us";
+            }
+            if (scenario.AllocatedBytesPerOperation > maxAllocated)
+            {
+                yield return $"{scenario.Name}: {scenario.AllocatedBytesPerOperation} B/op exceeds {maxAllocated} B/op";
+            }
+        }
+    }
+
+    /// <summary>
+    /// Returns a description of each scenario whose p99 or allocations grew by more than <paramref name="tolerance"/>
+    /// relative to <paramref name="baseline"/>.
+    /// </summary>
+    /// <remarks>Scenarios missing from either report are skipped.</remarks>
+    public static IEnumerable<string> CompareWithBaseline(BenchmarkReport report, BenchmarkReport baseline, double tolerance)
+    {
+        var previous = baseline.Scenarios.ToDictionary(s => s.Name);
+        foreach (var scenario in report.Scenarios)
+        {
+            if (!previous.TryGetValue(scenario.Name, out var before))
+            {
+                continue;
+            }
+            if (scenario.P99Microseconds > before.P99Microseconds * (1 + tolerance))
+            {
+                yield return $"{scenario.Name}: p99 {scenario.P99Microseconds} us, baseline {before.P99Microseconds} us";
+            }
+            // A few bytes of slack so near zero baselines do not fail on noise
+            if (scenario.AllocatedBytesPerOperation > before.AllocatedBytesPerOperation * (1 + tolerance) + 64)
+            {
+                yield return $"{scenario.Name}: {scenario.AllocatedBytesPerOperation} B/op, baseline {before.AllocatedBytesPerOperation} B/op";
+            }
+        }
+    }
+}
+
+public sealed class ScenarioThreshold
+{
+    [JsonPropertyName("max_p99_us")]
+    public long? MaxP99Microseconds { get; set; }
+
+    [JsonPropertyName("max_allocated_bytes_per_operation")]
+    public long? MaxAllocatedBytesPerOperation { get; set; }
+}
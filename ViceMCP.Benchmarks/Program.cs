@@ -0,0 +1,173 @@
+using System.Diagnostics;
+using System.Reflection;
+using ViceMCP.Tests;
+
+namespace ViceMCP.Benchmarks;
+
+/// <summary>
+/// Measures the bridge, batch execution and memory search against <see cref="FakeViceMonitor"/> running in a child
+/// process, so allocations counted here belong to the server side only.
+/// </summary>
+/// <remarks>
+/// <code>
+/// dotnet run -c Release --project ViceMCP.Benchmarks -- [--quick] [--report file] [--thresholds file]
+///     [--baseline file] [--tolerance 0.25] [--latency-us n] [--bandwidth bytes-per-second]
+/// </code>
+/// Exits with 1 when a scenario exceeds its threshold or regresses against the baseline report.
+/// </remarks>
+public static class Program
+{
+    private const string ServeOption = "--serve";
+
+    public static async Task<int> Main(string[] args)
+    {
+        var options = BenchmarkOptions.Parse(args);
+        if (options.Serve)
+        {
+            await ServeAsync(options);
+            return 0;
+        }
+
+        await using var monitor = await FakeMonitorProcess.StartAsync(options);
+        Console.WriteLine($"Fake monitor on port {monitor.Port}, latency {options.LatencyMicroseconds} us, " +
+            $"bandwidth {(options.BytesPerSecond > 0 ? $"{options.BytesPerSecond} B/s" : "unlimited")}");
+
+        var report = await new BenchmarkRunner(monitor.Port, options).RunAsync();
+        await report.WriteAsync(options.ReportPath);
+        Console.WriteLine($"Report written to {options.ReportPath}");
+
+        var violations = new List<string>();
+        if (File.Exists(options.ThresholdsPath))
+        {
+            violations.AddRange(BenchmarkThresholds.Load(options.ThresholdsPath).Check(report));
+        }
+        if (options.BaselinePath != null)
+        {
+            violations.AddRange(BenchmarkThresholds.CompareWithBaseline(report, await BenchmarkReport.ReadAsync(options.BaselinePath), options.Tolerance));
+        }
+        foreach (var violation in violations)
+        {
+            Console.Error.WriteLine($"REGRESSION: {violation}");
+        }
+        return violations.Count == 0 ? 0 : 1;
+    }
+
+    /// <summary>
+    /// Child process mode: runs the fake monitor until stdin closes.
+    /// </summary>
+    private static async Task ServeAsync(BenchmarkOptions options)
+    {
+        await using var monitor = new FakeViceMonitor
+        {
+            Latency = TimeSpan.FromMicroseconds(options.LatencyMicroseconds),
+            BytesPerSecond = options.BytesPerSecond,
+        }.Start();
+        Console.WriteLine(monitor.Port);
+        await Console.In.ReadToEndAsync();
+    }
+
+    /// <summary>
+    /// This program started again with <c>--serve</c>.
+    /// </summary>
+    private sealed class FakeMonitorProcess : IAsyncDisposable
+    {
+        private readonly Process _process;
+
+        private FakeMonitorProcess(Process process, int port)
+        {
+            _process = process;
+            Port = port;
+        }
+
+        public int Port { get; }
+
+        public static async Task<FakeMonitorProcess> StartAsync(BenchmarkOptions options)
+        {
+            var startInfo = new ProcessStartInfo
+            {
+                FileName = Environment.ProcessPath!,
+                RedirectStandardInput = true,
+                RedirectStandardOutput = true,
+                UseShellExecute = false,
+            };
+            // Under 'dotnet ViceMCP.Benchmarks.dll' the process is the host, pass the assembly along
+            if (Path.GetFileNameWithoutExtension(Environment.ProcessPath) == "dotnet")
+            {
+                startInfo.ArgumentList.Add(Assembly.GetEntryAssembly()!.Location);
+            }
+            startInfo.ArgumentList.Add(ServeOption);
+            startInfo.ArgumentList.Add("--latency-us");
+            startInfo.ArgumentList.Add(options.LatencyMicroseconds.ToString());
+            startInfo.ArgumentList.Add("--bandwidth");
+            startInfo.ArgumentList.Add(options.BytesPerSecond.ToString());
+
+            var process = Process.Start(startInfo) ?? throw new InvalidOperationException("Failed to start the fake monitor");
+            var line = await process.StandardOutput.ReadLineAsync();
+            if (!int.TryParse(line, out var port))
+            {
+                process.Kill();
+                throw new InvalidOperationException($"Fake monitor did not report its port: {line}");
+            }
+            return new FakeMonitorProcess(process, port);
+        }
+
+        public async ValueTask DisposeAsync()
+        {
+            _process.StandardInput.Close();
+            using var timeout = new CancellationTokenSource(TimeSpan.FromSeconds(5));
+            try
+            {
+                await _process.WaitForExitAsync(timeout.Token);
+            }
+            catch (OperationCanceledException)
+            {
+                _process.Kill();
+            }
+            _process.Dispose();
+        }
+    }
+}
+
+/// <summary>
+/// Command line options.
+/// </summary>
+public sealed record BenchmarkOptions
+{
+    public bool Serve { get; init; }
+    /// <summary>
+    /// Fewer iterations, for CI.
+    /// </summary>
+    public bool Quick { get; init; }
+    public string ReportPath { get; init; } = "benchmark-report.json";
+    public string ThresholdsPath { get; init; } = Path.Combine(AppContext.BaseDirectory, "benchmark-thresholds.json");
+    public string? BaselinePath { get; init; }
+    /// <summary>
+    /// Allowed relative increase over the baseline, 0.25 is 25%.
+    /// </summary>
+    public double Tolerance { get; init; } = 0.25;
+    public int LatencyMicroseconds { get; init; }
+    public long BytesPerSecond { get; init; }
+
+    /// <exception cref="ArgumentException">Thrown on unknown options or missing values.</exception>
+    public static BenchmarkOptions Parse(string[] args)
+    {
+        var options = new BenchmarkOptions();
+        for (int i = 0; i < args.Length; i++)
+        {
+            string Value() => i + 1 < args.Length ? args[++i] : throw new ArgumentException($"Missing value for {args[i]}");
+            options = args[i] switch
+            {
+                "--serve" => options with { Serve = true },
+                "--quick" => options with { Quick = true },
+                "--report" => options with { ReportPath = Value() },
+                "--thresholds" => options with { ThresholdsPath = Value() },
+                "--baseline" => options with { BaselinePath = Value() },
+                "--tolerance" => options with { Tolerance = double.Parse(Value(), System.Globalization.CultureInfo.InvariantCulture) },
+                "--latency-us" => options with { LatencyMicroseconds = int.Parse(Value()) },
+                "--bandwidth" => options with { BytesPerSecond = long.Parse(Value()) },
+                _ => throw new ArgumentException($"Unknown option {args[i]}"),
+            };
+        }
+        return options;
+    }
+}
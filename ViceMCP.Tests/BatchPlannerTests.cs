@@ -0,0 +1,255 @@
+using System.Reflection;
+using System.Text.Json;
+using FluentAssertions;
+using Moq;
+using ViceMCP.ViceBridge;
+using ViceMCP.ViceBridge.Commands;
+using ViceMCP.ViceBridge.Responses;
+using ViceMCP.ViceBridge.Services.Abstract;
+using Xunit;
+
+namespace ViceMCP.Tests;
+
+public class BatchPlannerTests
+{
+    private static BatchCommandSpec Spec(string command, params (string Name, string Value)[] parameters) => new()
+    {
+        Command = command,
+        Parameters = parameters.ToDictionary(p => p.Name, p => (object)p.Value)
+    };
+
+    private static BatchCommandSpec Write(string start, string data) =>
+        Spec("write_memory", ("startHex", start), ("dataHex", data));
+
+    private static BatchCommandSpec Read(string start, string end) =>
+        Spec("read_memory", ("startHex", start), ("endHex", end));
+
+    [Fact]
+    public void Plan_Should_Merge_Adjacent_Writes()
+    {
+        var plan = BatchPlanner.Plan([Write("d020", "00"), Write("d021", "06")]);
+
+        plan.OriginalCommands.Should().Be(2);
+        plan.PlannedCommands.Should().Be(1);
+        plan.Steps[0].Kind.Should().Be(BatchStepKind.Write);
+        plan.Steps[0].Start.Should().Be(0xD020);
+        plan.Steps[0].Data.Should().Equal(0x00, 0x06);
+    }
+
+    [Fact]
+    public void Plan_Should_Let_Last_Writer_Win_On_Overlap()
+    {
+        var plan = BatchPlanner.Plan([
+            Spec("fill_memory", ("startHex", "0400"), ("endHex", "0403"), ("pattern", "20")),
+            Write("0x0401", "01 02")
+        ]);
+
+        plan.PlannedCommands.Should().Be(1);
+        plan.Steps[0].Data.Should().Equal(0x20, 0x01, 0x02, 0x20);
+        plan.Steps[0].Members.Select(m => m.Index).Should().BeEquivalentTo([0, 1]);
+    }
+
+    [Fact]
+    public void Plan_Should_Send_Independent_Reads_Ahead_Of_Writes()
+    {
+        var plan = BatchPlanner.Plan([Write("0400", "01"), Read("1000", "1001"), Read("2000", "2001")]);
+
+        plan.Steps.Select(s => s.Kind).Should().Equal(BatchStepKind.Read, BatchStepKind.Read, BatchStepKind.Write);
+    }
+
+    [Fact]
+    public void Plan_Should_Keep_Read_After_Overlapping_Write()
+    {
+        var plan = BatchPlanner.Plan([Write("0400", "01"), Read("0400", "0400")]);
+
+        plan.Steps.Select(s => s.Kind).Should().Equal(BatchStepKind.Write, BatchStepKind.Read);
+    }
+
+    [Fact]
+    public void Plan_Should_Not_Move_Memory_Operations_Across_Bank_Switching_Writes()
+    {
+        var plan = BatchPlanner.Plan([Read("a000", "a0ff"), Write("0001", "35"), Read("a000", "a0ff")]);
+
+        plan.Steps.Select(s => s.Kind).Should().Equal(BatchStepKind.Read, BatchStepKind.Write, BatchStepKind.Read);
+        plan.Steps[1].Start.Should().Be(0x0001);
+    }
+
+    [Fact]
+    public void Plan_Should_Keep_IO_Writes_In_Issue_Order()
+    {
+        var plan = BatchPlanner.Plan([Write("dc03", "ff"), Write("dc01", "00"), Write("d418", "0f"), Write("dc02", "00")]);
+
+        plan.Steps.Select(s => s.Start).Should().Equal(0xDC03, 0xDC01, 0xD418, 0xDC02);
+    }
+
+    [Fact]
+    public void Plan_Should_Keep_IO_Read_After_IO_Write()
+    {
+        var plan = BatchPlanner.Plan([Write("dc00", "fe"), Read("dc01", "dc01"), Read("0400", "0400")]);
+
+        plan.Steps.Select(s => s.Kind).Should().Equal(BatchStepKind.Write, BatchStepKind.Read, BatchStepKind.Read);
+    }
+
+    [Fact]
+    public void Plan_Should_Serve_Repeated_Read_From_First_One()
+    {
+        var plan = BatchPlanner.Plan([Read("0400", "040f"), Read("0404", "0407")]);
+
+        plan.PlannedCommands.Should().Be(1);
+        plan.Steps[0].Members.Should().HaveCount(2);
+    }
+
+    [Fact]
+    public void Plan_Should_Not_Reuse_Read_After_Write_To_Its_Range()
+    {
+        var plan = BatchPlanner.Plan([Read("0400", "0400"), Write("0400", "01"), Read("0400", "0400")]);
+
+        plan.Steps.Select(s => s.Kind).Should().Equal(BatchStepKind.Read, BatchStepKind.Write, BatchStepKind.Read);
+    }
+
+    [Fact]
+    public void Plan_Should_Not_Move_Memory_Operations_Across_Other_Commands()
+    {
+        var plan = BatchPlanner.Plan([Write("0400", "01"), Spec("ping"), Write("0401", "02")]);
+
+        plan.Steps.Select(s => s.Kind).Should().Equal(BatchStepKind.Write, BatchStepKind.Passthrough, BatchStepKind.Write);
+    }
+
+    [Fact]
+    public void Plan_Should_Pass_Through_Unparsable_Memory_Commands()
+    {
+        var plan = BatchPlanner.Plan([Write("zz", "01")]);
+
+        plan.Steps.Single().Kind.Should().Be(BatchStepKind.Passthrough);
+    }
+
+    [Fact]
+    public void Plan_Should_Keep_Encoding_Per_Merged_Read()
+    {
+        var plan = BatchPlanner.Plan([
+            Spec("read_memory", ("startHex", "c000"), ("endHex", "c00f"), ("encoding", "base64")),
+            Read("c010", "c01f")]);
+
+        plan.PlannedCommands.Should().Be(1);
+        plan.Steps[0].Members.Select(m => m.Encoding).Should().Equal("base64", null);
+    }
+
+    [Fact]
+    public void Plan_Should_Pass_Through_Reads_With_Unknown_Encoding()
+    {
+        var plan = BatchPlanner.Plan([Spec("read_memory", ("startHex", "c000"), ("endHex", "c00f"), ("encoding", "ebcdic"))]);
+
+        plan.Steps.Should().ContainSingle().Which.Kind.Should().Be(BatchStepKind.Passthrough);
+    }
+
+    [Fact]
+    public void Plan_Should_Not_Merge_Across_Instances()
+    {
+        var commands = JsonSerializer.Deserialize<List<BatchCommandSpec>>("""
+        [
+            { "command": "write_memory", "parameters": { "startHex": "d020", "dataHex": "00", "instance": 1 } },
+            { "command": "write_memory", "parameters": { "startHex": "d021", "dataHex": "06", "instance": 2 } },
+            { "command": "read_memory", "parameters": { "startHex": "d020", "endHex": "d021", "instance": 2 } }
+        ]
+        """)!;
+
+        var plan = BatchPlanner.Plan(commands);
+
+        plan.Steps.Select(s => s.Kind).Should().Equal(BatchStepKind.Write, BatchStepKind.Write, BatchStepKind.Read);
+        plan.Steps.Select(s => s.Instance).Should().Equal(1, 2, 2);
+    }
+
+    [Fact]
+    public void Plan_Should_Reduce_Screen_Setup_Example()
+    {
+        var json = File.ReadAllText(Path.Combine(FindRepositoryRoot(), "batch_examples", "screen_setup_example.json"));
+        var commands = JsonSerializer.Deserialize<List<BatchCommandSpec>>(json)!;
+
+        var plan = BatchPlanner.Plan(commands);
+
+        plan.OriginalCommands.Should().Be(8);
+        plan.PlannedCommands.Should().Be(3);
+    }
+
+    [Fact]
+    public async Task ExecuteBatch_Should_Send_Planned_Commands_And_Report_Each_Original()
+    {
+        // Arrange
+        var bridge = new Mock<IViceBridge>();
+        var writes = new List<MemorySetCommand>();
+        bridge.Setup(x => x.EnqueueCommandAsync(It.IsAny<MemorySetCommand>(), It.IsAny<bool>()))
+            .Callback((MemorySetCommand cmd, bool _) =>
+            {
+                writes.Add(cmd);
+                var tcsField = typeof(ViceCommand<EmptyViceResponse>).GetField("tcs", BindingFlags.NonPublic | BindingFlags.Instance | BindingFlags.DeclaredOnly);
+                var tcs = (TaskCompletionSource<CommandResponse<EmptyViceResponse>>)tcsField!.GetValue(cmd)!;
+                tcs.SetResult(new CommandResponse<EmptyViceResponse>(new EmptyViceResponse(0x02, ErrorCode.OK)));
+            })
+            .Returns((MemorySetCommand cmd, bool _) => ValueTask.FromResult(cmd));
+        var tools = new ViceTools(bridge.Object, new ViceConfiguration());
+        var commandsJson = """
+        [
+            { "command": "write_memory", "parameters": { "startHex": "d020", "dataHex": "00" } },
+            { "command": "write_memory", "parameters": { "startHex": "d021", "dataHex": "06" } }
+        ]
+        """;
+
+        // Act
+        var response = JsonSerializer.Deserialize<BatchResponse>(await tools.ExecuteBatch(commandsJson))!;
+
+        // Assert
+        writes.Should().ContainSingle();
+        writes[0].StartAddress.Should().Be(0xD020);
+        response.TotalCommands.Should().Be(2);
+        response.PlannedCommands.Should().Be(1);
+        response.SuccessfulCommands.Should().Be(2);
+        response.Results.Select(r => r.Result).Should().Equal("Wrote 1 bytes to $D020", "Wrote 1 bytes to $D021");
+    }
+
+    [Fact]
+    public async Task ExecuteBatch_Should_Fail_Only_The_Step_That_Could_Not_Be_Enqueued()
+    {
+        // Arrange
+        var bridge = new Mock<IViceBridge>();
+        int calls = 0;
+        bridge.Setup(x => x.EnqueueCommandAsync(It.IsAny<MemorySetCommand>(), It.IsAny<bool>()))
+            .Returns((MemorySetCommand cmd, bool _) =>
+            {
+                if (++calls == 2)
+                {
+                    throw new InvalidOperationException("The bulk command queue is full");
+                }
+                var tcsField = typeof(ViceCommand<EmptyViceResponse>).GetField("tcs", BindingFlags.NonPublic | BindingFlags.Instance | BindingFlags.DeclaredOnly);
+                var tcs = (TaskCompletionSource<CommandResponse<EmptyViceResponse>>)tcsField!.GetValue(cmd)!;
+                tcs.SetResult(new CommandResponse<EmptyViceResponse>(new EmptyViceResponse(0x02, ErrorCode.OK)));
+                return ValueTask.FromResult(cmd);
+            });
+        var tools = new ViceTools(bridge.Object, new ViceConfiguration());
+        var commandsJson = """
+        [
+            { "command": "write_memory", "parameters": { "startHex": "0400", "dataHex": "01" } },
+            { "command": "write_memory", "parameters": { "startHex": "0500", "dataHex": "02" } },
+            { "command": "write_memory", "parameters": { "startHex": "0600", "dataHex": "03" } }
+        ]
+        """;
+
+        // Act
+        var response = JsonSerializer.Deserialize<BatchResponse>(await tools.ExecuteBatch(commandsJson))!;
+
+        // Assert
+        response.SuccessfulCommands.Should().Be(2);
+        response.FailedCommands.Should().Be(1);
+        response.Results.Select(r => r.Success).Should().Equal(true, false, true);
+        response.Results[1].Error.Should().Contain("queue is full");
+    }
+
+    private static string FindRepositoryRoot()
+    {
+        var directory = new DirectoryInfo(AppContext.BaseDirectory);
+        while (directory != null && !Directory.Exists(Path.Combine(directory.FullName, "batch_examples")))
+        {
+            directory = directory.Parent;
+        }
+        return directory?.FullName ?? throw new DirectoryNotFoundException("batch_examples not found");
+    }
+}
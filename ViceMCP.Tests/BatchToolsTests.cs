@@ -0,0 +1,57 @@
+using System.Reflection;
+using System.Text.Json;
+using FluentAssertions;
+using ModelContextProtocol.Server;
+
+namespace ViceMCP.Tests;
+
+public class BatchToolsTests
+{
+    private static readonly MethodInfo[] ToolMethods = typeof(ViceTools)
+        .GetMethods(BindingFlags.Public | BindingFlags.Instance)
+        .Where(m => m.GetCustomAttribute<McpServerToolAttribute>() != null)
+        .ToArray();
+
+    [Fact]
+    public void Table_Should_Have_An_Entry_For_Every_Tool()
+    {
+        var names = ToolMethods.Select(m => m.GetCustomAttribute<McpServerToolAttribute>()!.Name);
+
+        BatchTools.All.Keys.Should().BeEquivalentTo(names);
+    }
+
+    [Fact]
+    public void Entries_Should_Match_Tool_Parameters()
+    {
+        foreach (var method in ToolMethods)
+        {
+            var tool = BatchTools.All[method.GetCustomAttribute<McpServerToolAttribute>()!.Name!];
+            var expected = method.GetParameters()
+                .Where(p => p.ParameterType != typeof(CancellationToken))
+                .Select(p => new BatchParameter(p.Name!, !p.HasDefaultValue, p.HasDefaultValue ? p.DefaultValue : null));
+
+            tool.Parameters.Should().Equal(expected, $"{tool.Name} mirrors {method.Name}");
+        }
+    }
+
+    [Fact]
+    public void Bind_Should_Fill_Defaults_And_Convert_Json_Values()
+    {
+        var spec = JsonSerializer.Deserialize("""[{ "command": "step", "parameters": { "count": 5, "instance": null } }]""",
+            BatchJsonContext.Default.ListBatchCommandSpec)![0];
+
+        var arguments = BatchTools.All["step"].Bind(spec.Parameters);
+
+        arguments.Int(0).Should().Be(5);
+        arguments.Bool(1).Should().BeFalse();
+        arguments.NullableInt(2).Should().BeNull();
+    }
+
+    [Fact]
+    public void Bind_Should_Reject_Missing_Required_Parameters()
+    {
+        var act = () => BatchTools.All["write_memory"].Bind(new Dictionary<string, object> { ["startHex"] = "c000" });
+
+        act.Should().Throw<ArgumentException>().WithMessage("Required parameter 'dataHex' not provided for command");
+    }
+}
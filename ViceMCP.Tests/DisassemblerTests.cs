@@ -0,0 +1,73 @@
+using FluentAssertions;
+
+namespace ViceMCP.Tests;
+
+public class DisassemblerTests
+{
+    [Fact]
+    public void Disassemble_Should_Decode_Across_Page_Boundaries()
+    {
+        var memory = new byte[0x202];
+        // LDA #$01 at $C0FC, JMP $C000 straddling into $C100, then RTS
+        memory[0xFC] = 0xA9;
+        memory[0xFD] = 0x01;
+        memory[0xFE] = 0x4C;
+        memory[0xFF] = 0x00;
+        memory[0x100] = 0xC0;
+        memory[0x101] = 0x60;
+
+        var disassembly = new Disassembler().Disassemble(0xC0FC, 0xC101, memory.AsSpan(0xFC));
+
+        disassembly.Instructions.Select(i => $"{i.Address:X4} {i.Text}").Should().Equal("C0FC LDA #$01", "C0FE JMP $C000", "C101 RTS");
+        disassembly.Instructions[1].Bytes.Should().Equal(0x4C, 0x00, 0xC0);
+        disassembly.Pages.Should().Be(2);
+    }
+
+    [Fact]
+    public void Unchanged_Pages_Should_Come_From_The_Cache()
+    {
+        var disassembler = new Disassembler();
+        var memory = Enumerable.Repeat((byte)0xEA, 0x302).ToArray();
+
+        disassembler.Disassemble(0x1000, 0x12FF, memory).CachedPages.Should().Be(0);
+        disassembler.Disassemble(0x1000, 0x12FF, memory).CachedPages.Should().Be(3);
+
+        memory[0x180] = 0x60;
+        var changed = disassembler.Disassemble(0x1000, 0x12FF, memory);
+        changed.CachedPages.Should().Be(2);
+        changed.Instructions.Single(i => i.Address == 0x1180).Text.Should().Be("RTS");
+        disassembler.Misses.Should().Be(4);
+    }
+
+    [Fact]
+    public void Cache_Should_Drop_Least_Recently_Used_Pages()
+    {
+        var disassembler = new Disassembler(capacity: 2);
+        var memory = new byte[0x302];
+
+        disassembler.Disassemble(0x1000, 0x12FF, memory);
+
+        disassembler.Count.Should().Be(2);
+        disassembler.Disassemble(0x1200, 0x12FF, memory.AsSpan(0x200)).CachedPages.Should().Be(1);
+    }
+
+    [Fact]
+    public void Same_Bytes_Should_Decode_Differently_Per_Cpu()
+    {
+        var disassembler = new Disassembler();
+        var memory = new byte[] { 0x80, 0x02, 0x07, 0x10 };
+
+        disassembler.Disassemble(0xC000, 0xC003, memory).Instructions.Select(i => i.Text)
+            .Should().Equal("NOP #$02", "SLO $10");
+        disassembler.Disassemble(0xC000, 0xC003, memory, CpuVariant.Cmos65C02).Instructions.Select(i => i.Text)
+            .Should().Equal("BRA $C004", "RMB0 $10");
+    }
+
+    [Fact]
+    public void Operand_Past_End_Of_Memory_Should_Be_Shown_As_Byte()
+    {
+        var instructions = new Disassembler().Disassemble(0xFFFE, 0xFFFF, new byte[] { 0xEA, 0x20 }).Instructions;
+
+        instructions.Select(i => i.Text).Should().Equal("NOP", ".BYTE $20");
+    }
+}
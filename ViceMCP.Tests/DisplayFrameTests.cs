@@ -0,0 +1,78 @@
+using System.Buffers.Binary;
+using FluentAssertions;
+using ViceMCP.ViceBridge;
+using ViceMCP.ViceBridge.Commands;
+using ViceMCP.ViceBridge.Responses;
+
+namespace ViceMCP.Tests;
+
+public class DisplayFrameTests
+{
+    private static DisplayGetResponse Capture(int width, int height, int offsetX, int offsetY, int innerWidth, int innerHeight,
+        Action<byte[]>? paint = null)
+    {
+        var image = BufferManager.GetBuffer((uint)(width * height));
+        Array.Clear(image.Data, 0, image.Data.Length);
+        paint?.Invoke(image.Data);
+        return new DisplayGetResponse(0x02, ErrorCode.OK, (ushort)width, (ushort)height, (ushort)offsetX, (ushort)offsetY,
+            (ushort)innerWidth, (ushort)innerHeight, 8, image);
+    }
+
+    [Fact]
+    public void ToPng_Should_Write_Indexed_Png_Header()
+    {
+        using var response = Capture(16, 8, 0, 0, 16, 8, data => data[5] = 14);
+        using var frame = DisplayFrame.From(response, crop: false, scale: 1);
+
+        var png = frame.ToPng();
+
+        png.AsSpan(0, 8).ToArray().Should().Equal(0x89, 0x50, 0x4E, 0x47, 0x0D, 0x0A, 0x1A, 0x0A);
+        png.AsSpan(12, 4).ToArray().Should().Equal("IHDR"u8.ToArray());
+        BinaryPrimitives.ReadInt32BigEndian(png.AsSpan(16)).Should().Be(16);
+        BinaryPrimitives.ReadInt32BigEndian(png.AsSpan(20)).Should().Be(8);
+        png[25].Should().Be(3, "the colour type is indexed");
+        BinaryPrimitives.ReadInt32BigEndian(png.AsSpan(33)).Should().Be(15 * 3, "the palette stops at the highest index used");
+    }
+
+    [Fact]
+    public void From_Should_Crop_To_Inner_Area_And_Downscale()
+    {
+        using var response = Capture(32, 24, 8, 4, 16, 16, data =>
+        {
+            data[4 * 32 + 8] = 1;
+            data[6 * 32 + 10] = 2;
+            data[6 * 32 + 11] = 3;
+        });
+
+        using var frame = DisplayFrame.From(response, crop: true, scale: 2);
+
+        frame.Width.Should().Be(8);
+        frame.Height.Should().Be(8);
+        frame.Pixels[0].Should().Be(1);
+        frame.Pixels[1 * 8 + 1].Should().Be(2, "every other pixel of every other row is kept");
+    }
+
+    [Fact]
+    public void ChangedTiles_Should_Report_Only_Differing_Tiles()
+    {
+        using var before = DisplayFrame.From(Capture(32, 16, 0, 0, 32, 16), crop: false, scale: 1);
+        using var after = DisplayFrame.From(Capture(32, 16, 0, 0, 32, 16, data =>
+        {
+            data[0] = 1;
+            data[9 * 32 + 31] = 1;
+        }), crop: false, scale: 1);
+
+        after.ChangedTiles(before).Should().Equal((0, 0), (3, 1));
+        before.ChangedTiles(before).Should().BeEmpty();
+    }
+
+    [Fact]
+    public void From_Should_Reject_Invalid_Scale()
+    {
+        using var response = Capture(8, 8, 0, 0, 8, 8);
+
+        var act = () => DisplayFrame.From(response, crop: false, scale: 9);
+
+        act.Should().Throw<ArgumentException>().WithMessage("Scale must be between 1 and 8");
+    }
+}
@@ -0,0 +1,38 @@
+using Microsoft.Extensions.Logging.Abstractions;
+using ViceMCP.ViceBridge.Responses;
+using ViceMCP.ViceBridge.Services.Implementation;
+
+namespace ViceMCP.Tests;
+
+/// <summary>
+/// Base of tests running against a <see cref="FakeViceMonitor"/>, each test gets its own monitor and a bridge
+/// connected to it.
+/// </summary>
+/// <remarks>
+/// Overrides of <see cref="InitializeAsync"/> call the base first, overrides of <see cref="DisposeAsync"/> call
+/// it last.
+/// </remarks>
+public abstract class FakeMonitorTestBase : IAsyncLifetime
+{
+    protected FakeViceMonitor Monitor { get; } = new();
+    protected ViceBridge.Services.Implementation.ViceBridge Bridge { get; private set; } = null!;
+
+    public virtual async Task InitializeAsync()
+    {
+        Monitor.Start();
+        Bridge = new ViceBridge.Services.Implementation.ViceBridge(
+            NullLogger<ViceBridge.Services.Implementation.ViceBridge>.Instance,
+            new ResponseBuilder(NullLogger<ResponseBuilder>.Instance),
+            new PerformanceProfiler(),
+            new MessagesHistory());
+        Bridge.Start(Monitor.Port);
+        using var timeout = new CancellationTokenSource(TimeSpan.FromSeconds(10));
+        await Bridge.WaitForReadyAsync(timeout.Token);
+    }
+
+    public virtual async Task DisposeAsync()
+    {
+        await Bridge.DisposeAsync();
+        await Monitor.DisposeAsync();
+    }
+}
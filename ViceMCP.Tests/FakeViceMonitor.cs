@@ -0,0 +1,898 @@
+using System.Buffers.Binary;
+using System.Collections.Concurrent;
+using System.Diagnostics;
+using System.Net;
+using System.Net.Sockets;
+using System.Text;
+using ViceMCP.ViceBridge.Commands;
+using ViceMCP.ViceBridge.Responses;
+
+namespace ViceMCP.Tests;
+
+/// <summary>
+/// Stand-in for the VICE binary monitor speaking the same framing as VICE 3.x, so the bridge can be tested and
+/// timed without an emulator.
+/// </summary>
+/// <remarks>
+/// <para>
+/// Holds 64 KB per memory space and bank, the 6502 registers and checkpoints. Implements memory get/set,
+/// checkpoint set/get/list/toggle/delete, conditions, registers, step, execute until return, exit, reset, ping,
+/// info, banks, registers available, display, keyboard feed, dump/undump and quit. Other commands are answered
+/// with <see cref="ErrorCode.UnknownCommandType"/>.
+/// </para>
+/// <para>
+/// Like VICE, a command received while the machine runs stops it and broadcasts a Stopped response first; exit
+/// resumes it and broadcasts Resumed. Steps follow JSR, JMP and RTS, do not take branches and stop on exec
+/// checkpoints. Commands are handled one at a time in arrival order.
+/// </para>
+/// <para>
+/// <see cref="Latency"/> delays each answer, <see cref="BytesPerSecond"/> paces both directions of the link
+/// through one token bucket. Delays are subject to timer resolution (about 1 ms on Linux), the average
+/// bandwidth is exact.
+/// </para>
+/// </remarks>
+public sealed class FakeViceMonitor : IAsyncDisposable
+{
+    public const byte RegisterA = 0x00;
+    public const byte RegisterX = 0x01;
+    public const byte RegisterY = 0x02;
+    public const byte RegisterPC = 0x03;
+    public const byte RegisterSP = 0x04;
+    public const byte RegisterFlags = 0x05;
+    public const ushort ResetVector = 0xFCE2;
+
+    private const int CommandHeaderLength = 11;
+    private const int ResponseHeaderLength = 12;
+    private const int CheckpointInfoLength = 22;
+    private static readonly byte[] DumpMagic = "FAKEVSF1"u8.ToArray();
+    private static readonly (byte Id, byte Bits, string Name)[] RegisterDefinitions =
+    [
+        (RegisterA, 8, "A"), (RegisterX, 8, "X"), (RegisterY, 8, "Y"),
+        (RegisterPC, 16, "PC"), (RegisterSP, 8, "SP"), (RegisterFlags, 8, "FL"),
+    ];
+    private static readonly (ushort Id, string Name)[] Banks =
+    [
+        (0, "default"), (1, "cpu"), (2, "ram"), (3, "rom"), (4, "io"), (5, "cart"),
+    ];
+
+    private readonly TcpListener _listener;
+    private readonly CancellationTokenSource _cts = new();
+    private readonly SemaphoreSlim _writeLock = new(1, 1);
+    private readonly object _stateLock = new();
+    private readonly Dictionary<(MemSpace, ushort), byte[]> _memory = new();
+    private readonly SortedDictionary<uint, Checkpoint> _checkpoints = new();
+    private readonly ushort[] _registers = new ushort[RegisterDefinitions.Length];
+    private readonly ConcurrentDictionary<CommandType, int> _commandCounts = new();
+    private Task? _acceptTask;
+    private NetworkStream? _stream;
+    private uint _nextCheckpointNumber = 1;
+    private long _bytesReceived;
+    private long _bytesSent;
+    private long _nextTransferTimestamp;
+    private int _connections;
+
+    /// <summary>
+    /// Creates a monitor listening on the loopback interface.
+    /// </summary>
+    /// <param name="port">Port to listen on, 0 picks a free one, see <see cref="Port"/>.</param>
+    public FakeViceMonitor(int port = 0)
+    {
+        _listener = new TcpListener(IPAddress.Loopback, port);
+        ResetRegisters();
+    }
+
+    /// <summary>
+    /// Port the monitor listens on, valid after <see cref="Start"/>.
+    /// </summary>
+    public int Port => ((IPEndPoint)_listener.LocalEndpoint).Port;
+
+    /// <summary>
+    /// Delay before each answer, default none.
+    /// </summary>
+    public TimeSpan Latency { get; set; }
+
+    /// <summary>
+    /// Link bandwidth shared by both directions, 0 (default) for unlimited.
+    /// </summary>
+    public long BytesPerSecond { get; set; }
+
+    /// <summary>
+    /// Whether the emulated CPU runs. A command stops it, exit resumes it.
+    /// </summary>
+    public bool IsRunning { get; set; } = true;
+
+    /// <summary>
+    /// Whether any command but exit and quit stops a running machine like VICE does (default: true).
+    /// </summary>
+    public bool StopsOnCommand { get; set; } = true;
+
+    /// <summary>
+    /// Occurs when exit resumes the machine, before Resumed is broadcast. Tests play the running program with it.
+    /// </summary>
+    public event Action? Resumed;
+
+    /// <summary>
+    /// Occurs when a step executes a subroutine as one instruction, with its address. Tests play the subroutine
+    /// with it.
+    /// </summary>
+    public event Action<ushort>? SteppedOver;
+
+    public long BytesReceived => Interlocked.Read(ref _bytesReceived);
+    public long BytesSent => Interlocked.Read(ref _bytesSent);
+    public int Connections => Volatile.Read(ref _connections);
+
+    /// <summary>
+    /// Number of commands received per type.
+    /// </summary>
+    public IReadOnlyDictionary<CommandType, int> CommandCounts => _commandCounts;
+
+    /// <summary>
+    /// Starts accepting connections, one at a time like VICE.
+    /// </summary>
+    public FakeViceMonitor Start()
+    {
+        _listener.Start();
+        _acceptTask = Task.Run(() => AcceptLoopAsync(_cts.Token));
+        return this;
+    }
+
+    /// <summary>
+    /// Gets the live 64 KB of a memory space and bank, for setting up and checking state.
+    /// </summary>
+    public byte[] GetMemory(MemSpace memSpace = MemSpace.MainMemory, ushort bankId = 0)
+    {
+        lock (_stateLock)
+        {
+            return GetMemoryLocked(memSpace, bankId);
+        }
+    }
+
+    public ushort GetRegister(byte registerId)
+    {
+        lock (_stateLock)
+        {
+            return _registers[registerId];
+        }
+    }
+
+    public void SetRegister(byte registerId, ushort value)
+    {
+        lock (_stateLock)
+        {
+            _registers[registerId] = value;
+        }
+    }
+
+    /// <summary>
+    /// Stops the machine as if the user entered the monitor and broadcasts Stopped.
+    /// </summary>
+    public Task BreakAsync()
+    {
+        ushort pc;
+        lock (_stateLock)
+        {
+            IsRunning = false;
+            pc = _registers[RegisterPC];
+        }
+        return SendFrameAsync(BuildProgramCounterFrame(ResponseType.Stopped, pc), _cts.Token);
+    }
+
+    /// <summary>
+    /// Hits a checkpoint: moves the PC to its start, broadcasts its info and, when it stops, Stopped.
+    /// </summary>
+    /// <exception cref="ArgumentException">Thrown when the checkpoint doesn't exist.</exception>
+    public async Task HitCheckpointAsync(uint checkpointNumber)
+    {
+        byte[] info;
+        bool stops;
+        ushort pc;
+        lock (_stateLock)
+        {
+            if (!_checkpoints.TryGetValue(checkpointNumber, out var checkpoint))
+            {
+                throw new ArgumentException($"Checkpoint {checkpointNumber} does not exist", nameof(checkpointNumber));
+            }
+            checkpoint.HitCount++;
+            _registers[RegisterPC] = checkpoint.Start;
+            pc = checkpoint.Start;
+            stops = checkpoint.StopWhenHit;
+            info = BuildCheckpointInfo(checkpoint, currentlyHit: true);
+            if (stops)
+            {
+                IsRunning = false;
+            }
+        }
+        await SendFrameAsync(BuildFrame(ResponseType.CheckpointInfo, ErrorCode.OK, Constants.BroadcastRequestId, info), _cts.Token);
+        if (stops)
+        {
+            await SendFrameAsync(BuildProgramCounterFrame(ResponseType.Stopped, pc), _cts.Token);
+        }
+    }
+
+    /// <summary>
+    /// Drops the current connection as if VICE went away.
+    /// </summary>
+    public void Disconnect()
+    {
+        Interlocked.Exchange(ref _stream, null)?.Dispose();
+    }
+
+    public async ValueTask DisposeAsync()
+    {
+        _cts.Cancel();
+        _listener.Stop();
+        Disconnect();
+        if (_acceptTask != null)
+        {
+            try { await _acceptTask; }
+            catch (OperationCanceledException) { }
+        }
+        _cts.Dispose();
+    }
+
+    private async Task AcceptLoopAsync(CancellationToken ct)
+    {
+        while (!ct.IsCancellationRequested)
+        {
+            Socket socket;
+            try
+            {
+                socket = await _listener.AcceptSocketAsync(ct);
+            }
+            catch (Exception ex) when (ex is OperationCanceledException or SocketException or ObjectDisposedException)
+            {
+                return;
+            }
+            socket.NoDelay = true;
+            Interlocked.Increment(ref _connections);
+            var stream = new NetworkStream(socket, ownsSocket: true);
+            Volatile.Write(ref _stream, stream);
+            try
+            {
+                await ServeAsync(stream, ct);
+            }
+            catch (Exception ex) when (ex is IOException or SocketException or ObjectDisposedException or OperationCanceledException or EndOfStreamException)
+            {
+                // Client went away or the monitor is shutting down
+            }
+            finally
+            {
+                Interlocked.CompareExchange(ref _stream, null, stream);
+                await stream.DisposeAsync();
+            }
+        }
+    }
+
+    private async Task ServeAsync(NetworkStream stream, CancellationToken ct)
+    {
+        var header = new byte[CommandHeaderLength];
+        while (!ct.IsCancellationRequested)
+        {
+            await stream.ReadExactlyAsync(header, ct);
+            uint length = BinaryPrimitives.ReadUInt32LittleEndian(header.AsSpan(2));
+            uint requestId = BinaryPrimitives.ReadUInt32LittleEndian(header.AsSpan(6));
+            var commandType = (CommandType)header[10];
+            var body = new byte[length];
+            await stream.ReadExactlyAsync(body, ct);
+            Interlocked.Add(ref _bytesReceived, CommandHeaderLength + length);
+            await PaceAsync(CommandHeaderLength + (int)length, ct);
+            _commandCounts.AddOrUpdate(commandType, 1, (_, count) => count + 1);
+
+            if (header[0] != Constants.STX || header[1] != ViceCommand.DefaultApiVersion)
+            {
+                await SendFramesAsync([BuildFrame((ResponseType)commandType, ErrorCode.UnknownApiVersion, requestId)], ct);
+                continue;
+            }
+
+            var frames = new List<byte[]>();
+            lock (_stateLock)
+            {
+                if (IsRunning && StopsOnCommand && commandType is not (CommandType.Exit or CommandType.Quit))
+                {
+                    IsRunning = false;
+                    frames.Add(BuildProgramCounterFrame(ResponseType.Stopped, _registers[RegisterPC]));
+                }
+                try
+                {
+                    Handle(commandType, requestId, body, frames);
+                }
+                catch (Exception ex) when (ex is ArgumentOutOfRangeException or IndexOutOfRangeException)
+                {
+                    // Body shorter than the command needs
+                    frames.Add(BuildFrame((ResponseType)commandType, ErrorCode.IncorrectCommandLength, requestId));
+                }
+            }
+            await SendFramesAsync(frames, ct);
+            if (commandType == CommandType.Quit)
+            {
+                _listener.Stop();
+                return;
+            }
+        }
+    }
+
+    /// <summary>
+    /// Executes a command and adds its answer and any broadcasts it causes to <paramref name="frames"/>.
+    /// </summary>
+    private void Handle(CommandType commandType, uint requestId, ReadOnlySpan<byte> body, List<byte[]> frames)
+    {
+        switch (commandType)
+        {
+            case CommandType.MemoryGet:
+            {
+                var (start, end, memSpace, bankId) = ReadMemoryRange(body);
+                if (!IsValid(memSpace, bankId, out var error) || end < start)
+                {
+                    frames.Add(BuildFrame(ResponseType.MemoryGet, error ?? ErrorCode.InvalidParameterValue, requestId));
+                    break;
+                }
+                int length = end - start + 1;
+                var response = new byte[2 + length];
+                // VICE's length field is 16 bits wide, a full 64 KB read reports 0
+                BinaryPrimitives.WriteUInt16LittleEndian(response, (ushort)length);
+                GetMemoryLocked(memSpace, bankId).AsSpan(start, length).CopyTo(response.AsSpan(2));
+                frames.Add(BuildFrame(ResponseType.MemoryGet, ErrorCode.OK, requestId, response));
+                break;
+            }
+            case CommandType.MemorySet:
+            {
+                var (start, end, memSpace, bankId) = ReadMemoryRange(body);
+                var data = body[8..];
+                if (!IsValid(memSpace, bankId, out var error) || end < start)
+                {
+                    frames.Add(BuildFrame(ResponseType.MemorySet, error ?? ErrorCode.InvalidParameterValue, requestId));
+                    break;
+                }
+                if (data.Length != end - start + 1)
+                {
+                    frames.Add(BuildFrame(ResponseType.MemorySet, ErrorCode.IncorrectCommandLength, requestId));
+                    break;
+                }
+                data.CopyTo(GetMemoryLocked(memSpace, bankId).AsSpan(start));
+                frames.Add(BuildFrame(ResponseType.MemorySet, ErrorCode.OK, requestId));
+                break;
+            }
+            case CommandType.CheckpointSet:
+            {
+                var checkpoint = new Checkpoint(_nextCheckpointNumber++,
+                    BinaryPrimitives.ReadUInt16LittleEndian(body), BinaryPrimitives.ReadUInt16LittleEndian(body[2..]))
+                {
+                    StopWhenHit = body[4] != 0,
+                    Enabled = body[5] != 0,
+                    Operation = (CpuOperation)body[6],
+                    Temporary = body[7] != 0,
+                };
+                _checkpoints[checkpoint.Number] = checkpoint;
+                frames.Add(BuildFrame(ResponseType.CheckpointInfo, ErrorCode.OK, requestId, BuildCheckpointInfo(checkpoint, false)));
+                break;
+            }
+            case CommandType.CheckpointGet:
+            {
+                frames.Add(_checkpoints.TryGetValue(BinaryPrimitives.ReadUInt32LittleEndian(body), out var checkpoint)
+                    ? BuildFrame(ResponseType.CheckpointInfo, ErrorCode.OK, requestId, BuildCheckpointInfo(checkpoint, false))
+                    : BuildFrame(ResponseType.CheckpointInfo, ErrorCode.ObjectDoesNotExist, requestId));
+                break;
+            }
+            case CommandType.CheckpointDelete:
+            {
+                var found = _checkpoints.Remove(BinaryPrimitives.ReadUInt32LittleEndian(body));
+                frames.Add(BuildFrame((ResponseType)CommandType.CheckpointDelete, found ? ErrorCode.OK : ErrorCode.ObjectDoesNotExist, requestId));
+                break;
+            }
+            case CommandType.CheckpointList:
+            {
+                foreach (var checkpoint in _checkpoints.Values)
+                {
+                    frames.Add(BuildFrame(ResponseType.CheckpointInfo, ErrorCode.OK, requestId, BuildCheckpointInfo(checkpoint, false)));
+                }
+                var count = new byte[4];
+                BinaryPrimitives.WriteUInt32LittleEndian(count, (uint)_checkpoints.Count);
+                frames.Add(BuildFrame(ResponseType.CheckpointList, ErrorCode.OK, requestId, count));
+                break;
+            }
+            case CommandType.CheckpointToggle:
+            {
+                bool found = _checkpoints.TryGetValue(BinaryPrimitives.ReadUInt32LittleEndian(body), out var checkpoint);
+                if (found)
+                {
+                    checkpoint!.Enabled = body[4] != 0;
+                }
+                frames.Add(BuildFrame(ResponseType.CheckpointToggle, found ? ErrorCode.OK : ErrorCode.ObjectDoesNotExist, requestId));
+                break;
+            }
+            case CommandType.ConditionSet:
+            {
+                bool found = _checkpoints.TryGetValue(BinaryPrimitives.ReadUInt32LittleEndian(body), out var checkpoint);
+                if (found)
+                {
+                    checkpoint!.Condition = Encoding.ASCII.GetString(body.Slice(5, body[4]));
+                }
+                frames.Add(BuildFrame(ResponseType.ConditionSet, found ? ErrorCode.OK : ErrorCode.ObjectDoesNotExist, requestId));
+                break;
+            }
+            case CommandType.RegistersGet:
+                frames.Add(BuildFrame(ResponseType.RegisterInfo, ErrorCode.OK, requestId, BuildRegisters()));
+                break;
+            case CommandType.RegistersSet:
+            {
+                int count = BinaryPrimitives.ReadUInt16LittleEndian(body[1..]);
+                var items = body[3..];
+                for (int i = 0; i < count; i++)
+                {
+                    byte id = items[1];
+                    if (id >= _registers.Length)
+                    {
+                        frames.Add(BuildFrame(ResponseType.RegisterInfo, ErrorCode.ObjectDoesNotExist, requestId));
+                        return;
+                    }
+                    _registers[id] = BinaryPrimitives.ReadUInt16LittleEndian(items[2..]);
+                    items = items[(items[0] + 1)..];
+                }
+                frames.Add(BuildFrame(ResponseType.RegisterInfo, ErrorCode.OK, requestId, BuildRegisters()));
+                break;
+            }
+            case CommandType.AdvanceInstruction:
+            {
+                bool stepOver = body[0] != 0;
+                int count = Math.Max((int)BinaryPrimitives.ReadUInt16LittleEndian(body[1..]), 1);
+                frames.Add(BuildFrame(ResponseType.AdvanceInstruction, ErrorCode.OK, requestId));
+                for (int i = 0; i < count; i++)
+                {
+                    ExecuteInstruction(stepOver);
+                    if (TryHitExecCheckpoint(frames))
+                    {
+                        break;
+                    }
+                }
+                frames.Add(BuildProgramCounterFrame(ResponseType.Stopped, _registers[RegisterPC]));
+                break;
+            }
+            case CommandType.ExecuteUntilReturn:
+            {
+                frames.Add(BuildFrame(ResponseType.ExecuteUntilReturn, ErrorCode.OK, requestId));
+                // Bounded so a missing RTS can't hang the monitor
+                for (int i = 0; i < 0x10000; i++)
+                {
+                    var memory = GetMemoryLocked(MemSpace.MainMemory, 0);
+                    bool isReturn = memory[_registers[RegisterPC]] is 0x60 or 0x40;
+                    ExecuteInstruction(stepOver: true);
+                    if (isReturn || TryHitExecCheckpoint(frames))
+                    {
+                        break;
+                    }
+                }
+                frames.Add(BuildProgramCounterFrame(ResponseType.Stopped, _registers[RegisterPC]));
+                break;
+            }
+            case CommandType.KeyboardFeed:
+            {
+                // Queue into the C64 keyboard buffer at $0277, length at $C6
+                var memory = GetMemoryLocked(MemSpace.MainMemory, 0);
+                foreach (var key in body.Slice(1, body[0]))
+                {
+                    if (memory[0xC6] < 10)
+                    {
+                        memory[0x0277 + memory[0xC6]++] = key == (byte)'\n' ? (byte)0x0D : key;
+                    }
+                }
+                frames.Add(BuildFrame(ResponseType.KeyboardFeed, ErrorCode.OK, requestId));
+                break;
+            }
+            case CommandType.Ping:
+                frames.Add(BuildFrame(ResponseType.Ping, ErrorCode.OK, requestId));
+                break;
+            case CommandType.Info:
+                frames.Add(BuildFrame(ResponseType.Info, ErrorCode.OK, requestId, [4, 3, 7, 1, 0, 4, 0, 0, 0, 0]));
+                break;
+            case CommandType.BanksAvailable:
+                frames.Add(BuildFrame(ResponseType.BanksAvailable, ErrorCode.OK, requestId, BuildBanks()));
+                break;
+            case CommandType.RegistersAvailable:
+                frames.Add(BuildFrame(ResponseType.RegistersAvailable, ErrorCode.OK, requestId, BuildRegistersAvailable()));
+                break;
+            case CommandType.DisplayGet:
+                frames.Add(BuildFrame(ResponseType.DisplayGet, ErrorCode.OK, requestId, BuildDisplay()));
+                break;
+            case CommandType.Dump:
+            {
+                var fileName = Encoding.ASCII.GetString(body.Slice(3, body[2]));
+                frames.Add(BuildFrame(ResponseType.Dump, TryDump(fileName) ? ErrorCode.OK : ErrorCode.GeneralFailure, requestId));
+                break;
+            }
+            case CommandType.Undump:
+            {
+                var fileName = Encoding.ASCII.GetString(body.Slice(1, body[0]));
+                if (!TryUndump(fileName))
+                {
+                    frames.Add(BuildFrame(ResponseType.Undump, ErrorCode.GeneralFailure, requestId));
+                    break;
+                }
+                var pc = new byte[2];
+                BinaryPrimitives.WriteUInt16LittleEndian(pc, _registers[RegisterPC]);
+                frames.Add(BuildFrame(ResponseType.Undump, ErrorCode.OK, requestId, pc));
+                break;
+            }
+            case CommandType.Exit:
+                frames.Add(BuildFrame(ResponseType.Exit, ErrorCode.OK, requestId));
+                IsRunning = true;
+                Resumed?.Invoke();
+                frames.Add(BuildProgramCounterFrame(ResponseType.Resumed, _registers[RegisterPC]));
+                break;
+            case CommandType.Reset:
+                ResetRegisters();
+                frames.Add(BuildFrame(ResponseType.Reset, ErrorCode.OK, requestId));
+                break;
+            case CommandType.Quit:
+                frames.Add(BuildFrame(ResponseType.Quit, ErrorCode.OK, requestId));
+                break;
+            default:
+                frames.Add(BuildFrame((ResponseType)commandType, ErrorCode.UnknownCommandType, requestId));
+                break;
+        }
+    }
+
+    private static (ushort Start, ushort End, MemSpace MemSpace, ushort BankId) ReadMemoryRange(ReadOnlySpan<byte> body) => (
+        BinaryPrimitives.ReadUInt16LittleEndian(body[1..]),
+        BinaryPrimitives.ReadUInt16LittleEndian(body[3..]),
+        (MemSpace)body[5],
+        BinaryPrimitives.ReadUInt16LittleEndian(body[6..]));
+
+    private static bool IsValid(MemSpace memSpace, ushort bankId, out ErrorCode? error)
+    {
+        error = memSpace > MemSpace.Drive11 ? ErrorCode.InvalidMemSpace
+            : bankId >= Banks.Length ? ErrorCode.InvalidParameterValue
+            : null;
+        return error == null;
+    }
+
+    private byte[] GetMemoryLocked(MemSpace memSpace, ushort bankId)
+    {
+        if (!_memory.TryGetValue((memSpace, bankId), out var memory))
+        {
+            memory = new byte[0x10000];
+            _memory[(memSpace, bankId)] = memory;
+        }
+        return memory;
+    }
+
+    private void ResetRegisters()
+    {
+        Array.Clear(_registers);
+        _registers[RegisterPC] = ResetVector;
+        _registers[RegisterSP] = 0xFF;
+        _registers[RegisterFlags] = 0x24;
+    }
+
+    /// <summary>
+    /// Moves the PC past the instruction at PC. JSR, JMP and RTS change the flow, branches are not taken.
+    /// </summary>
+    private void ExecuteInstruction(bool stepOver)
+    {
+        var memory = GetMemoryLocked(MemSpace.MainMemory, 0);
+        ushort pc = _registers[RegisterPC];
+        byte opcode = memory[pc];
+        ushort operand = (ushort)(memory[(ushort)(pc + 1)] | memory[(ushort)(pc + 2)] << 8);
+        switch (opcode)
+        {
+            case 0x20 when !stepOver:
+            {
+                ushort returnAddress = (ushort)(pc + 2);
+                Push(memory, (byte)(returnAddress >> 8));
+                Push(memory, (byte)returnAddress);
+                _registers[RegisterPC] = operand;
+                break;
+            }
+            case 0x20:
+                SteppedOver?.Invoke(operand);
+                _registers[RegisterPC] = (ushort)(pc + 3);
+                break;
+            case 0x4C:
+                _registers[RegisterPC] = operand;
+                break;
+            case 0x60:
+            {
+                byte low = Pull(memory);
+                byte high = Pull(memory);
+                _registers[RegisterPC] = (ushort)((low | high << 8) + 1);
+                break;
+            }
+            default:
+                _registers[RegisterPC] = (ushort)(pc + GetInstructionLength(opcode));
+                break;
+        }
+    }
+
+    private void Push(byte[] memory, byte value)
+    {
+        memory[0x0100 + _registers[RegisterSP]] = value;
+        _registers[RegisterSP] = (byte)(_registers[RegisterSP] - 1);
+    }
+
+    private byte Pull(byte[] memory)
+    {
+        _registers[RegisterSP] = (byte)(_registers[RegisterSP] + 1);
+        return memory[0x0100 + _registers[RegisterSP]];
+    }
+
+    /// <summary>
+    /// Instruction length from the addressing mode bits of the opcode, illegal opcodes included.
+    /// </summary>
+    private static int GetInstructionLength(byte opcode)
+    {
+        int mode = (opcode >> 2) & 7;
+        switch (opcode & 3)
+        {
+            case 0:
+                if (mode == 0)
+                {
+                    // BRK, JSR, RTI, RTS, then immediate NOP/LDY/CPY/CPX
+                    return opcode switch { 0x00 or 0x40 or 0x60 => 1, 0x20 => 3, _ => 2 };
+                }
+                return mode switch { 2 or 6 => 1, 3 or 7 => 3, _ => 2 };
+            case 2:
+                return mode switch { 0 => opcode >= 0x80 ? 2 : 1, 2 or 4 or 6 => 1, 3 or 7 => 3, _ => 2 };
+            default:
+                return mode switch { 3 or 6 or 7 => 3, _ => 2 };
+        }
+    }
+
+    private bool TryHitExecCheckpoint(List<byte[]> frames)
+    {
+        ushort pc = _registers[RegisterPC];
+        foreach (var checkpoint in _checkpoints.Values)
+        {
+            if (checkpoint.Enabled && checkpoint.Operation.HasFlag(CpuOperation.Exec)
+                && pc >= checkpoint.Start && pc <= checkpoint.End)
+            {
+                checkpoint.HitCount++;
+                frames.Add(BuildFrame(ResponseType.CheckpointInfo, ErrorCode.OK, Constants.BroadcastRequestId,
+                    BuildCheckpointInfo(checkpoint, currentlyHit: true)));
+                if (checkpoint.Temporary)
+                {
+                    _checkpoints.Remove(checkpoint.Number);
+                }
+                return checkpoint.StopWhenHit;
+            }
+        }
+        return false;
+    }
+
+    private bool TryDump(string fileName)
+    {
+        try
+        {
+            using var writer = new BinaryWriter(File.Create(fileName));
+            writer.Write(DumpMagic);
+            foreach (var register in _registers)
+            {
+                writer.Write(register);
+            }
+            writer.Write(_memory.Count);
+            foreach (var ((memSpace, bankId), memory) in _memory)
+            {
+                writer.Write((byte)memSpace);
+                writer.Write(bankId);
+                writer.Write(memory);
+            }
+            return true;
+        }
+        catch (IOException)
+        {
+            return false;
+        }
+    }
+
+    private bool TryUndump(string fileName)
+    {
+        try
+        {
+            using var reader = new BinaryReader(File.OpenRead(fileName));
+            if (!reader.ReadBytes(DumpMagic.Length).AsSpan().SequenceEqual(DumpMagic))
+            {
+                return false;
+            }
+            for (int i = 0; i < _registers.Length; i++)
+            {
+                _registers[i] = reader.ReadUInt16();
+            }
+            _memory.Clear();
+            int banks = reader.ReadInt32();
+            for (int i = 0; i < banks; i++)
+            {
+                var key = ((MemSpace)reader.ReadByte(), reader.ReadUInt16());
+                _memory[key] = reader.ReadBytes(0x10000);
+            }
+            return true;
+        }
+        catch (Exception ex) when (ex is IOException or UnauthorizedAccessException)
+        {
+            return false;
+        }
+    }
+
+    private static byte[] BuildCheckpointInfo(Checkpoint checkpoint, bool currentlyHit)
+    {
+        var info = new byte[CheckpointInfoLength];
+        BinaryPrimitives.WriteUInt32LittleEndian(info, checkpoint.Number);
+        info[4] = (byte)(currentlyHit ? 1 : 0);
+        BinaryPrimitives.WriteUInt16LittleEndian(info.AsSpan(5), checkpoint.Start);
+        BinaryPrimitives.WriteUInt16LittleEndian(info.AsSpan(7), checkpoint.End);
+        info[9] = (byte)(checkpoint.StopWhenHit ? 1 : 0);
+        info[10] = (byte)(checkpoint.Enabled ? 1 : 0);
+        info[11] = (byte)checkpoint.Operation;
+        info[12] = (byte)(checkpoint.Temporary ? 1 : 0);
+        BinaryPrimitives.WriteUInt32LittleEndian(info.AsSpan(13), checkpoint.HitCount);
+        BinaryPrimitives.WriteUInt32LittleEndian(info.AsSpan(17), 0);
+        info[21] = (byte)(checkpoint.Condition != null ? 1 : 0);
+        return info;
+    }
+
+    private byte[] BuildRegisters()
+    {
+        var body = new byte[2 + _registers.Length * 4];
+        BinaryPrimitives.WriteUInt16LittleEndian(body, (ushort)_registers.Length);
+        for (int i = 0; i < _registers.Length; i++)
+        {
+            var item = body.AsSpan(2 + i * 4);
+            item[0] = 3;
+            item[1] = (byte)i;
+            BinaryPrimitives.WriteUInt16LittleEndian(item[2..], _registers[i]);
+        }
+        return body;
+    }
+
+    private static byte[] BuildBanks()
+    {
+        using var body = new MemoryStream();
+        using var writer = new BinaryWriter(body);
+        writer.Write((ushort)Banks.Length);
+        foreach (var (id, name) in Banks)
+        {
+            writer.Write((byte)(3 + name.Length));
+            writer.Write(id);
+            writer.Write((byte)name.Length);
+            writer.Write(Encoding.ASCII.GetBytes(name));
+        }
+        writer.Flush();
+        return body.ToArray();
+    }
+
+    private static byte[] BuildRegistersAvailable()
+    {
+        using var body = new MemoryStream();
+        using var writer = new BinaryWriter(body);
+        writer.Write((ushort)RegisterDefinitions.Length);
+        foreach (var (id, bits, name) in RegisterDefinitions)
+        {
+            writer.Write((byte)(3 + name.Length));
+            writer.Write(id);
+            writer.Write(bits);
+            writer.Write((byte)name.Length);
+            writer.Write(Encoding.ASCII.GetBytes(name));
+        }
+        writer.Flush();
+        return body.ToArray();
+    }
+
+    /// <summary>
+    /// An indexed 384x272 frame like x64sc's with the border in the $D020 color and the 320x200 inner area in the
+    /// $D021 color.
+    /// </summary>
+    private byte[] BuildDisplay()
+    {
+        const int width = 384, height = 272, offsetX = 32, offsetY = 35, innerWidth = 320, innerHeight = 200;
+        const int infoLength = 17;
+        var io = GetMemoryLocked(MemSpace.MainMemory, 0);
+        var body = new byte[4 + infoLength + width * height];
+        var span = body.AsSpan();
+        BinaryPrimitives.WriteUInt32LittleEndian(span, infoLength);
+        BinaryPrimitives.WriteUInt16LittleEndian(span[4..], width);
+        BinaryPrimitives.WriteUInt16LittleEndian(span[6..], height);
+        BinaryPrimitives.WriteUInt16LittleEndian(span[8..], offsetX);
+        BinaryPrimitives.WriteUInt16LittleEndian(span[10..], offsetY);
+        BinaryPrimitives.WriteUInt16LittleEndian(span[12..], innerWidth);
+        BinaryPrimitives.WriteUInt16LittleEndian(span[14..], innerHeight);
+        span[16] = 8;
+        BinaryPrimitives.WriteUInt32LittleEndian(span[17..], width * height);
+        var pixels = span[(4 + infoLength)..];
+        pixels.Fill((byte)(io[0xD020] & 0x0F));
+        for (int y = offsetY; y < offsetY + innerHeight; y++)
+        {
+            pixels.Slice(y * width + offsetX, innerWidth).Fill((byte)(io[0xD021] & 0x0F));
+        }
+        return body;
+    }
+
+    private static byte[] BuildProgramCounterFrame(ResponseType responseType, ushort pc)
+    {
+        var body = new byte[2];
+        BinaryPrimitives.WriteUInt16LittleEndian(body, pc);
+        return BuildFrame(responseType, ErrorCode.OK, Constants.BroadcastRequestId, body);
+    }
+
+    private static byte[] BuildFrame(ResponseType responseType, ErrorCode errorCode, uint requestId, ReadOnlySpan<byte> body = default)
+    {
+        var frame = new byte[ResponseHeaderLength + body.Length];
+        frame[0] = Constants.STX;
+        frame[1] = ViceCommand.DefaultApiVersion;
+        BinaryPrimitives.WriteUInt32LittleEndian(frame.AsSpan(2), (uint)body.Length);
+        frame[6] = (byte)responseType;
+        frame[7] = (byte)errorCode;
+        BinaryPrimitives.WriteUInt32LittleEndian(frame.AsSpan(8), requestId);
+        body.CopyTo(frame.AsSpan(ResponseHeaderLength));
+        return frame;
+    }
+
+    private async Task SendFramesAsync(List<byte[]> frames, CancellationToken ct)
+    {
+        if (Latency > TimeSpan.Zero)
+        {
+            await Task.Delay(Latency, ct);
+        }
+        foreach (var frame in frames)
+        {
+            await SendFrameAsync(frame, ct);
+        }
+    }
+
+    private async Task SendFrameAsync(byte[] frame, CancellationToken ct)
+    {
+        await PaceAsync(frame.Length, ct);
+        await _writeLock.WaitAsync(ct);
+        try
+        {
+            var stream = Volatile.Read(ref _stream);
+            if (stream == null)
+            {
+                return;
+            }
+            await stream.WriteAsync(frame, ct);
+            Interlocked.Add(ref _bytesSent, frame.Length);
+        }
+        finally
+        {
+            _writeLock.Release();
+        }
+    }
+
+    /// <summary>
+    /// Token bucket for <see cref="BytesPerSecond"/>: reserves transfer time for <paramref name="bytes"/> and
+    /// waits once the reservations run more than a millisecond ahead.
+    /// </summary>
+    private async Task PaceAsync(int bytes, CancellationToken ct)
+    {
+        long bytesPerSecond = BytesPerSecond;
+        if (bytesPerSecond <= 0)
+        {
+            return;
+        }
+        long duration = bytes * Stopwatch.Frequency / bytesPerSecond;
+        long now = Stopwatch.GetTimestamp();
+        long start, end;
+        do
+        {
+            start = Interlocked.Read(ref _nextTransferTimestamp);
+            end = Math.Max(start, now) + duration;
+        }
+        while (Interlocked.CompareExchange(ref _nextTransferTimestamp, end, start) != start);
+
+        var ahead = Stopwatch.GetElapsedTime(now, end);
+        if (ahead > TimeSpan.FromMilliseconds(1))
+        {
+            await Task.Delay(ahead, ct);
+        }
+    }
+
+    private sealed class Checkpoint(uint number, ushort start, ushort end)
+    {
+        public uint Number { get; } = number;
+        public ushort Start { get; } = start;
+        public ushort End { get; } = end;
+        public bool StopWhenHit { get; set; }
+        public bool Enabled { get; set; }
+        public CpuOperation Operation { get; set; }
+        public bool Temporary { get; set; }
+        public uint HitCount { get; set; }
+        public string? Condition { get; set; }
+    }
+}
@@ -0,0 +1,122 @@
+using System.Diagnostics;
+using FluentAssertions;
+using ViceMCP.ViceBridge;
+using ViceMCP.ViceBridge.Commands;
+
+namespace ViceMCP.Tests;
+
+public class FakeViceMonitorTests : FakeMonitorTestBase
+{
+    [Fact]
+    public async Task Memory_Written_Through_Bridge_Should_Read_Back()
+    {
+        using var data = BufferManager.GetBuffer(3);
+        new byte[] { 0xA9, 0x01, 0x60 }.CopyTo(data.Data, 0);
+
+        var write = await Bridge.EnqueueCommand(new MemorySetCommand(0, 0xC000, MemSpace.MainMemory, 0, data)).Response;
+        var read = await Bridge.EnqueueCommand(new MemoryGetCommand(0, 0xC000, 0xC002, MemSpace.MainMemory, 0)).Response;
+
+        write.IsSuccess.Should().BeTrue();
+        using var memory = read.Response!.Memory!.Value;
+        memory.Data.AsSpan(0, (int)memory.Size).ToArray().Should().Equal(0xA9, 0x01, 0x60);
+        Monitor.GetMemory()[0xC001].Should().Be(0x01);
+    }
+
+    [Fact]
+    public async Task Command_Should_Stop_Running_Machine_Until_Bridge_Resumes_It()
+    {
+        await Bridge.EnqueueCommand(new ExitCommand()).Response;
+        var states = new List<EmulatorRunState>();
+        var resumed = new TaskCompletionSource();
+        Bridge.RunStateChanged += (_, e) =>
+        {
+            lock (states)
+            {
+                states.Add(e.RunState);
+            }
+            if (e.RunState == EmulatorRunState.Running)
+            {
+                resumed.TrySetResult();
+            }
+        };
+
+        await Bridge.EnqueueCommand(new BanksAvailableCommand()).Response;
+        await resumed.Task.WaitAsync(TimeSpan.FromSeconds(5));
+
+        states.Should().Equal(EmulatorRunState.Stopped, EmulatorRunState.Running);
+        Monitor.IsRunning.Should().BeTrue();
+    }
+
+    [Fact]
+    public async Task CheckpointList_Should_Collect_Infos()
+    {
+        await Bridge.EnqueueCommand(new CheckpointSetCommand(0x0810, 0x0810, true, true, CpuOperation.Exec, false)).Response;
+        await Bridge.EnqueueCommand(new CheckpointSetCommand(0xD020, 0xD021, false, true, CpuOperation.Store, false)).Response;
+
+        var list = await Bridge.EnqueueCommand(new CheckpointListCommand()).Response;
+
+        list.Response!.TotalNumberOfCheckpoints.Should().Be(2);
+        list.Response.Info.Select(i => i.StartAddress).Should().Equal(0x0810, 0xD020);
+    }
+
+    [Fact]
+    public async Task Step_Should_Follow_Jsr_And_Stop_On_Exec_Checkpoint()
+    {
+        var memory = Monitor.GetMemory();
+        new byte[] { 0xA9, 0x00, 0x20, 0x00, 0xC1 }.CopyTo(memory, 0xC000);
+        Monitor.SetRegister(FakeViceMonitor.RegisterPC, 0xC000);
+        await Bridge.EnqueueCommand(new CheckpointSetCommand(0xC100, 0xC100, true, true, CpuOperation.Exec, false)).Response;
+
+        await Bridge.EnqueueCommand(new AdvanceInstructionCommand(false, 10)).Response;
+
+        Monitor.GetRegister(FakeViceMonitor.RegisterPC).Should().Be(0xC100);
+        Monitor.GetRegister(FakeViceMonitor.RegisterSP).Should().Be(0xFD);
+    }
+
+    [Fact]
+    public async Task Undump_Should_Restore_Dumped_State()
+    {
+        var path = Path.Combine(Path.GetTempPath(), $"fake-{Guid.NewGuid():N}.vsf");
+        try
+        {
+            Monitor.GetMemory()[0x0400] = 0x01;
+            Monitor.SetRegister(FakeViceMonitor.RegisterPC, 0x1234);
+            await Bridge.EnqueueCommand(new DumpCommand(false, false, path)).Response;
+            Monitor.GetMemory()[0x0400] = 0x02;
+            Monitor.SetRegister(FakeViceMonitor.RegisterPC, 0x0000);
+
+            var undump = await Bridge.EnqueueCommand(new UndumpCommand(path)).Response;
+
+            undump.Response!.ProgramCounterPosition.Should().Be(0x1234);
+            Monitor.GetMemory()[0x0400].Should().Be(0x01);
+        }
+        finally
+        {
+            File.Delete(path);
+        }
+    }
+
+    [Fact]
+    public async Task Latency_Should_Delay_Each_Answer()
+    {
+        Monitor.Latency = TimeSpan.FromMilliseconds(20);
+        var stopwatch = Stopwatch.StartNew();
+
+        await Bridge.EnqueueCommand(new PingCommand()).Response;
+
+        stopwatch.Elapsed.Should().BeGreaterThanOrEqualTo(TimeSpan.FromMilliseconds(18));
+    }
+
+    [Fact]
+    public async Task Bandwidth_Should_Pace_Transfers()
+    {
+        Monitor.BytesPerSecond = 200_000;
+        var stopwatch = Stopwatch.StartNew();
+
+        // 20 KB at 200 KB/s takes about 100 ms
+        var read = await Bridge.EnqueueCommand(new MemoryGetCommand(0, 0x0000, 0x4FFF, MemSpace.MainMemory, 0)).Response;
+        read.Response!.Memory!.Value.Dispose();
+
+        stopwatch.Elapsed.Should().BeGreaterThanOrEqualTo(TimeSpan.FromMilliseconds(90));
+    }
+}
@@ -0,0 +1,127 @@
+using System.Buffers.Binary;
+using FluentAssertions;
+
+namespace ViceMCP.Tests;
+
+public class InstructionTracerTests : FakeMonitorTestBase
+{
+    private readonly string _filePath = Path.Combine(Path.GetTempPath(), $"trace-{Guid.NewGuid():N}.bin");
+
+    public override async Task InitializeAsync()
+    {
+        await base.InitializeAsync();
+
+        // LDA #$01 / JSR $C100 / JMP $C000, $C100: INX / RTS
+        new byte[] { 0xA9, 0x01, 0x20, 0x00, 0xC1, 0x4C, 0x00, 0xC0 }.CopyTo(Monitor.GetMemory(), 0xC000);
+        new byte[] { 0xE8, 0x60 }.CopyTo(Monitor.GetMemory(), 0xC100);
+        Monitor.SetRegister(FakeViceMonitor.RegisterPC, 0xC000);
+    }
+
+    public override async Task DisposeAsync()
+    {
+        File.Delete(_filePath);
+        await base.DisposeAsync();
+    }
+
+    [Fact]
+    public async Task Trace_Should_Write_One_Record_Per_Instruction()
+    {
+        var result = await new InstructionTracer(Bridge).TraceAsync(_filePath, 6, [], null, stepOver: false);
+
+        result.Instructions.Should().Be(6);
+        result.Final.PC.Should().Be(0xC002);
+        result.PageReads.Should().Be(2);
+        var file = await File.ReadAllBytesAsync(_filePath);
+        file.Should().HaveCount(InstructionTracer.HeaderSize + 6 * InstructionTracer.RecordSize);
+        file.AsSpan(0, 4).ToArray().Should().Equal("VTRC"u8.ToArray());
+        BinaryPrimitives.ReadUInt32LittleEndian(file.AsSpan(8)).Should().Be(6);
+        var pcs = Enumerable.Range(0, 6)
+            .Select(i => BinaryPrimitives.ReadUInt16LittleEndian(file.AsSpan(InstructionTracer.HeaderSize + i * InstructionTracer.RecordSize)));
+        pcs.Should().Equal(0xC000, 0xC002, 0xC100, 0xC101, 0xC005, 0xC000);
+        file[InstructionTracer.HeaderSize + 7].Should().Be(0xA9, "the opcode follows the registers");
+    }
+
+    [Fact]
+    public async Task Trace_Should_Stop_Before_Stop_Address()
+    {
+        var result = await new InstructionTracer(Bridge).TraceAsync(_filePath, 1000, [0xC100], null, stepOver: false);
+
+        result.Instructions.Should().Be(2);
+        result.StopReason.Should().Be("reached $C100");
+        result.Recent.Last().Should().StartWith("$C002  JSR $C100");
+    }
+
+    [Fact]
+    public async Task Trace_Should_Decode_Code_Rewritten_By_A_Stepped_Over_Subroutine()
+    {
+        // The subroutine replaces the JMP after the call with a NOP
+        Monitor.SteppedOver += address =>
+        {
+            if (address == 0xC100)
+            {
+                Monitor.GetMemory()[0xC005] = 0xEA;
+            }
+        };
+
+        var result = await new InstructionTracer(Bridge).TraceAsync(_filePath, 3, [], null, stepOver: true);
+
+        result.Final.PC.Should().Be(0xC006);
+        result.Recent.Last().Should().StartWith("$C005  NOP");
+        var file = await File.ReadAllBytesAsync(_filePath);
+        file[InstructionTracer.HeaderSize + 2 * InstructionTracer.RecordSize + 7].Should().Be(0xEA);
+    }
+
+    [Fact]
+    public async Task Trace_Should_Keep_Emulator_Stopped_Until_Done()
+    {
+        // Let the auto-resume after the handshake settle first
+        await WaitUntilAsync(() => Monitor.IsRunning);
+        var resumed = 0;
+        Bridge.RunStateChanged += (_, e) =>
+        {
+            if (e.RunState == ViceBridge.EmulatorRunState.Running)
+            {
+                Interlocked.Increment(ref resumed);
+            }
+        };
+
+        using (Bridge.HoldAutoResume())
+        {
+            await new InstructionTracer(Bridge).TraceAsync(_filePath, 20, [], null, stepOver: false);
+            resumed.Should().Be(0);
+        }
+
+        // The resume owed by the trace is sent once the hold is released
+        await WaitUntilAsync(() => Volatile.Read(ref resumed) == 1);
+        Monitor.IsRunning.Should().BeTrue();
+    }
+
+    private static async Task WaitUntilAsync(Func<bool> condition)
+    {
+        using var timeout = new CancellationTokenSource(TimeSpan.FromSeconds(5));
+        while (!condition())
+        {
+            await Task.Delay(5, timeout.Token);
+        }
+    }
+
+    [Theory]
+    [InlineData("A==$01", true)]
+    [InlineData("A==1 && X<1", true)]
+    [InlineData("PC>=0xC100", false)]
+    [InlineData("FL&$04", true)]
+    public void Condition_Should_Compare_Registers(string condition, bool expected)
+    {
+        var registers = new CpuRegisters(0xC000, 0x01, 0x00, 0x00, 0xFF, 0x24);
+
+        TraceCondition.Parse(condition).Matches(registers).Should().Be(expected);
+    }
+
+    [Fact]
+    public void Condition_Should_Reject_Unknown_Register()
+    {
+        var act = () => TraceCondition.Parse("Q==1");
+
+        act.Should().Throw<ArgumentException>().WithMessage("Unknown register 'Q'*");
+    }
+}
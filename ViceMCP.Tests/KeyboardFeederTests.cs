@@ -0,0 +1,82 @@
+using System.Text;
+using FluentAssertions;
+using ViceMCP.ViceBridge.Commands;
+
+namespace ViceMCP.Tests;
+
+public class KeyboardFeederTests : FakeMonitorTestBase
+{
+    [Fact]
+    public async Task Feed_Should_Type_Long_Text_One_Buffer_At_A_Time()
+    {
+        var typed = new StringBuilder();
+        using var cts = new CancellationTokenSource();
+        // Plays the KERNAL: takes every key in the buffer and clears $C6, which hits the feeder's store checkpoint
+        var kernal = Task.Run(async () =>
+        {
+            while (!cts.IsCancellationRequested)
+            {
+                await Task.Delay(5);
+                var memory = Monitor.GetMemory();
+                if (memory[0xC6] > 0)
+                {
+                    typed.Append(Encoding.ASCII.GetString(memory, 0x0277, memory[0xC6]));
+                    memory[0xC6] = 0;
+                    try
+                    {
+                        await Monitor.HitCheckpointAsync(1);
+                    }
+                    catch (ArgumentException)
+                    {
+                        // The feeder already removed its checkpoint after the last chunk
+                    }
+                }
+            }
+        });
+
+        var result = await new KeyboardFeeder(Bridge, KeyboardProfile.C64).FeedAsync("10 PRINT \"HELLO WORLD\"\n20 GOTO 10\nRUN\n");
+        while (typed.Length < result.Keys)
+        {
+            await Task.Delay(5);
+        }
+        cts.Cancel();
+        await kernal;
+
+        result.Keys.Should().Be(38);
+        result.Chunks.Should().Be(4);
+        result.Reads.Should().BeGreaterOrEqualTo(3);
+        typed.ToString().Should().Be("10 PRINT \"HELLO WORLD\"\r20 GOTO 10\rRUN\r");
+        Monitor.CommandCounts[CommandType.CheckpointDelete].Should().Be(1);
+    }
+
+    [Fact]
+    public async Task Short_Text_Should_Be_Sent_Without_Pacing()
+    {
+        var result = await new KeyboardFeeder(Bridge, KeyboardProfile.C64).FeedAsync("RUN\n");
+
+        result.Chunks.Should().Be(1);
+        result.Reads.Should().Be(0);
+        Monitor.CommandCounts.Should().NotContainKey(CommandType.CheckpointSet);
+        Monitor.GetMemory()[0xC6].Should().Be(4);
+    }
+
+    [Fact]
+    public void Split_Should_Keep_Escape_Sequences_Whole()
+    {
+        KeyboardFeeder.Split("ABCDEFGHI\\nJKL", 10).Should().Equal(("ABCDEFGHI\\n", 10), ("JKL", 3));
+        KeyboardFeeder.Split("ABCDEFGH", 8).Should().Equal(("ABCDEFGH", 8));
+    }
+
+    [Theory]
+    [InlineData("x64sc", 0xC6, 10)]
+    [InlineData("x128", 0xD0, 10)]
+    [InlineData("xplus4", 0xEF, 8)]
+    [InlineData(null, 0xC6, 10)]
+    public void Profile_Should_Follow_Emulator(string? emulatorType, int countAddress, int bufferSize)
+    {
+        var profile = KeyboardProfile.ForEmulator(emulatorType);
+
+        profile.CountAddress.Should().Be((ushort)countAddress);
+        profile.BufferSize.Should().Be(bufferSize);
+    }
+}
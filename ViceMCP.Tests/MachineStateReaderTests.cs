@@ -0,0 +1,141 @@
+using FluentAssertions;
+using ViceMCP.ViceBridge.Commands;
+using ViceMCP.ViceBridge.Shared;
+
+namespace ViceMCP.Tests;
+
+public class MachineStateReaderTests : FakeMonitorTestBase
+{
+    // Bank ids of FakeViceMonitor
+    private const ushort RamBank = 2;
+    private const ushort IoBank = 4;
+
+    private MachineStateReader _reader = null!;
+
+    public override async Task InitializeAsync()
+    {
+        await base.InitializeAsync();
+        _reader = new MachineStateReader(Bridge);
+    }
+
+    [Fact]
+    public async Task Capture_Should_Decode_Io_Registers_And_Screen()
+    {
+        var io = Monitor.GetMemory(MemSpace.MainMemory, IoBank);
+        io[0xD000] = 24;
+        io[0xD001] = 50;
+        io[0xD010] = 0x01;
+        io[0xD011] = 0x1B;
+        io[0xD015] = 0x01;
+        io[0xD016] = 0xC8;
+        io[0xD018] = 0x17;
+        io[0xD020] = 0x0E;
+        io[0xD021] = 0x06;
+        io[0xD027] = 0xF1;
+        io[0xD400] = 0xD6;
+        io[0xD401] = 0x1C;
+        io[0xD404] = 0x21;
+        io[0xD405] = 0x09;
+        io[0xD418] = 0x1F;
+        io[0xDC04] = 0x25;
+        io[0xDC05] = 0x40;
+        io[0xDC0E] = 0x01;
+        io[0xDC08] = 0x05;
+        io[0xDC09] = 0x30;
+        io[0xDC0A] = 0x12;
+        io[0xDC0B] = 0x81;
+        io[0xDD00] = 0x97;
+        // "Hello" in the lower/upper case set, at $0400 of RAM
+        new byte[] { 0x48, 0x05, 0x0C, 0x0C, 0x0F }.CopyTo(Monitor.GetMemory(MemSpace.MainMemory, RamBank), 0x0400);
+        Monitor.GetMemory()[0x0001] = 0x37;
+        Monitor.SetRegister(FakeViceMonitor.RegisterPC, 0xC000);
+        await Bridge.EnqueueCommand(new CheckpointSetCommand(0xC000, 0xC000, true, true, CpuOperation.Exec, false)).Response;
+
+        var state = await _reader.CaptureAsync();
+
+        state.Register("PC").Should().Be(0xC000);
+        state.ZeroPage[1].Should().Be(0x37);
+        state.Vic!.ScreenAddress.Should().Be(0x0400);
+        state.Vic.CharsetAddress.Should().Be(0x1800);
+        state.Vic.Columns.Should().Be(40);
+        state.Vic.Rows.Should().Be(25);
+        state.Vic.BorderColor.Should().Be(14);
+        state.Vic.Sprites[0].Should().Match<SpriteState>(s => s.Enabled && s.X == 280 && s.Y == 50 && s.Color == 1);
+        state.Sid!.Volume.Should().Be(15);
+        state.Sid.Voices[0].Should().Match<SidVoice>(v => v.Frequency == 0x1CD6 && v.Gate && v.Decay == 9);
+        state.Sid.Voices[0].Waveforms.Should().Equal("sawtooth");
+        state.Cia1!.TimerA.Should().Be(0x4025);
+        state.Cia1.TimerARunning.Should().BeTrue();
+        state.Cia1.TimeOfDay.Should().Be("01:12:30.5 PM");
+        state.Screen!.Lines[0].Should().StartWith("Hello");
+        state.Checkpoints.Should().ContainSingle(c => c.StartAddress == 0xC000);
+    }
+
+    [Fact]
+    public async Task Metadata_Should_Be_Fetched_Once_Per_Connection()
+    {
+        var first = await _reader.CaptureAsync();
+        var second = await _reader.CaptureAsync();
+
+        first.MetadataCached.Should().BeFalse();
+        second.MetadataCached.Should().BeTrue();
+        second.Commands.Should().Be(first.Commands - 2);
+        second.Registers.Select(r => r.Name).Should().Contain(["A", "X", "Y", "PC", "SP", "FL"]);
+        Monitor.CommandCounts[CommandType.RegistersAvailable].Should().Be(1);
+        Monitor.CommandCounts[CommandType.BanksAvailable].Should().Be(1);
+
+        _reader.ClearMetadata();
+        (await _reader.CaptureAsync()).MetadataCached.Should().BeFalse();
+        _reader.MetadataFetches.Should().Be(2);
+    }
+
+    [Fact]
+    public async Task Metadata_Should_Be_Fetched_Again_After_Reconnecting()
+    {
+        await _reader.CaptureAsync();
+
+        Monitor.Disconnect();
+        using var timeout = new CancellationTokenSource(TimeSpan.FromSeconds(10));
+        while (_reader.Metadata != null)
+        {
+            await Task.Delay(20, timeout.Token);
+        }
+        await Bridge.WaitForReadyAsync(timeout.Token);
+
+        (await _reader.CaptureAsync()).MetadataCached.Should().BeFalse();
+        _reader.MetadataFetches.Should().Be(2);
+    }
+
+    [Fact]
+    public async Task Capture_Without_C64_Io_Should_Read_Registers_And_Low_Memory_Only()
+    {
+        var state = await _reader.CaptureAsync(c64Io: false);
+
+        state.Vic.Should().BeNull();
+        state.Sid.Should().BeNull();
+        state.Screen.Should().BeNull();
+        state.Stack.Length.Should().Be(256);
+        Monitor.CommandCounts[CommandType.MemoryGet].Should().Be(1);
+    }
+
+    [Theory]
+    [InlineData("x64sc", true)]
+    [InlineData("x128", true)]
+    [InlineData("xvic", false)]
+    [InlineData("xplus4", false)]
+    [InlineData(null, true)]
+    public void HasC64Io_Should_Follow_Emulator(string? emulatorType, bool expected)
+    {
+        MachineStateReader.HasC64Io(emulatorType).Should().Be(expected);
+    }
+
+    [Fact]
+    public void Screen_Codes_Should_Follow_Character_Set()
+    {
+        ScreenState.ToChar(0x01, lowercase: false).Should().Be('A');
+        ScreenState.ToChar(0x01, lowercase: true).Should().Be('a');
+        ScreenState.ToChar(0x41, lowercase: true).Should().Be('A');
+        ScreenState.ToChar(0x41, lowercase: false).Should().Be('.');
+        ScreenState.ToChar(0xB1, lowercase: false).Should().Be('1');
+    }
+}
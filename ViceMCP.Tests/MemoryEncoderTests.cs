@@ -0,0 +1,85 @@
+using FluentAssertions;
+using Xunit;
+
+namespace ViceMCP.Tests;
+
+public class MemoryEncoderTests
+{
+    private static readonly byte[] Sample = [0x08, 0x05, 0x0C, 0x0C, 0x0F];
+
+    [Fact]
+    public void Encode_Should_Default_To_Dashed_Hex()
+    {
+        MemoryEncoder.Encode(Sample, null).Should().Be(BitConverter.ToString(Sample));
+    }
+
+    [Fact]
+    public void Encode_Should_Write_Base64()
+    {
+        MemoryEncoder.Encode(Sample, "base64").Should().Be(Convert.ToBase64String(Sample));
+    }
+
+    [Fact]
+    public void Encode_Should_Compress_Runs_Of_Three_Or_More()
+    {
+        var data = new byte[] { 0xA9, 0x00, 0x00, 0x00, 0x00, 0x8D, 0x20, 0x20 };
+
+        MemoryEncoder.Encode(data, "rle").Should().Be("A9 00*4 8D 20 20");
+    }
+
+    [Fact]
+    public void Encode_Should_Collapse_Repeated_Hexdump_Lines()
+    {
+        var data = new byte[40];
+        data[0] = 0x41;
+
+        var lines = MemoryEncoder.Encode(data, "hexdump", 0xC000).Split('\n');
+
+        lines.Should().Equal(
+            "C000  41 00 00 00 00 00 00 00  00 00 00 00 00 00 00 00  |A...............|",
+            "C010  00 00 00 00 00 00 00 00  00 00 00 00 00 00 00 00  |................|",
+            "C020  00 00 00 00 00 00 00 00                           |........|",
+            "C028");
+    }
+
+    [Fact]
+    public void Encode_Should_Mark_Collapsed_Lines_With_Star()
+    {
+        var lines = MemoryEncoder.Encode(new byte[64], "hexdump", 0x1000).Split('\n');
+
+        lines.Should().HaveCount(3);
+        lines[1].Should().Be("*");
+        lines[2].Should().Be("1040");
+    }
+
+    [Theory]
+    [InlineData("hex")]
+    [InlineData("base64")]
+    [InlineData("rle")]
+    [InlineData("hexdump")]
+    public void Append_In_Chunks_Should_Match_Whole_Encoding(string encoding)
+    {
+        var data = new byte[1000];
+        new Random(42).NextBytes(data);
+        data.AsSpan(200, 300).Fill(0xEA);
+        var expected = MemoryEncoder.Encode(data, encoding, 0x0801);
+
+        foreach (var chunkSize in new[] { 1, 2, 7, 16, 333 })
+        {
+            var encoder = MemoryEncoder.Create(encoding, 0x0801, data.Length);
+            for (int offset = 0; offset < data.Length; offset += chunkSize)
+            {
+                encoder.Append(data.AsSpan(offset, Math.Min(chunkSize, data.Length - offset)));
+            }
+            encoder.Complete().Should().Be(expected, $"chunk size {chunkSize}");
+        }
+    }
+
+    [Fact]
+    public void Create_Should_Reject_Unknown_Encoding()
+    {
+        var act = () => MemoryEncoder.Create("ebcdic", 0, 1);
+
+        act.Should().Throw<ArgumentException>().WithMessage("*ebcdic*");
+    }
+}
@@ -0,0 +1,197 @@
+using System.Buffers;
+using System.Net;
+using System.Net.Sockets;
+using FluentAssertions;
+using Microsoft.Extensions.Logging.Abstractions;
+using ViceMCP.ViceBridge;
+using ViceMCP.ViceBridge.Commands;
+using ViceMCP.ViceBridge.Responses;
+using ViceMCP.ViceBridge.Services.Implementation;
+using ViceMCP.ViceBridge.Shared;
+
+namespace ViceMCP.Tests;
+
+/// <summary>
+/// Allocation counts are process wide, nothing else may run meanwhile.
+/// </summary>
+[CollectionDefinition(nameof(MemoryPathAllocationTests), DisableParallelization = true)]
+public class MemoryPathAllocationCollection;
+
+[Collection(nameof(MemoryPathAllocationTests))]
+public class MemoryPathAllocationTests
+{
+    private const int ResponseHeaderLength = 12;
+    private const int CommandHeaderLength = 11;
+
+    [Fact]
+    public async Task Full_Memory_Reads_Should_Allocate_Almost_Nothing()
+    {
+        // Arrange - a monitor answering every read with the same prebuilt 64 KB frame
+        var listener = new TcpListener(IPAddress.Loopback, 0);
+        listener.Start();
+        var frame = new byte[ResponseHeaderLength + 2 + 0x10000];
+        frame[0] = Constants.STX;
+        frame[1] = ViceCommand.DefaultApiVersion;
+        BitConverter.TryWriteBytes(frame.AsSpan(2), (uint)(2 + 0x10000));
+        frame[6] = (byte)ResponseType.MemoryGet;
+        frame[7] = (byte)ErrorCode.OK;
+        // VICE's length field is 16 bits wide, a full 64 KB read reports 0
+        for (int i = 0; i < 0x10000; i++)
+        {
+            frame[ResponseHeaderLength + 2 + i] = (byte)(i >> 8);
+        }
+        await using var bridge = new ViceBridge.Services.Implementation.ViceBridge(
+            NullLogger<ViceBridge.Services.Implementation.ViceBridge>.Instance,
+            new ResponseBuilder(NullLogger<ResponseBuilder>.Instance),
+            new PerformanceProfiler(),
+            new MessagesHistory());
+        bridge.Start(((IPEndPoint)listener.LocalEndpoint).Port);
+        using var client = await listener.AcceptTcpClientAsync();
+        using var stop = new CancellationTokenSource();
+        var monitor = ServeAsync(client.GetStream(), frame, stop.Token);
+
+        async Task<long> ReadAsync(int count)
+        {
+            long total = 0;
+            for (int i = 0; i < count; i++)
+            {
+                var result = await bridge.EnqueueCommand(new MemoryGetCommand(0, 0x0000, 0xFFFF, MemSpace.MainMemory, 0)).Response;
+                using var memory = result.Response!.Memory!.Value;
+                total += memory.Size;
+            }
+            return total;
+        }
+
+        // Act - warm up pools and JIT first
+        await ReadAsync(20);
+        long before = GC.GetTotalAllocatedBytes(precise: true);
+        const int reads = 50;
+        long received = await ReadAsync(reads);
+        long allocated = GC.GetTotalAllocatedBytes(precise: true) - before;
+        stop.Cancel();
+        listener.Stop();
+
+        // Assert - well below the payload, which was copied once into pooled buffers
+        received.Should().Be(reads * 0x10000L);
+        (allocated / reads).Should().BeLessThan(8 * 1024);
+        await monitor;
+    }
+
+    [Fact]
+    public void Segmented_Memory_Response_Should_Be_Copied_Once_Without_Allocating_The_Payload()
+    {
+        // Arrange - a 64 KB body split across receive segments
+        var builder = new ResponseBuilder(NullLogger<ResponseBuilder>.Instance);
+        var header = new byte[ResponseHeaderLength];
+        header[0] = Constants.STX;
+        header[1] = ViceCommand.DefaultApiVersion;
+        BitConverter.TryWriteBytes(header.AsSpan(2), (uint)(2 + 0x10000));
+        header[6] = (byte)ResponseType.MemoryGet;
+        BitConverter.TryWriteBytes(header.AsSpan(8), 7u);
+        var body = new byte[2 + 0x10000];
+        body[2] = 0xA9;
+        body[^1] = 0x60;
+        var sequence = Segments(body, 4096);
+        builder.Build(header, ViceCommand.DefaultApiVersion, sequence).Response.Should().BeOfType<MemoryGetResponse>()
+            .Which.Dispose();
+
+        // Act
+        long before = GC.GetAllocatedBytesForCurrentThread();
+        var (response, requestId) = builder.Build(header, ViceCommand.DefaultApiVersion, sequence);
+        long allocated = GC.GetAllocatedBytesForCurrentThread() - before;
+
+        // Assert
+        using var memory = (MemoryGetResponse)response;
+        requestId.Should().Be(7);
+        memory.Memory!.Value.Size.Should().Be(0x10000);
+        memory.Memory.Value.Span[0].Should().Be(0xA9);
+        memory.Memory.Value.Span[^1].Should().Be(0x60);
+        allocated.Should().BeLessThan(1024);
+    }
+
+    [Fact]
+    public void Slices_Should_Keep_The_Buffer_Until_The_Last_One_Is_Disposed()
+    {
+        // Arrange
+        var pool = new CountingPool();
+        var buffer = pool.GetBuffer(16);
+        for (int i = 0; i < 16; i++)
+        {
+            buffer.Data[i] = (byte)i;
+        }
+
+        // Act
+        var slice = buffer.Slice(4, 3);
+        var shared = slice.Share();
+        buffer.Dispose();
+        buffer.Dispose();
+        slice.Dispose();
+
+        // Assert
+        shared.Span.ToArray().Should().Equal(4, 5, 6);
+        shared.Offset.Should().Be(4);
+        pool.Returned.Should().Be(0);
+        shared.Dispose();
+        pool.Returned.Should().Be(1);
+        shared.Dispose();
+        pool.Returned.Should().Be(1);
+        var act = () => buffer.Share();
+        act.Should().Throw<ObjectDisposedException>();
+    }
+
+    private static async Task ServeAsync(NetworkStream stream, byte[] frame, CancellationToken ct)
+    {
+        var header = new byte[CommandHeaderLength];
+        var body = new byte[64];
+        try
+        {
+            while (true)
+            {
+                await stream.ReadExactlyAsync(header, ct);
+                await stream.ReadExactlyAsync(body.AsMemory(0, (int)BitConverter.ToUInt32(header, 2)), ct);
+                header.AsSpan(6, 4).CopyTo(frame.AsSpan(8));
+                await stream.WriteAsync(frame, ct);
+            }
+        }
+        catch (OperationCanceledException)
+        {
+        }
+        catch (IOException)
+        {
+        }
+    }
+
+    private static ReadOnlySequence<byte> Segments(byte[] data, int size)
+    {
+        var first = new Segment(data.AsMemory(0, size), 0);
+        var last = first;
+        for (int start = size; start < data.Length; start += size)
+        {
+            last = last.Append(data.AsMemory(start, Math.Min(size, data.Length - start)));
+        }
+        return new ReadOnlySequence<byte>(first, 0, last, last.Memory.Length);
+    }
+
+    private sealed class Segment : ReadOnlySequenceSegment<byte>
+    {
+        public Segment(ReadOnlyMemory<byte> memory, long runningIndex)
+        {
+            Memory = memory;
+            RunningIndex = runningIndex;
+        }
+
+        public Segment Append(ReadOnlyMemory<byte> memory)
+        {
+            var next = new Segment(memory, RunningIndex + Memory.Length);
+            Next = next;
+            return next;
+        }
+    }
+
+    private sealed class CountingPool : ArrayPool<byte>
+    {
+        public int Returned { get; private set; }
+        public override byte[] Rent(int minimumLength) => new byte[minimumLength];
+        public override void Return(byte[] array, bool clearArray = false) => Returned++;
+    }
+}
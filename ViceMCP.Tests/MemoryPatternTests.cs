@@ -0,0 +1,65 @@
+using FluentAssertions;
+using Xunit;
+
+namespace ViceMCP.Tests;
+
+public class MemoryPatternTests
+{
+    [Fact]
+    public void Parse_Should_Read_Exact_Wildcard_Nibble_And_Masked_Bytes()
+    {
+        var pattern = MemoryPattern.Parse("A9 ?? 2? ?F D0/F0");
+
+        pattern.Values.Should().Equal(0xA9, 0x00, 0x20, 0x0F, 0xD0);
+        pattern.Masks.Should().Equal(0xFF, 0x00, 0xF0, 0x0F, 0xF0);
+    }
+
+    [Fact]
+    public void Parse_Should_Reject_Invalid_Tokens()
+    {
+        var act = () => MemoryPattern.Parse("A9 GG");
+
+        act.Should().Throw<ArgumentException>().WithMessage("*GG*");
+    }
+
+    [Fact]
+    public void ParseMany_Should_Split_Patterns()
+    {
+        var patterns = MemoryPattern.ParseMany("20 D2 FF; A9 00 | 60");
+
+        patterns.Select(p => p.Text).Should().Equal("20 D2 FF", "A9 00", "60");
+    }
+
+    [Fact]
+    public void FindAll_Should_Match_Wildcards()
+    {
+        var data = new byte[] { 0x8D, 0x20, 0xD0, 0x8D, 0x21, 0xD0, 0x8D, 0x00, 0xC0 };
+
+        MemoryPattern.Parse("8D ?? D0").FindAll(data, 10).Should().Equal(0, 3);
+    }
+
+    [Fact]
+    public void FindAll_Should_Match_Patterns_Without_Exact_Bytes()
+    {
+        var data = new byte[] { 0x12, 0x34, 0x1F, 0x35 };
+
+        MemoryPattern.Parse("1? 3?").FindAll(data, 10).Should().Equal(0, 2);
+    }
+
+    [Fact]
+    public void FindAll_Should_Include_Overlapping_Matches_And_Honor_Limit()
+    {
+        var data = new byte[] { 0xEA, 0xEA, 0xEA, 0xEA };
+
+        MemoryPattern.Parse("EA EA").FindAll(data, 10).Should().Equal(0, 1, 2);
+        MemoryPattern.Parse("EA EA").FindAll(data, 2).Should().Equal(0, 1);
+    }
+
+    [Fact]
+    public void FindAll_Should_Find_Match_Ending_At_Last_Byte()
+    {
+        var data = new byte[] { 0x00, 0x20, 0xD2, 0xFF };
+
+        MemoryPattern.Parse("?? D2 FF").FindAll(data, 10).Should().Equal(1);
+    }
+}
@@ -0,0 +1,63 @@
+using FluentAssertions;
+
+namespace ViceMCP.Tests;
+
+public class MemoryWatchTests : FakeMonitorTestBase
+{
+    [Fact]
+    public async Task Sample_Should_Queue_Only_Changed_Bytes()
+    {
+        await using var watch = new MemoryWatch(1, 0, Bridge, MemoryWatch.ParseRanges("c000-c003, d020"), interval: null, onStop: true);
+        await watch.SampleAsync();
+
+        Monitor.GetMemory()[0xC001] = 0x07;
+        Monitor.GetMemory()[0xC002] = 0x08;
+        Monitor.GetMemory()[0xD020] = 0x02;
+        await watch.SampleAsync();
+
+        var changes = watch.Drain(10);
+        changes.Select(c => c.Address).Should().Equal(0xC001, 0xD020);
+        changes[0].OldValues.Should().Equal(0x00, 0x00);
+        changes[0].NewValues.Should().Equal(0x07, 0x08);
+        changes[1].NewValues.Should().Equal(0x02);
+        changes.Should().OnlyContain(c => c.Sample == 2);
+        watch.ChangedBytes.Should().Be(3);
+        watch.Drain(10).Should().BeEmpty();
+    }
+
+    [Fact]
+    public async Task Full_Queue_Should_Drop_Oldest_Changes()
+    {
+        await using var watch = new MemoryWatch(1, 0, Bridge, MemoryWatch.ParseRanges("1000"), interval: null, onStop: true, capacity: 2);
+        await watch.SampleAsync();
+
+        for (byte value = 1; value <= 3; value++)
+        {
+            Monitor.GetMemory()[0x1000] = value;
+            await watch.SampleAsync();
+        }
+
+        watch.Dropped.Should().Be(1);
+        watch.Drain(10).Select(c => c.NewValues[0]).Should().Equal(2, 3);
+    }
+
+    [Fact]
+    public void PlanReads_Should_Merge_Nearby_Ranges()
+    {
+        var (reads, locations) = MemoryWatch.PlanReads(MemoryWatch.ParseRanges("d020 c000-c003 c030 $a0-0xa2"));
+
+        reads.Should().Equal(((ushort)0x00A0, (ushort)0x00A2), ((ushort)0xC000, (ushort)0xC030), ((ushort)0xD020, (ushort)0xD020));
+        locations.Should().Equal((2, 0), (1, 0), (1, 0x30), (0, 0));
+    }
+
+    [Theory]
+    [InlineData("c010-c000")]
+    [InlineData("zz")]
+    [InlineData(" , ")]
+    public void ParseRanges_Should_Reject_Invalid_Ranges(string ranges)
+    {
+        var act = () => MemoryWatch.ParseRanges(ranges);
+
+        act.Should().Throw<ArgumentException>();
+    }
+}
@@ -0,0 +1,113 @@
+using System.Text.Json;
+using FluentAssertions;
+using ViceMCP.ViceBridge.Commands;
+using ViceMCP.ViceBridge.Responses;
+using ViceMCP.ViceBridge.Services.Abstract;
+using ViceMCP.ViceBridge.Services.Implementation;
+using Xunit;
+
+namespace ViceMCP.Tests;
+
+public class MessagesHistoryTests
+{
+    private static readonly EmptyViceResponse Ok = new(0x02, ErrorCode.OK);
+
+    [Fact]
+    public async Task UpdateWithResponse_Should_Pair_Response_With_Command()
+    {
+        IMessagesHistory history = new MessagesHistory();
+        int first = await history.AddCommandAsync(10, new PingCommand());
+        int second = await history.AddCommandAsync(11, new ExitCommand());
+
+        history.UpdateWithResponse(second, Ok);
+
+        var entries = ((MessagesHistory)history).GetEntries();
+        entries.Select(e => e.Sequence).Should().Equal(10u, 11u);
+        entries[0].Response.Should().BeNull();
+        entries[0].Elapsed.Should().BeNull();
+        entries[1].Response.Should().Be(Ok);
+        entries[1].Elapsed.Should().BeGreaterThanOrEqualTo(0);
+        first.Should().NotBe(second);
+    }
+
+    [Fact]
+    public async Task History_Should_Keep_Only_Most_Recent_Entries()
+    {
+        var history = new MessagesHistory(capacity: 3);
+        var ids = new List<int>();
+        for (uint sequence = 0; sequence < 5; sequence++)
+        {
+            ids.Add(await history.AddCommandAsync(sequence, new PingCommand()));
+        }
+
+        // The response to an overwritten command must not land on its successor
+        history.UpdateWithResponse(ids[0], Ok);
+
+        history.TotalCount.Should().Be(5);
+        var entries = history.GetEntries();
+        entries.Select(e => e.Sequence).Should().Equal(2u, 3u, 4u);
+        entries.Should().OnlyContain(e => e.Response == null);
+    }
+
+    [Fact]
+    public async Task UpdateWithLinkedResponse_Should_Attach_Checkpoint_Info()
+    {
+        var history = new MessagesHistory();
+        int id = await history.AddCommandAsync(1, new CheckpointListCommand());
+        var info = new CheckpointInfoResponse(0x02, ErrorCode.OK, 1, false, 0xE000, 0xE100, true, true, CpuOperation.Exec, false, 0, 0, false);
+
+        history.UpdateWithLinkedResponse(id, info);
+        history.AddsResponseOnly(new StoppedResponse(0x02, ErrorCode.OK, 0xE000));
+
+        var entries = history.GetEntries();
+        entries[0].LinkedResponses.Should().ContainSingle().Which.Should().Be(info);
+        entries[1].Sequence.Should().BeNull();
+        entries[1].Response.Should().BeOfType<StoppedResponse>();
+    }
+
+    [Fact]
+    public async Task ExportNdjsonAsync_Should_Write_One_Object_Per_Entry()
+    {
+        var history = new MessagesHistory();
+        int id = await history.AddCommandAsync(5, new PingCommand());
+        history.UpdateWithResponse(id, Ok);
+        history.AddsResponseOnly(new ResumedResponse(0x02, ErrorCode.OK, 0x0801));
+        using var stream = new MemoryStream();
+
+        var count = await history.ExportNdjsonAsync(stream);
+
+        count.Should().Be(2);
+        var lines = System.Text.Encoding.UTF8.GetString(stream.ToArray()).TrimEnd('\n').Split('\n');
+        lines.Should().HaveCount(2);
+        using var first = JsonDocument.Parse(lines[0]);
+        first.RootElement.GetProperty("sequence").GetUInt32().Should().Be(5);
+        first.RootElement.GetProperty("command").GetString().Should().Be("Ping");
+        first.RootElement.GetProperty("response").GetString().Should().Be("EmptyVice");
+        first.RootElement.TryGetProperty("elapsed_us", out _).Should().BeTrue();
+        using var second = JsonDocument.Parse(lines[1]);
+        second.RootElement.GetProperty("response").GetString().Should().Be("Resumed");
+        second.RootElement.TryGetProperty("sequence", out _).Should().BeFalse();
+    }
+
+    [Fact]
+    public async Task ExportBinaryAsync_Should_Write_Header_And_Fixed_Size_Records()
+    {
+        var history = new MessagesHistory();
+        int id = await history.AddCommandAsync(5, new PingCommand());
+        history.UpdateWithResponse(id, Ok);
+        using var stream = new MemoryStream();
+
+        await history.ExportBinaryAsync(stream);
+
+        var data = stream.ToArray();
+        data[..4].Should().Equal(MessagesHistory.BinaryMagic.ToArray());
+        // Magic, version, name count, "EmptyVice" name, entry count
+        int headerLength = 4 + 2 + 2 + 1 + "EmptyVice".Length + 4;
+        data.Length.Should().Be(headerLength + MessagesHistory.BinaryEntrySize);
+        var record = data[headerLength..];
+        BitConverter.ToUInt32(record[12..16]).Should().Be(5);
+        record[16].Should().Be(3);
+        record[17].Should().Be((byte)CommandType.Ping);
+        BitConverter.ToUInt16(record[20..22]).Should().Be(0);
+    }
+}
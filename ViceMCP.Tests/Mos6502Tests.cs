@@ -0,0 +1,53 @@
+using FluentAssertions;
+
+namespace ViceMCP.Tests;
+
+public class Mos6502Tests
+{
+    [Theory]
+    [InlineData(0xA9, 0x00, 0x00, "LDA #$00")]
+    [InlineData(0xB1, 0xFB, 0x00, "LDA ($FB),Y")]
+    [InlineData(0x6C, 0xFC, 0xFF, "JMP ($FFFC)")]
+    [InlineData(0xD0, 0xFE, 0x00, "BNE $C000")]
+    [InlineData(0x0A, 0x00, 0x00, "ASL A")]
+    [InlineData(0xA7, 0x02, 0x00, "LAX $02")]
+    public void Format_Should_Use_Monitor_Syntax(byte opcode, byte low, byte high, string expected)
+    {
+        Mos6502.Format(0xC000, opcode, low, high).Should().Be(expected);
+    }
+
+    [Fact]
+    public void Decode_Should_Mark_Undocumented_Opcodes()
+    {
+        Mos6502.Decode(0xEA).Should().Be(new OpcodeInfo("NOP", AddressingMode.Implied, false));
+        Mos6502.Decode(0xEB).Should().Be(new OpcodeInfo("SBC", AddressingMode.Immediate, true));
+        Mos6502.Decode(0x02).Mnemonic.Should().Be("JAM");
+        Enumerable.Range(0, 256).Count(o => !Mos6502.Decode((byte)o).Illegal).Should().Be(151);
+        Mos6502.Decode(0x20).Length.Should().Be(3);
+    }
+
+    [Theory]
+    [InlineData(0x80, 0xFE, 0x00, "BRA $C000")]
+    [InlineData(0xB2, 0xFB, 0x00, "LDA ($FB)")]
+    [InlineData(0x7C, 0x00, 0x10, "JMP ($1000,X)")]
+    [InlineData(0x8F, 0x02, 0xFD, "BBS0 $02,$C000")]
+    [InlineData(0x47, 0x02, 0x00, "RMB4 $02")]
+    [InlineData(0x1A, 0x00, 0x00, "INC A")]
+    [InlineData(0xA9, 0x00, 0x00, "LDA #$00")]
+    public void Format_Should_Decode_65C02_Opcodes(byte opcode, byte low, byte high, string expected)
+    {
+        Mos6502.Format(0xC000, opcode, low, high, CpuVariant.Cmos65C02).Should().Be(expected);
+    }
+
+    [Fact]
+    public void Undocumented_6502_Opcodes_Should_Be_Nops_Or_New_Instructions_On_65C02()
+    {
+        Mos6502.Decode(0xA7, CpuVariant.Cmos65C02).Mnemonic.Should().Be("SMB2");
+        Mos6502.Decode(0x02, CpuVariant.Cmos65C02).Should().Be(new OpcodeInfo("NOP", AddressingMode.Immediate, true));
+        Mos6502.Decode(0x5C, CpuVariant.Cmos65C02).Length.Should().Be(3);
+        Mos6502.Decode(0x0F, CpuVariant.Cmos65C02).Length.Should().Be(3);
+        Enumerable.Range(0, 256).Where(o => Mos6502.Decode((byte)o, CpuVariant.Cmos65C02).Illegal)
+            .Should().OnlyContain(o => Mos6502.Decode((byte)o, CpuVariant.Cmos65C02).Mnemonic == "NOP");
+        Mos6502.ParseCpu("8502").Should().Be(CpuVariant.Nmos6502);
+    }
+}
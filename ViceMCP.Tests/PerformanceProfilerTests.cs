@@ -0,0 +1,117 @@
+using FluentAssertions;
+using ViceMCP.ViceBridge;
+using ViceMCP.ViceBridge.Commands;
+using ViceMCP.ViceBridge.Services.Abstract;
+using ViceMCP.ViceBridge.Services.Implementation;
+using Xunit;
+
+namespace ViceMCP.Tests;
+
+public class PerformanceProfilerTests
+{
+    [Fact]
+    public void Histogram_Percentiles_Should_Be_Within_Bucket_Precision()
+    {
+        var histogram = new LatencyHistogram();
+        for (int value = 1; value <= 10000; value++)
+        {
+            histogram.Record(value);
+        }
+
+        histogram.Count.Should().Be(10000);
+        histogram.Max.Should().Be(10000);
+        histogram.GetValueAtPercentile(50).Should().BeInRange(5000, 5000 * 17 / 16);
+        histogram.GetValueAtPercentile(99).Should().BeInRange(9900, 10000);
+    }
+
+    [Fact]
+    public void Histogram_Buckets_Should_Be_Contiguous()
+    {
+        for (long value = 0; value < 100000; value++)
+        {
+            int index = LatencyHistogram.GetBucketIndex(value);
+            LatencyHistogram.GetHighestEquivalentValue(index).Should().BeGreaterThanOrEqualTo(value);
+            if (index > 0)
+            {
+                LatencyHistogram.GetHighestEquivalentValue(index - 1).Should().BeLessThan(value);
+            }
+        }
+    }
+
+    [Fact]
+    public void Events_Should_Keep_Only_Most_Recent()
+    {
+        var profiler = new PerformanceProfiler(eventCapacity: 4);
+        for (int i = 0; i < 10; i++)
+        {
+            profiler.Add(new TraceEvent(i.ToString(), i));
+        }
+
+        profiler.Events.Select(e => e.Ticks).Should().Equal(6, 7, 8, 9);
+    }
+
+    [Fact]
+    public void GetStatistics_Should_Aggregate_Completed_Requests_Per_Command_Type()
+    {
+        var profiler = new PerformanceProfiler();
+
+        profiler.RequestSent(1, CommandType.MemoryGet, 19, 1);
+        profiler.RequestSent(2, CommandType.Ping, 11, 2);
+        profiler.ResponseStarted(1);
+        profiler.ResponseReceived(1, 120);
+        profiler.RequestCompleted(1);
+        profiler.ResponseReceived(0xFFFFFFFF, 12);
+
+        var stats = profiler.GetStatistics();
+        stats.CommandsSent.Should().Be(2);
+        stats.CommandsCompleted.Should().Be(1);
+        stats.BytesSent.Should().Be(30);
+        stats.BytesReceived.Should().Be(132);
+        stats.MaxQueueDepth.Should().Be(2);
+        var command = stats.Commands.Should().ContainSingle().Subject;
+        command.CommandType.Should().Be(CommandType.MemoryGet);
+        command.BytesReceived.Should().Be(120);
+        command.Complete.Max.Should().BeGreaterThanOrEqualTo(command.FirstByte.Max);
+        stats.RecentRequests.Select(r => (r.RequestId, r.Completed.HasValue)).Should().Equal((1u, true), (2u, false));
+    }
+
+    [Fact]
+    public void RequestCompleted_Should_Count_Once()
+    {
+        var profiler = new PerformanceProfiler();
+        profiler.RequestSent(7, CommandType.MemorySet, 20, 1);
+
+        profiler.RequestCompleted(7);
+        profiler.RequestCompleted(7);
+
+        profiler.GetStatistics().Commands.Single().Count.Should().Be(1);
+    }
+
+    [Fact]
+    public void GetStatistics_Should_Report_Queue_Wait_Per_Lane()
+    {
+        var profiler = new PerformanceProfiler();
+
+        profiler.CommandDequeued(CommandPriority.Interactive, TimeSpan.FromMilliseconds(1));
+        profiler.CommandDequeued(CommandPriority.Bulk, TimeSpan.FromMilliseconds(10));
+        profiler.CommandDequeued(CommandPriority.Bulk, TimeSpan.FromMilliseconds(30));
+
+        var lanes = profiler.GetStatistics().Lanes;
+        lanes.Select(l => l.Priority).Should().Equal(CommandPriority.Interactive, CommandPriority.Bulk);
+        lanes[0].Count.Should().Be(1);
+        lanes[1].Count.Should().Be(2);
+        lanes[1].Wait.Max.Should().Be(TimeSpan.FromMilliseconds(30));
+    }
+
+    [Fact]
+    public void Clear_Should_Reset_Statistics()
+    {
+        var profiler = new PerformanceProfiler();
+        profiler.RequestSent(1, CommandType.Ping, 11, 1);
+        profiler.RequestCompleted(1);
+
+        profiler.Clear();
+
+        profiler.GetStatistics().Should().BeEquivalentTo(PerformanceStatistics.Empty, o => o.Excluding(s => s.Elapsed));
+    }
+}
@@ -0,0 +1,185 @@
+using System.Text.Json;
+using FluentAssertions;
+using ViceMCP.ViceBridge;
+using ViceMCP.ViceBridge.Commands;
+
+namespace ViceMCP.Tests;
+
+public class ProgramUploaderTests : FakeMonitorTestBase
+{
+    private ProgramUploader _uploader = null!;
+
+    public override async Task InitializeAsync()
+    {
+        await base.InitializeAsync();
+        _uploader = new ProgramUploader(Bridge);
+    }
+
+    public override async Task DisposeAsync()
+    {
+        await _uploader.DisposeAsync();
+        await base.DisposeAsync();
+    }
+
+    [Fact]
+    public async Task Reload_Should_Send_Only_Changed_Pages_As_Coalesced_Writes()
+    {
+        var image = Enumerable.Range(0, 0x0A00).Select(i => (byte)i).ToArray();
+        var first = await _uploader.UploadAsync(0x0801, image);
+        first.Should().Match<ProgramUpload>(u => u.Pages == 11 && u.PagesSent == 11 && u.Writes == 1 && u.BytesSent == 0x0A00);
+
+        image[0x0100] ^= 0xFF;  // $0901, page $09
+        image[0x0300] ^= 0xFF;  // $0B01, page $0B
+        image[0x0400] ^= 0xFF;  // $0C01, page $0C
+        var second = await _uploader.UploadAsync(0x0801, image);
+
+        second.PagesSent.Should().Be(3);
+        second.Writes.Should().Be(2);
+        second.BytesSent.Should().Be(3 * 256);
+        Monitor.GetMemory().AsSpan(0x0801, image.Length).ToArray().Should().Equal(image);
+        _uploader.BytesSkipped.Should().Be(image.Length - 3 * 256);
+    }
+
+    [Fact]
+    public async Task Unchanged_Reload_Should_Send_Nothing_Unless_Forced()
+    {
+        var image = new byte[600];
+        await _uploader.UploadAsync(0xC000, image);
+        Monitor.GetMemory()[0xC010] = 0x42;
+
+        var unchanged = await _uploader.UploadAsync(0xC000, image);
+        unchanged.BytesSent.Should().Be(0);
+        unchanged.Writes.Should().Be(0);
+        Monitor.GetMemory()[0xC010].Should().Be(0x42, "the uploader does not notice changes made by the program");
+
+        var forced = await _uploader.UploadAsync(0xC000, image, force: true);
+        forced.BytesSent.Should().Be(600);
+        Monitor.GetMemory()[0xC010].Should().Be(0x00);
+    }
+
+    [Fact]
+    public async Task Forgotten_Pages_Should_Be_Sent_Again()
+    {
+        var image = new byte[0x400];
+        await _uploader.UploadAsync(0x2000, image);
+
+        _uploader.Forget(0x21F0, 0x20);
+        var afterWrite = await _uploader.UploadAsync(0x2000, image);
+        afterWrite.PagesSent.Should().Be(2);
+        afterWrite.Writes.Should().Be(1);
+
+        _uploader.Clear();
+        var afterClear = await _uploader.UploadAsync(0x2000, image);
+        afterClear.PagesSent.Should().Be(4);
+    }
+
+    [Fact]
+    public async Task Batched_Writes_Should_Forget_Their_Pages()
+    {
+        var image = new byte[0x400];
+        await _uploader.UploadAsync(0x2000, image);
+        var config = new ViceConfiguration { BinaryMonitorPort = Monitor.Port };
+        await using var pool = new ViceInstancePool(Bridge, config);
+        var batch = JsonSerializer.Deserialize<BatchResponse>(await new ViceTools(pool, config).ExecuteBatch("""
+        [
+            { "command": "write_memory", "parameters": { "startHex": "2110", "dataHex": "01 02" } },
+            { "command": "fill_memory", "parameters": { "startHex": "2300", "endHex": "2303", "pattern": "ff" } }
+        ]
+        """))!;
+        batch.SuccessfulCommands.Should().Be(2);
+
+        var reload = await _uploader.UploadAsync(0x2000, image);
+
+        reload.PagesSent.Should().Be(2);
+        Monitor.GetMemory().AsSpan(0x2000, image.Length).ToArray().Should().Equal(image);
+    }
+
+    [Fact]
+    public async Task Upload_Should_Not_Store_Pages_Written_While_It_Runs()
+    {
+        var image = new byte[0x400];
+        Monitor.Latency = TimeSpan.FromMilliseconds(200);
+        var upload = _uploader.UploadAsync(0x2000, image);
+        using (var timeout = new CancellationTokenSource(TimeSpan.FromSeconds(5)))
+        {
+            while (Monitor.CommandCounts.GetValueOrDefault(CommandType.MemorySet) == 0)
+            {
+                await Task.Delay(5, timeout.Token);
+            }
+        }
+
+        // Lands after the upload's write, before the upload is answered
+        var buffer = BufferManager.GetBuffer(1);
+        buffer.Data[0] = 0x42;
+        using var write = Bridge.EnqueueCommand(new MemorySetCommand(0, 0x2110, MemSpace.MainMemory, 0, buffer), resumeOnStopped: true);
+        await upload;
+        (await write.Response).IsSuccess.Should().BeTrue();
+        Monitor.Latency = TimeSpan.Zero;
+
+        var reload = await _uploader.UploadAsync(0x2000, image);
+
+        reload.PagesSent.Should().Be(1);
+        Monitor.GetMemory()[0x2110].Should().Be(0x00);
+    }
+
+    [Fact]
+    public async Task Moved_Image_Should_Not_Match_Pages_It_Only_Partly_Covers()
+    {
+        var image = new byte[0x100];
+        await _uploader.UploadAsync(0x1000, image);
+
+        var moved = await _uploader.UploadAsync(0x1080, image);
+
+        moved.PagesSent.Should().Be(2);
+        moved.BytesSent.Should().Be(0x100);
+    }
+
+    [Fact]
+    public async Task Upload_Should_Reject_Images_Past_End_Of_Memory()
+    {
+        var act = async () => await _uploader.UploadAsync(0xFF00, new byte[0x101]);
+
+        await act.Should().ThrowAsync<ArgumentException>();
+    }
+
+    [Fact]
+    public async Task Watch_Should_Reload_Rebuilt_File()
+    {
+        var path = Path.Combine(Path.GetTempPath(), $"vicemcp-{Guid.NewGuid():N}.prg");
+        try
+        {
+            await File.WriteAllBytesAsync(path, [0x00, 0xC0, 0xA9, 0x01]);
+            var watch = await _uploader.StartWatchAsync(path, null);
+
+            await File.WriteAllBytesAsync(path, [0x00, 0xC0, 0xA9, 0x02]);
+            using var timeout = new CancellationTokenSource(TimeSpan.FromSeconds(10));
+            while (watch.Reloads == 0)
+            {
+                await Task.Delay(50, timeout.Token);
+            }
+
+            Monitor.GetMemory()[0xC001].Should().Be(0x02);
+            watch.LastUpload!.Address.Should().Be(0xC000);
+            (await _uploader.StopWatchAsync()).Should().BeSameAs(watch);
+        }
+        finally
+        {
+            File.Delete(path);
+        }
+    }
+
+    [Fact]
+    public void ParseProgram_Should_Split_Header_Unless_Address_Is_Given()
+    {
+        var (address, image) = ProgramUploader.ParseProgram([0x01, 0x08, 0x0B, 0x08], null);
+        address.Should().Be(0x0801);
+        image.ToArray().Should().Equal(0x0B, 0x08);
+
+        (address, image) = ProgramUploader.ParseProgram([0x01, 0x08, 0x0B], 0xC000);
+        address.Should().Be(0xC000);
+        image.Length.Should().Be(3);
+
+        var act = () => ProgramUploader.ParseProgram([0x01, 0x08], null);
+        act.Should().Throw<InvalidOperationException>();
+    }
+}
@@ -0,0 +1,63 @@
+using FluentAssertions;
+using ViceMCP.ViceBridge;
+using ViceMCP.ViceBridge.Commands;
+using Xunit;
+
+namespace ViceMCP.Tests;
+
+public class ShadowMemoryCacheTests
+{
+    private static byte[] Page(byte value) => Enumerable.Repeat(value, ShadowMemoryCache.PageSize).ToArray();
+
+    [Fact]
+    public void TryRead_Should_Miss_Until_Page_Is_Filled()
+    {
+        var cache = new ShadowMemoryCache();
+        var destination = new byte[4];
+
+        cache.TryRead(MemSpace.MainMemory, 0, 0xC000, 0xC003, destination).Should().BeFalse();
+        cache.Fill(cache.Generation, MemSpace.MainMemory, 0, 0xC000, Page(0xAA));
+
+        cache.TryRead(MemSpace.MainMemory, 0, 0xC000, 0xC003, destination).Should().BeTrue();
+        destination.Should().Equal(0xAA, 0xAA, 0xAA, 0xAA);
+        cache.Hits.Should().Be(1);
+        cache.Misses.Should().Be(1);
+    }
+
+    [Fact]
+    public void Fill_Should_Not_Validate_Partially_Covered_Pages()
+    {
+        var cache = new ShadowMemoryCache();
+
+        cache.Fill(cache.Generation, MemSpace.MainMemory, 0, 0xC010, new byte[16]);
+
+        cache.ValidPages.Should().Be(0);
+    }
+
+    [Fact]
+    public void Fill_Should_Be_Dropped_When_Invalidated_Since_Request()
+    {
+        var cache = new ShadowMemoryCache();
+        int generation = cache.Generation;
+
+        cache.Invalidate();
+        cache.Fill(generation, MemSpace.MainMemory, 0, 0xC000, Page(0x01));
+
+        cache.ValidPages.Should().Be(0);
+    }
+
+    [Fact]
+    public void Invalidate_Range_Should_Clear_Only_Its_Pages_In_All_Banks()
+    {
+        var cache = new ShadowMemoryCache();
+        cache.Fill(cache.Generation, MemSpace.MainMemory, 0, 0xC000, new byte[2 * ShadowMemoryCache.PageSize]);
+        cache.Fill(cache.Generation, MemSpace.MainMemory, 1, 0xC000, Page(0x00));
+        cache.Fill(cache.Generation, MemSpace.Drive8, 0, 0xC000, Page(0x00));
+
+        cache.Invalidate(MemSpace.MainMemory, 0xC010, 0xC010);
+
+        cache.ValidPages.Should().Be(2);
+        cache.TryRead(MemSpace.MainMemory, 0, 0xC100, 0xC1FF, new byte[256]).Should().BeTrue();
+        cache.TryRead(MemSpace.Drive8, 0, 0xC000, 0xC0FF, new byte[256]).Should().BeTrue();
+    }
+}
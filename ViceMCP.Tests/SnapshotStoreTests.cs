@@ -0,0 +1,134 @@
+using FluentAssertions;
+using ViceMCP.ViceBridge;
+using ViceMCP.ViceBridge.Commands;
+
+namespace ViceMCP.Tests;
+
+public class SnapshotStoreTests : FakeMonitorTestBase
+{
+    // Bank the fake reports as "ram"
+    private const ushort RamBank = 2;
+    private readonly string _directory = Path.Combine(Path.GetTempPath(), $"snapshots-{Guid.NewGuid():N}");
+    private SnapshotStore _store = null!;
+
+    public override async Task InitializeAsync()
+    {
+        await base.InitializeAsync();
+        _store = new SnapshotStore(_directory, capacity: 2);
+    }
+
+    public override async Task DisposeAsync()
+    {
+        _store.Dispose();
+        if (Directory.Exists(_directory))
+        {
+            Directory.Delete(_directory, recursive: true);
+        }
+        await base.DisposeAsync();
+    }
+
+    [Fact]
+    public async Task Memory_Snapshot_Should_Write_Back_Only_Changed_Pages()
+    {
+        var ram = Monitor.GetMemory(MemSpace.MainMemory, RamBank);
+        ram[0x0400] = 0x01;
+        ram[0xC0FF] = 0x02;
+        Monitor.SetRegister(FakeViceMonitor.RegisterPC, 0xC000);
+        await _store.SaveMemoryAsync(Bridge, "start");
+
+        ram[0x0400] = 0xFF;
+        ram[0xC0FF] = 0xFF;
+        ram[0xC100] = 0xFF;
+        Monitor.SetRegister(FakeViceMonitor.RegisterPC, 0x1234);
+        var result = await _store.RestoreAsync(Bridge, "start");
+
+        result.PagesCompared.Should().Be(256);
+        result.PagesWritten.Should().Be(3);
+        result.BytesWritten.Should().Be(3 * SnapshotStore.PageSize);
+        ram[0x0400].Should().Be(0x01);
+        ram[0xC0FF].Should().Be(0x02);
+        ram[0xC100].Should().Be(0x00);
+        Monitor.GetRegister(FakeViceMonitor.RegisterPC).Should().Be(0xC000);
+        Monitor.CommandCounts[CommandType.MemorySet].Should().Be(2, "pages $C0 and $C1 go out as one write");
+    }
+
+    [Fact]
+    public async Task Memory_Restore_Should_Keep_The_Program_Stopped_Until_Its_Registers_Are_Set()
+    {
+        var ram = Monitor.GetMemory(MemSpace.MainMemory, RamBank);
+        Monitor.SetRegister(FakeViceMonitor.RegisterPC, 0xC000);
+        await _store.SaveMemoryAsync(Bridge, "start");
+        using (var timeout = new CancellationTokenSource(TimeSpan.FromSeconds(10)))
+        {
+            while (Bridge.RunState != EmulatorRunState.Running)
+            {
+                await Task.Delay(10, timeout.Token);
+            }
+        }
+        ram[0x0400] = 0xFF;
+        Monitor.SetRegister(FakeViceMonitor.RegisterPC, 0x1234);
+        // The program at $1234 writes to page $20 whenever it runs, after the diff read it would go unnoticed
+        Monitor.Resumed += () =>
+        {
+            if (Monitor.GetRegister(FakeViceMonitor.RegisterPC) == 0x1234)
+            {
+                ram[0x2000] = 0xEE;
+            }
+        };
+
+        await _store.RestoreAsync(Bridge, "start");
+
+        ram[0x0400].Should().Be(0x00);
+        ram[0x2000].Should().Be(0x00);
+        Monitor.GetRegister(FakeViceMonitor.RegisterPC).Should().Be(0xC000);
+    }
+
+    [Fact]
+    public async Task Full_Snapshot_Should_Round_Trip_Through_Dump_And_Undump()
+    {
+        Monitor.GetMemory()[0x0801] = 0x0B;
+        var snapshot = await _store.SaveFullAsync(Bridge, "basic ready");
+        Monitor.GetMemory()[0x0801] = 0x00;
+
+        await _store.RestoreAsync(Bridge, "basic ready");
+
+        snapshot.FilePath.Should().StartWith(_directory);
+        File.Exists(snapshot.FilePath).Should().BeTrue();
+        Monitor.GetMemory()[0x0801].Should().Be(0x0B);
+    }
+
+    [Fact]
+    public async Task Store_Should_Evict_Least_Recently_Used_Snapshot()
+    {
+        var first = await _store.SaveFullAsync(Bridge, "first");
+        await _store.SaveFullAsync(Bridge, "second");
+        await _store.RestoreAsync(Bridge, "first");
+
+        await _store.SaveFullAsync(Bridge, "third");
+
+        _store.Snapshots.Select(s => s.Name).Should().Equal("third", "first");
+        File.Exists(first.FilePath).Should().BeTrue();
+        Directory.GetFiles(_directory).Should().HaveCount(2);
+    }
+
+    [Fact]
+    public async Task Restore_Should_Reject_Unknown_Name()
+    {
+        var act = () => _store.RestoreAsync(Bridge, "missing");
+
+        await act.Should().ThrowAsync<ArgumentException>().WithMessage("No snapshot named 'missing'");
+    }
+
+    [Fact]
+    public void DifferingRuns_Should_Coalesce_Adjacent_Pages()
+    {
+        var wanted = new byte[0x10000];
+        var current = new byte[0x10000];
+        current[0x0000] = 1;
+        current[0x0100] = 1;
+        current[0x0300] = 1;
+        current[0xFFFF] = 1;
+
+        SnapshotStore.DifferingRuns(wanted, current).Should().Equal((0x0000, 0x200), (0x0300, 0x100), (0xFF00, 0x100));
+    }
+}
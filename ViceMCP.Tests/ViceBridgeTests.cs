@@ -209,6 +209,410 @@ namespace ViceMCP.Tests
             await act.Should().ThrowAsync<OperationCanceledException>();
         }
 
+        [Fact]
+        public void RunState_Should_Be_Unknown_Initially()
+        {
+            // Assert
+            _viceBridge.RunState.Should().Be(EmulatorRunState.Unknown);
+        }
+
+        [Fact]
+        public void TrackRunState_Should_Follow_Stopped_And_Resumed_Broadcasts()
+        {
+            // Arrange
+            var changes = new List<(EmulatorRunState State, ushort? Pc)>();
+            _viceBridge.RunStateChanged += (_, e) => changes.Add((e.RunState, e.ProgramCounter));
+
+            // Act
+            _viceBridge.TrackRunState(new StoppedResponse(0x02, ErrorCode.OK, 0xC000));
+            _viceBridge.TrackRunState(new StoppedResponse(0x02, ErrorCode.OK, 0xC001));
+            _viceBridge.TrackRunState(new ResumedResponse(0x02, ErrorCode.OK, 0xC001));
+
+            // Assert
+            _viceBridge.RunState.Should().Be(EmulatorRunState.Running);
+            changes.Should().Equal(
+                (EmulatorRunState.Stopped, (ushort?)0xC000),
+                (EmulatorRunState.Running, (ushort?)0xC001));
+        }
+
+        [Fact]
+        public void TrackRunState_Should_Treat_Jam_As_Stopped()
+        {
+            // Act
+            _viceBridge.TrackRunState(new JamResponse(0x02, ErrorCode.OK, 0x1234));
+
+            // Assert
+            _viceBridge.RunState.Should().Be(EmulatorRunState.Stopped);
+        }
+
+        [Fact]
+        public void TrackRunState_Should_Ignore_Other_Responses()
+        {
+            // Act
+            _viceBridge.TrackRunState(new EmptyViceResponse(0x02, ErrorCode.OK));
+
+            // Assert
+            _viceBridge.RunState.Should().Be(EmulatorRunState.Unknown);
+        }
+
+        [Fact]
+        public async Task Pipelined_Commands_Should_Be_Matched_By_Request_Id()
+        {
+            // Arrange
+            _testListener = new TcpListener(IPAddress.Loopback, 6505);
+            _testListener.Start();
+            await using var bridge = new ViceBridge.Services.Implementation.ViceBridge(
+                _loggerMock.Object,
+                _responseBuilder,
+                _performanceProfilerMock.Object,
+                _messagesHistoryMock.Object,
+                new ViceConfiguration { PipelineDepth = 4 });
+            bridge.Start(6505);
+            using var client = await _testListener.AcceptTcpClientAsync();
+            var stream = client.GetStream();
+
+            // Act
+            var first = bridge.EnqueueCommand(new PingCommand());
+            var second = bridge.EnqueueCommand(new PingCommand());
+
+            // Both commands are on the wire before any response is sent
+            var firstId = await ReadRequestIdAsync(stream);
+            var secondId = await ReadRequestIdAsync(stream);
+
+            // Answer out of order
+            await WriteResponseAsync(stream, ResponseType.Ping, secondId);
+            await WriteResponseAsync(stream, ResponseType.Ping, firstId);
+
+            // Assert
+            firstId.Should().NotBe(secondId);
+            (await first.Response.WaitAsync(TimeSpan.FromSeconds(5))).IsSuccess.Should().BeTrue();
+            (await second.Response.WaitAsync(TimeSpan.FromSeconds(5))).IsSuccess.Should().BeTrue();
+        }
+
+        [Fact]
+        public async Task Responses_Should_Be_Framed_Regardless_Of_Packet_Boundaries()
+        {
+            // Arrange
+            _testListener = new TcpListener(IPAddress.Loopback, 6506);
+            _testListener.Start();
+            await using var bridge = new ViceBridge.Services.Implementation.ViceBridge(
+                _loggerMock.Object,
+                _responseBuilder,
+                _performanceProfilerMock.Object,
+                _messagesHistoryMock.Object,
+                new ViceConfiguration { PipelineDepth = 4 });
+            bridge.Start(6506);
+            using var client = await _testListener.AcceptTcpClientAsync();
+            client.NoDelay = true;
+            var stream = client.GetStream();
+
+            var first = bridge.EnqueueCommand(new PingCommand());
+            var second = bridge.EnqueueCommand(new PingCommand());
+            var firstId = await ReadRequestIdAsync(stream);
+            var secondId = await ReadRequestIdAsync(stream);
+
+            // Act - both responses back to back, trickled one byte at a time
+            var responses = new MemoryStream();
+            foreach (var requestId in new[] { firstId, secondId })
+            {
+                var response = new byte[12];
+                response[0] = Constants.STX;
+                response[1] = ViceCommand.DefaultApiVersion;
+                response[6] = (byte)ResponseType.Ping;
+                BitConverter.TryWriteBytes(response.AsSpan(8), requestId);
+                responses.Write(response);
+            }
+            foreach (var b in responses.ToArray())
+            {
+                await stream.WriteAsync(new[] { b });
+                await stream.FlushAsync();
+            }
+
+            // Assert
+            (await first.Response.WaitAsync(TimeSpan.FromSeconds(5))).IsSuccess.Should().BeTrue();
+            (await second.Response.WaitAsync(TimeSpan.FromSeconds(5))).IsSuccess.Should().BeTrue();
+        }
+
+        [Fact]
+        public async Task Shadow_Memory_Should_Serve_Reads_While_Stopped()
+        {
+            // Arrange
+            _testListener = new TcpListener(IPAddress.Loopback, 6507);
+            _testListener.Start();
+            await using var bridge = new ViceBridge.Services.Implementation.ViceBridge(
+                _loggerMock.Object,
+                _responseBuilder,
+                _performanceProfilerMock.Object,
+                _messagesHistoryMock.Object,
+                new ViceConfiguration { UseShadowMemory = true });
+            bridge.Start(6507);
+            using var client = await _testListener.AcceptTcpClientAsync();
+            var stream = client.GetStream();
+            await WriteResponseAsync(stream, ResponseType.Stopped, Constants.BroadcastRequestId, [0x00, 0xC0]);
+            var deadline = DateTime.UtcNow.AddSeconds(5);
+            while (bridge.RunState != EmulatorRunState.Stopped && DateTime.UtcNow < deadline)
+            {
+                await Task.Delay(10);
+            }
+
+            // Act - the first read goes to VICE as a whole page
+            var first = bridge.EnqueueCommand(new MemoryGetCommand(0, 0x1010, 0x1011, MemSpace.MainMemory, 0));
+            var (requestId, body) = await ReadCommandAsync(stream);
+            var page = new byte[2 + 256];
+            BitConverter.TryWriteBytes(page, (ushort)256);
+            for (int i = 0; i < 256; i++)
+            {
+                page[2 + i] = (byte)i;
+            }
+            await WriteResponseAsync(stream, ResponseType.MemoryGet, requestId, page);
+            var firstResult = await first.Response.WaitAsync(TimeSpan.FromSeconds(5));
+
+            // The second read of the same page never reaches VICE
+            var second = bridge.EnqueueCommand(new MemoryGetCommand(0, 0x1020, 0x1022, MemSpace.MainMemory, 0));
+
+            // Assert
+            BitConverter.ToUInt16(body, 1).Should().Be(0x1000);
+            BitConverter.ToUInt16(body, 3).Should().Be(0x10FF);
+            firstResult.Response!.Memory!.Value.Span.ToArray().Should().Equal(0x10, 0x11);
+            second.Response.IsCompleted.Should().BeTrue();
+            (await second.Response).Response!.Memory!.Value.Span.ToArray().Should().Equal(0x20, 0x21, 0x22);
+            bridge.ShadowMemory!.Hits.Should().Be(1);
+
+            // A write through the bridge drops the page
+            using var data = BufferManager.GetBuffer(1);
+            bridge.EnqueueCommand(new MemorySetCommand(0, 0x1020, MemSpace.MainMemory, 0, data));
+            bridge.ShadowMemory.ValidPages.Should().Be(0);
+        }
+
+        [Fact]
+        public async Task Reads_Should_Not_Overtake_A_Queued_Write_To_Their_Range()
+        {
+            // Arrange
+            _testListener = new TcpListener(IPAddress.Loopback, 6518);
+            _testListener.Start();
+            await using var bridge = new ViceBridge.Services.Implementation.ViceBridge(
+                _loggerMock.Object,
+                _responseBuilder,
+                _performanceProfilerMock.Object,
+                _messagesHistoryMock.Object,
+                new ViceConfiguration { UseShadowMemory = true, PipelineDepth = 1 });
+            bridge.Start(6518);
+            using var client = await _testListener.AcceptTcpClientAsync();
+            var stream = client.GetStream();
+            await WriteResponseAsync(stream, ResponseType.Stopped, Constants.BroadcastRequestId, [0x00, 0xC0]);
+            var deadline = DateTime.UtcNow.AddSeconds(5);
+            while (bridge.RunState != EmulatorRunState.Stopped && DateTime.UtcNow < deadline)
+            {
+                await Task.Delay(10);
+            }
+            // Stays stopped when the queue runs dry, so the last read could come from the cache
+            using var hold = bridge.HoldAutoResume();
+            bridge.EnqueueCommand(new PingCommand());
+            var pingId = await ReadRequestIdAsync(stream);
+
+            // Act - queued while the only pipeline slot is taken
+            using var data = BufferManager.GetBuffer(1);
+            data.Data[0] = 0xAA;
+            var write = bridge.EnqueueCommand(new MemorySetCommand(0, 0x1020, MemSpace.MainMemory, 0, data), CommandPriority.Bulk);
+            var besideWrite = bridge.EnqueueCommand(new MemoryGetCommand(0, 0x1010, 0x1010, MemSpace.MainMemory, 0));
+            var ofWrite = bridge.EnqueueCommand(new MemoryGetCommand(0, 0x1020, 0x1020, MemSpace.MainMemory, 0));
+            await WriteResponseAsync(stream, ResponseType.Ping, pingId);
+            // The read beside the write overtakes it, but as is: its page is about to change
+            var (besideId, besideBody) = await ReadCommandAsync(stream);
+            await WriteResponseAsync(stream, ResponseType.MemoryGet, besideId, [0x01, 0x00, 0x00]);
+            await besideWrite.Response.WaitAsync(TimeSpan.FromSeconds(5));
+            // The read of the written byte waits for the write
+            var (writeId, writeType) = await ReadCommandWithTypeAsync(stream);
+            await WriteResponseAsync(stream, ResponseType.MemorySet, writeId);
+            await write.Response.WaitAsync(TimeSpan.FromSeconds(5));
+            var (ofWriteId, ofWriteBody) = await ReadCommandAsync(stream);
+            var page = new byte[2 + 256];
+            BitConverter.TryWriteBytes(page, (ushort)256);
+            page[2 + 0x20] = 0xAA;
+            await WriteResponseAsync(stream, ResponseType.MemoryGet, ofWriteId, page);
+            var ofWriteResult = await ofWrite.Response.WaitAsync(TimeSpan.FromSeconds(5));
+            var cached = bridge.EnqueueCommand(new MemoryGetCommand(0, 0x1020, 0x1020, MemSpace.MainMemory, 0));
+
+            // Assert
+            BitConverter.ToUInt16(besideBody, 1).Should().Be(0x1010);
+            writeType.Should().Be(CommandType.MemorySet);
+            BitConverter.ToUInt16(ofWriteBody, 1).Should().Be(0x1000);
+            ofWriteResult.Response!.Memory!.Value.Span[0].Should().Be(0xAA);
+            cached.Response.IsCompleted.Should().BeTrue();
+            (await cached.Response).Response!.Memory!.Value.Span[0].Should().Be(0xAA);
+        }
+
+        [Fact]
+        public async Task WaitForReadyAsync_Should_Return_Once_Monitor_Starts_Listening()
+        {
+            // Arrange - the bridge starts before anything listens, as it does while VICE is starting
+            await using var bridge = new ViceBridge.Services.Implementation.ViceBridge(
+                _loggerMock.Object,
+                _responseBuilder,
+                _performanceProfilerMock.Object,
+                _messagesHistoryMock.Object);
+            bridge.Start(6508);
+            var ready = bridge.WaitForReadyAsync(new CancellationTokenSource(TimeSpan.FromSeconds(10)).Token);
+            await Task.Delay(300);
+            _testListener = new TcpListener(IPAddress.Loopback, 6508);
+            _testListener.Start();
+            var stopwatch = System.Diagnostics.Stopwatch.StartNew();
+
+            // Act
+            using var client = await _testListener.AcceptTcpClientAsync();
+            var stream = client.GetStream();
+            var (requestId, _) = await ReadCommandAsync(stream);
+            await WriteResponseAsync(stream, ResponseType.Info, requestId, [4, 3, 7, 1, 0, 4, 0, 0, 0, 0]);
+            var info = await ready;
+
+            // Assert - picked up by the backoff, not by a fixed sleep
+            stopwatch.Elapsed.Should().BeLessThan(TimeSpan.FromSeconds(2));
+            info.Major.Should().Be(3);
+            info.Minor.Should().Be(7);
+            ready.IsCompletedSuccessfully.Should().BeTrue();
+        }
+
+        private static async Task<uint> ReadRequestIdAsync(NetworkStream stream)
+        {
+            var (requestId, _) = await ReadCommandAsync(stream);
+            return requestId;
+        }
+
+        private static async Task<(uint RequestId, byte[] Body)> ReadCommandAsync(NetworkStream stream)
+        {
+            var header = new byte[11];
+            await stream.ReadExactlyAsync(header);
+            var body = new byte[BitConverter.ToUInt32(header, 2)];
+            await stream.ReadExactlyAsync(body);
+            return (BitConverter.ToUInt32(header, 6), body);
+        }
+
+        private static async Task WriteResponseAsync(NetworkStream stream, ResponseType responseType, uint requestId,
+            byte[]? body = null)
+        {
+            body ??= [];
+            var response = new byte[12 + body.Length];
+            response[0] = Constants.STX;
+            response[1] = ViceCommand.DefaultApiVersion;
+            BitConverter.TryWriteBytes(response.AsSpan(2), (uint)body.Length);
+            response[6] = (byte)responseType;
+            response[7] = (byte)ErrorCode.OK;
+            BitConverter.TryWriteBytes(response.AsSpan(8), requestId);
+            body.CopyTo(response, 12);
+            await stream.WriteAsync(response);
+        }
+
+        [Fact]
+        public async Task Interactive_Commands_Should_Overtake_Queued_Bulk_Commands()
+        {
+            // Arrange
+            _testListener = new TcpListener(IPAddress.Loopback, 6509);
+            _testListener.Start();
+            await using var bridge = new ViceBridge.Services.Implementation.ViceBridge(
+                _loggerMock.Object,
+                _responseBuilder,
+                _performanceProfilerMock.Object,
+                _messagesHistoryMock.Object,
+                new ViceConfiguration { PipelineDepth = 1 });
+            bridge.Start(6509);
+            using var client = await _testListener.AcceptTcpClientAsync();
+            var stream = client.GetStream();
+            var first = bridge.EnqueueCommand(new PingCommand());
+            var (firstId, _) = await ReadCommandWithTypeAsync(stream);
+
+            // Act - queued while the only pipeline slot is taken
+            using var cts = new CancellationTokenSource();
+            var bulk1 = bridge.EnqueueCommand(new MemoryGetCommand(0, 0xC000, 0xC000, MemSpace.MainMemory, 0), CommandPriority.Bulk);
+            var cancelled = bridge.EnqueueCommand(new MemoryGetCommand(0, 0xC001, 0xC001, MemSpace.MainMemory, 0), CommandPriority.Bulk, ct: cts.Token);
+            var bulk2 = bridge.EnqueueCommand(new MemoryGetCommand(0, 0xC002, 0xC002, MemSpace.MainMemory, 0), CommandPriority.Bulk);
+            var ping = bridge.EnqueueCommand(new PingCommand());
+            cts.Cancel();
+            await WriteResponseAsync(stream, ResponseType.Ping, firstId);
+
+            var sent = new List<CommandType>();
+            for (int i = 0; i < 3; i++)
+            {
+                var (requestId, commandType) = await ReadCommandWithTypeAsync(stream);
+                sent.Add(commandType);
+                if (commandType == CommandType.Ping)
+                {
+                    await WriteResponseAsync(stream, ResponseType.Ping, requestId);
+                }
+                else
+                {
+                    await WriteResponseAsync(stream, ResponseType.MemoryGet, requestId, [1, 0, 0x42]);
+                }
+            }
+
+            // Assert
+            sent.Should().Equal(CommandType.Ping, CommandType.MemoryGet, CommandType.MemoryGet);
+            (await first.Response.WaitAsync(TimeSpan.FromSeconds(5))).IsSuccess.Should().BeTrue();
+            (await ping.Response.WaitAsync(TimeSpan.FromSeconds(5))).IsSuccess.Should().BeTrue();
+            (await bulk1.Response.WaitAsync(TimeSpan.FromSeconds(5))).IsSuccess.Should().BeTrue();
+            (await bulk2.Response.WaitAsync(TimeSpan.FromSeconds(5))).IsSuccess.Should().BeTrue();
+            var act = async () => await cancelled.Response;
+            await act.Should().ThrowAsync<OperationCanceledException>();
+        }
+
+        [Fact]
+        public async Task Full_Lane_Should_Refuse_Or_Hold_Back_Commands()
+        {
+            // Arrange - nothing listens, so commands stay queued
+            await using var bridge = new ViceBridge.Services.Implementation.ViceBridge(
+                _loggerMock.Object,
+                _responseBuilder,
+                _performanceProfilerMock.Object,
+                _messagesHistoryMock.Object,
+                new ViceConfiguration { MaxQueuedCommands = 1 });
+            bridge.Start(6510);
+            bridge.EnqueueCommand(new PingCommand(), CommandPriority.Bulk);
+
+            // Act & Assert
+            bridge.Invoking(b => b.EnqueueCommand(new PingCommand(), CommandPriority.Bulk))
+                .Should().Throw<InvalidOperationException>().WithMessage("*bulk command queue is full*");
+            bridge.Invoking(b => b.EnqueueCommand(new PingCommand(), CommandPriority.Normal)).Should().NotThrow();
+            bridge.Invoking(b => b.EnqueueCommand(new PingCommand())).Should().NotThrow();
+
+            using var cts = new CancellationTokenSource();
+            var waiting = bridge.EnqueueCommandAsync(new PingCommand(), CommandPriority.Bulk, ct: cts.Token).AsTask();
+            await Task.Delay(50);
+            waiting.IsCompleted.Should().BeFalse();
+            cts.Cancel();
+            var act = async () => await waiting;
+            await act.Should().ThrowAsync<OperationCanceledException>();
+        }
+
+        [Fact]
+        public async Task Command_Scope_Should_Set_Lane_Of_Commands_Enqueued_Without_One()
+        {
+            // Arrange
+            await using var bridge = new ViceBridge.Services.Implementation.ViceBridge(
+                _loggerMock.Object,
+                _responseBuilder,
+                _performanceProfilerMock.Object,
+                _messagesHistoryMock.Object,
+                new ViceConfiguration { MaxQueuedCommands = 1 });
+            bridge.Start(6511);
+
+            // Act & Assert - pings default to the unbounded interactive lane
+            using (CommandScope.Enter(CommandPriority.Bulk))
+            {
+                bridge.EnqueueCommand(new PingCommand());
+                bridge.Invoking(b => b.EnqueueCommand(new PingCommand()))
+                    .Should().Throw<InvalidOperationException>();
+            }
+            CommandScope.Priority.Should().BeNull();
+            bridge.Invoking(b => b.EnqueueCommand(new PingCommand())).Should().NotThrow();
+        }
+
+        private static async Task<(uint RequestId, CommandType CommandType)> ReadCommandWithTypeAsync(NetworkStream stream)
+        {
+            var header = new byte[11];
+            await stream.ReadExactlyAsync(header);
+            await stream.ReadExactlyAsync(new byte[BitConverter.ToUInt32(header, 2)]);
+            return (BitConverter.ToUInt32(header, 6), (CommandType)header[10]);
+        }
+
         [Fact]
         public async Task DisposeAsync_Should_Stop_Bridge()
         {
@@ -0,0 +1,159 @@
+using System.Reflection;
+using System.Text.Json;
+using FluentAssertions;
+using Moq;
+using ViceMCP.ViceBridge;
+using ViceMCP.ViceBridge.Commands;
+using ViceMCP.ViceBridge.Responses;
+using ViceMCP.ViceBridge.Services.Abstract;
+using ViceMCP.ViceBridge.Shared;
+using Xunit;
+
+namespace ViceMCP.Tests;
+
+public class ViceInstancePoolTests
+{
+    private readonly ViceConfiguration _config = new() { BinaryMonitorPort = 6600, MaxInstances = 3 };
+    private readonly Mock<IViceBridge> _primary = new();
+    private readonly List<Mock<IViceBridge>> _created = new();
+    private readonly ViceInstancePool _pool;
+
+    public ViceInstancePoolTests()
+    {
+        _pool = new ViceInstancePool(_primary.Object, _config, () =>
+        {
+            var mock = new Mock<IViceBridge>();
+            _created.Add(mock);
+            return mock.Object;
+        });
+    }
+
+    [Fact]
+    public void Get_Should_Create_Instances_On_Consecutive_Ports()
+    {
+        var instance = _pool.Get(2);
+
+        instance.Port.Should().Be(6602);
+        _pool.Instances.Select(i => i.Port).Should().Equal(6600, 6601, 6602);
+        _pool.Get(0).Bridge.Should().BeSameAs(_primary.Object);
+        _created.Should().HaveCount(2);
+    }
+
+    [Fact]
+    public void Get_Should_Reject_Instances_Outside_The_Pool()
+    {
+        var act = () => _pool.Get(3);
+
+        act.Should().Throw<ArgumentException>().WithMessage("*VICE_MAX_INSTANCES*");
+    }
+
+    [Fact]
+    public void Lease_Should_Hand_Out_Each_Instance_Once()
+    {
+        var first = _pool.Lease("a");
+        var second = _pool.Lease("b");
+        var third = _pool.Lease("c");
+
+        new[] { first.Id, second.Id, third.Id }.Should().Equal(0, 1, 2);
+        second.LeasedBy.Should().Be("b");
+        var act = () => _pool.Lease("d");
+        act.Should().Throw<InvalidOperationException>().WithMessage("All 3 instances are leased");
+    }
+
+    [Fact]
+    public void Release_Should_Make_Instance_Available_Again()
+    {
+        _pool.Lease("a");
+        var leased = _pool.Lease("b");
+
+        _pool.Release(leased.Id, "b");
+
+        leased.LeasedBy.Should().BeNull();
+        _pool.Lease("c").Id.Should().Be(leased.Id);
+    }
+
+    [Fact]
+    public void Release_Should_Check_Owner()
+    {
+        var leased = _pool.Lease("a");
+
+        var act = () => _pool.Release(leased.Id, "b");
+
+        act.Should().Throw<InvalidOperationException>().WithMessage("*leased by a");
+        leased.LeasedBy.Should().Be("a");
+    }
+
+    [Fact]
+    public async Task ViceTools_Should_Route_Calls_By_Instance()
+    {
+        var tools = new ViceTools(_pool, _config);
+        _pool.Get(1);
+        SetupPing(_created[0]);
+
+        var result = await tools.Ping(instance: 1);
+
+        result.Should().Be("Pong! VICE is responding");
+        _created[0].Verify(x => x.Start(6601), Times.Once);
+        _created[0].Verify(x => x.EnqueueCommand(It.IsAny<PingCommand>(), false), Times.Once);
+        _primary.Verify(x => x.EnqueueCommand(It.IsAny<PingCommand>(), It.IsAny<bool>()), Times.Never);
+    }
+
+    [Fact]
+    public async Task ViceTools_Should_Use_Selected_Instance_By_Default()
+    {
+        _pool.Select(2);
+        SetupPing(_created[1]);
+
+        await new ViceTools(_pool, _config).Ping();
+
+        _created[1].Verify(x => x.EnqueueCommand(It.IsAny<PingCommand>(), false), Times.Once);
+        _primary.Verify(x => x.EnqueueCommand(It.IsAny<PingCommand>(), It.IsAny<bool>()), Times.Never);
+    }
+
+    [Fact]
+    public async Task ExecuteBatch_Should_Send_Memory_Steps_To_The_Instance_Each_Command_Names()
+    {
+        // Arrange
+        var tools = new ViceTools(_pool, _config);
+        _pool.Get(1);
+        var writes = new List<MemorySetCommand>();
+        _created[0]
+            .Setup(x => x.EnqueueCommand(It.IsAny<MemorySetCommand>(), true))
+            .Callback((MemorySetCommand cmd, bool _) =>
+            {
+                writes.Add(cmd);
+                var tcsField = typeof(ViceCommand<EmptyViceResponse>).GetField("tcs", BindingFlags.NonPublic | BindingFlags.Instance | BindingFlags.DeclaredOnly);
+                var tcs = (TaskCompletionSource<CommandResponse<EmptyViceResponse>>)tcsField!.GetValue(cmd)!;
+                tcs.SetResult(new CommandResponse<EmptyViceResponse>(new EmptyViceResponse(0x02, ErrorCode.OK)));
+            })
+            .Returns((MemorySetCommand cmd, bool _) => cmd);
+        var commandsJson = """
+        [
+            { "command": "write_memory", "parameters": { "startHex": "d020", "dataHex": "00", "instance": 1 } },
+            { "command": "write_memory", "parameters": { "startHex": "d021", "dataHex": "06", "instance": 1 } }
+        ]
+        """;
+
+        // Act
+        var response = JsonSerializer.Deserialize<BatchResponse>(await tools.ExecuteBatch(commandsJson))!;
+
+        // Assert
+        response.SuccessfulCommands.Should().Be(2);
+        writes.Should().ContainSingle().Which.StartAddress.Should().Be(0xD020);
+        _created[0].Verify(x => x.Start(6601), Times.Once);
+        _primary.Verify(x => x.EnqueueCommand(It.IsAny<MemorySetCommand>(), It.IsAny<bool>()), Times.Never);
+    }
+
+    private static void SetupPing(Mock<IViceBridge> bridge)
+    {
+        bridge
+            .Setup(x => x.EnqueueCommand(It.IsAny<PingCommand>(), false))
+            .Callback((PingCommand cmd, bool resumeOnStopped) =>
+            {
+                var tcsField = typeof(ViceCommand<EmptyViceResponse>).GetField("tcs", BindingFlags.NonPublic | BindingFlags.Instance | BindingFlags.DeclaredOnly);
+                var tcs = (TaskCompletionSource<CommandResponse<EmptyViceResponse>>)tcsField!.GetValue(cmd)!;
+                tcs.SetResult(new CommandResponse<EmptyViceResponse>(new EmptyViceResponse(0x02, ErrorCode.OK)));
+            })
+            .Returns((PingCommand cmd, bool resumeOnStopped) => cmd);
+    }
+}
@@ -324,5 +324,94 @@ public class ViceToolsMemoryOperationsTests : IDisposable
         result.Should().Be("Memory regions $C000-$C003 and $D000-$D003 are identical");
     }
 
+    [Fact]
+    public async Task CompareMemory_Should_Release_First_Read_When_Second_Fails()
+    {
+        // Arrange
+        var pool = new CountingPool();
+        var responses = new Queue<CommandResponse<MemoryGetResponse>>(
+        [
+            new CommandResponse<MemoryGetResponse>(new MemoryGetResponse(0x02, ErrorCode.OK, pool.GetBuffer(4))),
+            new CommandResponse<MemoryGetResponse>(ErrorCode.InvalidMemSpace),
+        ]);
+        
+        _viceBridgeMock.Setup(x => x.Start(6502));
+        
+        _viceBridgeMock
+            .Setup(x => x.EnqueueCommand(It.IsAny<MemoryGetCommand>(), It.IsAny<bool>()))
+            .Returns((MemoryGetCommand cmd, bool resumeOnStopped) => 
+            {
+                var commandType = typeof(ViceCommand<MemoryGetResponse>);
+                var tcsField = commandType.GetField("tcs", BindingFlags.NonPublic | BindingFlags.Instance | BindingFlags.DeclaredOnly);
+                var tcs = (TaskCompletionSource<CommandResponse<MemoryGetResponse>>)tcsField!.GetValue(cmd)!;
+                tcs.SetResult(responses.Dequeue());
+                return cmd;
+            });
+
+        // Act
+        var act = () => _viceTools.CompareMemory("C000", "D000", 4);
+
+        // Assert
+        await act.Should().ThrowAsync<InvalidOperationException>().WithMessage("Failed to read second region*");
+        pool.Returned.Should().Be(1);
+    }
+
+    #region SaveMemory Tests
+
+    [Fact]
+    public async Task SaveMemory_Should_Keep_The_Existing_File_When_A_Read_Fails()
+    {
+        // Arrange - the first chunk arrives, the connection drops on the second
+        var directory = Directory.CreateTempSubdirectory("vicemcp-save-");
+        var filePath = Path.Combine(directory.FullName, "memory.bin");
+        await File.WriteAllTextAsync(filePath, "old");
+        int reads = 0;
+        
+        _viceBridgeMock.Setup(x => x.Start(6502));
+        
+        _viceBridgeMock
+            .Setup(x => x.EnqueueCommand(It.IsAny<MemoryGetCommand>(), It.IsAny<bool>()))
+            .Returns((MemoryGetCommand cmd, bool resumeOnStopped) => 
+            {
+                var commandType = typeof(ViceCommand<MemoryGetResponse>);
+                var tcsField = commandType.GetField("tcs", BindingFlags.NonPublic | BindingFlags.Instance | BindingFlags.DeclaredOnly);
+                var tcs = (TaskCompletionSource<CommandResponse<MemoryGetResponse>>)tcsField!.GetValue(cmd)!;
+                if (reads++ == 0)
+                {
+                    var buffer = BufferManager.GetBuffer((uint)(cmd.EndAddress - cmd.StartAddress + 1));
+                    tcs.SetResult(new CommandResponse<MemoryGetResponse>(new MemoryGetResponse(0x02, ErrorCode.OK, buffer)));
+                }
+                else
+                {
+                    tcs.SetException(new IOException("Connection reset"));
+                }
+                return cmd;
+            });
+
+        try
+        {
+            // Act
+            var act = () => _viceTools.SaveMemory("0000", "1FFF", filePath);
+
+            // Assert
+            await act.Should().ThrowAsync<IOException>();
+            (await File.ReadAllTextAsync(filePath)).Should().Be("old");
+            directory.GetFiles().Select(f => f.Name).Should().Equal("memory.bin");
+        }
+        finally
+        {
+            directory.Delete(recursive: true);
+        }
+    }
+
+    #endregion
+
+    private sealed class CountingPool : System.Buffers.ArrayPool<byte>
+    {
+        public int Returned { get; private set; }
+        public override byte[] Rent(int minimumLength) => new byte[minimumLength];
+        public override void Return(byte[] array, bool clearArray = false) => Returned++;
+    }
+
     #endregion
 }
\ No newline at end of file
@@ -66,6 +66,34 @@ public class ViceToolsTests
             false), Times.Once);
     }
 
+    [Fact]
+    public async Task ReadMemory_Should_Read_Large_Ranges_In_Chunks_And_Encode()
+    {
+        // Arrange
+        var reads = new List<MemoryGetCommand>();
+        _viceBridgeMock
+            .Setup(x => x.EnqueueCommand(It.IsAny<MemoryGetCommand>(), It.IsAny<bool>()))
+            .Callback((MemoryGetCommand cmd, bool resumeOnStopped) =>
+            {
+                reads.Add(cmd);
+                var buffer = BufferManager.GetBuffer((uint)(cmd.EndAddress - cmd.StartAddress + 1));
+                Array.Fill(buffer.Data, (byte)0xEA, 0, (int)buffer.Size);
+                var commandType = typeof(ViceCommand<MemoryGetResponse>);
+                var tcsField = commandType.GetField("tcs", BindingFlags.NonPublic | BindingFlags.Instance | BindingFlags.DeclaredOnly);
+                var tcs = (TaskCompletionSource<CommandResponse<MemoryGetResponse>>)tcsField!.GetValue(cmd)!;
+                tcs.SetResult(new CommandResponse<MemoryGetResponse>(new MemoryGetResponse(0x02, ErrorCode.OK, buffer)));
+            })
+            .Returns((MemoryGetCommand cmd, bool resumeOnStopped) => cmd);
+
+        // Act
+        var result = await _viceTools.ReadMemory("2000", "4fff", "rle");
+
+        // Assert
+        result.Should().Be("EA*12288");
+        reads.Should().HaveCount(3);
+        reads.Select(r => r.StartAddress).Should().Equal(0x2000, 0x3000, 0x4000);
+    }
+
     [Fact]
     public async Task ReadMemory_Should_Handle_Parse_Errors()
     {
@@ -38,6 +38,12 @@ public class BatchResponse
     [JsonPropertyName("total_commands")]
     public int TotalCommands { get; set; }
     
+    /// <summary>
+    /// Number of commands actually sent after <see cref="BatchPlanner"/> merged memory operations.
+    /// </summary>
+    [JsonPropertyName("planned_commands")]
+    public int PlannedCommands { get; set; }
+    
     [JsonPropertyName("successful_commands")]
     public int SuccessfulCommands { get; set; }
     
@@ -49,4 +55,13 @@ public class BatchResponse
     
     [JsonPropertyName("execution_time_ms")]
     public long ExecutionTimeMs { get; set; }
-}
\ No newline at end of file
+}
+
+/// <summary>
+/// Serialization metadata generated at compile time for the batch JSON, so parsing a batch and writing its response
+/// need no reflection and stay AOT compatible.
+/// </summary>
+[JsonSourceGenerationOptions(WriteIndented = true)]
+[JsonSerializable(typeof(List<BatchCommandSpec>))]
+[JsonSerializable(typeof(BatchResponse))]
+internal partial class BatchJsonContext : JsonSerializerContext;
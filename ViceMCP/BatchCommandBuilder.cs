@@ -1,91 +1,81 @@
 using System.Diagnostics;
-using System.Reflection;
-using System.Text.Json;
-using ModelContextProtocol.Server;
+using ViceMCP.ViceBridge;
+using ViceMCP.ViceBridge.Commands;
+using ViceMCP.ViceBridge.Services.Abstract;
+using ViceMCP.ViceBridge.Shared;
 
 namespace ViceMCP;
 
 public class BatchCommandBuilder
 {
     private readonly ViceTools _viceTools;
-    private readonly Dictionary<string, MethodInfo> _commandMethods;
 
     public BatchCommandBuilder(ViceTools viceTools)
     {
         _viceTools = viceTools;
-        _commandMethods = BuildCommandMethodsMap();
     }
 
-    private Dictionary<string, MethodInfo> BuildCommandMethodsMap()
-    {
-        var methods = new Dictionary<string, MethodInfo>();
-        var type = typeof(ViceTools);
-        
-        foreach (var method in type.GetMethods(BindingFlags.Public | BindingFlags.Instance))
-        {
-            var mcpAttribute = method.GetCustomAttribute<McpServerToolAttribute>();
-            if (mcpAttribute != null && !string.IsNullOrEmpty(mcpAttribute.Name))
-            {
-                methods[mcpAttribute.Name] = method;
-            }
-        }
-        
-        return methods;
-    }
-
-    public async Task<BatchResponse> ExecuteBatchAsync(List<BatchCommandSpec> commands, bool failFast = true)
+    /// <summary>
+    /// Executes the batch following <see cref="BatchPlanner.Plan"/>. Results are reported per original command.
+    /// </summary>
+    /// <remarks>
+    /// Memory steps between two other commands are sent together, so with <paramref name="failFast"/> a memory
+    /// failure stops the batch only after the rest of its run was sent; those results are reported too.
+    /// </remarks>
+    public async Task<BatchResponse> ExecuteBatchAsync(List<BatchCommandSpec> commands, bool failFast = true,
+        CancellationToken ct = default)
     {
         var stopwatch = Stopwatch.StartNew();
+        var plan = BatchPlanner.Plan(commands);
         var response = new BatchResponse
         {
             TotalCommands = commands.Count,
+            PlannedCommands = plan.PlannedCommands,
             Results = new List<BatchResult>()
         };
+        var results = new BatchResult?[commands.Count];
 
-        for (int i = 0; i < commands.Count; i++)
+        int stepIndex = 0;
+        while (stepIndex < plan.Steps.Count)
         {
-            var command = commands[i];
-            var result = new BatchResult
+            var step = plan.Steps[stepIndex];
+            bool failed;
+            if (step.Kind == BatchStepKind.Passthrough)
             {
-                Command = command.Command,
-                Description = command.Description
-            };
-
-            try
+                int index = step.Members[0].Index;
+                var result = await ExecuteCommandAsync(commands[index], ct);
+                results[index] = result;
+                failed = !result.Success;
+                stepIndex++;
+            }
+            else
             {
-                if (!_commandMethods.TryGetValue(command.Command, out var method))
+                int end = stepIndex;
+                while (end < plan.Steps.Count && plan.Steps[end].Kind != BatchStepKind.Passthrough)
                 {
-                    throw new InvalidOperationException($"Unknown command: {command.Command}");
+                    end++;
                 }
-
-                var parameters = PrepareParameters(method, command.Parameters);
-                var task = (Task)method.Invoke(_viceTools, parameters)!;
-                await task;
-
-                // Get the result from the task
-                var resultProperty = task.GetType().GetProperty("Result");
-                if (resultProperty != null)
-                {
-                    result.Result = resultProperty.GetValue(task)?.ToString() ?? "";
-                }
-
-                result.Success = true;
-                response.SuccessfulCommands++;
+                failed = await ExecuteMemoryStepsAsync(commands, plan.Steps, stepIndex, end, results);
+                stepIndex = end;
             }
-            catch (Exception ex)
-            {
-                result.Success = false;
-                result.Error = ex.InnerException?.Message ?? ex.Message;
-                response.FailedCommands++;
 
-                if (failFast)
-                {
-                    response.Results.Add(result);
-                    break;
-                }
+            if (failed && failFast)
+            {
+                break;
             }
+        }
 
+        foreach (var result in results)
+        {
+            if (result == null)
+            {
+                continue;
+            }
             response.Results.Add(result);
+            if (result.Success)
+                response.SuccessfulCommands++;
+            else
+                response.FailedCommands++;
         }
 
         stopwatch.Stop();
@@ -93,88 +83,148 @@ public class BatchCommandBuilder
         return response;
     }
 
-    private object[] PrepareParameters(MethodInfo method, Dictionary<string, object> parameters)
+    private async Task<BatchResult> ExecuteCommandAsync(BatchCommandSpec command, CancellationToken ct)
     {
-        var parameterInfos = method.GetParameters();
-        var preparedParams = new object[parameterInfos.Length];
-
-        for (int i = 0; i < parameterInfos.Length; i++)
+        var result = new BatchResult
         {
-            var paramInfo = parameterInfos[i];
-            var paramName = paramInfo.Name!;
-            var paramType = paramInfo.ParameterType;
+            Command = command.Command,
+            Description = command.Description
+        };
 
-            if (parameters.TryGetValue(paramName, out var value))
-            {
-                preparedParams[i] = ConvertParameter(value, paramType);
-            }
-            else if (paramInfo.HasDefaultValue)
-            {
-                preparedParams[i] = paramInfo.DefaultValue!;
-            }
-            else
+        try
+        {
+            if (!BatchTools.All.TryGetValue(command.Command, out var tool))
             {
-                throw new ArgumentException($"Required parameter '{paramName}' not provided for command");
+                throw new InvalidOperationException($"Unknown command: {command.Command}");
             }
-        }
 
-        return preparedParams;
-    }
-
-    private object ConvertParameter(object value, Type targetType)
-    {
-        // Handle nullable types
-        if (targetType.IsGenericType && targetType.GetGenericTypeDefinition() == typeof(Nullable<>))
-        {
-            if (value == null)
-                return null!;
-            targetType = Nullable.GetUnderlyingType(targetType)!;
+            result.Result = await tool.Invoke(_viceTools, tool.Bind(command.Parameters), ct);
+            result.Success = true;
         }
-
-        // Handle JsonElement from JSON deserialization
-        if (value is JsonElement jsonElement)
+        catch (Exception ex)
         {
-            return ConvertJsonElement(jsonElement, targetType);
+            result.Success = false;
+            result.Error = ex.Message;
         }
 
-        // Direct conversion for compatible types
-        if (targetType.IsAssignableFrom(value.GetType()))
-        {
-            return value;
-        }
-
-        // Type conversion
-        return Convert.ChangeType(value, targetType);
+        return result;
     }
 
-    private object ConvertJsonElement(JsonElement element, Type targetType)
+    /// <summary>
+    /// Enqueues the memory steps in <paramref name="steps"/>[start..end) back to back, then collects their responses.
+    /// </summary>
+    /// <remarks>
+    /// A step naming an instance routes the rest of the batch to it, as the tool method would. A step that can't be
+    /// enqueued fails on its own, the steps already sent are still awaited.
+    /// </remarks>
+    /// <returns>True when any of them failed.</returns>
+    private async Task<bool> ExecuteMemoryStepsAsync(List<BatchCommandSpec> commands, IReadOnlyList<BatchStep> steps,
+        int start, int end, BatchResult?[] results)
     {
-        if (targetType == typeof(string))
-        {
-            return element.GetString() ?? "";
-        }
-        if (targetType == typeof(int))
-        {
-            return element.GetInt32();
-        }
-        if (targetType == typeof(bool))
+        var sent = new List<(BatchStep Step, IViceCommand? Command, string? Error)>(end - start);
+        for (int i = start; i < end; i++)
         {
-            return element.GetBoolean();
-        }
-        if (targetType == typeof(uint))
-        {
-            return element.GetUInt32();
-        }
-        if (targetType == typeof(long))
-        {
-            return element.GetInt64();
+            var step = steps[i];
+            IViceBridge bridge;
+            try
+            {
+                _viceTools.Route(step.Instance);
+                await _viceTools.Instance.EnsureBridgeStartedAsync();
+                bridge = _viceTools.Bridge;
+            }
+            catch (Exception ex)
+            {
+                sent.Add((step, null, ex.Message));
+                continue;
+            }
+
+            if (step.Kind == BatchStepKind.Read)
+            {
+                var command = new MemoryGetCommand(0, (ushort)step.Start, (ushort)step.End, MemSpace.MainMemory, 0);
+                try
+                {
+                    sent.Add((step, await bridge.EnqueueCommandAsync(command), null));
+                }
+                catch (Exception ex)
+                {
+                    sent.Add((step, null, ex.Message));
+                }
+            }
+            else
+            {
+                var buffer = BufferManager.GetBuffer((uint)step.Length);
+                step.Data!.CopyTo(buffer.Data, 0);
+                var command = new MemorySetCommand(0, (ushort)step.Start, MemSpace.MainMemory, 0, buffer);
+                try
+                {
+                    sent.Add((step, await bridge.EnqueueCommandAsync(command, resumeOnStopped: true), null));
+                }
+                catch (Exception ex)
+                {
+                    // Never queued, so nobody else releases its buffer
+                    command.Dispose();
+                    sent.Add((step, null, ex.Message));
+                }
+            }
         }
-        if (targetType == typeof(double))
+
+        bool failed = false;
+        foreach (var (step, command, routeError) in sent)
         {
-            return element.GetDouble();
+            string? error = routeError;
+            ManagedBuffer? memory = null;
+            try
+            {
+                switch (command)
+                {
+                    case MemoryGetCommand read:
+                        var readResult = await read.Response;
+                        if (!readResult.IsSuccess)
+                            error = $"Failed to read memory: {readResult.ErrorCode}";
+                        else if (readResult.Response?.Memory is not { } data)
+                            error = "No memory data returned";
+                        else
+                            memory = data;
+                        break;
+                    case MemorySetCommand write:
+                        using (write)
+                        {
+                            var writeResult = await write.Response;
+                            if (!writeResult.IsSuccess)
+                                error = $"Failed to write memory: {writeResult.ErrorCode}";
+                        }
+                        break;
+                }
+            }
+            catch (Exception ex)
+            {
+                error = ex.Message;
+            }
+
+            using (memory)
+            {
+                foreach (var member in step.Members)
+                {
+                    var spec = commands[member.Index];
+                    var result = new BatchResult
+                    {
+                        Command = spec.Command,
+                        Description = spec.Description,
+                        Success = error == null,
+                        Error = error,
+                    };
+                    if (error == null)
+                    {
+                        result.Result = member.Result
+                            ?? MemoryEncoder.Encode(memory!.Value.Span.Slice(member.Start - step.Start, member.Length),
+                                member.Encoding, member.Start);
+                    }
+                    results[member.Index] = result;
+                }
+            }
+            failed |= error != null;
         }
 
-        // For complex types, deserialize from JSON
-        return JsonSerializer.Deserialize(element.GetRawText(), targetType)!;
+        return failed;
     }
-}
\ No newline at end of file
+}
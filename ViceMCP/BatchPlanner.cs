@@ -0,0 +1,370 @@
+using System.Globalization;
+using System.Text.Json;
+
+namespace ViceMCP;
+
+/// <summary>
+/// What a planned batch step sends to VICE.
+/// </summary>
+public enum BatchStepKind
+{
+    /// <summary>
+    /// A single memory read serving one or more read_memory commands.
+    /// </summary>
+    Read,
+    /// <summary>
+    /// A single memory write merged from one or more write_memory/fill_memory commands.
+    /// </summary>
+    Write,
+    /// <summary>
+    /// Any other command, executed as is through its tool method.
+    /// </summary>
+    Passthrough,
+}
+
+/// <summary>
+/// Part of a planned step that belongs to one command of the original batch.
+/// </summary>
+/// <param name="Index">Index of the command in the original batch.</param>
+/// <param name="Start">First address the command touches.</param>
+/// <param name="Length">Number of bytes the command touches.</param>
+/// <param name="Result">Result text of a write command, null for reads and passthrough commands.</param>
+/// <param name="Encoding">Output encoding of a read command, see <see cref="MemoryEncoder"/>.</param>
+public record BatchStepMember(int Index, int Start, int Length, string? Result = null, string? Encoding = null);
+
+/// <summary>
+/// One command of a <see cref="BatchPlan"/>.
+/// </summary>
+public class BatchStep
+{
+    public BatchStepKind Kind { get; }
+    public int Start { get; internal set; }
+    public int End { get; internal set; }
+    /// <summary>
+    /// Bytes to write for <see cref="BatchStepKind.Write"/> steps.
+    /// </summary>
+    public byte[]? Data { get; internal set; }
+    /// <summary>
+    /// Pool instance memory steps go to, null for the instance the batch runs on.
+    /// </summary>
+    public int? Instance { get; internal set; }
+    public List<BatchStepMember> Members { get; } = new();
+    public int Length => End - Start + 1;
+
+    internal BatchStep(BatchStepKind kind, int start = 0, int end = 0)
+    {
+        Kind = kind;
+        Start = start;
+        End = end;
+    }
+
+    internal bool Overlaps(int start, int end) => start <= End && end >= Start;
+    internal bool Touches(int start, int end) => start <= End + 1 && end + 1 >= Start;
+}
+
+/// <summary>
+/// Result of <see cref="BatchPlanner.Plan"/>.
+/// </summary>
+public class BatchPlan
+{
+    public IReadOnlyList<BatchStep> Steps { get; }
+    public int OriginalCommands { get; }
+    public int PlannedCommands => Steps.Count;
+
+    internal BatchPlan(IReadOnlyList<BatchStep> steps, int originalCommands)
+    {
+        Steps = steps;
+        OriginalCommands = originalCommands;
+    }
+}
+
+/// <summary>
+/// Turns execute_batch commands into the minimal sequence of commands to send.
+/// </summary>
+/// <remarks>
+/// Runs of read_memory, write_memory and fill_memory between other commands are planned together:
+/// adjacent and overlapping writes merge into one write (last writer wins), overlapping and adjacent reads
+/// merge into one read, a read already answered by an earlier read with no write to its range in between
+/// is served from it, and reads that don't depend on pending writes are sent ahead of them back to back.
+/// Writes are sent in the order they were issued, a write merged into an earlier one never moves ahead of an I/O
+/// write when it is an I/O write itself, and I/O reads stay behind pending I/O writes. Writes that switch banks,
+/// the 6510 port at $0000-$0001 and the C128 MMU at $D500-$D50B and $FF00-$FF04, change what every other address
+/// holds, so they are barriers. Any other command, or a memory command whose parameters don't parse, is a barrier
+/// executed in order.
+/// Memory commands naming another instance than the previous one start a new run, nothing is merged across
+/// instances.
+/// </remarks>
+public static class BatchPlanner
+{
+    private static readonly char[] WriteSeparators = [' '];
+    private static readonly char[] FillSeparators = [' ', '-', ','];
+    private static readonly (int Start, int End)[] BankSwitchRanges = [(0x0000, 0x0001), (0xD500, 0xD50B), (0xFF00, 0xFF04)];
+
+    public static BatchPlan Plan(IReadOnlyList<BatchCommandSpec> commands)
+    {
+        var steps = new List<BatchStep>();
+        var pendingReads = new List<BatchStep>();
+        var pendingWrites = new List<BatchStep>();
+        // Reads already planned whose data is still current
+        var validReads = new List<BatchStep>();
+        int? runInstance = null;
+
+        void Flush()
+        {
+            steps.AddRange(pendingReads);
+            steps.AddRange(pendingWrites);
+            pendingReads.Clear();
+            pendingWrites.Clear();
+        }
+
+        // Memory of another instance is unrelated, switching instances ends the run
+        void SwitchTo(int? instance)
+        {
+            if (instance != runInstance)
+            {
+                Flush();
+                validReads.Clear();
+                runInstance = instance;
+            }
+        }
+
+        for (int i = 0; i < commands.Count; i++)
+        {
+            var command = commands[i];
+            bool routable = TryGetInstance(command.Parameters, out var instance);
+            if (routable && TryParseRead(command, out int readStart, out int readEnd, out var encoding))
+            {
+                SwitchTo(instance);
+                if (pendingWrites.Any(w => w.Overlaps(readStart, readEnd))
+                    || (IsIo(readStart, readEnd) && pendingWrites.Any(w => IsIo(w.Start, w.End))))
+                {
+                    Flush();
+                }
+                var member = new BatchStepMember(i, readStart, readEnd - readStart + 1, Encoding: encoding);
+                var cached = validReads.FirstOrDefault(r => r.Start <= readStart && r.End >= readEnd);
+                if (cached != null)
+                {
+                    cached.Members.Add(member);
+                    continue;
+                }
+
+                var read = new BatchStep(BatchStepKind.Read, readStart, readEnd) { Instance = instance };
+                read.Members.Add(member);
+                foreach (var touching in pendingReads.Where(r => r.Touches(read.Start, read.End)).ToList())
+                {
+                    read.Start = Math.Min(read.Start, touching.Start);
+                    read.End = Math.Max(read.End, touching.End);
+                    read.Members.AddRange(touching.Members);
+                    pendingReads.Remove(touching);
+                    validReads.Remove(touching);
+                }
+                pendingReads.Add(read);
+                validReads.Add(read);
+            }
+            else if (routable && TryParseWrite(command, i, out var write))
+            {
+                SwitchTo(instance);
+                write.Instance = instance;
+                if (BankSwitchRanges.Any(r => write.Overlaps(r.Start, r.End)))
+                {
+                    Flush();
+                    validReads.Clear();
+                    steps.Add(write);
+                    continue;
+                }
+                if (pendingReads.Any(r => r.Overlaps(write.Start, write.End)))
+                {
+                    Flush();
+                }
+                validReads.RemoveAll(r => r.Overlaps(write.Start, write.End));
+                MergeWrite(pendingWrites, write);
+            }
+            else
+            {
+                Flush();
+                validReads.Clear();
+                var passthrough = new BatchStep(BatchStepKind.Passthrough);
+                passthrough.Members.Add(new BatchStepMember(i, 0, 0));
+                steps.Add(passthrough);
+            }
+        }
+        Flush();
+
+        return new BatchPlan(steps, commands.Count);
+    }
+
+    /// <summary>
+    /// Merges a write into the pending writes it overlaps or touches, in place of the first of them. Its bytes are
+    /// applied last.
+    /// </summary>
+    /// <remarks>
+    /// The merged write goes ahead of the pending writes between, when that would reorder I/O writes the write is
+    /// queued on its own instead.
+    /// </remarks>
+    private static void MergeWrite(List<BatchStep> pendingWrites, BatchStep write)
+    {
+        var touching = pendingWrites.Where(w => w.Touches(write.Start, write.End)).ToList();
+        int position = touching.Count > 0 ? pendingWrites.IndexOf(touching[0]) : -1;
+        bool reordersIo = position >= 0
+            && touching.Skip(1).Append(write).Any(w => IsIo(w.Start, w.End))
+            && pendingWrites.Skip(position).Except(touching).Any(w => IsIo(w.Start, w.End));
+        if (touching.Count == 0 || reordersIo)
+        {
+            pendingWrites.Add(write);
+            return;
+        }
+
+        int start = Math.Min(write.Start, touching.Min(w => w.Start));
+        int end = Math.Max(write.End, touching.Max(w => w.End));
+        var merged = new BatchStep(BatchStepKind.Write, start, end) { Data = new byte[end - start + 1], Instance = write.Instance };
+        foreach (var previous in touching)
+        {
+            previous.Data!.CopyTo(merged.Data, previous.Start - start);
+            merged.Members.AddRange(previous.Members);
+            pendingWrites.Remove(previous);
+        }
+        write.Data!.CopyTo(merged.Data, write.Start - start);
+        merged.Members.AddRange(write.Members);
+        pendingWrites.Insert(position, merged);
+    }
+
+    private static bool IsIo(int start, int end) => start <= 0xDFFF && end >= 0xD000;
+
+    private static bool TryParseRead(BatchCommandSpec command, out int start, out int end, out string? encoding)
+    {
+        start = end = 0;
+        encoding = null;
+        if (command.Parameters.ContainsKey("encoding"))
+        {
+            // An unsupported encoding is left to the tool method so the error is reported as usual
+            if (!TryGetString(command.Parameters, "encoding", out var name) || !MemoryEncoder.IsSupported(name))
+            {
+                return false;
+            }
+            encoding = name;
+        }
+        return command.Command == "read_memory"
+            && TryGetAddress(command.Parameters, "startHex", out start)
+            && TryGetAddress(command.Parameters, "endHex", out end)
+            && end >= start;
+    }
+
+    private static bool TryParseWrite(BatchCommandSpec command, int index, out BatchStep write)
+    {
+        write = null!;
+        byte[]? data;
+        string result;
+        if (!TryGetAddress(command.Parameters, "startHex", out int start))
+        {
+            return false;
+        }
+
+        switch (command.Command)
+        {
+            case "write_memory":
+                if (!TryGetBytes(command.Parameters, "dataHex", WriteSeparators, out data))
+                {
+                    return false;
+                }
+                result = $"Wrote {data.Length} bytes to ${start:X4}";
+                break;
+            case "fill_memory":
+                if (!TryGetAddress(command.Parameters, "endHex", out int end) || end < start
+                    || !TryGetBytes(command.Parameters, "pattern", FillSeparators, out var pattern))
+                {
+                    return false;
+                }
+                data = new byte[end - start + 1];
+                for (int i = 0; i < data.Length; i++)
+                {
+                    data[i] = pattern[i % pattern.Length];
+                }
+                result = $"Filled ${start:X4}-${end:X4} with pattern {string.Join(" ", pattern.Select(b => $"{b:X2}"))}";
+                break;
+            default:
+                return false;
+        }
+
+        if (start + data.Length - 1 > ushort.MaxValue)
+        {
+            return false;
+        }
+        write = new BatchStep(BatchStepKind.Write, start, start + data.Length - 1) { Data = data };
+        write.Members.Add(new BatchStepMember(index, start, data.Length, result));
+        return true;
+    }
+
+    private static bool TryGetString(Dictionary<string, object> parameters, string name, out string value)
+    {
+        value = parameters.TryGetValue(name, out var raw) switch
+        {
+            true when raw is string text => text,
+            true when raw is JsonElement { ValueKind: JsonValueKind.String } element => element.GetString()!,
+            _ => null!,
+        };
+        return value != null;
+    }
+
+    /// <summary>
+    /// Reads the optional instance parameter. A value that isn't a plain number is left to the tool method.
+    /// </summary>
+    private static bool TryGetInstance(Dictionary<string, object> parameters, out int? instance)
+    {
+        instance = null;
+        if (!parameters.TryGetValue("instance", out var raw))
+        {
+            return true;
+        }
+        switch (raw)
+        {
+            case null:
+            case JsonElement { ValueKind: JsonValueKind.Null }:
+                return true;
+            case int value:
+                instance = value;
+                return true;
+            case JsonElement { ValueKind: JsonValueKind.Number } element when element.TryGetInt32(out var value):
+                instance = value;
+                return true;
+            default:
+                return false;
+        }
+    }
+
+    private static bool TryGetAddress(Dictionary<string, object> parameters, string name, out int address)
+    {
+        address = 0;
+        if (!TryGetString(parameters, name, out var hex))
+        {
+            return false;
+        }
+        if (hex.StartsWith("0x", StringComparison.OrdinalIgnoreCase))
+            hex = hex.Substring(2);
+        if (!ushort.TryParse(hex, NumberStyles.AllowHexSpecifier, CultureInfo.InvariantCulture, out var value))
+        {
+            return false;
+        }
+        address = value;
+        return true;
+    }
+
+    private static bool TryGetBytes(Dictionary<string, object> parameters, string name, char[] separators,
+        out byte[] bytes)
+    {
+        bytes = [];
+        if (!TryGetString(parameters, name, out var text))
+        {
+            return false;
+        }
+        var parts = text.Split(separators, StringSplitOptions.RemoveEmptyEntries);
+        bytes = new byte[parts.Length];
+        for (int i = 0; i < parts.Length; i++)
+        {
+            if (!byte.TryParse(parts[i], NumberStyles.AllowHexSpecifier, CultureInfo.InvariantCulture, out bytes[i]))
+            {
+                return false;
+            }
+        }
+        return bytes.Length > 0;
+    }
+}
@@ -0,0 +1,212 @@
+using System.Collections.Frozen;
+using System.Collections.Immutable;
+using System.Globalization;
+using System.Text.Json;
+
+namespace ViceMCP;
+
+/// <summary>
+/// Typed invokers of the tools a batch can run, keyed by their <c>McpServerTool</c> name.
+/// </summary>
+/// <remarks>
+/// Spelled out instead of discovered with reflection: a batch command is a dictionary lookup and a direct call, with
+/// no <c>MethodInfo.Invoke</c> or boxed <c>Task.Result</c>, and nothing here stands in the way of trimming or
+/// Native AOT. The parameter lists mirror the tool signatures, <c>BatchToolsTests</c> checks them against the
+/// attributes so a tool added to <see cref="ViceTools"/> without an entry here fails the tests.
+/// </remarks>
+internal static class BatchTools
+{
+    private static readonly BatchParameter Instance = BatchParameter.Optional("instance", null);
+
+    public static readonly FrozenDictionary<string, BatchTool> All = new BatchTool[]
+    {
+        new("read_memory", [BatchParameter.Required("startHex"), BatchParameter.Required("endHex"), BatchParameter.Optional("encoding", MemoryEncoder.Hex), Instance],
+            (t, a, ct) => t.ReadMemory(a.String(0), a.String(1), a.String(2), a.NullableInt(3), ct)),
+        new("write_memory", [BatchParameter.Required("startHex"), BatchParameter.Required("dataHex"), Instance],
+            (t, a, _) => t.WriteMemory(a.String(0), a.String(1), a.NullableInt(2))),
+        new("get_registers", [Instance],
+            (t, a, _) => t.GetRegisters(a.NullableInt(0))),
+        new("get_machine_state", [BatchParameter.Optional("includeScreen", true), Instance],
+            (t, a, ct) => t.GetMachineState(a.Bool(0), a.NullableInt(1), ct)),
+        new("set_register", [BatchParameter.Required("registerName"), BatchParameter.Required("valueHex"), Instance],
+            (t, a, _) => t.SetRegister(a.String(0), a.String(1), a.NullableInt(2))),
+        new("step", [BatchParameter.Optional("count", 1), BatchParameter.Optional("stepOver", false), Instance],
+            (t, a, _) => t.Step(a.Int(0), a.Bool(1), a.NullableInt(2))),
+        new("trace", [BatchParameter.Optional("count", 1000), BatchParameter.Optional("stopAt", null), BatchParameter.Optional("condition", null),
+                BatchParameter.Optional("stepOver", false), BatchParameter.Optional("filePath", null), Instance],
+            (t, a, ct) => t.Trace(a.Int(0), a.NullableString(1), a.NullableString(2), a.Bool(3), a.NullableString(4), a.NullableInt(5), ct)),
+        new("continue_execution", [Instance],
+            (t, a, _) => t.ContinueExecution(a.NullableInt(0))),
+        new("reset", [BatchParameter.Optional("mode", "soft"), Instance],
+            (t, a, _) => t.Reset(a.String(0), a.NullableInt(1))),
+        new("get_info", [Instance],
+            (t, a, _) => t.GetInfo(a.NullableInt(0))),
+        new("ping", [Instance],
+            (t, a, _) => t.Ping(a.NullableInt(0))),
+        new("get_memory_cache_stats", [BatchParameter.Optional("reset", false), Instance],
+            (t, a, _) => t.GetMemoryCacheStats(a.Bool(0), a.NullableInt(1))),
+        new("get_performance_stats", [BatchParameter.Optional("reset", false), BatchParameter.Optional("slowest", 5), Instance],
+            (t, a, _) => t.GetPerformanceStats(a.Bool(0), a.Int(1), a.NullableInt(2))),
+        new("export_message_history", [BatchParameter.Required("filePath"), BatchParameter.Optional("format", "ndjson"), Instance],
+            (t, a, _) => t.ExportMessageHistory(a.String(0), a.String(1), a.NullableInt(2))),
+        new("get_banks", [Instance],
+            (t, a, _) => t.GetBanks(a.NullableInt(0))),
+        new("set_checkpoint", [BatchParameter.Required("startHex"), BatchParameter.Optional("endHex", null), BatchParameter.Optional("stopWhenHit", true),
+                BatchParameter.Optional("enabled", true), Instance],
+            (t, a, _) => t.SetCheckpoint(a.String(0), a.NullableString(1), a.Bool(2), a.Bool(3), a.NullableInt(4))),
+        new("list_checkpoints", [Instance],
+            (t, a, _) => t.ListCheckpoints(a.NullableInt(0))),
+        new("delete_checkpoint", [BatchParameter.Required("checkpointNumber"), Instance],
+            (t, a, _) => t.DeleteCheckpoint(a.UInt(0), a.NullableInt(1))),
+        new("toggle_checkpoint", [BatchParameter.Required("checkpointNumber"), BatchParameter.Required("enabled"), Instance],
+            (t, a, _) => t.ToggleCheckpoint(a.UInt(0), a.Bool(1), a.NullableInt(2))),
+        new("get_display", [BatchParameter.Optional("useVic", true), BatchParameter.Optional("crop", false), BatchParameter.Optional("scale", 1),
+                BatchParameter.Optional("diff", false), BatchParameter.Optional("frames", 1), BatchParameter.Optional("intervalMs", 20),
+                BatchParameter.Optional("filePath", null), Instance],
+            (t, a, _) => t.GetDisplay(a.Bool(0), a.Bool(1), a.Int(2), a.Bool(3), a.Int(4), a.Int(5), a.NullableString(6), a.NullableInt(7))),
+        new("quit_vice", [Instance],
+            (t, a, _) => t.QuitVice(a.NullableInt(0))),
+        new("start_vice", [BatchParameter.Optional("emulatorType", "x64sc"), BatchParameter.Optional("arguments", null), Instance],
+            (t, a, _) => t.StartVice(a.String(0), a.NullableString(1), a.NullableInt(2))),
+        new("start_vice_pool", [BatchParameter.Optional("count", 2), BatchParameter.Optional("emulatorType", "x64sc"), BatchParameter.Optional("arguments", null)],
+            (t, a, _) => t.StartVicePool(a.Int(0), a.String(1), a.NullableString(2))),
+        new("lease_instance", [BatchParameter.Required("owner"), BatchParameter.Optional("emulatorType", "x64sc"), BatchParameter.Optional("arguments", null)],
+            (t, a, _) => t.LeaseInstance(a.String(0), a.String(1), a.NullableString(2))),
+        new("release_instance", [BatchParameter.Required("instance"), BatchParameter.Optional("owner", null), BatchParameter.Optional("quit", false)],
+            (t, a, _) => t.ReleaseInstance(a.Int(0), a.NullableString(1), a.Bool(2))),
+        new("select_instance", [BatchParameter.Required("instance")],
+            (t, a, _) => t.SelectInstance(a.Int(0))),
+        new("list_instances", [],
+            (t, _, _) => t.ListInstances()),
+        new("copy_memory", [BatchParameter.Required("sourceHex"), BatchParameter.Required("destHex"), BatchParameter.Required("length"), Instance],
+            (t, a, _) => t.CopyMemory(a.String(0), a.String(1), a.Int(2), a.NullableInt(3))),
+        new("fill_memory", [BatchParameter.Required("startHex"), BatchParameter.Required("endHex"), BatchParameter.Required("pattern"), Instance],
+            (t, a, _) => t.FillMemory(a.String(0), a.String(1), a.String(2), a.NullableInt(3))),
+        new("search_memory", [BatchParameter.Required("startHex"), BatchParameter.Required("endHex"), BatchParameter.Required("pattern"),
+                BatchParameter.Optional("maxResults", 10), BatchParameter.Optional("memspace", "main"), BatchParameter.Optional("bank", "0"), Instance],
+            (t, a, ct) => t.SearchMemory(a.String(0), a.String(1), a.String(2), a.Int(3), a.String(4), a.String(5), a.NullableInt(6), ct)),
+        new("disassemble", [BatchParameter.Required("startHex"), BatchParameter.Optional("endHex", null),
+                BatchParameter.Optional("cpu", "6502"), BatchParameter.Optional("showCheckpoints", true), Instance],
+            (t, a, ct) => t.Disassemble(a.String(0), a.NullableString(1), a.String(2), a.Bool(3), a.NullableInt(4), ct)),
+        new("send_keys", [BatchParameter.Required("keys"), Instance],
+            (t, a, ct) => t.SendKeys(a.String(0), a.NullableInt(1), ct)),
+        new("compare_memory", [BatchParameter.Required("addr1Hex"), BatchParameter.Required("addr2Hex"), BatchParameter.Required("length"), Instance],
+            (t, a, _) => t.CompareMemory(a.String(0), a.String(1), a.Int(2), a.NullableInt(3))),
+        new("load_program", [BatchParameter.Required("filePath"), BatchParameter.Optional("addressHex", null),
+                BatchParameter.Optional("force", false), BatchParameter.Optional("watch", false), Instance],
+            (t, a, ct) => t.LoadProgram(a.String(0), a.NullableString(1), a.Bool(2), a.Bool(3), a.NullableInt(4), ct)),
+        new("save_memory", [BatchParameter.Required("startHex"), BatchParameter.Required("endHex"), BatchParameter.Required("filePath"),
+                BatchParameter.Optional("asPrg", true), BatchParameter.Optional("encoding", "binary"), Instance],
+            (t, a, ct) => t.SaveMemory(a.String(0), a.String(1), a.String(2), a.Bool(3), a.String(4), a.NullableInt(5), ct)),
+        new("snapshot_save", [BatchParameter.Required("name"), BatchParameter.Optional("memoryOnly", false), Instance],
+            (t, a, ct) => t.SnapshotSave(a.String(0), a.Bool(1), a.NullableInt(2), ct)),
+        new("snapshot_restore", [BatchParameter.Required("name"), Instance],
+            (t, a, ct) => t.SnapshotRestore(a.String(0), a.NullableInt(1), ct)),
+        new("list_snapshots", [],
+            (t, _, _) => Task.FromResult(t.ListSnapshots())),
+        new("watch_memory", [BatchParameter.Required("ranges"), BatchParameter.Optional("intervalMs", 100), BatchParameter.Optional("onStop", false),
+                BatchParameter.Optional("capacity", MemoryWatch.DefaultCapacity), Instance],
+            (t, a, _) => t.WatchMemory(a.String(0), a.Int(1), a.Bool(2), a.Int(3), a.NullableInt(4))),
+        new("poll_memory_watch", [BatchParameter.Required("id"), BatchParameter.Optional("max", 200)],
+            (t, a, _) => Task.FromResult(t.PollMemoryWatch(a.Int(0), a.Int(1)))),
+        new("stop_memory_watch", [BatchParameter.Required("id")],
+            (t, a, _) => t.StopMemoryWatch(a.Int(0))),
+        new("execute_batch", [BatchParameter.Required("commandsJson"), BatchParameter.Optional("failFast", true), Instance],
+            (t, a, ct) => t.ExecuteBatch(a.String(0), a.Bool(1), a.NullableInt(2), ct)),
+    }.ToFrozenDictionary(t => t.Name);
+}
+
+/// <summary>
+/// A tool a batch can run.
+/// </summary>
+/// <param name="Name">Tool name.</param>
+/// <param name="Parameters">Parameters in the order of the tool method, without its cancellation token.</param>
+/// <param name="Invoke">Calls the tool with bound arguments.</param>
+internal sealed record BatchTool(string Name, ImmutableArray<BatchParameter> Parameters,
+    Func<ViceTools, BatchArguments, CancellationToken, Task<string>> Invoke)
+{
+    /// <summary>
+    /// Binds the parameters of a batch command, filling in defaults. Unknown parameters are ignored.
+    /// </summary>
+    /// <exception cref="ArgumentException">Thrown when a required parameter is missing.</exception>
+    public BatchArguments Bind(Dictionary<string, object> parameters)
+    {
+        var values = new object?[Parameters.Length];
+        for (int i = 0; i < values.Length; i++)
+        {
+            var parameter = Parameters[i];
+            if (parameters.TryGetValue(parameter.Name, out var value))
+            {
+                values[i] = value;
+            }
+            else if (parameter.IsRequired)
+            {
+                throw new ArgumentException($"Required parameter '{parameter.Name}' not provided for command");
+            }
+            else
+            {
+                values[i] = parameter.DefaultValue;
+            }
+        }
+        return new BatchArguments(Parameters, values);
+    }
+}
+
+/// <summary>
+/// A tool parameter, named as in the tool method.
+/// </summary>
+internal readonly record struct BatchParameter(string Name, bool IsRequired, object? DefaultValue)
+{
+    public static BatchParameter Required(string name) => new(name, true, null);
+    public static BatchParameter Optional(string name, object? defaultValue) => new(name, false, defaultValue);
+}
+
+/// <summary>
+/// Bound arguments of a batch command, read by parameter index. Values come from the batch JSON as
+/// <see cref="JsonElement"/>, or are defaults or values of a spec built in code.
+/// </summary>
+internal readonly struct BatchArguments
+{
+    private readonly ImmutableArray<BatchParameter> _parameters;
+    private readonly object?[] _values;
+
+    public BatchArguments(ImmutableArray<BatchParameter> parameters, object?[] values)
+    {
+        _parameters = parameters;
+        _values = values;
+    }
+
+    public string String(int index) => NullableString(index) ?? "";
+
+    public string? NullableString(int index) => _values[index] switch
+    {
+        null or JsonElement { ValueKind: JsonValueKind.Null } => null,
+        JsonElement element => element.GetString(),
+        var value => Convert.ToString(value, CultureInfo.InvariantCulture),
+    };
+
+    public int Int(int index) => NullableInt(index) ?? throw NullArgument(index);
+
+    public int? NullableInt(int index) => _values[index] switch
+    {
+        null or JsonElement { ValueKind: JsonValueKind.Null } => null,
+        JsonElement element => element.GetInt32(),
+        var value => Convert.ToInt32(value, CultureInfo.InvariantCulture),
+    };
+
+    public uint UInt(int index) => _values[index] switch
+    {
+        null or JsonElement { ValueKind: JsonValueKind.Null } => throw NullArgument(index),
+        JsonElement element => element.GetUInt32(),
+        var value => Convert.ToUInt32(value, CultureInfo.InvariantCulture),
+    };
+
+    public bool Bool(int index) => _values[index] switch
+    {
+        null or JsonElement { ValueKind: JsonValueKind.Null } => throw NullArgument(index),
+        JsonElement element => element.GetBoolean(),
+        var value => Convert.ToBoolean(value, CultureInfo.InvariantCulture),
+    };
+
+    private ArgumentException NullArgument(int index) => new($"Parameter '{_parameters[index].Name}' must not be null");
+}
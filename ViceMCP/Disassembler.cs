@@ -0,0 +1,206 @@
+using System.Buffers.Binary;
+using System.Collections.Immutable;
+using System.Security.Cryptography;
+
+namespace ViceMCP;
+
+/// <summary>
+/// Decodes machine code with the tables of <see cref="Mos6502"/>, remembering what it decoded per 256 byte page.
+/// </summary>
+/// <remarks>
+/// A page is decoded from the offset where the previous page's last instruction ended, and may end with an
+/// instruction reaching up to two bytes into the next page. Decoded pages are keyed by CPU, address, entry offset
+/// and a hash of the bytes they were decoded from, so paging through unchanged code never decodes it twice, while
+/// changed code gets a new key. The least recently used pages are dropped beyond <see cref="Capacity"/>.
+/// </remarks>
+/// <threadsafety>Class is thread safe.</threadsafety>
+public sealed class Disassembler
+{
+    public const int PageSize = 256;
+    /// <summary>
+    /// Default number of decoded pages kept.
+    /// </summary>
+    public const int DefaultCapacity = 1024;
+    // Longest instruction minus its opcode, how far a page's last instruction can reach into the next page
+    private const int MaxOperandLength = 2;
+
+    private readonly Dictionary<PageKey, LinkedListNode<(PageKey Key, DecodedPage Page)>> _pages = new();
+    private readonly LinkedList<(PageKey Key, DecodedPage Page)> _lru = new();
+    private readonly object _lock = new();
+    private long _hits;
+    private long _misses;
+
+    public Disassembler(int capacity = DefaultCapacity)
+    {
+        if (capacity < 1)
+        {
+            throw new ArgumentException("Capacity must be at least 1");
+        }
+        Capacity = capacity;
+    }
+
+    public int Capacity { get; }
+    /// <summary>
+    /// Pages served without decoding.
+    /// </summary>
+    public long Hits => Interlocked.Read(ref _hits);
+    public long Misses => Interlocked.Read(ref _misses);
+
+    public int Count
+    {
+        get
+        {
+            lock (_lock)
+            {
+                return _pages.Count;
+            }
+        }
+    }
+
+    /// <summary>
+    /// Decodes the instructions starting from <paramref name="start"/> up to <paramref name="end"/>.
+    /// </summary>
+    /// <param name="start">Address of the first instruction.</param>
+    /// <param name="end">Last address an instruction may start at.</param>
+    /// <param name="memory">Memory from <paramref name="start"/> on. To decode every page from the cache it
+    /// reaches to the end of <paramref name="end"/>'s page plus two bytes, or to $FFFF.</param>
+    /// <param name="cpu">Opcode table to decode with.</param>
+    /// <exception cref="ArgumentException">Thrown when <paramref name="memory"/> doesn't reach <paramref name="end"/>.</exception>
+    public Disassembly Disassemble(ushort start, ushort end, ReadOnlySpan<byte> memory, CpuVariant cpu = CpuVariant.Nmos6502)
+    {
+        if (end < start || memory.Length < end - start + 1)
+        {
+            throw new ArgumentException($"Memory for ${start:X4}-${end:X4} is required");
+        }
+
+        var instructions = ImmutableArray.CreateBuilder<DisassembledInstruction>();
+        int pages = 0;
+        int cached = 0;
+        int address = start;
+        while (address <= end)
+        {
+            int pageStart = address & ~(PageSize - 1);
+            // Bytes a page can be decoded from, a partial page at the end of the read is decoded but not kept
+            int available = Math.Min(memory.Length - (address - start), pageStart + PageSize + MaxOperandLength - address);
+            var bytes = memory.Slice(address - start, available);
+            bool complete = available == pageStart + PageSize + MaxOperandLength - address || address + available > 0xFFFF;
+
+            bool hit = false;
+            var page = complete ? GetOrDecode(new PageKey(cpu, (ushort)address, Hash(bytes)), bytes, out hit) : Decode(cpu, (ushort)address, bytes);
+            pages++;
+            if (hit)
+            {
+                cached++;
+            }
+            foreach (var instruction in page.Instructions)
+            {
+                if (instruction.Address > end)
+                {
+                    break;
+                }
+                instructions.Add(instruction);
+            }
+            if (page.Next <= address)
+            {
+                break;
+            }
+            address = page.Next;
+        }
+        return new Disassembly(instructions.ToImmutable(), pages, cached);
+    }
+
+    private DecodedPage GetOrDecode(PageKey key, ReadOnlySpan<byte> bytes, out bool hit)
+    {
+        lock (_lock)
+        {
+            if (_pages.TryGetValue(key, out var node))
+            {
+                _lru.Remove(node);
+                _lru.AddFirst(node);
+                Interlocked.Increment(ref _hits);
+                hit = true;
+                return node.Value.Page;
+            }
+        }
+
+        Interlocked.Increment(ref _misses);
+        hit = false;
+        var page = Decode(key.Cpu, key.Address, bytes);
+        lock (_lock)
+        {
+            if (!_pages.ContainsKey(key))
+            {
+                _pages[key] = _lru.AddFirst((key, page));
+                if (_pages.Count > Capacity)
+                {
+                    _pages.Remove(_lru.Last!.Value.Key);
+                    _lru.RemoveLast();
+                }
+            }
+        }
+        return page;
+    }
+
+    /// <summary>
+    /// Decodes the instructions starting in the page of <paramref name="address"/>, from <paramref name="address"/> on.
+    /// </summary>
+    private static DecodedPage Decode(CpuVariant cpu, ushort address, ReadOnlySpan<byte> bytes)
+    {
+        int pageEnd = (address & ~(PageSize - 1)) + PageSize;
+        var instructions = ImmutableArray.CreateBuilder<DisassembledInstruction>();
+        int offset = 0;
+        while (address + offset < pageEnd && offset < bytes.Length)
+        {
+            var pc = (ushort)(address + offset);
+            byte opcode = bytes[offset];
+            var info = Mos6502.Decode(opcode, cpu);
+            if (offset + info.Length > bytes.Length)
+            {
+                // Operand beyond the bytes read, or beyond $FFFF
+                instructions.Add(new DisassembledInstruction(pc, [opcode], $".BYTE ${opcode:X2}", false));
+                offset++;
+                continue;
+            }
+            byte low = info.Length > 1 ? bytes[offset + 1] : (byte)0;
+            byte high = info.Length > 2 ? bytes[offset + 2] : (byte)0;
+            instructions.Add(new DisassembledInstruction(pc, bytes.Slice(offset, info.Length).ToImmutableArray(),
+                Mos6502.Format(pc, opcode, low, high, cpu), info.Illegal));
+            offset += info.Length;
+        }
+        return new DecodedPage(instructions.ToImmutable(), address + offset);
+    }
+
+    private static UInt128 Hash(ReadOnlySpan<byte> bytes)
+    {
+        Span<byte> hash = stackalloc byte[SHA256.HashSizeInBytes];
+        SHA256.HashData(bytes, hash);
+        return BinaryPrimitives.ReadUInt128LittleEndian(hash);
+    }
+
+    /// <summary>
+    /// Identifies a decoded page: the CPU, the address decoding started at and the bytes it saw.
+    /// </summary>
+    private readonly record struct PageKey(CpuVariant Cpu, ushort Address, UInt128 Hash);
+
+    /// <summary>
+    /// Instructions starting in one page and the address after the last of them.
+    /// </summary>
+    private sealed record DecodedPage(ImmutableArray<DisassembledInstruction> Instructions, int Next);
+}
+
+/// <summary>
+/// A decoded instruction.
+/// </summary>
+/// <param name="Address">Address of the opcode.</param>
+/// <param name="Bytes">Opcode and operand bytes.</param>
+/// <param name="Text">Instruction in the syntax of VICE's monitor.</param>
+/// <param name="Illegal">Whether the opcode is undocumented.</param>
+public sealed record DisassembledInstruction(ushort Address, ImmutableArray<byte> Bytes, string Text, bool Illegal);
+
+/// <summary>
+/// Outcome of <see cref="Disassembler.Disassemble"/>.
+/// </summary>
+/// <param name="Instructions">Decoded instructions in address order.</param>
+/// <param name="Pages">Pages the instructions start in.</param>
+/// <param name="CachedPages">Pages served without decoding.</param>
+public sealed record Disassembly(ImmutableArray<DisassembledInstruction> Instructions, int Pages, int CachedPages);
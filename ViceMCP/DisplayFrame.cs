@@ -0,0 +1,143 @@
+using ViceMCP.ViceBridge;
+using ViceMCP.ViceBridge.Responses;
+
+namespace ViceMCP;
+
+/// <summary>
+/// Indexed pixels of one display capture after cropping and downscaling, in a pooled buffer.
+/// </summary>
+/// <remarks>
+/// Frames of the same size can be compared tile by tile, see <see cref="ChangedTiles"/>.
+/// </remarks>
+public sealed class DisplayFrame : IDisposable
+{
+    /// <summary>
+    /// Tile edge in output pixels for <see cref="ChangedTiles"/>, one character cell at scale 1.
+    /// </summary>
+    public const int TileSize = 8;
+
+    private readonly ManagedBuffer _pixels;
+
+    private DisplayFrame(int width, int height, ManagedBuffer pixels)
+    {
+        Width = width;
+        Height = height;
+        _pixels = pixels;
+    }
+
+    public int Width { get; }
+    public int Height { get; }
+    public ReadOnlySpan<byte> Pixels => _pixels.Data.AsSpan(0, Width * Height);
+
+    /// <summary>
+    /// Builds a frame from a capture.
+    /// </summary>
+    /// <param name="response">Indexed 8 bpp capture.</param>
+    /// <param name="crop">Keep only the inner area, without the border.</param>
+    /// <param name="scale">Keep every <paramref name="scale"/>th pixel of every <paramref name="scale"/>th row.</param>
+    /// <exception cref="ArgumentException">Thrown when <paramref name="scale"/> is outside 1-8.</exception>
+    /// <exception cref="InvalidOperationException">Thrown when the capture is not 8 bpp.</exception>
+    public static DisplayFrame From(DisplayGetResponse response, bool crop, int scale)
+    {
+        if (scale is < 1 or > 8)
+        {
+            throw new ArgumentException("Scale must be between 1 and 8");
+        }
+        if (response.BitsPerPixel != 8)
+        {
+            throw new InvalidOperationException($"Unsupported display format: {response.BitsPerPixel} bpp");
+        }
+
+        int sourceWidth = response.DebugWidth;
+        int left = 0, top = 0, width = response.DebugWidth, height = response.DebugHeight;
+        if (crop)
+        {
+            left = response.DebugOffsetX;
+            top = response.DebugOffsetY;
+            width = Math.Min(response.InnerWidth, sourceWidth - left);
+            height = Math.Min(response.InnerHeight, response.DebugHeight - top);
+        }
+        int outWidth = Math.Max(1, width / scale);
+        int outHeight = Math.Max(1, height / scale);
+
+        // A capture shorter than its header promises leaves the missing rows at colour 0
+        var source = response.Image is { } image ? image.Span : ReadOnlySpan<byte>.Empty;
+        var pixels = BufferManager.GetBuffer((uint)(outWidth * outHeight));
+        var target = pixels.Data.AsSpan(0, outWidth * outHeight);
+        target.Clear();
+        for (int y = 0; y < outHeight; y++)
+        {
+            int rowStart = (top + y * scale) * sourceWidth + left;
+            var row = target.Slice(y * outWidth, outWidth);
+            if (scale == 1)
+            {
+                int available = Math.Clamp(source.Length - rowStart, 0, outWidth);
+                source.Slice(Math.Min(rowStart, source.Length), available).CopyTo(row);
+                continue;
+            }
+            for (int x = 0; x < outWidth; x++)
+            {
+                int index = rowStart + x * scale;
+                if (index < source.Length)
+                {
+                    row[x] = source[index];
+                }
+            }
+        }
+        return new DisplayFrame(outWidth, outHeight, pixels);
+    }
+
+    /// <summary>
+    /// Encodes the whole frame as a PNG.
+    /// </summary>
+    public byte[] ToPng() => PngEncoder.EncodeIndexed(Pixels, Width, Height, Width);
+
+    /// <summary>
+    /// Encodes a rectangle of the frame as a PNG.
+    /// </summary>
+    public byte[] ToPng(int x, int y, int width, int height) =>
+        PngEncoder.EncodeIndexed(Pixels[(y * Width + x)..], width, height, Width);
+
+    /// <summary>
+    /// Tells whether <paramref name="other"/> has the same size, so the two can be diffed.
+    /// </summary>
+    public bool IsComparableTo(DisplayFrame? other) => other != null && other.Width == Width && other.Height == Height;
+
+    /// <summary>
+    /// Returns the column and row of each <see cref="TileSize"/> tile that differs from <paramref name="previous"/>.
+    /// </summary>
+    /// <exception cref="ArgumentException">Thrown when the frames differ in size.</exception>
+    public List<(int Column, int Row)> ChangedTiles(DisplayFrame previous)
+    {
+        if (!IsComparableTo(previous))
+        {
+            throw new ArgumentException("Frames differ in size");
+        }
+        var changed = new List<(int, int)>();
+        var current = Pixels;
+        var before = previous.Pixels;
+        for (int tileY = 0; tileY < Height; tileY += TileSize)
+        {
+            int rows = Math.Min(TileSize, Height - tileY);
+            for (int tileX = 0; tileX < Width; tileX += TileSize)
+            {
+                int columns = Math.Min(TileSize, Width - tileX);
+                for (int y = tileY; y < tileY + rows; y++)
+                {
+                    int offset = y * Width + tileX;
+                    if (!current.Slice(offset, columns).SequenceEqual(before.Slice(offset, columns)))
+                    {
+                        changed.Add((tileX / TileSize, tileY / TileSize));
+                        break;
+                    }
+                }
+            }
+        }
+        return changed;
+    }
+
+    public void Dispose()
+    {
+        _pixels.Dispose();
+    }
+}
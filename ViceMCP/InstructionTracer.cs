@@ -0,0 +1,403 @@
+using System.Buffers.Binary;
+using System.Diagnostics;
+using System.Globalization;
+using ViceMCP.ViceBridge.Commands;
+using ViceMCP.ViceBridge.Responses;
+using ViceMCP.ViceBridge.Services.Abstract;
+
+namespace ViceMCP;
+
+/// <summary>
+/// Steps the CPU one instruction at a time and records the registers and instruction bytes of every step to a
+/// binary trace file.
+/// </summary>
+/// <remarks>
+/// <para>
+/// Each step is an advance and a register read enqueued back to back while auto-resume is held, so VICE never
+/// runs between two steps and the only per-instruction cost is the monitor round trip. Instruction bytes are
+/// decoded from 256 byte pages read the first time the PC enters them. A cached page is dropped when a traced
+/// instruction writes to it, so self-modifying code is decoded correctly. Pushes drop the stack page and a stepped
+/// over subroutine drops every page, as its writes are not traced; writes by DMA or interrupts are not seen.
+/// </para>
+/// <para>
+/// The file starts with a 16 byte header: <c>VTRC</c>, version (u16), record size (u16), record count (u32) and
+/// flags (u32, bit 0 set when subroutines were stepped over). Each 12 byte record holds PC (u16), A, X, Y, SP,
+/// flags, the opcode and its two following bytes, the instruction length and a reserved byte, all little endian
+/// and captured before the instruction executed.
+/// </para>
+/// </remarks>
+public sealed class InstructionTracer
+{
+    public const int HeaderSize = 16;
+    public const int RecordSize = 12;
+    public const ushort FileVersion = 1;
+    /// <summary>
+    /// Number of most recent instructions kept for <see cref="TraceResult.Recent"/>.
+    /// </summary>
+    public const int RecentCount = 16;
+    private const int HotCount = 8;
+
+    private static readonly HashSet<string> WritingMnemonics =
+    [
+        "STA", "STX", "STY", "INC", "DEC", "ASL", "LSR", "ROL", "ROR",
+        "SAX", "SLO", "RLA", "SRE", "RRA", "DCP", "ISB", "SHA", "SHX", "SHY", "SHS",
+    ];
+
+    private readonly IViceBridge _bridge;
+    private readonly byte[]?[] _pages = new byte[]?[256];
+    private int _pageReads;
+
+    public InstructionTracer(IViceBridge bridge)
+    {
+        _bridge = bridge;
+    }
+
+    /// <summary>
+    /// Traces up to <paramref name="maxInstructions"/> instructions.
+    /// </summary>
+    /// <param name="filePath">Trace file to write, replaced when it exists.</param>
+    /// <param name="maxInstructions">Number of instructions after which tracing stops.</param>
+    /// <param name="stopAddresses">Stop before executing an instruction at one of these addresses.</param>
+    /// <param name="condition">Stop before executing an instruction when the registers match.</param>
+    /// <param name="stepOver">Execute subroutines as a single step.</param>
+    /// <param name="ct">Stops tracing early, the file holds the instructions traced so far.</param>
+    /// <exception cref="InvalidOperationException">Thrown when VICE rejects a step or register read.</exception>
+    public async Task<TraceResult> TraceAsync(string filePath, int maxInstructions, IReadOnlyCollection<ushort> stopAddresses,
+        TraceCondition? condition, bool stepOver, CancellationToken ct = default)
+    {
+        var stopwatch = Stopwatch.StartNew();
+        using var hold = _bridge.HoldAutoResume();
+        var registerIds = await GetRegisterIdsAsync();
+        var registers = await ReadRegistersAsync(registerIds);
+
+        var hits = new Dictionary<ushort, int>();
+        var recent = new Queue<string>(RecentCount);
+        var record = new byte[RecordSize];
+        string stopReason = $"traced {maxInstructions} instructions";
+        int traced = 0;
+        using (var file = new FileStream(filePath, FileMode.Create, FileAccess.Write, FileShare.Read, 1 << 16))
+        {
+            file.Write(BuildHeader(0, stepOver));
+            for (; traced < maxInstructions; traced++)
+            {
+                if (ct.IsCancellationRequested)
+                {
+                    stopReason = "cancelled";
+                    break;
+                }
+                ushort pc = registers.PC;
+                if (traced > 0 && stopAddresses.Contains(pc))
+                {
+                    stopReason = $"reached ${pc:X4}";
+                    break;
+                }
+                if (traced > 0 && condition?.Matches(registers) == true)
+                {
+                    stopReason = $"condition {condition} met at ${pc:X4}";
+                    break;
+                }
+
+                byte opcode = await ReadByteAsync(pc);
+                var info = Mos6502.Decode(opcode);
+                byte low = info.Length > 1 ? await ReadByteAsync((ushort)(pc + 1)) : (byte)0;
+                byte high = info.Length > 2 ? await ReadByteAsync((ushort)(pc + 2)) : (byte)0;
+                WriteRecord(record, registers, opcode, low, high, info.Length);
+                file.Write(record);
+
+                hits[pc] = hits.GetValueOrDefault(pc) + 1;
+                if (recent.Count == RecentCount)
+                {
+                    recent.Dequeue();
+                }
+                recent.Enqueue($"${pc:X4}  {Mos6502.Format(pc, opcode, low, high),-14} A={registers.A:X2} X={registers.X:X2} Y={registers.Y:X2} SP={registers.SP:X2} FL={registers.Flags:X2}");
+
+                if (info.Mnemonic == "JAM")
+                {
+                    traced++;
+                    stopReason = $"CPU jammed at ${pc:X4}";
+                    break;
+                }
+                await InvalidateWrittenPageAsync(info, low, high, registers, stepOver);
+
+                var step = _bridge.EnqueueCommand(new AdvanceInstructionCommand(stepOver, 1));
+                var read = _bridge.EnqueueCommand(new RegistersGetCommand(MemSpace.MainMemory));
+                var stepResult = await step.Response;
+                if (!stepResult.IsSuccess)
+                {
+                    throw new InvalidOperationException($"Failed to step at ${pc:X4}: {stepResult.ErrorCode}");
+                }
+                registers = ParseRegisters(await read.Response, registerIds);
+            }
+
+            // The header's record count is only known at the end
+            file.Position = 0;
+            file.Write(BuildHeader(traced, stepOver));
+        }
+
+        return new TraceResult(
+            filePath,
+            traced,
+            stopReason,
+            stopwatch.Elapsed,
+            hits.Count,
+            _pageReads,
+            hits.OrderByDescending(h => h.Value).Take(HotCount).Select(h => (h.Key, h.Value)).ToArray(),
+            recent.ToArray(),
+            registers);
+    }
+
+    private static byte[] BuildHeader(int records, bool stepOver)
+    {
+        var header = new byte[HeaderSize];
+        "VTRC"u8.CopyTo(header);
+        BinaryPrimitives.WriteUInt16LittleEndian(header.AsSpan(4), FileVersion);
+        BinaryPrimitives.WriteUInt16LittleEndian(header.AsSpan(6), RecordSize);
+        BinaryPrimitives.WriteUInt32LittleEndian(header.AsSpan(8), (uint)records);
+        BinaryPrimitives.WriteUInt32LittleEndian(header.AsSpan(12), stepOver ? 1u : 0u);
+        return header;
+    }
+
+    private static void WriteRecord(byte[] record, CpuRegisters registers, byte opcode, byte low, byte high, int length)
+    {
+        BinaryPrimitives.WriteUInt16LittleEndian(record, registers.PC);
+        record[2] = registers.A;
+        record[3] = registers.X;
+        record[4] = registers.Y;
+        record[5] = registers.SP;
+        record[6] = registers.Flags;
+        record[7] = opcode;
+        record[8] = low;
+        record[9] = high;
+        record[10] = (byte)length;
+        record[11] = 0;
+    }
+
+    private async ValueTask<byte> ReadByteAsync(ushort address)
+    {
+        var page = _pages[address >> 8] ?? await ReadPageAsync(address >> 8);
+        return page[address & 0xFF];
+    }
+
+    private async Task<byte[]> ReadPageAsync(int page)
+    {
+        ushort start = (ushort)(page << 8);
+        var result = await _bridge.EnqueueCommand(new MemoryGetCommand(0, start, (ushort)(start | 0xFF), MemSpace.MainMemory, 0)).Response;
+        if (!result.IsSuccess || result.Response?.Memory is not { } memory)
+        {
+            throw new InvalidOperationException($"Failed to read memory at ${start:X4}: {result.ErrorCode}");
+        }
+        using (memory)
+        {
+            if (memory.Size < 0x100)
+            {
+                throw new InvalidOperationException($"Memory read returned {memory.Size} of 256 bytes");
+            }
+            var data = memory.Span[..0x100].ToArray();
+            _pages[page] = data;
+            _pageReads++;
+            return data;
+        }
+    }
+
+    /// <summary>
+    /// Drops the cached page an instruction is about to write to, so code it modifies is read again.
+    /// </summary>
+    private async Task InvalidateWrittenPageAsync(OpcodeInfo info, byte low, byte high, CpuRegisters registers,
+        bool stepOver)
+    {
+        if (info.Mnemonic == "JSR" && stepOver)
+        {
+            // The whole subroutine runs in one step, any page may have been written
+            Array.Clear(_pages);
+            return;
+        }
+        if (info.Mnemonic is "JSR" or "BRK" or "PHA" or "PHP")
+        {
+            _pages[0x01] = null;
+            return;
+        }
+        if (!WritingMnemonics.Contains(info.Mnemonic))
+        {
+            return;
+        }
+        int? target = info.Mode switch
+        {
+            AddressingMode.ZeroPage => low,
+            AddressingMode.ZeroPageX => (low + registers.X) & 0xFF,
+            AddressingMode.ZeroPageY => (low + registers.Y) & 0xFF,
+            AddressingMode.Absolute => low | high << 8,
+            AddressingMode.AbsoluteX => ((low | high << 8) + registers.X) & 0xFFFF,
+            AddressingMode.AbsoluteY => ((low | high << 8) + registers.Y) & 0xFFFF,
+            _ => null,
+        };
+        if (info.Mode == AddressingMode.IndirectX)
+        {
+            int pointer = (low + registers.X) & 0xFF;
+            target = await ReadByteAsync((ushort)pointer) | await ReadByteAsync((ushort)((pointer + 1) & 0xFF)) << 8;
+        }
+        else if (info.Mode == AddressingMode.IndirectY)
+        {
+            target = ((await ReadByteAsync(low) | await ReadByteAsync((ushort)((low + 1) & 0xFF)) << 8) + registers.Y) & 0xFFFF;
+        }
+        if (target is { } address)
+        {
+            _pages[address >> 8] = null;
+        }
+    }
+
+    private async Task<RegisterIds> GetRegisterIdsAsync()
+    {
+        var result = await _bridge.EnqueueCommand(new RegistersAvailableCommand(MemSpace.MainMemory)).Response;
+        if (!result.IsSuccess || result.Response == null)
+        {
+            throw new InvalidOperationException($"Failed to query registers: {result.ErrorCode}");
+        }
+        var ids = result.Response.Items.ToDictionary(r => r.Name.ToUpperInvariant(), r => r.Id);
+        byte Id(string name, byte fallback) => ids.TryGetValue(name, out var id) ? id : fallback;
+        return new RegisterIds(Id("A", 0), Id("X", 1), Id("Y", 2), Id("PC", 3), Id("SP", 4), Id("FL", 5));
+    }
+
+    private async Task<CpuRegisters> ReadRegistersAsync(RegisterIds ids) =>
+        ParseRegisters(await _bridge.EnqueueCommand(new RegistersGetCommand(MemSpace.MainMemory)).Response, ids);
+
+    private static CpuRegisters ParseRegisters(CommandResponse<RegistersResponse> result, RegisterIds ids)
+    {
+        if (!result.IsSuccess || result.Response == null)
+        {
+            throw new InvalidOperationException($"Failed to read registers: {result.ErrorCode}");
+        }
+        ushort pc = 0;
+        byte a = 0, x = 0, y = 0, sp = 0, flags = 0;
+        foreach (var item in result.Response.Items)
+        {
+            if (item.RegisterId == ids.PC) pc = item.RegisterValue;
+            else if (item.RegisterId == ids.A) a = (byte)item.RegisterValue;
+            else if (item.RegisterId == ids.X) x = (byte)item.RegisterValue;
+            else if (item.RegisterId == ids.Y) y = (byte)item.RegisterValue;
+            else if (item.RegisterId == ids.SP) sp = (byte)item.RegisterValue;
+            else if (item.RegisterId == ids.Flags) flags = (byte)item.RegisterValue;
+        }
+        return new CpuRegisters(pc, a, x, y, sp, flags);
+    }
+
+    private sealed record RegisterIds(byte A, byte X, byte Y, byte PC, byte SP, byte Flags);
+}
+
+/// <summary>
+/// 6502 registers of one traced instruction.
+/// </summary>
+public readonly record struct CpuRegisters(ushort PC, byte A, byte X, byte Y, byte SP, byte Flags);
+
+/// <summary>
+/// Outcome of <see cref="InstructionTracer.TraceAsync"/>.
+/// </summary>
+/// <param name="FilePath">The trace file.</param>
+/// <param name="Instructions">Number of records written.</param>
+/// <param name="StopReason">Why tracing stopped.</param>
+/// <param name="Elapsed">Time taken.</param>
+/// <param name="UniqueAddresses">Number of distinct PCs executed.</param>
+/// <param name="PageReads">Memory pages read to decode instructions.</param>
+/// <param name="Hot">Most executed addresses with their count.</param>
+/// <param name="Recent">The last instructions traced, disassembled with their registers.</param>
+/// <param name="Final">Registers when tracing stopped.</param>
+public sealed record TraceResult(string FilePath, int Instructions, string StopReason, TimeSpan Elapsed,
+    int UniqueAddresses, int PageReads, (ushort Address, int Count)[] Hot, string[] Recent, CpuRegisters Final);
+
+/// <summary>
+/// Register comparisons that stop a trace, like <c>A==$00 &amp;&amp; X&gt;=10</c>.
+/// </summary>
+/// <remarks>
+/// Registers are A, X, Y, SP, PC and FL; operators ==, !=, &lt;, &lt;=, &gt;, &gt;= and, for flags, &amp; which
+/// matches when any of the given bits is set. Values are hex with <c>$</c> or <c>0x</c>, decimal otherwise.
+/// </remarks>
+public sealed class TraceCondition
+{
+    private static readonly string[] Operators = ["==", "!=", "<=", ">=", "<", ">", "&"];
+    private readonly (string Register, string Operator, int Value)[] _terms;
+    private readonly string _text;
+
+    private TraceCondition(string text, (string, string, int)[] terms)
+    {
+        _text = text;
+        _terms = terms;
+    }
+
+    /// <summary>
+    /// Parses a condition.
+    /// </summary>
+    /// <exception cref="ArgumentException">Thrown when a term is not valid.</exception>
+    public static TraceCondition Parse(string text)
+    {
+        var terms = new List<(string, string, int)>();
+        foreach (var term in text.Split("&&", StringSplitOptions.TrimEntries | StringSplitOptions.RemoveEmptyEntries))
+        {
+            var op = Operators.FirstOrDefault(o => term.Contains(o))
+                ?? throw new ArgumentException($"Invalid condition '{term}', expected e.g. A==$00");
+            var sides = term.Split(op, 2, StringSplitOptions.TrimEntries);
+            var register = sides[0].ToUpperInvariant();
+            if (register is not ("A" or "X" or "Y" or "SP" or "PC" or "FL"))
+            {
+                throw new ArgumentException($"Unknown register '{sides[0]}' in condition, expected A, X, Y, SP, PC or FL");
+            }
+            if (!TryParseValue(sides[1], out var value))
+            {
+                throw new ArgumentException($"Invalid value '{sides[1]}' in condition");
+            }
+            terms.Add((register, op, value));
+        }
+        if (terms.Count == 0)
+        {
+            throw new ArgumentException("Condition is empty");
+        }
+        return new TraceCondition(text.Trim(), terms.ToArray());
+    }
+
+    private static bool TryParseValue(string text, out int value)
+    {
+        if (text.StartsWith('$'))
+        {
+            return int.TryParse(text[1..], NumberStyles.HexNumber, CultureInfo.InvariantCulture, out value);
+        }
+        if (text.StartsWith("0x", StringComparison.OrdinalIgnoreCase))
+        {
+            return int.TryParse(text[2..], NumberStyles.HexNumber, CultureInfo.InvariantCulture, out value);
+        }
+        return int.TryParse(text, NumberStyles.Integer, CultureInfo.InvariantCulture, out value);
+    }
+
+    /// <summary>
+    /// Tells whether all terms hold for <paramref name="registers"/>.
+    /// </summary>
+    public bool Matches(CpuRegisters registers)
+    {
+        foreach (var (register, op, value) in _terms)
+        {
+            int actual = register switch
+            {
+                "A" => registers.A,
+                "X" => registers.X,
+                "Y" => registers.Y,
+                "SP" => registers.SP,
+                "PC" => registers.PC,
+                _ => registers.Flags,
+            };
+            bool holds = op switch
+            {
+                "==" => actual == value,
+                "!=" => actual != value,
+                "<=" => actual <= value,
+                ">=" => actual >= value,
+                "<" => actual < value,
+                ">" => actual > value,
+                _ => (actual & value) != 0,
+            };
+            if (!holds)
+            {
+                return false;
+            }
+        }
+        return true;
+    }
+
+    public override string ToString() => _text;
+}
@@ -0,0 +1,240 @@
+using System.Diagnostics;
+using System.Threading.Channels;
+using ViceMCP.ViceBridge;
+using ViceMCP.ViceBridge.Commands;
+using ViceMCP.ViceBridge.Responses;
+using ViceMCP.ViceBridge.Services.Abstract;
+using ViceMCP.ViceBridge.Shared;
+
+namespace ViceMCP;
+
+/// <summary>
+/// Keyboard buffer of a machine, which decides how much text can be fed at once.
+/// </summary>
+/// <param name="Machine">Machine name.</param>
+/// <param name="CountAddress">Zero page location holding the number of keys waiting in the buffer.</param>
+/// <param name="BufferSize">Number of keys the buffer holds.</param>
+public sealed record KeyboardProfile(string Machine, ushort CountAddress, int BufferSize)
+{
+    public static readonly KeyboardProfile C64 = new("C64", 0xC6, 10);
+    public static readonly KeyboardProfile C128 = new("C128", 0xD0, 10);
+    public static readonly KeyboardProfile Vic20 = new("VIC-20", 0xC6, 10);
+    public static readonly KeyboardProfile Pet = new("PET", 0x9E, 10);
+    public static readonly KeyboardProfile Plus4 = new("Plus/4", 0xEF, 8);
+    public static readonly KeyboardProfile CbmII = new("CBM-II", 0xD1, 10);
+
+    /// <summary>
+    /// Profile of an emulator <c>start_vice</c> accepts, the C64 when the emulator is not known.
+    /// </summary>
+    public static KeyboardProfile ForEmulator(string? emulatorType) => emulatorType?.ToLowerInvariant() switch
+    {
+        "x128" => C128,
+        "xvic" => Vic20,
+        "xpet" => Pet,
+        "xplus4" => Plus4,
+        "xcbm2" or "xcbm5x0" => CbmII,
+        _ => C64,
+    };
+}
+
+/// <summary>
+/// Types text longer than the keyboard buffer by feeding it one buffer full at a time.
+/// </summary>
+/// <remarks>
+/// While feeding, a store checkpoint on <see cref="KeyboardProfile.CountAddress"/> stops the machine each time
+/// it takes a key from the buffer, and the counter is read then. The next chunk goes out as soon as the counter
+/// is back to zero, so the pace follows the machine instead of fixed sleeps. Should a hit go missing, the counter
+/// is read again after <see cref="RecheckInterval"/> without one.
+/// </remarks>
+public sealed class KeyboardFeeder
+{
+    /// <summary>
+    /// Time the machine may take no keys before feeding gives up.
+    /// </summary>
+    public static readonly TimeSpan StallTimeout = TimeSpan.FromSeconds(10);
+    /// <summary>
+    /// Time without a checkpoint hit after which the counter is read anyway.
+    /// </summary>
+    public static readonly TimeSpan RecheckInterval = TimeSpan.FromSeconds(1);
+
+    private readonly IViceBridge _bridge;
+
+    public KeyboardFeeder(IViceBridge bridge, KeyboardProfile profile)
+    {
+        _bridge = bridge;
+        Profile = profile;
+    }
+
+    public KeyboardProfile Profile { get; }
+
+    /// <summary>
+    /// Types <paramref name="text"/>, special keys escaped with backslashes as for <see cref="KeyboardFeedCommand"/>.
+    /// </summary>
+    /// <param name="text">Text to type.</param>
+    /// <param name="ct">Stops feeding, keys already fed are still typed.</param>
+    /// <exception cref="InvalidOperationException">Thrown when VICE rejects a command.</exception>
+    /// <exception cref="TimeoutException">Thrown when the machine takes no keys for <see cref="StallTimeout"/>.</exception>
+    public async Task<KeyboardFeedResult> FeedAsync(string text, CancellationToken ct = default)
+    {
+        var stopwatch = Stopwatch.StartNew();
+        var chunks = Split(text, Profile.BufferSize);
+        int keys = chunks.Sum(c => c.Keys);
+        if (chunks.Count <= 1)
+        {
+            // Fits the buffer, nothing to pace
+            await SendAsync(text, resumeOnStopped: false, ct);
+            return new KeyboardFeedResult(keys, 1, 0, stopwatch.Elapsed);
+        }
+
+        var hits = Channel.CreateBounded<bool>(new BoundedChannelOptions(1) { FullMode = BoundedChannelFullMode.DropWrite });
+        uint? checkpoint = null;
+        void OnViceResponse(object? sender, ViceResponseEventArgs e)
+        {
+            if (e.Response is CheckpointInfoResponse { CurrentlyHit: true } info && info.CheckpointNumber == checkpoint)
+            {
+                hits.Writer.TryWrite(true);
+            }
+        }
+
+        _bridge.ViceResponse += OnViceResponse;
+        int reads = 0;
+        int typed = 0;
+        try
+        {
+            var set = await _bridge.EnqueueCommand(new CheckpointSetCommand(Profile.CountAddress, Profile.CountAddress,
+                StopWhenHit: true, Enabled: true, CpuOperation.Store, Temporary: false), resumeOnStopped: true).Response;
+            if (!set.IsSuccess || set.Response is null)
+            {
+                throw new InvalidOperationException($"Failed to watch the keyboard buffer: {set.ErrorCode}");
+            }
+            checkpoint = set.Response.CheckpointNumber;
+
+            foreach (var (chunk, chunkKeys) in chunks)
+            {
+                if (typed > 0)
+                {
+                    reads += await WaitUntilEmptyAsync(hits.Reader, typed, keys, ct);
+                }
+                await SendAsync(chunk, resumeOnStopped: true, ct);
+                typed += chunkKeys;
+            }
+        }
+        finally
+        {
+            _bridge.ViceResponse -= OnViceResponse;
+            if (checkpoint is { } number)
+            {
+                // Also resumes the machine when the last key taken stopped it
+                await _bridge.EnqueueCommand(new CheckpointDeleteCommand(number), resumeOnStopped: true).Response;
+            }
+        }
+        return new KeyboardFeedResult(keys, chunks.Count, reads, stopwatch.Elapsed);
+    }
+
+    /// <summary>
+    /// Splits text into chunks of at most <paramref name="bufferSize"/> keys, keeping escape sequences whole.
+    /// </summary>
+    internal static List<(string Text, int Keys)> Split(string text, int bufferSize)
+    {
+        var chunks = new List<(string Text, int Keys)>();
+        int start = 0;
+        int keys = 0;
+        for (int i = 0; i < text.Length; i++)
+        {
+            if (text[i] == '\\' && i + 1 < text.Length)
+            {
+                i++;
+            }
+            if (++keys == bufferSize)
+            {
+                chunks.Add((text[start..(i + 1)], keys));
+                start = i + 1;
+                keys = 0;
+            }
+        }
+        if (keys > 0)
+        {
+            chunks.Add((text[start..], keys));
+        }
+        return chunks;
+    }
+
+    /// <summary>
+    /// Reads the buffer counter after every checkpoint hit until it is zero.
+    /// </summary>
+    /// <returns>Number of reads.</returns>
+    private async Task<int> WaitUntilEmptyAsync(ChannelReader<bool> hits, int typed, int keys, CancellationToken ct)
+    {
+        int reads = 0;
+        int lastCount = -1;
+        var lastProgress = Stopwatch.StartNew();
+        while (true)
+        {
+            using (var recheck = CancellationTokenSource.CreateLinkedTokenSource(ct))
+            {
+                recheck.CancelAfter(RecheckInterval);
+                try
+                {
+                    await hits.ReadAsync(recheck.Token);
+                }
+                catch (OperationCanceledException) when (!ct.IsCancellationRequested)
+                {
+                    // No hit for a while, read anyway
+                }
+            }
+
+            int count = await ReadCountAsync(ct);
+            reads++;
+            if (count == 0)
+            {
+                return reads;
+            }
+            if (count != lastCount)
+            {
+                lastCount = count;
+                lastProgress.Restart();
+            }
+            else if (lastProgress.Elapsed >= StallTimeout)
+            {
+                throw new TimeoutException(
+                    $"The {Profile.Machine} took no keys for {StallTimeout.TotalSeconds:F0} seconds, {typed - count} of {keys} keys typed");
+            }
+        }
+    }
+
+    private async Task<int> ReadCountAsync(CancellationToken ct)
+    {
+        var command = _bridge.EnqueueCommand(
+            new MemoryGetCommand(0, Profile.CountAddress, Profile.CountAddress, MemSpace.MainMemory, 0), resumeOnStopped: true);
+        var result = await command.Response.WaitAsync(ct);
+        if (!result.IsSuccess || result.Response?.Memory is not { } memory)
+        {
+            throw new InvalidOperationException($"Failed to read the keyboard buffer: {result.ErrorCode}");
+        }
+        using (memory)
+        {
+            return memory.Span[0];
+        }
+    }
+
+    private async Task SendAsync(string text, bool resumeOnStopped, CancellationToken ct)
+    {
+        var result = await _bridge.EnqueueCommand(new KeyboardFeedCommand(text), resumeOnStopped).Response.WaitAsync(ct);
+        if (!result.IsSuccess)
+        {
+            throw new InvalidOperationException($"Failed to send keys: {result.ErrorCode}");
+        }
+    }
+}
+
+/// <summary>
+/// Outcome of <see cref="KeyboardFeeder.FeedAsync"/>.
+/// </summary>
+/// <param name="Keys">Keys typed, an escape sequence counts as one.</param>
+/// <param name="Chunks">Keyboard feed commands sent.</param>
+/// <param name="Reads">Reads of the buffer counter while waiting for the machine.</param>
+/// <param name="Elapsed">Time taken.</param>
+public sealed record KeyboardFeedResult(int Keys, int Chunks, int Reads, TimeSpan Elapsed)
+{
+    public double KeysPerSecond => Keys / Math.Max(Elapsed.TotalSeconds, 1e-6);
+}
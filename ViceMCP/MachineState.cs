@@ -0,0 +1,512 @@
+using System.Collections.Immutable;
+using System.Diagnostics;
+using System.Text;
+using ViceMCP.ViceBridge;
+using ViceMCP.ViceBridge.Commands;
+using ViceMCP.ViceBridge.Responses;
+using ViceMCP.ViceBridge.Services.Abstract;
+using ViceMCP.ViceBridge.Shared;
+
+namespace ViceMCP;
+
+/// <summary>
+/// Captures the state of a machine in one go: registers, zero page, stack, I/O chips, screen and checkpoints.
+/// </summary>
+/// <remarks>
+/// Auto-resume is held for the whole capture, so every part comes from the same stopped CPU. The reads are
+/// pipelined back to back, followed by one more read of the screen the VIC-II registers point at. Register and
+/// bank metadata doesn't change while connected to the same emulator, it is fetched with the first capture and
+/// kept until the connection changes.
+/// </remarks>
+/// <threadsafety>Class is thread safe.</threadsafety>
+public sealed class MachineStateReader
+{
+    public const ushort IoStart = 0xD000;
+    // Up to and including CIA 2, so one read covers VIC-II, SID, color RAM and both CIAs
+    public const ushort IoEnd = 0xDD0F;
+    public const int ScreenColumns = 40;
+    public const int ScreenRows = 25;
+
+    private readonly IViceBridge _bridge;
+    private readonly object _lock = new();
+    private MachineMetadata? _metadata;
+    private int _generation;
+    private long _metadataFetches;
+
+    public MachineStateReader(IViceBridge bridge)
+    {
+        _bridge = bridge;
+        // Reader and bridge belong to the same instance and live as long, no need to unsubscribe
+        _bridge.ConnectedChanged += OnConnectedChanged;
+    }
+
+    /// <summary>
+    /// Cached metadata, null until the first capture after connecting.
+    /// </summary>
+    public MachineMetadata? Metadata
+    {
+        get
+        {
+            lock (_lock)
+            {
+                return _metadata;
+            }
+        }
+    }
+
+    /// <summary>
+    /// Times register and bank metadata was fetched from VICE.
+    /// </summary>
+    public long MetadataFetches => Interlocked.Read(ref _metadataFetches);
+
+    /// <summary>
+    /// Whether an emulator has the C64's VIC-II, SID and CIAs at $D000, true when the emulator is not known.
+    /// </summary>
+    public static bool HasC64Io(string? emulatorType) =>
+        emulatorType?.ToLowerInvariant() is null or "x64" or "x64sc" or "x64dtv" or "xscpu64" or "x128";
+
+    /// <summary>
+    /// Forgets the cached metadata.
+    /// </summary>
+    public void ClearMetadata()
+    {
+        lock (_lock)
+        {
+            _metadata = null;
+            _generation++;
+        }
+    }
+
+    /// <summary>
+    /// Returns register and bank metadata, from the cache when there is one.
+    /// </summary>
+    /// <exception cref="InvalidOperationException">Thrown when VICE rejects a command.</exception>
+    public async Task<MachineMetadata> GetMetadataAsync(CancellationToken ct = default)
+    {
+        int generation;
+        lock (_lock)
+        {
+            if (_metadata != null)
+            {
+                return _metadata;
+            }
+            generation = _generation;
+        }
+
+        var registers = _bridge.EnqueueCommand(new RegistersAvailableCommand(MemSpace.MainMemory), CommandPriority.Normal, ct: ct);
+        var banks = _bridge.EnqueueCommand(new BanksAvailableCommand(), CommandPriority.Normal, ct: ct);
+        var registersResult = await registers.Response.WaitAsync(ct);
+        var banksResult = await banks.Response.WaitAsync(ct);
+        if (!registersResult.IsSuccess || registersResult.Response == null)
+        {
+            throw new InvalidOperationException($"Failed to query registers: {registersResult.ErrorCode}");
+        }
+        if (!banksResult.IsSuccess || banksResult.Response == null)
+        {
+            throw new InvalidOperationException($"Failed to query banks: {banksResult.ErrorCode}");
+        }
+        Interlocked.Increment(ref _metadataFetches);
+
+        var metadata = new MachineMetadata(registersResult.Response.Items, banksResult.Response.Banks);
+        lock (_lock)
+        {
+            // Metadata fetched across a reconnect may describe the previous emulator
+            if (generation == _generation)
+            {
+                _metadata ??= metadata;
+                return _metadata;
+            }
+        }
+        return metadata;
+    }
+
+    /// <summary>
+    /// Captures the state of the machine.
+    /// </summary>
+    /// <param name="c64Io">Whether to read and decode VIC-II, SID, CIAs and the screen, see <see cref="HasC64Io"/>.</param>
+    /// <param name="includeScreen">Whether to read the screen.</param>
+    /// <param name="ct">Cancels the capture.</param>
+    /// <exception cref="InvalidOperationException">Thrown when VICE rejects a command.</exception>
+    public async Task<MachineState> CaptureAsync(bool c64Io = true, bool includeScreen = true, CancellationToken ct = default)
+    {
+        var stopwatch = Stopwatch.StartNew();
+        bool cached = Metadata != null;
+        var metadata = await GetMetadataAsync(ct);
+        int commands = cached ? 0 : 2;
+
+        using var hold = _bridge.HoldAutoResume();
+        var registers = _bridge.EnqueueCommand(new RegistersGetCommand(MemSpace.MainMemory), CommandPriority.Normal, ct: ct);
+        var lowMemory = _bridge.EnqueueCommand(new MemoryGetCommand(0, 0x0000, 0x01FF, MemSpace.MainMemory, 0),
+            CommandPriority.Normal, ct: ct);
+        var io = c64Io
+            ? _bridge.EnqueueCommand(new MemoryGetCommand(0, IoStart, IoEnd, MemSpace.MainMemory, metadata.BankId("io") ?? 0),
+                CommandPriority.Normal, ct: ct)
+            : null;
+        var checkpoints = _bridge.EnqueueCommand(new CheckpointListCommand(), CommandPriority.Normal, ct: ct);
+        commands += io != null ? 4 : 3;
+
+        var registersResult = await registers.Response.WaitAsync(ct);
+        if (!registersResult.IsSuccess || registersResult.Response == null)
+        {
+            throw new InvalidOperationException($"Failed to get registers: {registersResult.ErrorCode}");
+        }
+        var names = metadata.Registers.ToDictionary(r => r.Id);
+        var registerValues = registersResult.Response.Items
+            .Select(r => names.TryGetValue(r.RegisterId, out var info)
+                ? new RegisterValue(info.Name, info.Size, r.RegisterValue)
+                : new RegisterValue($"R{r.RegisterId}", 16, r.RegisterValue))
+            .ToImmutableArray();
+
+        var low = await ReadAsync(lowMemory, ct);
+        VicIIState? vic = null;
+        SidState? sid = null;
+        CiaState? cia1 = null;
+        CiaState? cia2 = null;
+        ScreenState? screen = null;
+        if (io != null)
+        {
+            var ioBytes = await ReadAsync(io, ct);
+            vic = VicIIState.Decode(ioBytes.AsSpan(0, 0x2F), ioBytes[0xD00 + 0x00]);
+            sid = SidState.Decode(ioBytes.AsSpan(0x400, 0x1D));
+            cia1 = CiaState.Decode(ioBytes.AsSpan(0xC00, 0x10));
+            cia2 = CiaState.Decode(ioBytes.AsSpan(0xD00, 0x10));
+            if (includeScreen)
+            {
+                // Screen memory is RAM as the VIC-II sees it, whatever the CPU has banked in there
+                ushort end = (ushort)(vic.ScreenAddress + ScreenColumns * ScreenRows - 1);
+                var screenRead = _bridge.EnqueueCommand(
+                    new MemoryGetCommand(0, vic.ScreenAddress, end, MemSpace.MainMemory, metadata.BankId("ram") ?? 0),
+                    CommandPriority.Normal, ct: ct);
+                commands++;
+                var codes = await ReadAsync(screenRead, ct);
+                screen = ScreenState.Decode(vic.ScreenAddress, codes, ioBytes.AsSpan(0x800, ScreenColumns * ScreenRows),
+                    vic.LowercaseCharset);
+            }
+        }
+
+        var checkpointsResult = await checkpoints.Response.WaitAsync(ct);
+        if (!checkpointsResult.IsSuccess || checkpointsResult.Response == null)
+        {
+            throw new InvalidOperationException($"Failed to list checkpoints: {checkpointsResult.ErrorCode}");
+        }
+
+        return new MachineState(registerValues, metadata.Banks, low.AsSpan(0, 0x100).ToImmutableArray(),
+            low.AsSpan(0x100, 0x100).ToImmutableArray(), vic, sid, cia1, cia2, screen, checkpointsResult.Response.Info,
+            commands, cached, stopwatch.Elapsed);
+    }
+
+    private static async Task<byte[]> ReadAsync(MemoryGetCommand command, CancellationToken ct)
+    {
+        var result = await command.Response.WaitAsync(ct);
+        if (!result.IsSuccess || result.Response?.Memory is not { } memory)
+        {
+            throw new InvalidOperationException(
+                $"Failed to read ${command.StartAddress:X4}-${command.EndAddress:X4}: {result.ErrorCode}");
+        }
+        using (memory)
+        {
+            int expected = command.EndAddress - command.StartAddress + 1;
+            if (memory.Size < expected)
+            {
+                throw new InvalidOperationException(
+                    $"Read of ${command.StartAddress:X4}-${command.EndAddress:X4} returned {memory.Size} bytes");
+            }
+            return memory.Span[..expected].ToArray();
+        }
+    }
+
+    // A new connection may lead to another emulator with other registers and banks
+    private void OnConnectedChanged(object? sender, ConnectedChangedEventArgs e) => ClearMetadata();
+}
+
+/// <summary>
+/// Registers and memory banks of the connected emulator.
+/// </summary>
+/// <param name="Registers">Registers as reported by <see cref="RegistersAvailableCommand"/>.</param>
+/// <param name="Banks">Banks as reported by <see cref="BanksAvailableCommand"/>.</param>
+public sealed record MachineMetadata(ImmutableArray<FullRegisterItem> Registers, ImmutableArray<BankItem> Banks)
+{
+    /// <summary>
+    /// Id of the bank called <paramref name="name"/>, null when the emulator has none.
+    /// </summary>
+    public ushort? BankId(string name) =>
+        Banks.FirstOrDefault(b => string.Equals(b.Name, name, StringComparison.OrdinalIgnoreCase))?.BankId;
+}
+
+/// <summary>
+/// A register and its value.
+/// </summary>
+/// <param name="Name">Name VICE gives the register.</param>
+/// <param name="Bits">Width of the register.</param>
+/// <param name="Value">The value.</param>
+public sealed record RegisterValue(string Name, int Bits, ushort Value);
+
+/// <summary>
+/// Outcome of <see cref="MachineStateReader.CaptureAsync"/>.
+/// </summary>
+/// <param name="Registers">CPU registers.</param>
+/// <param name="Banks">Memory banks of the emulator.</param>
+/// <param name="ZeroPage">$0000-$00FF as the CPU sees it.</param>
+/// <param name="Stack">$0100-$01FF.</param>
+/// <param name="Vic">VIC-II registers, null on machines without one.</param>
+/// <param name="Sid">SID registers, null on machines without one.</param>
+/// <param name="Cia1">CIA 1 registers, null on machines without one.</param>
+/// <param name="Cia2">CIA 2 registers, null on machines without one.</param>
+/// <param name="Screen">Text screen, null when not read.</param>
+/// <param name="Checkpoints">Checkpoints set.</param>
+/// <param name="Commands">Commands sent to VICE.</param>
+/// <param name="MetadataCached">Whether register and bank metadata came from the cache.</param>
+/// <param name="Elapsed">Time taken.</param>
+public sealed record MachineState(ImmutableArray<RegisterValue> Registers, ImmutableArray<BankItem> Banks,
+    ImmutableArray<byte> ZeroPage, ImmutableArray<byte> Stack, VicIIState? Vic, SidState? Sid, CiaState? Cia1,
+    CiaState? Cia2, ScreenState? Screen, ImmutableArray<CheckpointInfoResponse> Checkpoints, int Commands,
+    bool MetadataCached, TimeSpan Elapsed)
+{
+    /// <summary>
+    /// Value of the register called <paramref name="name"/>, null when there is none.
+    /// </summary>
+    public ushort? Register(string name) =>
+        Registers.FirstOrDefault(r => string.Equals(r.Name, name, StringComparison.OrdinalIgnoreCase))?.Value;
+}
+
+/// <summary>
+/// A sprite as the VIC-II registers describe it.
+/// </summary>
+public sealed record SpriteState(int Number, bool Enabled, int X, int Y, int Color, bool Multicolor, bool ExpandX,
+    bool ExpandY, bool BehindBackground);
+
+/// <summary>
+/// VIC-II registers $D000-$D02E decoded.
+/// </summary>
+/// <param name="Bank">Start of the 16 KB the VIC-II sees, from CIA 2 port A.</param>
+/// <param name="ScreenAddress">Start of screen memory.</param>
+/// <param name="CharsetAddress">Start of the character set.</param>
+/// <param name="BitmapAddress">Start of the bitmap in bitmap mode.</param>
+/// <param name="RasterLine">Current raster line.</param>
+/// <param name="DisplayEnabled">Whether the screen is on.</param>
+/// <param name="BitmapMode">Whether in bitmap mode.</param>
+/// <param name="ExtendedColor">Whether in extended background color mode.</param>
+/// <param name="MulticolorMode">Whether in multicolor mode.</param>
+/// <param name="Columns">38 or 40 visible columns.</param>
+/// <param name="Rows">24 or 25 visible rows.</param>
+/// <param name="ScrollX">Horizontal fine scroll.</param>
+/// <param name="ScrollY">Vertical fine scroll.</param>
+/// <param name="BorderColor">Border color.</param>
+/// <param name="BackgroundColors">Background colors 0-3.</param>
+/// <param name="SpriteMulticolors">Sprite multicolors 0 and 1.</param>
+/// <param name="InterruptStatus">$D019.</param>
+/// <param name="InterruptMask">$D01A.</param>
+/// <param name="Sprites">The eight sprites.</param>
+public sealed record VicIIState(ushort Bank, ushort ScreenAddress, ushort CharsetAddress, ushort BitmapAddress,
+    int RasterLine, bool DisplayEnabled, bool BitmapMode, bool ExtendedColor, bool MulticolorMode, int Columns,
+    int Rows, int ScrollX, int ScrollY, int BorderColor, ImmutableArray<int> BackgroundColors,
+    ImmutableArray<int> SpriteMulticolors, byte InterruptStatus, byte InterruptMask, ImmutableArray<SpriteState> Sprites)
+{
+    /// <summary>
+    /// Whether the character set is the lower/upper case one of the character ROM.
+    /// </summary>
+    public bool LowercaseCharset => (CharsetAddress & 0x3FFF) == 0x1800 && (Bank & 0x4000) == 0;
+
+    /// <summary>
+    /// Decodes the registers.
+    /// </summary>
+    /// <param name="registers">$D000-$D02E.</param>
+    /// <param name="cia2PortA">$DD00, whose low two bits select the bank.</param>
+    public static VicIIState Decode(ReadOnlySpan<byte> registers, byte cia2PortA)
+    {
+        byte control1 = registers[0x11];
+        byte control2 = registers[0x16];
+        byte memory = registers[0x18];
+        var bank = (ushort)((3 - (cia2PortA & 0x03)) * 0x4000);
+        var sprites = ImmutableArray.CreateBuilder<SpriteState>(8);
+        for (int i = 0; i < 8; i++)
+        {
+            int bit = 1 << i;
+            sprites.Add(new SpriteState(i, (registers[0x15] & bit) != 0,
+                registers[i * 2] | ((registers[0x10] & bit) != 0 ? 0x100 : 0), registers[i * 2 + 1],
+                registers[0x27 + i] & 0x0F, (registers[0x1C] & bit) != 0, (registers[0x1D] & bit) != 0,
+                (registers[0x17] & bit) != 0, (registers[0x1B] & bit) != 0));
+        }
+        return new VicIIState(
+            bank,
+            (ushort)(bank + (memory >> 4) * 0x400),
+            (ushort)(bank + ((memory >> 1) & 0x07) * 0x800),
+            (ushort)(bank + ((memory >> 3) & 0x01) * 0x2000),
+            registers[0x12] | ((control1 & 0x80) << 1),
+            (control1 & 0x10) != 0,
+            (control1 & 0x20) != 0,
+            (control1 & 0x40) != 0,
+            (control2 & 0x10) != 0,
+            (control2 & 0x08) != 0 ? 40 : 38,
+            (control1 & 0x08) != 0 ? 25 : 24,
+            control2 & 0x07,
+            control1 & 0x07,
+            registers[0x20] & 0x0F,
+            [registers[0x21] & 0x0F, registers[0x22] & 0x0F, registers[0x23] & 0x0F, registers[0x24] & 0x0F],
+            [registers[0x25] & 0x0F, registers[0x26] & 0x0F],
+            registers[0x19],
+            registers[0x1A],
+            sprites.MoveToImmutable());
+    }
+}
+
+/// <summary>
+/// A SID voice decoded.
+/// </summary>
+/// <param name="Frequency">16-bit frequency value.</param>
+/// <param name="PulseWidth">12-bit pulse width.</param>
+/// <param name="Waveforms">Selected waveforms: triangle, sawtooth, pulse and/or noise.</param>
+/// <param name="Gate">Whether the envelope is gated on.</param>
+/// <param name="Sync">Whether synced to the previous voice.</param>
+/// <param name="Ring">Whether ring modulated by the previous voice.</param>
+/// <param name="Test">Whether the oscillator is held in test.</param>
+/// <param name="Attack">Attack 0-15.</param>
+/// <param name="Decay">Decay 0-15.</param>
+/// <param name="Sustain">Sustain 0-15.</param>
+/// <param name="Release">Release 0-15.</param>
+public sealed record SidVoice(ushort Frequency, int PulseWidth, ImmutableArray<string> Waveforms, bool Gate, bool Sync,
+    bool Ring, bool Test, int Attack, int Decay, int Sustain, int Release);
+
+/// <summary>
+/// SID registers $D400-$D41C decoded.
+/// </summary>
+/// <remarks>
+/// Most SID registers are write-only on the real chip, VICE reports the last values written.
+/// </remarks>
+/// <param name="Voices">The three voices.</param>
+/// <param name="Cutoff">11-bit filter cutoff.</param>
+/// <param name="Resonance">Filter resonance 0-15.</param>
+/// <param name="FilteredVoices">Voices 1-3 routed through the filter.</param>
+/// <param name="FilterExternal">Whether the external input is filtered.</param>
+/// <param name="FilterModes">Filter modes: low, band and/or high pass.</param>
+/// <param name="Voice3Off">Whether voice 3 is disconnected from the output.</param>
+/// <param name="Volume">Master volume 0-15.</param>
+/// <param name="Oscillator3">Current value of voice 3's oscillator.</param>
+/// <param name="Envelope3">Current value of voice 3's envelope.</param>
+public sealed record SidState(ImmutableArray<SidVoice> Voices, int Cutoff, int Resonance, ImmutableArray<int> FilteredVoices,
+    bool FilterExternal, ImmutableArray<string> FilterModes, bool Voice3Off, int Volume, byte Oscillator3, byte Envelope3)
+{
+    private static readonly string[] WaveformNames = ["triangle", "sawtooth", "pulse", "noise"];
+    private static readonly string[] FilterModeNames = ["low", "band", "high"];
+
+    /// <summary>
+    /// Decodes the registers.
+    /// </summary>
+    /// <param name="registers">$D400-$D41C.</param>
+    public static SidState Decode(ReadOnlySpan<byte> registers)
+    {
+        var voices = ImmutableArray.CreateBuilder<SidVoice>(3);
+        for (int v = 0; v < 3; v++)
+        {
+            var r = registers.Slice(v * 7, 7);
+            byte control = r[4];
+            voices.Add(new SidVoice((ushort)(r[0] | r[1] << 8), r[2] | (r[3] & 0x0F) << 8,
+                Bits(control >> 4, WaveformNames), (control & 0x01) != 0, (control & 0x02) != 0, (control & 0x04) != 0,
+                (control & 0x08) != 0, r[5] >> 4, r[5] & 0x0F, r[6] >> 4, r[6] & 0x0F));
+        }
+        byte routing = registers[0x17];
+        byte mode = registers[0x18];
+        return new SidState(voices.MoveToImmutable(), (registers[0x15] & 0x07) | registers[0x16] << 3, routing >> 4,
+            Enumerable.Range(0, 3).Where(v => (routing & (1 << v)) != 0).Select(v => v + 1).ToImmutableArray(),
+            (routing & 0x08) != 0, Bits(mode >> 4, FilterModeNames), (mode & 0x80) != 0, mode & 0x0F,
+            registers[0x1B], registers[0x1C]);
+    }
+
+    private static ImmutableArray<string> Bits(int bits, string[] names) =>
+        names.Where((_, i) => (bits & (1 << i)) != 0).ToImmutableArray();
+}
+
+/// <summary>
+/// CIA registers decoded.
+/// </summary>
+/// <param name="PortA">Data port A.</param>
+/// <param name="PortB">Data port B.</param>
+/// <param name="DirectionA">Data direction of port A, set bits are outputs.</param>
+/// <param name="DirectionB">Data direction of port B, set bits are outputs.</param>
+/// <param name="TimerA">Timer A counter.</param>
+/// <param name="TimerB">Timer B counter.</param>
+/// <param name="TimerARunning">Whether timer A counts.</param>
+/// <param name="TimerBRunning">Whether timer B counts.</param>
+/// <param name="TimeOfDay">Time of day clock as hh:mm:ss.t with AM/PM.</param>
+/// <param name="InterruptStatus">Interrupt control register as read.</param>
+/// <param name="ControlA">Control register A.</param>
+/// <param name="ControlB">Control register B.</param>
+public sealed record CiaState(byte PortA, byte PortB, byte DirectionA, byte DirectionB, ushort TimerA, ushort TimerB,
+    bool TimerARunning, bool TimerBRunning, string TimeOfDay, byte InterruptStatus, byte ControlA, byte ControlB)
+{
+    /// <summary>
+    /// Decodes the registers.
+    /// </summary>
+    /// <param name="registers">The 16 registers.</param>
+    public static CiaState Decode(ReadOnlySpan<byte> registers)
+    {
+        byte hours = registers[0x0B];
+        var timeOfDay = $"{hours & 0x1F:X2}:{registers[0x0A]:X2}:{registers[0x09]:X2}.{registers[0x08] & 0x0F:X} " +
+            ((hours & 0x80) != 0 ? "PM" : "AM");
+        return new CiaState(registers[0x00], registers[0x01], registers[0x02], registers[0x03],
+            (ushort)(registers[0x04] | registers[0x05] << 8), (ushort)(registers[0x06] | registers[0x07] << 8),
+            (registers[0x0E] & 0x01) != 0, (registers[0x0F] & 0x01) != 0, timeOfDay, registers[0x0D],
+            registers[0x0E], registers[0x0F]);
+    }
+}
+
+/// <summary>
+/// The 40x25 text screen.
+/// </summary>
+/// <param name="Address">Start of screen memory.</param>
+/// <param name="Lines">Screen codes as text, reverse characters shown as normal ones and graphics as '.'.</param>
+/// <param name="Codes">Screen codes.</param>
+/// <param name="Colors">Color RAM, one color per character.</param>
+public sealed record ScreenState(ushort Address, ImmutableArray<string> Lines, ImmutableArray<byte> Codes,
+    ImmutableArray<byte> Colors)
+{
+    /// <summary>
+    /// Decodes screen codes to text.
+    /// </summary>
+    /// <param name="address">Start of screen memory.</param>
+    /// <param name="codes">1000 screen codes.</param>
+    /// <param name="colors">1000 color RAM nibbles.</param>
+    /// <param name="lowercase">Whether the lower/upper case character set is in use.</param>
+    public static ScreenState Decode(ushort address, ReadOnlySpan<byte> codes, ReadOnlySpan<byte> colors, bool lowercase)
+    {
+        var lines = ImmutableArray.CreateBuilder<string>(MachineStateReader.ScreenRows);
+        var line = new StringBuilder(MachineStateReader.ScreenColumns);
+        for (int row = 0; row < MachineStateReader.ScreenRows; row++)
+        {
+            line.Clear();
+            foreach (byte code in codes.Slice(row * MachineStateReader.ScreenColumns, MachineStateReader.ScreenColumns))
+            {
+                line.Append(ToChar(code, lowercase));
+            }
+            lines.Add(line.ToString());
+        }
+        var colorNibbles = new byte[colors.Length];
+        for (int i = 0; i < colors.Length; i++)
+        {
+            colorNibbles[i] = (byte)(colors[i] & 0x0F);
+        }
+        return new ScreenState(address, lines.MoveToImmutable(), codes.ToImmutableArray(),
+            ImmutableArray.Create(colorNibbles));
+    }
+
+    /// <summary>
+    /// Screen code as the nearest ASCII character.
+    /// </summary>
+    internal static char ToChar(byte code, bool lowercase)
+    {
+        int c = code & 0x7F;
+        return c switch
+        {
+            0x00 => '@',
+            >= 0x01 and <= 0x1A => (char)((lowercase ? 'a' : 'A') + c - 1),
+            0x1B => '[',
+            0x1C => '\\',
+            0x1D => ']',
+            0x1E => '^',
+            0x1F => '_',
+            >= 0x20 and <= 0x3F => (char)c,
+            >= 0x41 and <= 0x5A when lowercase => (char)('A' + c - 0x41),
+            _ => '.',
+        };
+    }
+}
@@ -0,0 +1,295 @@
+using System.Text;
+
+namespace ViceMCP;
+
+/// <summary>
+/// Turns memory bytes into text. Data can be appended in chunks as reads complete; the result is the same
+/// as encoding the whole range at once.
+/// </summary>
+/// <remarks>
+/// <list type="bullet">
+/// <item><c>hex</c>: dash separated bytes, <c>A9-00-8D</c> (default).</item>
+/// <item><c>base64</c>: standard base64 of the bytes.</item>
+/// <item><c>rle</c>: space separated bytes where runs of 3 or more are written as <c>byte*count</c>
+/// with a decimal count, <c>A9 00*250 60</c>.</item>
+/// <item><c>hexdump</c>: 16 bytes per line with address and ASCII columns. Lines identical to the previous
+/// one are collapsed into a single <c>*</c> and the last line holds the address after the range.</item>
+/// </list>
+/// </remarks>
+public abstract class MemoryEncoder
+{
+    public const string Hex = "hex";
+    public const string Base64 = "base64";
+    public const string Rle = "rle";
+    public const string Hexdump = "hexdump";
+
+    public static IReadOnlyList<string> Encodings { get; } = [Hex, Base64, Rle, Hexdump];
+
+    private const string HexDigits = "0123456789ABCDEF";
+
+    protected readonly StringBuilder Output;
+
+    private MemoryEncoder(int capacity)
+    {
+        Output = new StringBuilder(capacity);
+    }
+
+    /// <summary>
+    /// Tells whether <paramref name="encoding"/> names a supported encoding. Null and empty mean <c>hex</c>.
+    /// </summary>
+    public static bool IsSupported(string? encoding) =>
+        string.IsNullOrWhiteSpace(encoding) || Encodings.Contains(encoding.Trim().ToLowerInvariant());
+
+    /// <summary>
+    /// Creates an encoder for a range.
+    /// </summary>
+    /// <param name="encoding">One of <see cref="Encodings"/>, null or empty for <c>hex</c>.</param>
+    /// <param name="startAddress">Address of the first byte, shown by <c>hexdump</c>.</param>
+    /// <param name="length">Expected number of bytes, used to size the output.</param>
+    /// <exception cref="ArgumentException">Thrown when the encoding is not supported.</exception>
+    public static MemoryEncoder Create(string? encoding, int startAddress, int length)
+    {
+        var name = string.IsNullOrWhiteSpace(encoding) ? Hex : encoding.Trim().ToLowerInvariant();
+        return name switch
+        {
+            Hex => new HexEncoder(length),
+            Base64 => new Base64Encoder(length),
+            Rle => new RleEncoder(length),
+            Hexdump => new HexdumpEncoder(startAddress, length),
+            _ => throw new ArgumentException($"Unknown encoding '{encoding}', expected one of: {string.Join(", ", Encodings)}"),
+        };
+    }
+
+    /// <summary>
+    /// Encodes a whole range at once.
+    /// </summary>
+    /// <exception cref="ArgumentException">Thrown when the encoding is not supported.</exception>
+    public static string Encode(ReadOnlySpan<byte> data, string? encoding, int startAddress = 0)
+    {
+        var encoder = Create(encoding, startAddress, data.Length);
+        encoder.Append(data);
+        return encoder.Complete();
+    }
+
+    /// <summary>
+    /// Appends the next bytes of the range.
+    /// </summary>
+    public abstract void Append(ReadOnlySpan<byte> data);
+
+    /// <summary>
+    /// Flushes pending bytes and returns the encoded text.
+    /// </summary>
+    public virtual string Complete() => Output.ToString();
+
+    private void AppendHex(byte value)
+    {
+        Output.Append(HexDigits[value >> 4]).Append(HexDigits[value & 0x0F]);
+    }
+
+    private sealed class HexEncoder(int length) : MemoryEncoder(Math.Max(0, length * 3 - 1))
+    {
+        public override void Append(ReadOnlySpan<byte> data)
+        {
+            foreach (var value in data)
+            {
+                if (Output.Length > 0)
+                {
+                    Output.Append('-');
+                }
+                AppendHex(value);
+            }
+        }
+    }
+
+    private sealed class Base64Encoder(int length) : MemoryEncoder((length + 2) / 3 * 4)
+    {
+        // Bytes not yet encoded because base64 works on groups of 3
+        private readonly byte[] _pending = new byte[3];
+        private int _pendingCount;
+
+        public override void Append(ReadOnlySpan<byte> data)
+        {
+            if (_pendingCount > 0)
+            {
+                int take = Math.Min(3 - _pendingCount, data.Length);
+                data[..take].CopyTo(_pending.AsSpan(_pendingCount));
+                _pendingCount += take;
+                data = data[take..];
+                if (_pendingCount < 3)
+                {
+                    return;
+                }
+                Output.Append(Convert.ToBase64String(_pending));
+                _pendingCount = 0;
+            }
+
+            int whole = data.Length - data.Length % 3;
+            if (whole > 0)
+            {
+                Output.Append(Convert.ToBase64String(data[..whole]));
+            }
+            data[whole..].CopyTo(_pending);
+            _pendingCount = data.Length - whole;
+        }
+
+        public override string Complete()
+        {
+            if (_pendingCount > 0)
+            {
+                Output.Append(Convert.ToBase64String(_pending.AsSpan(0, _pendingCount)));
+                _pendingCount = 0;
+            }
+            return base.Complete();
+        }
+    }
+
+    private sealed class RleEncoder(int length) : MemoryEncoder(Math.Min(length * 3, 4096))
+    {
+        private const int MinRun = 3;
+
+        private byte _value;
+        private int _count;
+
+        public override void Append(ReadOnlySpan<byte> data)
+        {
+            while (!data.IsEmpty)
+            {
+                if (_count == 0)
+                {
+                    _value = data[0];
+                }
+                int run = data.IndexOfAnyExcept(_value);
+                if (run < 0)
+                {
+                    _count += data.Length;
+                    return;
+                }
+                _count += run;
+                data = data[run..];
+                if (_count > 0)
+                {
+                    Flush();
+                }
+            }
+        }
+
+        public override string Complete()
+        {
+            Flush();
+            return base.Complete();
+        }
+
+        private void Flush()
+        {
+            if (_count >= MinRun)
+            {
+                Separate();
+                AppendHex(_value);
+                Output.Append('*').Append(_count);
+            }
+            else
+            {
+                for (int i = 0; i < _count; i++)
+                {
+                    Separate();
+                    AppendHex(_value);
+                }
+            }
+            _count = 0;
+        }
+
+        private void Separate()
+        {
+            if (Output.Length > 0)
+            {
+                Output.Append(' ');
+            }
+        }
+    }
+
+    private sealed class HexdumpEncoder(int startAddress, int length) : MemoryEncoder(Math.Min((length / 16 + 2) * 74, 16384))
+    {
+        private const int LineLength = 16;
+
+        private readonly byte[] _line = new byte[LineLength];
+        private readonly byte[] _previous = new byte[LineLength];
+        private int _lineCount;
+        private int _offset;
+        private bool _hasPrevious;
+        private bool _collapsed;
+
+        public override void Append(ReadOnlySpan<byte> data)
+        {
+            while (!data.IsEmpty)
+            {
+                int take = Math.Min(LineLength - _lineCount, data.Length);
+                data[..take].CopyTo(_line.AsSpan(_lineCount));
+                _lineCount += take;
+                data = data[take..];
+                if (_lineCount == LineLength)
+                {
+                    FlushLine();
+                }
+            }
+        }
+
+        public override string Complete()
+        {
+            if (_lineCount > 0)
+            {
+                FlushLine();
+            }
+            Output.Append((startAddress + _offset).ToString("X4"));
+            return base.Complete();
+        }
+
+        private void FlushLine()
+        {
+            var line = _line.AsSpan(0, _lineCount);
+            if (_hasPrevious && _lineCount == LineLength && line.SequenceEqual(_previous))
+            {
+                if (!_collapsed)
+                {
+                    Output.Append("*\n");
+                    _collapsed = true;
+                }
+            }
+            else
+            {
+                WriteLine(line);
+                line.CopyTo(_previous);
+                _hasPrevious = true;
+                _collapsed = false;
+            }
+            _offset += _lineCount;
+            _lineCount = 0;
+        }
+
+        private void WriteLine(ReadOnlySpan<byte> line)
+        {
+            Output.Append((startAddress + _offset).ToString("X4")).Append("  ");
+            for (int i = 0; i < LineLength; i++)
+            {
+                if (i == LineLength / 2)
+                {
+                    Output.Append(' ');
+                }
+                if (i < line.Length)
+                {
+                    AppendHex(line[i]);
+                    Output.Append(' ');
+                }
+                else
+                {
+                    Output.Append("   ");
+                }
+            }
+            Output.Append(" |");
+            foreach (var value in line)
+            {
+                Output.Append(value is >= 0x20 and < 0x7F ? (char)value : '.');
+            }
+            Output.Append("|\n");
+        }
+    }
+}
@@ -0,0 +1,203 @@
+using System.Globalization;
+
+namespace ViceMCP;
+
+/// <summary>
+/// Byte pattern for memory searches. Each byte carries a mask and matches when (memory &amp; mask) == value.
+/// </summary>
+/// <remarks>
+/// Tokens are hex bytes separated by spaces, dashes or commas: <c>A9</c> matches exactly, <c>??</c> matches any
+/// byte, <c>A?</c> or <c>?9</c> match a single nibble and <c>A9/F0</c> gives an explicit mask.
+/// </remarks>
+public sealed class MemoryPattern
+{
+    private static readonly char[] Separators = [' ', '-', ','];
+    private static readonly char[] PatternSeparators = [';', '|'];
+
+    private readonly int _anchorOffset;
+    private readonly int _anchorLength;
+
+    public string Text { get; }
+    public byte[] Values { get; }
+    public byte[] Masks { get; }
+    public int Length => Values.Length;
+
+    private MemoryPattern(string text, byte[] values, byte[] masks)
+    {
+        Text = text;
+        Values = values;
+        Masks = masks;
+
+        // The longest run of exact bytes drives the vectorized IndexOf, the rest is verified per candidate
+        for (int i = 0; i < masks.Length;)
+        {
+            if (masks[i] != 0xFF)
+            {
+                i++;
+                continue;
+            }
+            int runStart = i;
+            while (i < masks.Length && masks[i] == 0xFF)
+            {
+                i++;
+            }
+            if (i - runStart > _anchorLength)
+            {
+                _anchorOffset = runStart;
+                _anchorLength = i - runStart;
+            }
+        }
+    }
+
+    /// <summary>
+    /// Parses a single pattern.
+    /// </summary>
+    /// <exception cref="ArgumentException">Thrown when the pattern is empty or a token is not valid.</exception>
+    public static MemoryPattern Parse(string text)
+    {
+        var tokens = text.Split(Separators, StringSplitOptions.RemoveEmptyEntries);
+        if (tokens.Length == 0)
+        {
+            throw new ArgumentException("Search pattern must contain at least one byte");
+        }
+
+        var values = new byte[tokens.Length];
+        var masks = new byte[tokens.Length];
+        for (int i = 0; i < tokens.Length; i++)
+        {
+            if (!TryParseToken(tokens[i], out values[i], out masks[i]))
+            {
+                throw new ArgumentException($"Invalid pattern byte '{tokens[i]}', expected hex (A9), wildcard (??, A?) or value/mask (A9/F0)");
+            }
+        }
+        return new MemoryPattern(text.Trim(), values, masks);
+    }
+
+    /// <summary>
+    /// Parses several patterns separated by ';' or '|'.
+    /// </summary>
+    /// <exception cref="ArgumentException">Thrown when no pattern is given or one of them is not valid.</exception>
+    public static IReadOnlyList<MemoryPattern> ParseMany(string text)
+    {
+        var patterns = text.Split(PatternSeparators, StringSplitOptions.RemoveEmptyEntries | StringSplitOptions.TrimEntries)
+            .Select(Parse)
+            .ToList();
+        if (patterns.Count == 0)
+        {
+            throw new ArgumentException("Search pattern must contain at least one byte");
+        }
+        return patterns;
+    }
+
+    /// <summary>
+    /// Tells whether the pattern matches <paramref name="data"/> at <paramref name="offset"/>.
+    /// </summary>
+    public bool IsMatch(ReadOnlySpan<byte> data, int offset)
+    {
+        if (offset < 0 || offset + Length > data.Length)
+        {
+            return false;
+        }
+        for (int i = 0; i < Length; i++)
+        {
+            if ((data[offset + i] & Masks[i]) != Values[i])
+            {
+                return false;
+            }
+        }
+        return true;
+    }
+
+    /// <summary>
+    /// Finds match offsets in <paramref name="data"/>, overlapping matches included.
+    /// </summary>
+    /// <param name="data">Memory to scan.</param>
+    /// <param name="maxResults">Stop after this many matches.</param>
+    /// <returns>Offsets of the matches in ascending order.</returns>
+    public List<int> FindAll(ReadOnlySpan<byte> data, int maxResults)
+    {
+        var offsets = new List<int>();
+        int last = data.Length - Length;
+        if (last < 0 || maxResults <= 0)
+        {
+            return offsets;
+        }
+
+        if (_anchorLength == 0)
+        {
+            for (int offset = 0; offset <= last && offsets.Count < maxResults; offset++)
+            {
+                if (IsMatch(data, offset))
+                {
+                    offsets.Add(offset);
+                }
+            }
+            return offsets;
+        }
+
+        // Index in the window is the candidate start: the anchor of a match at offset s sits at s + _anchorOffset
+        var anchor = Values.AsSpan(_anchorOffset, _anchorLength);
+        var window = data.Slice(_anchorOffset, last + _anchorLength);
+        int from = 0;
+        while (from <= last)
+        {
+            int index = window[from..].IndexOf(anchor);
+            if (index < 0)
+            {
+                break;
+            }
+            int start = from + index;
+            if (IsMatch(data, start))
+            {
+                offsets.Add(start);
+                if (offsets.Count >= maxResults)
+                {
+                    break;
+                }
+            }
+            from = start + 1;
+        }
+        return offsets;
+    }
+
+    private static bool TryParseToken(string token, out byte value, out byte mask)
+    {
+        value = 0;
+        mask = 0;
+        int slash = token.IndexOf('/');
+        if (slash >= 0)
+        {
+            if (!byte.TryParse(token.AsSpan(0, slash), NumberStyles.AllowHexSpecifier, CultureInfo.InvariantCulture, out value)
+                || !byte.TryParse(token.AsSpan(slash + 1), NumberStyles.AllowHexSpecifier, CultureInfo.InvariantCulture, out mask))
+            {
+                return false;
+            }
+            value &= mask;
+            return true;
+        }
+
+        if (token.Length is < 1 or > 2)
+        {
+            return false;
+        }
+        if (token.Length == 1)
+        {
+            token = token == "?" ? "??" : "0" + token;
+        }
+        for (int i = 0; i < 2; i++)
+        {
+            int shift = i == 0 ? 4 : 0;
+            if (token[i] == '?')
+            {
+                continue;
+            }
+            if (!Uri.IsHexDigit(token[i]))
+            {
+                return false;
+            }
+            value |= (byte)(Convert.ToByte(token[i].ToString(), 16) << shift);
+            mask |= (byte)(0x0F << shift);
+        }
+        return true;
+    }
+}
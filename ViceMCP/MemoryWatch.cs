@@ -0,0 +1,376 @@
+using System.Globalization;
+using ViceMCP.ViceBridge;
+using ViceMCP.ViceBridge.Commands;
+using ViceMCP.ViceBridge.Services.Abstract;
+using ViceMCP.ViceBridge.Shared;
+
+namespace ViceMCP;
+
+/// <summary>
+/// Samples memory ranges of one emulator at an interval and/or whenever it stops, and queues the bytes that
+/// changed since the previous sample.
+/// </summary>
+/// <remarks>
+/// A sample is a single burst of reads, ranges close to each other are read together, so it costs one stop and
+/// one auto-resume of the emulator. The queue is bounded: when the client polls too rarely the oldest changes
+/// are dropped and counted in <see cref="Dropped"/>.
+/// </remarks>
+public sealed class MemoryWatch : IAsyncDisposable
+{
+    /// <summary>
+    /// Default number of queued changes.
+    /// </summary>
+    public const int DefaultCapacity = 1000;
+    // Ranges separated by fewer bytes than this are read with one command
+    private const int MergeGap = 64;
+    private static readonly char[] RangeSeparators = [',', ';', ' '];
+
+    private readonly IViceBridge _bridge;
+    private readonly (ushort Start, ushort End)[] _reads;
+    // Read and offset into it of each range
+    private readonly (int Read, int Offset)[] _locations;
+    private readonly byte[][] _previous;
+    private readonly Queue<MemoryChange> _changes = new();
+    private readonly object _lock = new();
+    private readonly CancellationTokenSource _cts = new();
+    private readonly Task? _timerLoop;
+    private int _sampling;
+    private long _samples;
+    private long _changedBytes;
+    private long _dropped;
+    private long _failures;
+
+    /// <summary>
+    /// Creates a watch and starts sampling.
+    /// </summary>
+    /// <param name="id">Id the watch is polled by.</param>
+    /// <param name="instanceId">Pool instance the bridge belongs to.</param>
+    /// <param name="bridge">Bridge of the watched emulator.</param>
+    /// <param name="ranges">Inclusive address ranges of main memory.</param>
+    /// <param name="interval">Time between samples, null to sample only on stops.</param>
+    /// <param name="onStop">Also sample whenever the emulator reports it stopped.</param>
+    /// <param name="capacity">Number of changes queued before the oldest are dropped.</param>
+    /// <exception cref="ArgumentException">Thrown when there is nothing to watch or no trigger to sample on.</exception>
+    public MemoryWatch(int id, int instanceId, IViceBridge bridge, IReadOnlyList<(ushort Start, ushort End)> ranges,
+        TimeSpan? interval, bool onStop, int capacity = DefaultCapacity)
+    {
+        if (ranges.Count == 0)
+        {
+            throw new ArgumentException("At least one range is required");
+        }
+        if (interval == null && !onStop)
+        {
+            throw new ArgumentException("A watch needs an interval, sampling on stops, or both");
+        }
+        if (capacity < 1)
+        {
+            throw new ArgumentException("Capacity must be at least 1");
+        }
+
+        Id = id;
+        InstanceId = instanceId;
+        Ranges = ranges.ToArray();
+        Interval = interval;
+        OnStop = onStop;
+        Capacity = capacity;
+        StartedAt = DateTime.UtcNow;
+        _bridge = bridge;
+        (_reads, _locations) = PlanReads(Ranges);
+        _previous = Ranges.Select(r => new byte[r.End - r.Start + 1]).ToArray();
+
+        if (onStop)
+        {
+            _bridge.RunStateChanged += OnRunStateChanged;
+        }
+        if (interval is { } period)
+        {
+            _timerLoop = RunTimerAsync(period, _cts.Token);
+        }
+    }
+
+    public int Id { get; }
+    public int InstanceId { get; }
+    public IReadOnlyList<(ushort Start, ushort End)> Ranges { get; }
+    public TimeSpan? Interval { get; }
+    public bool OnStop { get; }
+    public int Capacity { get; }
+    public DateTime StartedAt { get; }
+    public int ReadsPerSample => _reads.Length;
+    public int BytesPerSample => _reads.Sum(r => r.End - r.Start + 1);
+    /// <summary>
+    /// Samples taken, the first one is the baseline the later ones are compared with.
+    /// </summary>
+    public long Samples => Interlocked.Read(ref _samples);
+    public long ChangedBytes => Interlocked.Read(ref _changedBytes);
+    /// <summary>
+    /// Changes dropped because the queue was full.
+    /// </summary>
+    public long Dropped => Interlocked.Read(ref _dropped);
+    public long Failures => Interlocked.Read(ref _failures);
+    public string? LastError { get; private set; }
+
+    /// <summary>
+    /// Number of changes waiting for <see cref="Drain"/>.
+    /// </summary>
+    public int Pending
+    {
+        get
+        {
+            lock (_lock)
+            {
+                return _changes.Count;
+            }
+        }
+    }
+
+    /// <summary>
+    /// Parses ranges like <c>c000-c0ff, d020, $a0-$a2</c>: hex addresses or inclusive ranges separated by commas,
+    /// semicolons or spaces.
+    /// </summary>
+    /// <exception cref="ArgumentException">Thrown when a range is not valid or there is none.</exception>
+    public static List<(ushort Start, ushort End)> ParseRanges(string text)
+    {
+        var ranges = new List<(ushort Start, ushort End)>();
+        foreach (var token in text.Split(RangeSeparators, StringSplitOptions.RemoveEmptyEntries))
+        {
+            var bounds = token.Split('-');
+            if (bounds.Length > 2 || !TryParseAddress(bounds[0], out var start))
+            {
+                throw new ArgumentException($"Invalid range '{token}', expected an address or start-end in hex");
+            }
+            var end = start;
+            if (bounds.Length == 2 && !TryParseAddress(bounds[1], out end))
+            {
+                throw new ArgumentException($"Invalid range '{token}', expected an address or start-end in hex");
+            }
+            if (end < start)
+            {
+                throw new ArgumentException($"Invalid range '{token}', end is before start");
+            }
+            ranges.Add((start, end));
+        }
+        if (ranges.Count == 0)
+        {
+            throw new ArgumentException("At least one range is required");
+        }
+        return ranges;
+    }
+
+    private static bool TryParseAddress(string text, out ushort address)
+    {
+        text = text.Trim();
+        if (text.StartsWith("0x", StringComparison.OrdinalIgnoreCase))
+        {
+            text = text[2..];
+        }
+        else if (text.StartsWith('$'))
+        {
+            text = text[1..];
+        }
+        return ushort.TryParse(text, NumberStyles.HexNumber, CultureInfo.InvariantCulture, out address);
+    }
+
+    /// <summary>
+    /// Merges ranges into as few reads as possible and locates each range within its read.
+    /// </summary>
+    internal static ((ushort Start, ushort End)[] Reads, (int Read, int Offset)[] Locations) PlanReads(
+        IReadOnlyList<(ushort Start, ushort End)> ranges)
+    {
+        var reads = new List<(ushort Start, ushort End)>();
+        foreach (var range in ranges.OrderBy(r => r.Start))
+        {
+            if (reads.Count > 0 && range.Start <= reads[^1].End + MergeGap)
+            {
+                reads[^1] = (reads[^1].Start, Math.Max(reads[^1].End, range.End));
+            }
+            else
+            {
+                reads.Add(range);
+            }
+        }
+        var locations = ranges
+            .Select(r =>
+            {
+                int read = reads.FindIndex(x => x.Start <= r.Start && r.End <= x.End);
+                return (read, r.Start - reads[read].Start);
+            })
+            .ToArray();
+        return (reads.ToArray(), locations);
+    }
+
+    /// <summary>
+    /// Takes a sample and queues the changes since the previous one.
+    /// </summary>
+    /// <returns>False when a sample was already running and this one was skipped.</returns>
+    /// <exception cref="InvalidOperationException">Thrown when a read fails.</exception>
+    public async Task<bool> SampleAsync(CancellationToken ct = default)
+    {
+        // Skipping while a sample runs also ignores the stop VICE reports for the sample's own reads
+        if (Interlocked.Exchange(ref _sampling, 1) == 1)
+        {
+            return false;
+        }
+        var memories = new ManagedBuffer?[_reads.Length];
+        try
+        {
+            var commands = _reads
+                .Select(r => _bridge.EnqueueCommand(new MemoryGetCommand(0, r.Start, r.End, MemSpace.MainMemory, 0),
+                    CommandPriority.Bulk, ct: ct))
+                .ToArray();
+            for (int i = 0; i < commands.Length; i++)
+            {
+                var result = await commands[i].Response.WaitAsync(ct);
+                if (!result.IsSuccess || result.Response?.Memory is not { } memory)
+                {
+                    throw new InvalidOperationException($"Failed to read memory: {result.ErrorCode}");
+                }
+                memories[i] = memory;
+                int expected = _reads[i].End - _reads[i].Start + 1;
+                if (memory.Size < expected)
+                {
+                    throw new InvalidOperationException($"Memory read returned {memory.Size} of {expected} bytes");
+                }
+            }
+            Compare(memories, DateTime.UtcNow);
+            return true;
+        }
+        finally
+        {
+            foreach (var memory in memories)
+            {
+                memory?.Dispose();
+            }
+            Volatile.Write(ref _sampling, 0);
+        }
+    }
+
+    /// <summary>
+    /// Compares a sample with the previous one in place, queueing each run of changed bytes.
+    /// </summary>
+    private void Compare(ManagedBuffer?[] memories, DateTime timestamp)
+    {
+        lock (_lock)
+        {
+            long sample = Interlocked.Increment(ref _samples);
+            for (int r = 0; r < Ranges.Count; r++)
+            {
+                var (read, offset) = _locations[r];
+                var previous = _previous[r].AsSpan();
+                var current = memories[read]!.Value.Span.Slice(offset, previous.Length);
+                if (sample == 1)
+                {
+                    current.CopyTo(previous);
+                    continue;
+                }
+                int i = 0;
+                while (i < previous.Length)
+                {
+                    i += current[i..].CommonPrefixLength(previous[i..]);
+                    if (i == previous.Length)
+                    {
+                        break;
+                    }
+                    int runStart = i;
+                    while (i < previous.Length && current[i] != previous[i])
+                    {
+                        i++;
+                    }
+                    var change = new MemoryChange(timestamp, sample, (ushort)(Ranges[r].Start + runStart),
+                        previous[runStart..i].ToArray(), current[runStart..i].ToArray());
+                    current[runStart..i].CopyTo(previous[runStart..]);
+                    _changedBytes += i - runStart;
+                    if (_changes.Count == Capacity)
+                    {
+                        _changes.Dequeue();
+                        _dropped++;
+                    }
+                    _changes.Enqueue(change);
+                }
+            }
+        }
+    }
+
+    /// <summary>
+    /// Removes and returns up to <paramref name="max"/> queued changes, oldest first.
+    /// </summary>
+    public List<MemoryChange> Drain(int max)
+    {
+        lock (_lock)
+        {
+            var changes = new List<MemoryChange>(Math.Min(max, _changes.Count));
+            while (changes.Count < max && _changes.TryDequeue(out var change))
+            {
+                changes.Add(change);
+            }
+            return changes;
+        }
+    }
+
+    private async Task RunTimerAsync(TimeSpan interval, CancellationToken ct)
+    {
+        using var timer = new PeriodicTimer(interval);
+        try
+        {
+            while (await timer.WaitForNextTickAsync(ct))
+            {
+                await SampleSafelyAsync(ct);
+            }
+        }
+        catch (OperationCanceledException)
+        {
+            // Watch stopped
+        }
+    }
+
+    private void OnRunStateChanged(object? sender, RunStateChangedEventArgs e)
+    {
+        if (e.RunState == EmulatorRunState.Stopped && !_cts.IsCancellationRequested)
+        {
+            _ = SampleSafelyAsync(_cts.Token);
+        }
+    }
+
+    /// <summary>
+    /// Takes a sample in the background, a failed one is counted and the watch keeps going.
+    /// </summary>
+    private async Task SampleSafelyAsync(CancellationToken ct)
+    {
+        try
+        {
+            await SampleAsync(ct);
+        }
+        catch (OperationCanceledException) when (ct.IsCancellationRequested)
+        {
+            // Watch stopped
+        }
+        catch (Exception ex)
+        {
+            Interlocked.Increment(ref _failures);
+            LastError = ex.Message;
+        }
+    }
+
+    public async ValueTask DisposeAsync()
+    {
+        if (OnStop)
+        {
+            _bridge.RunStateChanged -= OnRunStateChanged;
+        }
+        _cts.Cancel();
+        if (_timerLoop != null)
+        {
+            await _timerLoop;
+        }
+        _cts.Dispose();
+    }
+}
+
+/// <summary>
+/// A run of bytes a <see cref="MemoryWatch"/> saw change between two samples.
+/// </summary>
+/// <param name="Timestamp">When the sample that saw the change completed.</param>
+/// <param name="Sample">Number of that sample.</param>
+/// <param name="Address">Address of the first changed byte.</param>
+/// <param name="OldValues">Values in the previous sample.</param>
+/// <param name="NewValues">Values in this sample.</param>
+public sealed record MemoryChange(DateTime Timestamp, long Sample, ushort Address, byte[] OldValues, byte[] NewValues);
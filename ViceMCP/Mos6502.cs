@@ -0,0 +1,240 @@
+namespace ViceMCP;
+
+/// <summary>
+/// Addressing modes of the 6502 family, which decide an instruction's length and operand syntax.
+/// </summary>
+public enum AddressingMode : byte
+{
+    Implied,
+    Accumulator,
+    Immediate,
+    ZeroPage,
+    ZeroPageX,
+    ZeroPageY,
+    IndirectX,
+    IndirectY,
+    Absolute,
+    AbsoluteX,
+    AbsoluteY,
+    Indirect,
+    Relative,
+    /// <summary>
+    /// <c>(zp)</c>, 65C02 only.
+    /// </summary>
+    ZeroPageIndirect,
+    /// <summary>
+    /// <c>(abs,X)</c>, 65C02 only.
+    /// </summary>
+    AbsoluteIndexedIndirect,
+    /// <summary>
+    /// Zero page address and branch offset of BBR and BBS, 65C02 only.
+    /// </summary>
+    ZeroPageRelative,
+}
+
+/// <summary>
+/// CPUs whose opcode tables <see cref="Mos6502"/> decodes.
+/// </summary>
+public enum CpuVariant : byte
+{
+    /// <summary>
+    /// NMOS 6502 and the 6510 and 8502 derived from it, which share its opcodes.
+    /// </summary>
+    Nmos6502,
+    /// <summary>
+    /// CMOS 65C02 with the Rockwell and WDC bit instructions, WAI and STP.
+    /// </summary>
+    Cmos65C02,
+}
+
+/// <summary>
+/// A decoded opcode.
+/// </summary>
+/// <param name="Mnemonic">Upper case mnemonic.</param>
+/// <param name="Mode">Addressing mode.</param>
+/// <param name="Illegal">Whether the opcode is undocumented on the CPU it was decoded for.</param>
+public readonly record struct OpcodeInfo(string Mnemonic, AddressingMode Mode, bool Illegal)
+{
+    /// <summary>
+    /// Instruction length in bytes, including the opcode.
+    /// </summary>
+    public int Length => Mos6502.OperandLength(Mode) + 1;
+}
+
+/// <summary>
+/// Opcode tables of the NMOS 6502/6510 as used in the C64, including the undocumented opcodes with the names
+/// VICE's monitor uses, and of the 65C02.
+/// </summary>
+public static class Mos6502
+{
+    // Indexed by opcode, '*' marks undocumented ones
+    private static readonly string[] Table =
+    [
+        "BRK imp", "ORA izx", "*JAM imp", "*SLO izx", "*NOP zp", "ORA zp", "ASL zp", "*SLO zp",
+        "PHP imp", "ORA imm", "ASL acc", "*ANC imm", "*NOP abs", "ORA abs", "ASL abs", "*SLO abs",
+        "BPL rel", "ORA izy", "*JAM imp", "*SLO izy", "*NOP zpx", "ORA zpx", "ASL zpx", "*SLO zpx",
+        "CLC imp", "ORA aby", "*NOP imp", "*SLO aby", "*NOP abx", "ORA abx", "ASL abx", "*SLO abx",
+        "JSR abs", "AND izx", "*JAM imp", "*RLA izx", "BIT zp", "AND zp", "ROL zp", "*RLA zp",
+        "PLP imp", "AND imm", "ROL acc", "*ANC imm", "BIT abs", "AND abs", "ROL abs", "*RLA abs",
+        "BMI rel", "AND izy", "*JAM imp", "*RLA izy", "*NOP zpx", "AND zpx", "ROL zpx", "*RLA zpx",
+        "SEC imp", "AND aby", "*NOP imp", "*RLA aby", "*NOP abx", "AND abx", "ROL abx", "*RLA abx",
+        "RTI imp", "EOR izx", "*JAM imp", "*SRE izx", "*NOP zp", "EOR zp", "LSR zp", "*SRE zp",
+        "PHA imp", "EOR imm", "LSR acc", "*ALR imm", "JMP abs", "EOR abs", "LSR abs", "*SRE abs",
+        "BVC rel", "EOR izy", "*JAM imp", "*SRE izy", "*NOP zpx", "EOR zpx", "LSR zpx", "*SRE zpx",
+        "CLI imp", "EOR aby", "*NOP imp", "*SRE aby", "*NOP abx", "EOR abx", "LSR abx", "*SRE abx",
+        "RTS imp", "ADC izx", "*JAM imp", "*RRA izx", "*NOP zp", "ADC zp", "ROR zp", "*RRA zp",
+        "PLA imp", "ADC imm", "ROR acc", "*ARR imm", "JMP ind", "ADC abs", "ROR abs", "*RRA abs",
+        "BVS rel", "ADC izy", "*JAM imp", "*RRA izy", "*NOP zpx", "ADC zpx", "ROR zpx", "*RRA zpx",
+        "SEI imp", "ADC aby", "*NOP imp", "*RRA aby", "*NOP abx", "ADC abx", "ROR abx", "*RRA abx",
+        "*NOP imm", "STA izx", "*NOP imm", "*SAX izx", "STY zp", "STA zp", "STX zp", "*SAX zp",
+        "DEY imp", "*NOP imm", "TXA imp", "*ANE imm", "STY abs", "STA abs", "STX abs", "*SAX abs",
+        "BCC rel", "STA izy", "*JAM imp", "*SHA izy", "STY zpx", "STA zpx", "STX zpy", "*SAX zpy",
+        "TYA imp", "STA aby", "TXS imp", "*SHS aby", "*SHY abx", "STA abx", "*SHX aby", "*SHA aby",
+        "LDY imm", "LDA izx", "LDX imm", "*LAX izx", "LDY zp", "LDA zp", "LDX zp", "*LAX zp",
+        "TAY imp", "LDA imm", "TAX imp", "*LXA imm", "LDY abs", "LDA abs", "LDX abs", "*LAX abs",
+        "BCS rel", "LDA izy", "*JAM imp", "*LAX izy", "LDY zpx", "LDA zpx", "LDX zpy", "*LAX zpy",
+        "CLV imp", "LDA aby", "TSX imp", "*LAS aby", "LDY abx", "LDA abx", "LDX aby", "*LAX aby",
+        "CPY imm", "CMP izx", "*NOP imm", "*DCP izx", "CPY zp", "CMP zp", "DEC zp", "*DCP zp",
+        "INY imp", "CMP imm", "DEX imp", "*SBX imm", "CPY abs", "CMP abs", "DEC abs", "*DCP abs",
+        "BNE rel", "CMP izy", "*JAM imp", "*DCP izy", "*NOP zpx", "CMP zpx", "DEC zpx", "*DCP zpx",
+        "CLD imp", "CMP aby", "*NOP imp", "*DCP aby", "*NOP abx", "CMP abx", "DEC abx", "*DCP abx",
+        "CPX imm", "SBC izx", "*NOP imm", "*ISB izx", "CPX zp", "SBC zp", "INC zp", "*ISB zp",
+        "INX imp", "SBC imm", "NOP imp", "*SBC imm", "CPX abs", "SBC abs", "INC abs", "*ISB abs",
+        "BEQ rel", "SBC izy", "*JAM imp", "*ISB izy", "*NOP zpx", "SBC zpx", "INC zpx", "*ISB zpx",
+        "SED imp", "SBC aby", "*NOP imp", "*ISB aby", "*NOP abx", "SBC abx", "INC abx", "*ISB abx",
+    ];
+
+    // 65C02 opcodes that differ from the NMOS table, besides the RMB, SMB, BBR and BBS columns
+    private static readonly Dictionary<int, string> CmosChanges = new()
+    {
+        [0x04] = "TSB zp", [0x0C] = "TSB abs", [0x14] = "TRB zp", [0x1C] = "TRB abs",
+        [0x12] = "ORA izp", [0x32] = "AND izp", [0x52] = "EOR izp", [0x72] = "ADC izp",
+        [0x92] = "STA izp", [0xB2] = "LDA izp", [0xD2] = "CMP izp", [0xF2] = "SBC izp",
+        [0x1A] = "INC acc", [0x3A] = "DEC acc", [0x5A] = "PHY imp", [0x7A] = "PLY imp", [0xDA] = "PHX imp", [0xFA] = "PLX imp",
+        [0x34] = "BIT zpx", [0x3C] = "BIT abx", [0x89] = "BIT imm",
+        [0x64] = "STZ zp", [0x74] = "STZ zpx", [0x9C] = "STZ abs", [0x9E] = "STZ abx",
+        [0x7C] = "JMP iax", [0x80] = "BRA rel", [0xCB] = "WAI imp", [0xDB] = "STP imp",
+    };
+
+    private static readonly OpcodeInfo[] Opcodes = Table.Select(ParseEntry).ToArray();
+    private static readonly OpcodeInfo[] CmosOpcodes = Enumerable.Range(0, 256).Select(CmosEntry).Select(ParseEntry).ToArray();
+
+    /// <summary>
+    /// Decodes an opcode.
+    /// </summary>
+    public static OpcodeInfo Decode(byte opcode, CpuVariant cpu = CpuVariant.Nmos6502) => TableOf(cpu)[opcode];
+
+    /// <summary>
+    /// Parses a CPU name: 6502, 6510 or 8502 for the NMOS table, 65c02 for the CMOS one.
+    /// </summary>
+    /// <exception cref="ArgumentException">Thrown when the CPU is not known.</exception>
+    public static CpuVariant ParseCpu(string cpu) => cpu.Trim().ToLowerInvariant() switch
+    {
+        "6502" or "6510" or "8502" or "nmos" => CpuVariant.Nmos6502,
+        "65c02" or "cmos" => CpuVariant.Cmos65C02,
+        _ => throw new ArgumentException($"Unknown CPU '{cpu}', expected 6502, 6510, 8502 or 65c02"),
+    };
+
+    /// <summary>
+    /// Number of operand bytes an addressing mode takes.
+    /// </summary>
+    public static int OperandLength(AddressingMode mode) => mode switch
+    {
+        AddressingMode.Implied or AddressingMode.Accumulator => 0,
+        AddressingMode.Absolute or AddressingMode.AbsoluteX or AddressingMode.AbsoluteY or AddressingMode.Indirect
+            or AddressingMode.AbsoluteIndexedIndirect or AddressingMode.ZeroPageRelative => 2,
+        _ => 1,
+    };
+
+    /// <summary>
+    /// Formats an instruction in the syntax of VICE's monitor, e.g. <c>LDA ($FB),Y</c>. Branch targets are
+    /// resolved to absolute addresses.
+    /// </summary>
+    /// <param name="address">Address of the opcode.</param>
+    /// <param name="opcode">The opcode.</param>
+    /// <param name="low">First operand byte, ignored when the instruction has none.</param>
+    /// <param name="high">Second operand byte, ignored when the instruction has fewer.</param>
+    /// <param name="cpu">Opcode table to decode with.</param>
+    public static string Format(ushort address, byte opcode, byte low, byte high, CpuVariant cpu = CpuVariant.Nmos6502)
+    {
+        var info = TableOf(cpu)[opcode];
+        int word = low | high << 8;
+        return info.Mode switch
+        {
+            AddressingMode.Implied => info.Mnemonic,
+            AddressingMode.Accumulator => $"{info.Mnemonic} A",
+            AddressingMode.Immediate => $"{info.Mnemonic} #${low:X2}",
+            AddressingMode.ZeroPage => $"{info.Mnemonic} ${low:X2}",
+            AddressingMode.ZeroPageX => $"{info.Mnemonic} ${low:X2},X",
+            AddressingMode.ZeroPageY => $"{info.Mnemonic} ${low:X2},Y",
+            AddressingMode.IndirectX => $"{info.Mnemonic} (${low:X2},X)",
+            AddressingMode.IndirectY => $"{info.Mnemonic} (${low:X2}),Y",
+            AddressingMode.Absolute => $"{info.Mnemonic} ${word:X4}",
+            AddressingMode.AbsoluteX => $"{info.Mnemonic} ${word:X4},X",
+            AddressingMode.AbsoluteY => $"{info.Mnemonic} ${word:X4},Y",
+            AddressingMode.Indirect => $"{info.Mnemonic} (${word:X4})",
+            AddressingMode.Relative => $"{info.Mnemonic} ${(ushort)(address + 2 + (sbyte)low):X4}",
+            AddressingMode.ZeroPageIndirect => $"{info.Mnemonic} (${low:X2})",
+            AddressingMode.AbsoluteIndexedIndirect => $"{info.Mnemonic} (${word:X4},X)",
+            AddressingMode.ZeroPageRelative => $"{info.Mnemonic} ${low:X2},${(ushort)(address + 3 + (sbyte)high):X4}",
+            _ => info.Mnemonic,
+        };
+    }
+
+    private static OpcodeInfo[] TableOf(CpuVariant cpu) => cpu == CpuVariant.Cmos65C02 ? CmosOpcodes : Opcodes;
+
+    /// <summary>
+    /// Table entry of an opcode on the 65C02, where the opcodes undocumented on the 6502 are either new
+    /// instructions or NOPs of various lengths.
+    /// </summary>
+    private static string CmosEntry(int opcode)
+    {
+        int bit = opcode >> 4 & 7;
+        switch (opcode & 0x0F)
+        {
+            case 0x07:
+                return opcode < 0x80 ? $"RMB{bit} zp" : $"SMB{bit} zp";
+            case 0x0F:
+                return opcode < 0x80 ? $"BBR{bit} zpr" : $"BBS{bit} zpr";
+        }
+        if (CmosChanges.TryGetValue(opcode, out var entry) || !Table[opcode].StartsWith('*'))
+        {
+            return entry ?? Table[opcode];
+        }
+        return (opcode & 0x0F) switch
+        {
+            0x02 => "*NOP imm",
+            0x03 or 0x0B => "*NOP imp",
+            0x04 => opcode == 0x44 ? "*NOP zp" : "*NOP zpx",
+            0x0C => "*NOP abs",
+            _ => throw new InvalidOperationException($"No 65C02 entry for opcode ${opcode:X2}"),
+        };
+    }
+
+    private static OpcodeInfo ParseEntry(string entry)
+    {
+        bool illegal = entry[0] == '*';
+        var parts = entry.TrimStart('*').Split(' ');
+        var mode = parts[1] switch
+        {
+            "imp" => AddressingMode.Implied,
+            "acc" => AddressingMode.Accumulator,
+            "imm" => AddressingMode.Immediate,
+            "zp" => AddressingMode.ZeroPage,
+            "zpx" => AddressingMode.ZeroPageX,
+            "zpy" => AddressingMode.ZeroPageY,
+            "izx" => AddressingMode.IndirectX,
+            "izy" => AddressingMode.IndirectY,
+            "abs" => AddressingMode.Absolute,
+            "abx" => AddressingMode.AbsoluteX,
+            "aby" => AddressingMode.AbsoluteY,
+            "ind" => AddressingMode.Indirect,
+            "rel" => AddressingMode.Relative,
+            "izp" => AddressingMode.ZeroPageIndirect,
+            "iax" => AddressingMode.AbsoluteIndexedIndirect,
+            "zpr" => AddressingMode.ZeroPageRelative,
+            _ => throw new InvalidOperationException($"Unknown addressing mode in opcode table: {entry}"),
+        };
+        return new OpcodeInfo(parts[0], mode, illegal);
+    }
+}
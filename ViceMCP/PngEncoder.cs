@@ -0,0 +1,130 @@
+using System.Buffers;
+using System.Buffers.Binary;
+using System.IO.Compression;
+
+namespace ViceMCP;
+
+/// <summary>
+/// Writes 8 bit indexed images as palette PNGs, which keeps VICE's indexed display output at one byte per pixel
+/// instead of expanding it to RGB.
+/// </summary>
+public static class PngEncoder
+{
+    /// <summary>
+    /// VICE's default VIC-II palette (Pepto). Indices of other video chips are shown with these colours too,
+    /// wrapping every 16 entries.
+    /// </summary>
+    public static ReadOnlySpan<byte> C64Palette =>
+    [
+        0x00, 0x00, 0x00, 0xFF, 0xFF, 0xFF, 0x68, 0x37, 0x2B, 0x70, 0xA4, 0xB2,
+        0x6F, 0x3D, 0x86, 0x58, 0x8D, 0x43, 0x35, 0x28, 0x79, 0xB8, 0xC7, 0x6F,
+        0x6F, 0x4F, 0x25, 0x43, 0x39, 0x00, 0x9A, 0x67, 0x59, 0x44, 0x44, 0x44,
+        0x6C, 0x6C, 0x6C, 0x9A, 0xD2, 0x84, 0x6C, 0x5E, 0xB5, 0x95, 0x95, 0x95,
+    ];
+
+    private static ReadOnlySpan<byte> Signature => [0x89, 0x50, 0x4E, 0x47, 0x0D, 0x0A, 0x1A, 0x0A];
+    private static readonly uint[] CrcTable = BuildCrcTable();
+
+    /// <summary>
+    /// Encodes <paramref name="pixels"/>, <paramref name="width"/> by <paramref name="height"/> palette indices
+    /// in rows of <paramref name="stride"/> bytes.
+    /// </summary>
+    public static byte[] EncodeIndexed(ReadOnlySpan<byte> pixels, int width, int height, int stride)
+    {
+        if (width <= 0 || height <= 0)
+        {
+            throw new ArgumentException("Image must be at least 1x1");
+        }
+
+        int maxIndex = 0;
+        for (int y = 0; y < height; y++)
+        {
+            foreach (var index in pixels.Slice(y * stride, width))
+            {
+                maxIndex = Math.Max(maxIndex, index);
+            }
+        }
+
+        using var output = new MemoryStream(width * height / 4 + 1024);
+        output.Write(Signature);
+
+        Span<byte> header = stackalloc byte[13];
+        BinaryPrimitives.WriteInt32BigEndian(header, width);
+        BinaryPrimitives.WriteInt32BigEndian(header[4..], height);
+        header[8] = 8; // bit depth
+        header[9] = 3; // indexed colour
+        header[10] = 0; // deflate
+        header[11] = 0; // adaptive filtering
+        header[12] = 0; // no interlace
+        WriteChunk(output, "IHDR"u8, header);
+
+        int entries = maxIndex + 1;
+        Span<byte> palette = stackalloc byte[entries * 3];
+        for (int i = 0; i < entries; i++)
+        {
+            C64Palette.Slice(i % 16 * 3, 3).CopyTo(palette[(i * 3)..]);
+        }
+        WriteChunk(output, "PLTE"u8, palette);
+
+        // Every row is prefixed with filter type 0, indexed pixels compress best unfiltered
+        int rawLength = (width + 1) * height;
+        var raw = ArrayPool<byte>.Shared.Rent(rawLength);
+        try
+        {
+            for (int y = 0; y < height; y++)
+            {
+                raw[y * (width + 1)] = 0;
+                pixels.Slice(y * stride, width).CopyTo(raw.AsSpan(y * (width + 1) + 1));
+            }
+            using var compressed = new MemoryStream(rawLength / 4 + 64);
+            using (var zlib = new ZLibStream(compressed, CompressionLevel.Fastest, leaveOpen: true))
+            {
+                zlib.Write(raw, 0, rawLength);
+            }
+            WriteChunk(output, "IDAT"u8, compressed.GetBuffer().AsSpan(0, (int)compressed.Length));
+        }
+        finally
+        {
+            ArrayPool<byte>.Shared.Return(raw);
+        }
+
+        WriteChunk(output, "IEND"u8, ReadOnlySpan<byte>.Empty);
+        return output.ToArray();
+    }
+
+    private static void WriteChunk(Stream output, ReadOnlySpan<byte> type, ReadOnlySpan<byte> data)
+    {
+        Span<byte> field = stackalloc byte[4];
+        BinaryPrimitives.WriteInt32BigEndian(field, data.Length);
+        output.Write(field);
+        output.Write(type);
+        output.Write(data);
+        uint crc = UpdateCrc(UpdateCrc(0xFFFFFFFF, type), data) ^ 0xFFFFFFFF;
+        BinaryPrimitives.WriteUInt32BigEndian(field, crc);
+        output.Write(field);
+    }
+
+    private static uint UpdateCrc(uint crc, ReadOnlySpan<byte> data)
+    {
+        foreach (var b in data)
+        {
+            crc = CrcTable[(crc ^ b) & 0xFF] ^ (crc >> 8);
+        }
+        return crc;
+    }
+
+    private static uint[] BuildCrcTable()
+    {
+        var table = new uint[256];
+        for (uint n = 0; n < 256; n++)
+        {
+            uint c = n;
+            for (int k = 0; k < 8; k++)
+            {
+                c = (c & 1) != 0 ? 0xEDB88320 ^ (c >> 1) : c >> 1;
+            }
+            table[n] = c;
+        }
+        return table;
+    }
+}
@@ -20,9 +20,17 @@ public class Program
         
         // Add ViceBridge services
         builder.Services.AddSingleton<ViceMCP.ViceBridge.Responses.ResponseBuilder>();
-        builder.Services.AddSingleton<ViceMCP.ViceBridge.Services.Abstract.IPerformanceProfiler, EmptyPerformanceProfiler>();
-        builder.Services.AddSingleton<ViceMCP.ViceBridge.Services.Abstract.IMessagesHistory, SimpleMessagesHistory>();
+        builder.Services.AddSingleton<ViceMCP.ViceBridge.Services.Abstract.IPerformanceProfiler, ViceMCP.ViceBridge.Services.Implementation.PerformanceProfiler>();
+        builder.Services.AddSingleton<ViceMCP.ViceBridge.Services.Abstract.IMessagesHistory, ViceMCP.ViceBridge.Services.Implementation.MessagesHistory>();
         builder.Services.AddSingleton<ViceMCP.ViceBridge.Services.Abstract.IViceBridge, ViceMCP.ViceBridge.Services.Implementation.ViceBridge>();
+        
+        // Instance 0 uses the bridge above, other pool instances get their own bridge, profiler and history
+        builder.Services.AddSingleton(services => new ViceInstancePool(
+            services.GetRequiredService<ViceMCP.ViceBridge.Services.Abstract.IViceBridge>(),
+            services.GetRequiredService<ViceConfiguration>(),
+            () => ActivatorUtilities.CreateInstance<ViceMCP.ViceBridge.Services.Implementation.ViceBridge>(services,
+                new ViceMCP.ViceBridge.Services.Implementation.PerformanceProfiler(),
+                new ViceMCP.ViceBridge.Services.Implementation.MessagesHistory())));
 
         builder.Services
             .AddMcpServer()
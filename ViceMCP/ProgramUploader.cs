@@ -0,0 +1,456 @@
+using System.Buffers.Binary;
+using System.Diagnostics;
+using System.Security.Cryptography;
+using System.Threading.Channels;
+using ViceMCP.ViceBridge;
+using ViceMCP.ViceBridge.Commands;
+using ViceMCP.ViceBridge.Services.Abstract;
+using ViceMCP.ViceBridge.Shared;
+
+namespace ViceMCP;
+
+/// <summary>
+/// Uploads program images to one emulator, sending only the <see cref="PageSize"/> pages that differ from what
+/// it uploaded there before.
+/// </summary>
+/// <remarks>
+/// The uploader keeps a hash of the bytes it last wrote to each page. Any main memory write enqueued on the bridge
+/// forgets the pages it touches, and a reset, a snapshot restore or a lost connection forgets all of them. A page
+/// forgotten while an upload is in flight is not stored by it, as the other write may have landed after the
+/// upload's. Changes the running program makes to its own image are not noticed, a forced upload sends the whole
+/// image again.
+/// </remarks>
+/// <threadsafety>Class is thread safe, uploads to the same emulator run one at a time.</threadsafety>
+public sealed class ProgramUploader : IAsyncDisposable
+{
+    /// <summary>
+    /// Granularity of change detection in bytes.
+    /// </summary>
+    public const int PageSize = 256;
+    private const int PageCount = 0x10000 / PageSize;
+
+    private readonly IViceBridge _bridge;
+    private readonly object _lock = new();
+    // What the last upload wrote to each page, null when unknown
+    private readonly PageContent?[] _pages = new PageContent?[PageCount];
+    // Times each page has been forgotten
+    private readonly int[] _generations = new int[PageCount];
+    private readonly SemaphoreSlim _uploadLock = new(1, 1);
+    private bool _tracksConnection;
+    private ProgramWatch? _watch;
+    private long _uploads;
+    private long _bytesSent;
+    private long _bytesSkipped;
+
+    public ProgramUploader(IViceBridge bridge)
+    {
+        _bridge = bridge;
+    }
+
+    public long Uploads => Interlocked.Read(ref _uploads);
+    public long BytesSent => Interlocked.Read(ref _bytesSent);
+    /// <summary>
+    /// Bytes not sent because their page was unchanged.
+    /// </summary>
+    public long BytesSkipped => Interlocked.Read(ref _bytesSkipped);
+
+    /// <summary>
+    /// Watch re-uploading a program file on rebuilds, null when none is running.
+    /// </summary>
+    public ProgramWatch? Watch => Volatile.Read(ref _watch);
+
+    /// <summary>
+    /// Splits a PRG file into load address and image.
+    /// </summary>
+    /// <param name="file">Contents of the file.</param>
+    /// <param name="address">Load address overriding the header, the whole file is the image then.</param>
+    /// <exception cref="InvalidOperationException">Thrown when there is no image.</exception>
+    public static (ushort Address, ReadOnlyMemory<byte> Image) ParseProgram(byte[] file, ushort? address)
+    {
+        if (address is { } overridden)
+        {
+            if (file.Length == 0)
+            {
+                throw new InvalidOperationException("No data to load");
+            }
+            return (overridden, file);
+        }
+        if (file.Length < 2)
+        {
+            throw new InvalidOperationException("PRG file too small - must contain at least load address");
+        }
+        if (file.Length == 2)
+        {
+            throw new InvalidOperationException("No data to load after address bytes");
+        }
+        return (BinaryPrimitives.ReadUInt16LittleEndian(file), file.AsMemory(2));
+    }
+
+    /// <summary>
+    /// Writes <paramref name="image"/> to main memory at <paramref name="address"/>, skipping the pages that still
+    /// hold what the previous upload wrote. Changed pages next to each other go out as one write.
+    /// </summary>
+    /// <param name="address">Load address.</param>
+    /// <param name="image">Bytes to load.</param>
+    /// <param name="force">Send every page.</param>
+    /// <param name="ct">Cancels writes that are still queued.</param>
+    /// <exception cref="ArgumentException">Thrown when the image runs past $FFFF.</exception>
+    /// <exception cref="InvalidOperationException">Thrown when VICE fails to write.</exception>
+    public async Task<ProgramUpload> UploadAsync(ushort address, ReadOnlyMemory<byte> image, bool force = false,
+        CancellationToken ct = default)
+    {
+        if (image.IsEmpty)
+        {
+            throw new ArgumentException("Nothing to upload");
+        }
+        if (address + image.Length > 0x10000)
+        {
+            throw new ArgumentException($"{image.Length} bytes loaded at ${address:X4} run past $FFFF");
+        }
+        TrackConnection();
+
+        await _uploadLock.WaitAsync(ct);
+        try
+        {
+            var stopwatch = Stopwatch.StartNew();
+            int end = address + image.Length - 1;
+            int firstPage = address / PageSize;
+            var contents = new PageContent[end / PageSize - firstPage + 1];
+            for (int i = 0; i < contents.Length; i++)
+            {
+                int pageStart = Math.Max(address, (firstPage + i) * PageSize);
+                int pageEnd = Math.Min(end, (firstPage + i) * PageSize + PageSize - 1);
+                contents[i] = PageContent.Of((ushort)pageStart, image.Span.Slice(pageStart - address, pageEnd - pageStart + 1));
+            }
+
+            List<(int Start, int Length)> runs;
+            // Generation of each page once the upload's own write has forgotten it
+            var generations = new int[contents.Length];
+            lock (_lock)
+            {
+                var changed = new bool[contents.Length];
+                for (int i = 0; i < contents.Length; i++)
+                {
+                    changed[i] = force || _pages[firstPage + i] != contents[i];
+                    generations[i] = _generations[firstPage + i] + (changed[i] ? 1 : 0);
+                }
+                runs = ChangedRuns(contents, i => changed[i]);
+            }
+
+            var writes = new List<MemorySetCommand>();
+            int bytesSent = 0;
+            try
+            {
+                foreach (var (start, length) in runs)
+                {
+                    var buffer = BufferManager.GetBuffer((uint)length);
+                    image.Span.Slice(start - address, length).CopyTo(buffer.Data);
+                    // Owned by the list from here on, so it is released even when enqueueing fails
+                    var write = new MemorySetCommand(0, (ushort)start, MemSpace.MainMemory, 0, buffer);
+                    writes.Add(write);
+                    await _bridge.EnqueueCommandAsync(write, CommandPriority.Bulk, resumeOnStopped: true, ct);
+                    bytesSent += length;
+                }
+                foreach (var write in writes)
+                {
+                    var result = await write.Response;
+                    if (!result.IsSuccess)
+                    {
+                        throw new InvalidOperationException($"Failed to load program at ${write.StartAddress:X4}: {result.ErrorCode}");
+                    }
+                }
+            }
+            catch
+            {
+                // Some writes may have landed, memory no longer matches any hash
+                Forget(address, image.Length);
+                throw;
+            }
+            finally
+            {
+                foreach (var write in writes)
+                {
+                    write.Dispose();
+                }
+            }
+
+            lock (_lock)
+            {
+                for (int i = 0; i < contents.Length; i++)
+                {
+                    // Written by someone else meanwhile, what the page holds is unknown
+                    if (_generations[firstPage + i] == generations[i])
+                    {
+                        _pages[firstPage + i] = contents[i];
+                    }
+                }
+            }
+            Interlocked.Increment(ref _uploads);
+            Interlocked.Add(ref _bytesSent, bytesSent);
+            Interlocked.Add(ref _bytesSkipped, image.Length - bytesSent);
+            return new ProgramUpload(address, image.Length, contents.Length,
+                runs.Sum(r => (r.Start + r.Length - 1) / PageSize - r.Start / PageSize + 1), runs.Count, bytesSent,
+                stopwatch.Elapsed);
+        }
+        finally
+        {
+            _uploadLock.Release();
+        }
+    }
+
+    /// <summary>
+    /// Forgets the pages a write of <paramref name="length"/> bytes at <paramref name="address"/> touches, so the
+    /// next upload sends them again. Writes running past $FFFF wrap around like they do in VICE.
+    /// </summary>
+    public void Forget(ushort address, int length)
+    {
+        if (length <= 0)
+        {
+            return;
+        }
+        int firstPage = address / PageSize;
+        int pages = Math.Min((address + length - 1) / PageSize - firstPage + 1, PageCount);
+        lock (_lock)
+        {
+            for (int i = 0; i < pages; i++)
+            {
+                int page = (firstPage + i) % PageCount;
+                _pages[page] = null;
+                _generations[page]++;
+            }
+        }
+    }
+
+    /// <summary>
+    /// Forgets all pages, for when memory changed in ways the uploader can't follow.
+    /// </summary>
+    public void Clear()
+    {
+        lock (_lock)
+        {
+            Array.Clear(_pages);
+            for (int page = 0; page < PageCount; page++)
+            {
+                _generations[page]++;
+            }
+        }
+    }
+
+    /// <summary>
+    /// Re-uploads <paramref name="filePath"/> whenever it changes, replacing the running watch.
+    /// </summary>
+    /// <param name="filePath">PRG file to watch.</param>
+    /// <param name="address">Load address overriding the PRG header.</param>
+    public async Task<ProgramWatch> StartWatchAsync(string filePath, ushort? address)
+    {
+        var watch = new ProgramWatch(this, Path.GetFullPath(filePath), address);
+        var previous = Interlocked.Exchange(ref _watch, watch);
+        if (previous != null)
+        {
+            await previous.DisposeAsync();
+        }
+        return watch;
+    }
+
+    /// <summary>
+    /// Stops the running watch.
+    /// </summary>
+    /// <returns>The stopped watch, null when none was running.</returns>
+    public async Task<ProgramWatch?> StopWatchAsync()
+    {
+        var watch = Interlocked.Exchange(ref _watch, null);
+        if (watch != null)
+        {
+            await watch.DisposeAsync();
+        }
+        return watch;
+    }
+
+    public async ValueTask DisposeAsync()
+    {
+        await StopWatchAsync();
+        if (_tracksConnection)
+        {
+            _bridge.ConnectedChanged -= OnConnectedChanged;
+            _bridge.MemoryWriting -= OnMemoryWriting;
+        }
+    }
+
+    /// <summary>
+    /// Collects start address and length of each run of consecutive pages <paramref name="changed"/> selects.
+    /// </summary>
+    private static List<(int Start, int Length)> ChangedRuns(PageContent[] contents, Func<int, bool> changed)
+    {
+        var runs = new List<(int Start, int Length)>();
+        int runStart = -1;
+        for (int i = 0; i <= contents.Length; i++)
+        {
+            bool differs = i < contents.Length && changed(i);
+            if (differs && runStart < 0)
+            {
+                runStart = i;
+            }
+            else if (!differs && runStart >= 0)
+            {
+                var last = contents[i - 1];
+                runs.Add((contents[runStart].Start, last.Start + last.Length - contents[runStart].Start));
+                runStart = -1;
+            }
+        }
+        return runs;
+    }
+
+    private void TrackConnection()
+    {
+        lock (_lock)
+        {
+            if (!_tracksConnection)
+            {
+                _tracksConnection = true;
+                _bridge.ConnectedChanged += OnConnectedChanged;
+                _bridge.MemoryWriting += OnMemoryWriting;
+            }
+        }
+    }
+
+    // Whatever is on the other side of a new connection holds memory the uploader knows nothing about
+    private void OnConnectedChanged(object? sender, ConnectedChangedEventArgs e) => Clear();
+
+    // Covers the uploader's own writes too, UploadAsync counts on them forgetting each page they touch once
+    private void OnMemoryWriting(object? sender, MemoryWritingEventArgs e)
+    {
+        if (e.MemSpace == MemSpace.MainMemory)
+        {
+            Forget(e.StartAddress, e.Length);
+        }
+    }
+
+    /// <summary>
+    /// Part of a page an upload covered and the hash of the bytes it wrote there.
+    /// </summary>
+    private readonly record struct PageContent(ushort Start, int Length, UInt128 Hash)
+    {
+        public static PageContent Of(ushort start, ReadOnlySpan<byte> data)
+        {
+            Span<byte> hash = stackalloc byte[SHA256.HashSizeInBytes];
+            SHA256.HashData(data, hash);
+            return new PageContent(start, data.Length, BinaryPrimitives.ReadUInt128LittleEndian(hash));
+        }
+    }
+}
+
+/// <summary>
+/// Outcome of <see cref="ProgramUploader.UploadAsync"/>.
+/// </summary>
+/// <param name="Address">Load address.</param>
+/// <param name="Length">Size of the image in bytes.</param>
+/// <param name="Pages">Pages the image covers.</param>
+/// <param name="PagesSent">Pages that changed and were written.</param>
+/// <param name="Writes">Write commands sent.</param>
+/// <param name="BytesSent">Bytes written.</param>
+/// <param name="Elapsed">Time taken.</param>
+public sealed record ProgramUpload(ushort Address, int Length, int Pages, int PagesSent, int Writes, int BytesSent,
+    TimeSpan Elapsed)
+{
+    public ushort EndAddress => (ushort)(Address + Length - 1);
+}
+
+/// <summary>
+/// Re-uploads a program file through a <see cref="ProgramUploader"/> each time it is rebuilt.
+/// </summary>
+/// <remarks>
+/// Rebuilds usually write a file in several steps, so an upload starts only once the file has been quiet for
+/// <see cref="SettleTime"/>. A file that can't be read or parsed yet is counted as a failure and retried on the
+/// next change.
+/// </remarks>
+public sealed class ProgramWatch : IAsyncDisposable
+{
+    /// <summary>
+    /// Time without changes to the file before it is uploaded.
+    /// </summary>
+    public static readonly TimeSpan SettleTime = TimeSpan.FromMilliseconds(200);
+
+    private readonly ProgramUploader _uploader;
+    private readonly FileSystemWatcher _watcher;
+    private readonly Channel<bool> _changed = Channel.CreateBounded<bool>(
+        new BoundedChannelOptions(1) { FullMode = BoundedChannelFullMode.DropWrite });
+    private readonly CancellationTokenSource _cts = new();
+    private readonly Task _loop;
+    private long _reloads;
+    private long _failures;
+
+    internal ProgramWatch(ProgramUploader uploader, string filePath, ushort? address)
+    {
+        _uploader = uploader;
+        FilePath = filePath;
+        Address = address;
+        StartedAt = DateTime.UtcNow;
+        _watcher = new FileSystemWatcher(Path.GetDirectoryName(filePath)!, Path.GetFileName(filePath))
+        {
+            NotifyFilter = NotifyFilters.LastWrite | NotifyFilters.Size | NotifyFilters.FileName,
+        };
+        // Assemblers often write a temporary file and rename it over the old one
+        _watcher.Changed += OnFileChanged;
+        _watcher.Created += OnFileChanged;
+        _watcher.Renamed += OnFileChanged;
+        _watcher.EnableRaisingEvents = true;
+        _loop = RunAsync(_cts.Token);
+    }
+
+    public string FilePath { get; }
+    /// <summary>
+    /// Load address overriding the PRG header, null to use the header.
+    /// </summary>
+    public ushort? Address { get; }
+    public DateTime StartedAt { get; }
+    public long Reloads => Interlocked.Read(ref _reloads);
+    public long Failures => Interlocked.Read(ref _failures);
+    public ProgramUpload? LastUpload { get; private set; }
+    public string? LastError { get; private set; }
+
+    private void OnFileChanged(object sender, FileSystemEventArgs e) => _changed.Writer.TryWrite(true);
+
+    private async Task RunAsync(CancellationToken ct)
+    {
+        try
+        {
+            while (await _changed.Reader.WaitToReadAsync(ct))
+            {
+                do
+                {
+                    _changed.Reader.TryRead(out _);
+                    await Task.Delay(SettleTime, ct);
+                }
+                while (_changed.Reader.TryPeek(out _));
+                await ReloadAsync(ct);
+            }
+        }
+        catch (OperationCanceledException) when (ct.IsCancellationRequested)
+        {
+        }
+    }
+
+    private async Task ReloadAsync(CancellationToken ct)
+    {
+        try
+        {
+            var (address, image) = ProgramUploader.ParseProgram(await File.ReadAllBytesAsync(FilePath, ct), Address);
+            LastUpload = await _uploader.UploadAsync(address, image, ct: ct);
+            LastError = null;
+            Interlocked.Increment(ref _reloads);
+        }
+        catch (Exception ex) when (ex is not OperationCanceledException || !ct.IsCancellationRequested)
+        {
+            LastError = ex.Message;
+            Interlocked.Increment(ref _failures);
+        }
+    }
+
+    public async ValueTask DisposeAsync()
+    {
+        _watcher.Dispose();
+        _cts.Cancel();
+        await _loop;
+        _cts.Dispose();
+    }
+}
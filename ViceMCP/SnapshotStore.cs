@@ -0,0 +1,378 @@
+using System.Collections.Immutable;
+using System.Diagnostics;
+using ViceMCP.ViceBridge;
+using ViceMCP.ViceBridge.Commands;
+using ViceMCP.ViceBridge.Services.Abstract;
+using ViceMCP.ViceBridge.Shared;
+
+namespace ViceMCP;
+
+/// <summary>
+/// Named machine snapshots for resetting the emulator to a known state, least recently used first out once
+/// <see cref="Capacity"/> is reached.
+/// </summary>
+/// <remarks>
+/// Full snapshots are VICE snapshot files written with <see cref="DumpCommand"/> to <see cref="Directory"/>, a RAM
+/// backed path where the platform has one, and loaded with <see cref="UndumpCommand"/>. They capture the whole
+/// machine, including I/O chips and drives.
+/// Memory snapshots keep the 64KB of RAM and the CPU registers in this process. Restoring one reads the current
+/// RAM and writes back only the <see cref="PageSize"/> pages that differ, which for a test that touched a few
+/// pages costs two round trips instead of a snapshot file load. Auto-resume is held from the first read until the
+/// registers are set, so the program can't change memory between the read and the writes.
+/// </remarks>
+/// <threadsafety>Class is thread safe.</threadsafety>
+public sealed class SnapshotStore : IDisposable
+{
+    /// <summary>
+    /// Granularity of memory snapshot restores in bytes.
+    /// </summary>
+    public const int PageSize = 256;
+    private const int ReadChunkSize = 0x1000;
+    private const string RamBankName = "ram";
+    // Raster line and cycle counters, VICE reports them but they are not state to restore
+    private static readonly HashSet<string> ReadOnlyRegisters = new(StringComparer.OrdinalIgnoreCase) { "LIN", "CYC" };
+
+    private readonly object _lock = new();
+    private readonly LinkedList<MachineSnapshot> _lru = new();
+    private readonly Dictionary<string, LinkedListNode<MachineSnapshot>> _byName = new(StringComparer.Ordinal);
+
+    /// <summary>
+    /// Creates a store.
+    /// </summary>
+    /// <param name="directory">Where full snapshot files go, created on first use.</param>
+    /// <param name="capacity">Largest number of snapshots kept.</param>
+    public SnapshotStore(string directory, int capacity)
+    {
+        Directory = directory;
+        Capacity = Math.Max(1, capacity);
+    }
+
+    public string Directory { get; }
+    public int Capacity { get; }
+
+    /// <summary>
+    /// Snapshots, most recently used first.
+    /// </summary>
+    public IReadOnlyList<MachineSnapshot> Snapshots
+    {
+        get
+        {
+            lock (_lock)
+            {
+                return _lru.ToArray();
+            }
+        }
+    }
+
+    /// <summary>
+    /// /dev/shm when present, so VICE writes snapshot files to memory, the temp directory otherwise.
+    /// </summary>
+    public static string DefaultDirectory()
+    {
+        const string sharedMemory = "/dev/shm";
+        var root = OperatingSystem.IsLinux() && System.IO.Directory.Exists(sharedMemory) ? sharedMemory : Path.GetTempPath();
+        return Path.Combine(root, $"vicemcp-snapshots-{Environment.ProcessId}");
+    }
+
+    /// <summary>
+    /// Saves the whole machine with <see cref="DumpCommand"/>.
+    /// </summary>
+    /// <exception cref="InvalidOperationException">Thrown when VICE fails to write the snapshot.</exception>
+    public async Task<MachineSnapshot> SaveFullAsync(IViceBridge bridge, string name)
+    {
+        System.IO.Directory.CreateDirectory(Directory);
+        var path = Path.Combine(Directory, $"{FileNameOf(name)}-{Guid.NewGuid():N}.vsf");
+        var result = await bridge.EnqueueCommand(new DumpCommand(false, false, path), resumeOnStopped: true).Response;
+        if (!result.IsSuccess)
+        {
+            throw new InvalidOperationException($"Failed to save snapshot: {result.ErrorCode}");
+        }
+        var size = File.Exists(path) ? new FileInfo(path).Length : 0;
+        return Add(new MachineSnapshot(name, SnapshotKind.Full, DateTime.UtcNow, size) { FilePath = path });
+    }
+
+    /// <summary>
+    /// Saves RAM and CPU registers. VICE is held stopped until all reads are answered, so they see the same machine.
+    /// </summary>
+    /// <exception cref="InvalidOperationException">Thrown when a read fails.</exception>
+    public async Task<MachineSnapshot> SaveMemoryAsync(IViceBridge bridge, string name)
+    {
+        using var hold = bridge.HoldAutoResume();
+        var banks = bridge.EnqueueCommand(new BanksAvailableCommand());
+        var available = bridge.EnqueueCommand(new RegistersAvailableCommand(MemSpace.MainMemory));
+        var banksResult = await banks.Response;
+        var availableResult = await available.Response;
+        if (!banksResult.IsSuccess || !availableResult.IsSuccess)
+        {
+            throw new InvalidOperationException($"Failed to query banks and registers: {banksResult.ErrorCode}, {availableResult.ErrorCode}");
+        }
+        ushort bankId = banksResult.Response!.Banks.FirstOrDefault(b => b.Name == RamBankName)?.BankId ?? 0;
+        var restorable = availableResult.Response!.Items
+            .Where(r => !ReadOnlyRegisters.Contains(r.Name))
+            .Select(r => r.Id)
+            .ToHashSet();
+
+        var memory = new byte[0x10000];
+        var reads = await EnqueueReadsAsync(bridge, bankId);
+        var registers = await bridge.EnqueueCommandAsync(new RegistersGetCommand(MemSpace.MainMemory));
+        await CopyReadsAsync(reads, memory);
+        var registersResult = await registers.Response;
+        if (!registersResult.IsSuccess)
+        {
+            throw new InvalidOperationException($"Failed to read registers: {registersResult.ErrorCode}");
+        }
+
+        return Add(new MachineSnapshot(name, SnapshotKind.Memory, DateTime.UtcNow, memory.Length)
+        {
+            Memory = memory,
+            BankId = bankId,
+            Registers = registersResult.Response!.Items.Where(r => restorable.Contains(r.RegisterId)).ToImmutableArray(),
+        });
+    }
+
+    /// <summary>
+    /// Restores a snapshot and marks it most recently used.
+    /// </summary>
+    /// <exception cref="ArgumentException">Thrown when there is no snapshot named <paramref name="name"/>.</exception>
+    /// <exception cref="InvalidOperationException">Thrown when VICE fails to restore.</exception>
+    public async Task<SnapshotRestoreResult> RestoreAsync(IViceBridge bridge, string name)
+    {
+        var snapshot = Touch(name);
+        var stopwatch = Stopwatch.StartNew();
+        if (snapshot.Kind == SnapshotKind.Full)
+        {
+            var result = await bridge.EnqueueCommand(new UndumpCommand(snapshot.FilePath!), resumeOnStopped: true).Response;
+            if (!result.IsSuccess)
+            {
+                throw new InvalidOperationException($"Failed to restore snapshot: {result.ErrorCode}");
+            }
+            return new SnapshotRestoreResult(snapshot, 0, 0, (int)snapshot.SizeBytes, stopwatch.Elapsed);
+        }
+
+        // The program must not run between the read and the writes, pages it changed would be left alone
+        using var hold = bridge.HoldAutoResume();
+        var current = new byte[0x10000];
+        await CopyReadsAsync(await EnqueueReadsAsync(bridge, snapshot.BankId), current);
+
+        var writes = new List<MemorySetCommand>();
+        int pagesWritten = 0;
+        RegistersSetCommand registers;
+        try
+        {
+            foreach (var (start, length) in DifferingRuns(snapshot.Memory!, current))
+            {
+                var buffer = BufferManager.GetBuffer((uint)length);
+                snapshot.Memory.AsSpan(start, length).CopyTo(buffer.Data);
+                var write = new MemorySetCommand(0, (ushort)start, MemSpace.MainMemory, snapshot.BankId, buffer);
+                writes.Add(write);
+                await bridge.EnqueueCommandAsync(write, resumeOnStopped: true);
+                pagesWritten += length / PageSize;
+            }
+            registers = await bridge.EnqueueCommandAsync(new RegistersSetCommand(MemSpace.MainMemory, snapshot.Registers), resumeOnStopped: true);
+
+            foreach (var write in writes)
+            {
+                var result = await write.Response;
+                if (!result.IsSuccess)
+                {
+                    throw new InvalidOperationException($"Failed to restore memory at ${write.StartAddress:X4}: {result.ErrorCode}");
+                }
+            }
+        }
+        finally
+        {
+            foreach (var write in writes)
+            {
+                write.Dispose();
+            }
+        }
+        var registersResult = await registers.Response;
+        if (!registersResult.IsSuccess)
+        {
+            throw new InvalidOperationException($"Failed to restore registers: {registersResult.ErrorCode}");
+        }
+        return new SnapshotRestoreResult(snapshot, 0x10000 / PageSize, pagesWritten, pagesWritten * PageSize, stopwatch.Elapsed);
+    }
+
+    /// <summary>
+    /// Removes a snapshot and its file.
+    /// </summary>
+    /// <returns>False when there is no snapshot named <paramref name="name"/>.</returns>
+    public bool Remove(string name)
+    {
+        MachineSnapshot snapshot;
+        lock (_lock)
+        {
+            if (!_byName.Remove(name, out var node))
+            {
+                return false;
+            }
+            _lru.Remove(node);
+            snapshot = node.Value;
+        }
+        DeleteFile(snapshot);
+        return true;
+    }
+
+    public void Dispose()
+    {
+        MachineSnapshot[] snapshots;
+        lock (_lock)
+        {
+            snapshots = _lru.ToArray();
+            _lru.Clear();
+            _byName.Clear();
+        }
+        foreach (var snapshot in snapshots)
+        {
+            DeleteFile(snapshot);
+        }
+    }
+
+    /// <summary>
+    /// Yields start and length of each run of consecutive pages where <paramref name="wanted"/> and
+    /// <paramref name="current"/> differ, so neighbouring pages go out as one write.
+    /// </summary>
+    internal static IEnumerable<(int Start, int Length)> DifferingRuns(byte[] wanted, byte[] current)
+    {
+        int runStart = -1;
+        for (int page = 0; page < wanted.Length; page += PageSize)
+        {
+            bool differs = !wanted.AsSpan(page, PageSize).SequenceEqual(current.AsSpan(page, PageSize));
+            if (differs && runStart < 0)
+            {
+                runStart = page;
+            }
+            else if (!differs && runStart >= 0)
+            {
+                yield return (runStart, page - runStart);
+                runStart = -1;
+            }
+        }
+        if (runStart >= 0)
+        {
+            yield return (runStart, wanted.Length - runStart);
+        }
+    }
+
+    private MachineSnapshot Add(MachineSnapshot snapshot)
+    {
+        var evicted = new List<MachineSnapshot>();
+        lock (_lock)
+        {
+            if (_byName.Remove(snapshot.Name, out var existing))
+            {
+                _lru.Remove(existing);
+                evicted.Add(existing.Value);
+            }
+            _byName[snapshot.Name] = _lru.AddFirst(snapshot);
+            while (_lru.Count > Capacity)
+            {
+                var last = _lru.Last!;
+                _lru.RemoveLast();
+                _byName.Remove(last.Value.Name);
+                evicted.Add(last.Value);
+            }
+        }
+        foreach (var old in evicted)
+        {
+            DeleteFile(old);
+        }
+        return snapshot;
+    }
+
+    private MachineSnapshot Touch(string name)
+    {
+        lock (_lock)
+        {
+            if (!_byName.TryGetValue(name, out var node))
+            {
+                throw new ArgumentException($"No snapshot named '{name}'");
+            }
+            _lru.Remove(node);
+            _lru.AddFirst(node);
+            return node.Value;
+        }
+    }
+
+    private static async Task<List<MemoryGetCommand>> EnqueueReadsAsync(IViceBridge bridge, ushort bankId)
+    {
+        var reads = new List<MemoryGetCommand>();
+        for (int address = 0; address < 0x10000; address += ReadChunkSize)
+        {
+            reads.Add(await bridge.EnqueueCommandAsync(new MemoryGetCommand(0, (ushort)address, (ushort)(address + ReadChunkSize - 1), MemSpace.MainMemory, bankId)));
+        }
+        return reads;
+    }
+
+    private static async Task CopyReadsAsync(List<MemoryGetCommand> reads, byte[] destination)
+    {
+        foreach (var read in reads)
+        {
+            var result = await read.Response;
+            if (!result.IsSuccess || result.Response?.Memory is not { } memory)
+            {
+                throw new InvalidOperationException($"Failed to read memory: {result.ErrorCode}");
+            }
+            using (memory)
+            {
+                if (memory.Size < ReadChunkSize)
+                {
+                    throw new InvalidOperationException($"Memory read returned {memory.Size} of {ReadChunkSize} bytes");
+                }
+                memory.Span[..ReadChunkSize].CopyTo(destination.AsSpan(read.StartAddress));
+            }
+        }
+    }
+
+    private static string FileNameOf(string name)
+    {
+        var safe = new string(name.Select(c => char.IsAsciiLetterOrDigit(c) || c is '-' or '_' ? c : '_').Take(40).ToArray());
+        return safe.Length == 0 ? "snapshot" : safe;
+    }
+
+    private static void DeleteFile(MachineSnapshot snapshot)
+    {
+        if (snapshot.FilePath == null)
+        {
+            return;
+        }
+        try
+        {
+            File.Delete(snapshot.FilePath);
+        }
+        catch (IOException)
+        {
+            // VICE may still hold the file, the directory is temporary anyway
+        }
+    }
+}
+
+public enum SnapshotKind
+{
+    /// <summary>
+    /// VICE snapshot file of the whole machine.
+    /// </summary>
+    Full,
+    /// <summary>
+    /// RAM and CPU registers held in process.
+    /// </summary>
+    Memory,
+}
+
+/// <summary>
+/// A snapshot held by <see cref="SnapshotStore"/>.
+/// </summary>
+/// <param name="SizeBytes">File size of a full snapshot, 64KB for a memory snapshot.</param>
+public sealed record MachineSnapshot(string Name, SnapshotKind Kind, DateTime CreatedAt, long SizeBytes)
+{
+    public string? FilePath { get; init; }
+    public byte[]? Memory { get; init; }
+    public ushort BankId { get; init; }
+    public ImmutableArray<RegisterItem> Registers { get; init; } = ImmutableArray<RegisterItem>.Empty;
+}
+
+/// <param name="PagesCompared">Pages checked against the machine, 0 for a full snapshot.</param>
+/// <param name="PagesWritten">Pages that differed and were written back.</param>
+/// <param name="BytesWritten">Memory bytes sent, or the snapshot file size for a full snapshot.</param>
+public sealed record SnapshotRestoreResult(MachineSnapshot Snapshot, int PagesCompared, int PagesWritten, int BytesWritten, TimeSpan Elapsed);
@@ -33,6 +33,9 @@ namespace ViceMCP.ViceBridge
     /// </summary>
     /// <remarks>
     /// It should be disposed once it is not need anymore to return data to the pool. Otherwise memory leaks will happen.
+    /// The array is reference counted: <see cref="Share"/> and <see cref="Slice"/> hand out views that hold their own
+    /// reference and have to be disposed as well. The array goes back to the pool when the last view is disposed.
+    /// Disposing a view, or a copy of it, more than once is ignored.
     /// </remarks>
     public readonly struct ManagedBuffer: IDisposable
     {
@@ -41,33 +44,107 @@ namespace ViceMCP.ViceBridge
         /// </summary>
         public static readonly ManagedBuffer Empty = new (0);
         /// <summary>
-        /// Byte array of minimal size of <see cref="Size"/>.
+        /// Byte array of minimal size of <see cref="Offset"/> + <see cref="Size"/>.
         /// </summary>
         public byte[] Data { get; }
-        private readonly ArrayPool<byte>? _pool;
+        private readonly Reference? _reference;
+        /// <summary>
+        /// Where the content starts within <see cref="Data"/>. It is zero unless the buffer is a <see cref="Slice"/>.
+        /// </summary>
+        public int Offset { get; }
         /// <summary>
         /// The requested size of data.
         /// </summary>
         /// <remarks>Depending on the pool, the actual <see cref="Data"/> length can be larger.</remarks>
         public uint Size { get; }
+        /// <summary>
+        /// The content, <see cref="Size"/> bytes starting at <see cref="Offset"/>.
+        /// </summary>
+        public ReadOnlySpan<byte> Span => Data.AsSpan(Offset, (int)Size);
+        /// <summary>
+        /// The content as memory, valid until this view is disposed.
+        /// </summary>
+        public ReadOnlyMemory<byte> Memory => Data.AsMemory(Offset, (int)Size);
         ManagedBuffer(uint size)
         {
-            _pool = null;
+            _reference = null;
             Data = [];
             Size = size;
         }
         internal ManagedBuffer(ArrayPool<byte> pool, byte[] data, uint size)
+            : this(new Reference(new Owner(pool, data)), data, 0, size)
         {
-            this._pool = pool;
+        }
+        ManagedBuffer(Reference? reference, byte[] data, int offset, uint size)
+        {
+            _reference = reference;
             Data = data;
+            Offset = offset;
             Size = size;
         }
         /// <summary>
+        /// Takes another reference to the same content.
+        /// </summary>
+        /// <returns>A view that keeps the array out of the pool until it is disposed.</returns>
+        /// <exception cref="ObjectDisposedException">This view has already been disposed.</exception>
+        public ManagedBuffer Share() => Slice(0, (int)Size);
+        /// <summary>
+        /// Takes another reference to a part of the content without copying it.
+        /// </summary>
+        /// <param name="start">Start within the content.</param>
+        /// <param name="length">Length of the slice.</param>
+        /// <returns>A view that keeps the array out of the pool until it is disposed.</returns>
+        /// <exception cref="ObjectDisposedException">This view has already been disposed.</exception>
+        public ManagedBuffer Slice(int start, int length)
+        {
+            ArgumentOutOfRangeException.ThrowIfNegative(start);
+            ArgumentOutOfRangeException.ThrowIfNegative(length);
+            ArgumentOutOfRangeException.ThrowIfGreaterThan((uint)start + (uint)length, Size, nameof(length));
+            return new ManagedBuffer(_reference?.Share(), Data, Offset + start, (uint)length);
+        }
+        /// <summary>
         /// Releases all resources used by the <see cref="ManagedBuffer"/>.
         /// </summary>
         public void Dispose()
         {
-            _pool?.Return(Data);
+            _reference?.Release();
+        }
+
+        /// <summary>
+        /// Counts the views of a rented array.
+        /// </summary>
+        sealed class Owner(ArrayPool<byte> pool, byte[] data)
+        {
+            int _references = 1;
+            public void AddReference() => Interlocked.Increment(ref _references);
+            public void Release()
+            {
+                if (Interlocked.Decrement(ref _references) == 0)
+                {
+                    pool.Return(data);
+                }
+            }
+        }
+
+        /// <summary>
+        /// One view's reference, released at most once however often the view, or a copy of it, is disposed.
+        /// </summary>
+        sealed class Reference(Owner owner)
+        {
+            int _released;
+            public Reference Share()
+            {
+                ObjectDisposedException.ThrowIf(Volatile.Read(ref _released) != 0, typeof(ManagedBuffer));
+                owner.AddReference();
+                return new Reference(owner);
+            }
+            public void Release()
+            {
+                if (Interlocked.Exchange(ref _released, 1) == 0)
+                {
+                    owner.Release();
+                }
+            }
         }
     }
 }
\ No newline at end of file
@@ -0,0 +1,24 @@
+namespace ViceMCP.ViceBridge
+{
+    /// <summary>
+    /// Lane of the bridge queue a command waits in. The bridge always sends from the highest non-empty lane and
+    /// keeps commands of the same lane in order, except that a memory read doesn't overtake a queued write to its
+    /// range: the write's lane goes first up to the write.
+    /// </summary>
+    public enum CommandPriority
+    {
+        /// <summary>
+        /// Short requests a user waits on, such as ping, registers, checkpoints and stepping. Never refused for a
+        /// full queue.
+        /// </summary>
+        Interactive,
+        /// <summary>
+        /// Everything not classified otherwise.
+        /// </summary>
+        Normal,
+        /// <summary>
+        /// Large transfers and background work such as batches, snapshots, memory watches and dumps.
+        /// </summary>
+        Bulk
+    }
+}
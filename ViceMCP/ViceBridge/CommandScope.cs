@@ -0,0 +1,58 @@
+namespace ViceMCP.ViceBridge
+{
+    /// <summary>
+    /// Ambient lane and cancellation for commands enqueued without an explicit <see cref="CommandPriority"/>.
+    /// </summary>
+    /// <remarks>
+    /// Flows with the async context, so a tool can move every command it enqueues, including those of the helpers
+    /// it calls, to one lane. Commands of a single lane are never reordered, which keeps dependent sequences intact.
+    /// </remarks>
+    public static class CommandScope
+    {
+        private static readonly AsyncLocal<Scope?> CurrentScope = new();
+
+        /// <summary>
+        /// Lane of the innermost scope, null outside any scope.
+        /// </summary>
+        public static CommandPriority? Priority => CurrentScope.Value?.Priority;
+
+        /// <summary>
+        /// Cancellation of the innermost scope, <see cref="CancellationToken.None"/> outside any scope.
+        /// </summary>
+        public static CancellationToken CancellationToken => CurrentScope.Value?.CancellationToken ?? default;
+
+        /// <summary>
+        /// Puts the commands enqueued until the returned handle is disposed in <paramref name="priority"/> and
+        /// cancels the ones still unsent when <paramref name="ct"/> is cancelled.
+        /// </summary>
+        /// <returns>A handle that restores the enclosing scope when disposed.</returns>
+        public static IDisposable Enter(CommandPriority priority, CancellationToken ct = default)
+        {
+            var scope = new Scope(priority, ct, CurrentScope.Value);
+            CurrentScope.Value = scope;
+            return scope;
+        }
+
+        private sealed class Scope : IDisposable
+        {
+            public Scope(CommandPriority priority, CancellationToken cancellationToken, Scope? parent)
+            {
+                Priority = priority;
+                CancellationToken = cancellationToken;
+                Parent = parent;
+            }
+
+            public CommandPriority Priority { get; }
+            public CancellationToken CancellationToken { get; }
+            public Scope? Parent { get; }
+
+            public void Dispose()
+            {
+                if (CurrentScope.Value == this)
+                {
+                    CurrentScope.Value = Parent;
+                }
+            }
+        }
+    }
+}
@@ -10,7 +10,11 @@ namespace ViceMCP.ViceBridge.Commands
     /// <param name="MemSpace">Describes which part of the computer you want to write.</param>
     /// <param name="BankId">Describes which bank you want. This is dependent on your machine. If the memspace selected doesn't support banks, this value is ignored. </param>
     /// <param name="MemoryContent">Memory content to set.</param>
-    /// <remarks>MemoryContent will be disposed together with this command.</remarks>
+    /// <remarks>
+    /// The command owns <paramref name="MemoryContent"/> and releases it when disposed. Dispose it once its response
+    /// has completed, VICE has been sent the content by then. Pass <see cref="ManagedBuffer.Share"/> to keep using
+    /// the bytes elsewhere.
+    /// </remarks>
     public record MemorySetCommand(byte SideEffects, ushort StartAddress, MemSpace MemSpace, ushort BankId, ManagedBuffer MemoryContent)
         : ViceCommand<EmptyViceResponse>(CommandType.MemorySet), IDisposable
     {
@@ -28,7 +32,7 @@ namespace ViceMCP.ViceBridge.Commands
             BitConverter.TryWriteBytes(buffer[3..], EndAddress);
             buffer[5] = (byte)MemSpace;
             BitConverter.TryWriteBytes(buffer[6..], BankId);
-            MemoryContent.Data[0..(int)MemoryContent.Size].CopyTo(buffer[8..]);
+            MemoryContent.Span.CopyTo(buffer[8..]);
         }
         /// <summary>
         /// Releases all resources used by the <see cref="MemorySetCommand"/>.
@@ -52,17 +52,17 @@ namespace ViceMCP.ViceBridge.Commands
         {
             if (response is TResponse && response.ErrorCode == ErrorCode.OK)
             {
-                tcs.SetResult(new CommandResponse<TResponse>((TResponse)response));
+                tcs.TrySetResult(new CommandResponse<TResponse>((TResponse)response));
             }
             else
             {
-                tcs.SetResult(new CommandResponse<TResponse>(response.ErrorCode));
+                tcs.TrySetResult(new CommandResponse<TResponse>(response.ErrorCode));
             }
         }
         /// <inheritdoc />
         public void SetException(Exception ex)
         {
-            tcs.SetException(ex);
+            tcs.TrySetException(ex);
         }
         /// <inheritdoc cref="IViceCommand.GetBinaryData(uint)"/>
         public (ManagedBuffer Buffer, uint Length) GetBinaryData(uint requestId)
@@ -0,0 +1,22 @@
+namespace ViceMCP.ViceBridge
+{
+    /// <summary>
+    /// Execution state of the emulated CPU as reported by VICE broadcast responses.
+    /// </summary>
+    public enum EmulatorRunState
+    {
+        /// <summary>
+        /// No <see cref="Responses.StoppedResponse"/> or <see cref="Responses.ResumedResponse"/> has been seen
+        /// since the connection was established.
+        /// </summary>
+        Unknown,
+        /// <summary>
+        /// The CPU is executing.
+        /// </summary>
+        Running,
+        /// <summary>
+        /// The CPU is held in the monitor, either by a checkpoint, stepping or an incoming command.
+        /// </summary>
+        Stopped
+    }
+}
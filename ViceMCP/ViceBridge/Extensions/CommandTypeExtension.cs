@@ -0,0 +1,74 @@
+namespace ViceMCP.ViceBridge.Commands
+{
+    internal static class CommandTypeExtension
+    {
+        /// <summary>
+        /// Commands that let the CPU run or replace the machine state. They are never pipelined with other
+        /// commands because their effect is not complete when VICE answers them.
+        /// </summary>
+        internal static bool IsPipelineBarrier(this CommandType commandType) => commandType switch
+        {
+            CommandType.Exit
+                or CommandType.AdvanceInstruction
+                or CommandType.ExecuteUntilReturn
+                or CommandType.Reset
+                or CommandType.AutoStart
+                or CommandType.Undump
+                or CommandType.Quit => true,
+            _ => false,
+        };
+
+        /// <summary>
+        /// Lane of a command enqueued without an explicit priority or <see cref="CommandScope"/>.
+        /// </summary>
+        internal static CommandPriority DefaultPriority(this CommandType commandType) => commandType switch
+        {
+            CommandType.Ping
+                or CommandType.Exit
+                or CommandType.AdvanceInstruction
+                or CommandType.ExecuteUntilReturn
+                or CommandType.CheckpointGet
+                or CommandType.CheckpointSet
+                or CommandType.CheckpointDelete
+                or CommandType.CheckpointList
+                or CommandType.CheckpointToggle
+                or CommandType.ConditionSet
+                or CommandType.RegistersGet
+                or CommandType.RegistersSet
+                or CommandType.RegistersAvailable
+                or CommandType.BanksAvailable
+                or CommandType.Info => CommandPriority.Interactive,
+            CommandType.Dump
+                or CommandType.Undump
+                or CommandType.AutoStart => CommandPriority.Bulk,
+            _ => CommandPriority.Normal,
+        };
+
+        /// <summary>
+        /// Commands that cannot change emulator memory. Anything else invalidates the shadow memory cache.
+        /// </summary>
+        /// <remarks>
+        /// <see cref="CommandType.MemorySet"/> is not listed, it invalidates only the range it writes.
+        /// </remarks>
+        internal static bool PreservesMemory(this CommandType commandType) => commandType switch
+        {
+            CommandType.MemoryGet
+                or CommandType.CheckpointGet
+                or CommandType.CheckpointSet
+                or CommandType.CheckpointDelete
+                or CommandType.CheckpointList
+                or CommandType.CheckpointToggle
+                or CommandType.ConditionSet
+                or CommandType.RegistersGet
+                or CommandType.RegistersSet
+                or CommandType.Dump
+                or CommandType.ResourceGet
+                or CommandType.Ping
+                or CommandType.BanksAvailable
+                or CommandType.RegistersAvailable
+                or CommandType.DisplayGet
+                or CommandType.Info => true,
+            _ => false,
+        };
+    }
+}
@@ -0,0 +1,136 @@
+using System.Numerics;
+
+namespace ViceMCP.ViceBridge
+{
+    /// <summary>
+    /// Fixed size latency histogram with log-linear buckets in the style of HdrHistogram.
+    /// </summary>
+    /// <remarks>
+    /// Values are recorded in microseconds. Below 16 every value has its own bucket, above that each power of two
+    /// is split into 16 buckets, so a reported percentile is within 1/16 (about 6%) of the recorded value at any
+    /// magnitude. Recording is a few interlocked operations on a preallocated array and never allocates.
+    /// </remarks>
+    /// <threadsafety>Class is thread safe.</threadsafety>
+    public sealed class LatencyHistogram
+    {
+        private const int SubBucketBits = 4;
+        private const int SubBucketCount = 1 << SubBucketBits;
+        private const int BucketCount = 64 * SubBucketCount;
+
+        private readonly long[] _counts = new long[BucketCount];
+        private long _count;
+        private long _sum;
+        private long _max;
+
+        /// <summary>
+        /// Number of recorded values.
+        /// </summary>
+        public long Count => Interlocked.Read(ref _count);
+
+        /// <summary>
+        /// Largest recorded value in microseconds, exact.
+        /// </summary>
+        public long Max => Interlocked.Read(ref _max);
+
+        /// <summary>
+        /// Mean of the recorded values in microseconds.
+        /// </summary>
+        public double Mean
+        {
+            get
+            {
+                long count = Count;
+                return count > 0 ? (double)Interlocked.Read(ref _sum) / count : 0;
+            }
+        }
+
+        /// <summary>
+        /// Records a value.
+        /// </summary>
+        /// <param name="microseconds">
+        /// The value to record, negative values are recorded as 0.
+        /// </param>
+        public void Record(long microseconds)
+        {
+            if (microseconds < 0)
+            {
+                microseconds = 0;
+            }
+            Interlocked.Increment(ref _counts[GetBucketIndex(microseconds)]);
+            Interlocked.Increment(ref _count);
+            Interlocked.Add(ref _sum, microseconds);
+            long max = Interlocked.Read(ref _max);
+            while (microseconds > max)
+            {
+                long previous = Interlocked.CompareExchange(ref _max, microseconds, max);
+                if (previous == max)
+                {
+                    break;
+                }
+                max = previous;
+            }
+        }
+
+        /// <summary>
+        /// Gets the value at the given percentile.
+        /// </summary>
+        /// <param name="percentile">
+        /// Percentile between 0 and 100.
+        /// </param>
+        /// <returns>
+        /// The highest value equivalent to the bucket holding the percentile, capped at <see cref="Max"/>,
+        /// or 0 when nothing was recorded.
+        /// </returns>
+        public long GetValueAtPercentile(double percentile)
+        {
+            long count = Count;
+            if (count == 0)
+            {
+                return 0;
+            }
+            long target = Math.Max(1, (long)Math.Ceiling(Math.Clamp(percentile, 0, 100) / 100 * count));
+            long cumulative = 0;
+            for (int i = 0; i < BucketCount; i++)
+            {
+                cumulative += Interlocked.Read(ref _counts[i]);
+                if (cumulative >= target)
+                {
+                    return Math.Min(GetHighestEquivalentValue(i), Max);
+                }
+            }
+            return Max;
+        }
+
+        /// <summary>
+        /// Clears all recorded values.
+        /// </summary>
+        public void Reset()
+        {
+            Array.Clear(_counts);
+            Interlocked.Exchange(ref _count, 0);
+            Interlocked.Exchange(ref _sum, 0);
+            Interlocked.Exchange(ref _max, 0);
+        }
+
+        internal static int GetBucketIndex(long value)
+        {
+            if (value < SubBucketCount)
+            {
+                return (int)value;
+            }
+            int shift = 63 - BitOperations.LeadingZeroCount((ulong)value) - SubBucketBits;
+            return (shift + 1) * SubBucketCount + (int)((value >> shift) & (SubBucketCount - 1));
+        }
+
+        internal static long GetHighestEquivalentValue(int index)
+        {
+            if (index < SubBucketCount)
+            {
+                return index;
+            }
+            int shift = index / SubBucketCount - 1;
+            long lowest = (long)(SubBucketCount + index % SubBucketCount) << shift;
+            return lowest + (1L << shift) - 1;
+        }
+    }
+}
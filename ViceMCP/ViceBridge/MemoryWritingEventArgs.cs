@@ -0,0 +1,34 @@
+using ViceMCP.ViceBridge.Commands;
+
+namespace ViceMCP.ViceBridge
+{
+    /// <summary>
+    /// Occurs when a memory write is enqueued.
+    /// </summary>
+    public class MemoryWritingEventArgs : EventArgs
+    {
+        /// <summary>
+        /// Gets the memory space written to.
+        /// </summary>
+        public MemSpace MemSpace { get; }
+        /// <summary>
+        /// Gets the bank written to.
+        /// </summary>
+        public ushort BankId { get; }
+        /// <summary>
+        /// Gets the first address written.
+        /// </summary>
+        public ushort StartAddress { get; }
+        /// <summary>
+        /// Gets the number of bytes written, running past $FFFF wraps around.
+        /// </summary>
+        public int Length { get; }
+        internal MemoryWritingEventArgs(MemSpace memSpace, ushort bankId, ushort startAddress, int length)
+        {
+            MemSpace = memSpace;
+            BankId = bankId;
+            StartAddress = startAddress;
+            Length = length;
+        }
+    }
+}
@@ -1,4 +1,5 @@
-﻿using System.Collections.Immutable;
+﻿using System.Buffers;
+using System.Collections.Immutable;
 using System.Text;
 using Microsoft.Extensions.Logging;
 using ViceMCP.ViceBridge.Commands;
@@ -23,23 +24,32 @@ namespace ViceMCP.ViceBridge.Responses
         }
 
         internal uint GetResponseBodyLength(ReadOnlySpan<byte> header) => BitConverter.ToUInt32(header[2..]);
-        internal (ViceResponse Response, uint RequestId) Build(ReadOnlySpan<byte> header, byte expectedApiVersion, ReadOnlySpan<byte> buffer)
+        /// <summary>
+        /// Builds a response whose body may span several receive segments.
+        /// </summary>
+        /// <remarks>
+        /// Memory payloads are copied once, straight from the segments into the pooled buffer of the response.
+        /// Other bodies are small and are flattened first when they are not contiguous.
+        /// </remarks>
+        internal (ViceResponse Response, uint RequestId) Build(ReadOnlySpan<byte> header, byte expectedApiVersion, in ReadOnlySequence<byte> body)
         {
-            byte stx = header[0]; // should be STX
-            if (stx != Constants.STX)
+            if (body.IsSingleSegment)
             {
-                throw new Exception("Not starting with STX");
+                return Build(header, expectedApiVersion, body.FirstSpan);
             }
-            byte apiVersion = header[1];
-            if (apiVersion != expectedApiVersion)
+            if ((ResponseType)header[6] == ResponseType.MemoryGet)
             {
-                throw new Exception($"Unknown API version {apiVersion}");
+                var (apiVersion, errorCode, requestId) = ReadHeader(header, expectedApiVersion);
+                return (BuildMemoryGetResponse(apiVersion, errorCode, body), requestId);
             }
-            uint length = GetResponseBodyLength(header);
+            using var flat = BufferManager.GetBuffer((uint)body.Length);
+            body.CopyTo(flat.Data);
+            return Build(header, expectedApiVersion, flat.Span);
+        }
+        internal (ViceResponse Response, uint RequestId) Build(ReadOnlySpan<byte> header, byte expectedApiVersion, ReadOnlySpan<byte> buffer)
+        {
+            var (apiVersion, errorCode, requestId) = ReadHeader(header, expectedApiVersion);
             var responseType = (ResponseType)header[6];
-            var errorCode = (ErrorCode)header[7];
-            uint requestId = BitConverter.ToUInt32(header[8..]);
-            _logger.LogDebug($"Decoding {responseType}({(byte)responseType:x2}) with error code {errorCode} and request id {requestId:x4}");
             ViceResponse result = responseType switch
             {
                 ResponseType.MemoryGet          => BuildMemoryGetResponse(apiVersion, errorCode, buffer),
@@ -74,13 +84,36 @@ namespace ViceMCP.ViceBridge.Responses
             return (result, requestId);
         }
 
+        (byte ApiVersion, ErrorCode ErrorCode, uint RequestId) ReadHeader(ReadOnlySpan<byte> header, byte expectedApiVersion)
+        {
+            byte stx = header[0]; // should be STX
+            if (stx != Constants.STX)
+            {
+                throw new Exception("Not starting with STX");
+            }
+            byte apiVersion = header[1];
+            if (apiVersion != expectedApiVersion)
+            {
+                throw new Exception($"Unknown API version {apiVersion}");
+            }
+            var responseType = (ResponseType)header[6];
+            var errorCode = (ErrorCode)header[7];
+            uint requestId = BitConverter.ToUInt32(header[8..]);
+            _logger.LogDebug($"Decoding {responseType}({(byte)responseType:x2}) with error code {errorCode} and request id {requestId:x4}");
+            return (apiVersion, errorCode, requestId);
+        }
+        /// <summary>
+        /// VICE reports the length of a full 64KB segment as zero; the body length tells them apart.
+        /// </summary>
+        static int GetMemorySegmentLength(ushort declared, long bodyLength)
+            => declared == 0 && bodyLength > 2 ? (int)Math.Min(bodyLength - 2, 0x10000) : declared;
         internal MemoryGetResponse BuildMemoryGetResponse(byte apiVersion, ErrorCode errorCode, ReadOnlySpan<byte> buffer)
         {
             ManagedBuffer segmentBuffer;
             if (errorCode == ErrorCode.OK)
             {
-                ushort memorySegmentLength = BitConverter.ToUInt16(buffer);
-                segmentBuffer = BufferManager.GetBuffer(memorySegmentLength);
+                int memorySegmentLength = GetMemorySegmentLength(BitConverter.ToUInt16(buffer), buffer.Length);
+                segmentBuffer = BufferManager.GetBuffer((uint)memorySegmentLength);
                 buffer.Slice(2, memorySegmentLength).CopyTo(segmentBuffer.Data);
             }
             else
@@ -89,6 +122,23 @@ namespace ViceMCP.ViceBridge.Responses
             }
             return new MemoryGetResponse(apiVersion, errorCode, segmentBuffer);
         }
+        internal MemoryGetResponse BuildMemoryGetResponse(byte apiVersion, ErrorCode errorCode, in ReadOnlySequence<byte> buffer)
+        {
+            ManagedBuffer segmentBuffer;
+            if (errorCode == ErrorCode.OK)
+            {
+                Span<byte> lengthBytes = stackalloc byte[sizeof(ushort)];
+                buffer.Slice(0, sizeof(ushort)).CopyTo(lengthBytes);
+                int memorySegmentLength = GetMemorySegmentLength(BitConverter.ToUInt16(lengthBytes), buffer.Length);
+                segmentBuffer = BufferManager.GetBuffer((uint)memorySegmentLength);
+                buffer.Slice(sizeof(ushort), memorySegmentLength).CopyTo(segmentBuffer.Data);
+            }
+            else
+            {
+                segmentBuffer = ManagedBuffer.Empty;
+            }
+            return new MemoryGetResponse(apiVersion, errorCode, segmentBuffer);
+        }
         internal CheckpointInfoResponse BuildCheckpointInfoResponse(byte apiVersion, ErrorCode errorCode, ReadOnlySpan<byte> buffer)
         {
             if (errorCode == ErrorCode.OK)
@@ -17,6 +17,8 @@ namespace ViceMCP.ViceBridge.Responses
     /// <param name="ApiVersion"><inheritdoc cref="ViceMCP.ViceBridge.Responses.ViceResponse" /></param>
     /// <param name="ErrorCode"><inheritdoc cref="ViceMCP.ViceBridge.Responses.ViceResponse" /></param>
     /// <param name="Memory">The memory at the address.</param>
+    /// <remarks>The response owns one reference to <paramref name="Memory"/>. Take it over, or call <see cref="ManagedBuffer.Share"/>
+    /// to keep the bytes beyond <see cref="Dispose"/>.</remarks>
     public record MemoryGetResponse(byte ApiVersion, ErrorCode ErrorCode, ManagedBuffer? Memory) : ViceResponse(ApiVersion, ErrorCode), IDisposable
     {
         /// <summary>
@@ -0,0 +1,22 @@
+namespace ViceMCP.ViceBridge
+{
+    /// <summary>
+    /// Occurs when emulator run state changes.
+    /// </summary>
+    public class RunStateChangedEventArgs : EventArgs
+    {
+        /// <summary>
+        /// Gets the new run state.
+        /// </summary>
+        public EmulatorRunState RunState { get; }
+        /// <summary>
+        /// Gets the program counter reported with the state change, if any.
+        /// </summary>
+        public ushort? ProgramCounter { get; }
+        internal RunStateChangedEventArgs(EmulatorRunState runState, ushort? programCounter)
+        {
+            RunState = runState;
+            ProgramCounter = programCounter;
+        }
+    }
+}
@@ -47,7 +47,8 @@ namespace ViceMCP.ViceBridge.Services.Abstract
 /// <param name="Command">VICE command. Null when response is unbound.</param>
 /// <param name="Response">VICE response</param>
 /// <param name="StartTime">Ticks when command was issued.</param>
-/// <param name="Elapsed">Ticks when response was received. Null when response is unbound.</param>
+/// <param name="Elapsed">Ticks from issuing the command to receiving the response. Null when response is unbound
+/// or hasn't arrived yet.</param>
 /// <param name="LinkedResponses">A list of linked responses (i.e. for <see cref="CheckpointInfoResponse"/>)</param>
 public record CommunicationData(uint? Sequence, IViceCommand? Command, ViceResponse? Response, long StartTime, long? Elapsed,
     ImmutableArray<ViceResponse> LinkedResponses);
\ No newline at end of file
@@ -1,4 +1,5 @@
 using System.Collections.Immutable;
+using ViceMCP.ViceBridge.Commands;
 
 namespace ViceMCP.ViceBridge.Services.Abstract
 {
@@ -12,7 +13,7 @@ namespace ViceMCP.ViceBridge.Services.Abstract
         /// </summary>
         bool IsEnabled { get; }
         /// <summary>
-        /// List of collected events.
+        /// List of collected events. Implementations may keep only the most recent ones.
         /// </summary>
         ImmutableArray<PerformanceEvent> Events { get; }
         /// <summary>
@@ -28,8 +29,98 @@ namespace ViceMCP.ViceBridge.Services.Abstract
         /// Clears log and resets start ticks.
         /// </summary>
         void Clear();
+        /// <summary>
+        /// A command is about to be written to the socket.
+        /// </summary>
+        /// <param name="requestId">Request ID the command is sent with.</param>
+        /// <param name="commandType">Type of the command.</param>
+        /// <param name="bytes">Size of the command on the wire.</param>
+        /// <param name="queueDepth">Commands queued or in flight, this one included.</param>
+        void RequestSent(uint requestId, CommandType commandType, int bytes, int queueDepth) { }
+        /// <summary>
+        /// The header of a response to <paramref name="requestId"/> has arrived.
+        /// </summary>
+        /// <remarks>Can be called more than once for a request, only the first call counts.</remarks>
+        void ResponseStarted(uint requestId) { }
+        /// <summary>
+        /// A whole response frame has been read, including broadcasts and intermediate responses.
+        /// </summary>
+        /// <param name="requestId">Request ID carried by the response.</param>
+        /// <param name="bytes">Size of the frame on the wire.</param>
+        void ResponseReceived(uint requestId, int bytes) { }
+        /// <summary>
+        /// The final response to <paramref name="requestId"/> has been routed to its command.
+        /// </summary>
+        void RequestCompleted(uint requestId) { }
+        /// <summary>
+        /// A command has been taken from the bridge queue to be sent.
+        /// </summary>
+        /// <param name="priority">Lane it waited in.</param>
+        /// <param name="wait">Time since it was enqueued.</param>
+        void CommandDequeued(CommandPriority priority, TimeSpan wait) { }
+        /// <summary>
+        /// Gets aggregated statistics since creation or <see cref="Clear"/> method call.
+        /// </summary>
+        PerformanceStatistics GetStatistics() => PerformanceStatistics.Empty;
+    }
+    /// <summary>
+    /// Aggregated profiler statistics.
+    /// </summary>
+    /// <param name="Elapsed">Time covered by the statistics.</param>
+    /// <param name="CommandsSent">Number of commands sent.</param>
+    /// <param name="CommandsCompleted">Number of commands that received their final response.</param>
+    /// <param name="BytesSent">Bytes written to VICE.</param>
+    /// <param name="BytesReceived">Bytes read from VICE, broadcasts included.</param>
+    /// <param name="AverageQueueDepth">Average number of commands queued or in flight when a command was sent.</param>
+    /// <param name="MaxQueueDepth">Largest number of commands queued or in flight when a command was sent.</param>
+    /// <param name="Commands">Per command type statistics, ordered by command type.</param>
+    /// <param name="RecentRequests">Timelines of the most recent requests, oldest first.</param>
+    /// <param name="Lanes">Queue wait per lane that sent any command, ordered by priority.</param>
+    public record PerformanceStatistics(TimeSpan Elapsed, long CommandsSent, long CommandsCompleted, long BytesSent,
+        long BytesReceived, double AverageQueueDepth, int MaxQueueDepth, ImmutableArray<CommandStatistics> Commands,
+        ImmutableArray<RequestTimeline> RecentRequests, ImmutableArray<LaneStatistics> Lanes)
+    {
+        /// <summary>
+        /// Statistics of a profiler that doesn't collect any.
+        /// </summary>
+        public static PerformanceStatistics Empty { get; } = new(TimeSpan.Zero, 0, 0, 0, 0, 0, 0,
+            ImmutableArray<CommandStatistics>.Empty, ImmutableArray<RequestTimeline>.Empty,
+            ImmutableArray<LaneStatistics>.Empty);
     }
     /// <summary>
+    /// Statistics of a single command type.
+    /// </summary>
+    /// <param name="CommandType">The command type.</param>
+    /// <param name="Count">Number of completed commands.</param>
+    /// <param name="BytesSent">Bytes written for completed commands.</param>
+    /// <param name="BytesReceived">Bytes read for completed commands.</param>
+    /// <param name="FirstByte">Time from sending the command to the arrival of its response header.</param>
+    /// <param name="Complete">Time from sending the command to its final response.</param>
+    public record CommandStatistics(CommandType CommandType, long Count, long BytesSent, long BytesReceived,
+        LatencySummary FirstByte, LatencySummary Complete);
+    /// <summary>
+    /// Time commands of a lane spent in the bridge queue.
+    /// </summary>
+    /// <param name="Priority">The lane.</param>
+    /// <param name="Count">Number of commands taken from it, cancelled ones excluded.</param>
+    /// <param name="Wait">Time from enqueueing a command to taking it for sending.</param>
+    public record LaneStatistics(CommandPriority Priority, long Count, LatencySummary Wait);
+    /// <summary>
+    /// Percentiles of a latency distribution.
+    /// </summary>
+    public record LatencySummary(TimeSpan P50, TimeSpan P99, TimeSpan Max, TimeSpan Mean);
+    /// <summary>
+    /// Timestamps of a single request, relative to the start of the profiler.
+    /// </summary>
+    /// <param name="RequestId">Request ID of the command.</param>
+    /// <param name="CommandType">The command type.</param>
+    /// <param name="QueueDepth">Commands queued or in flight when it was sent.</param>
+    /// <param name="Sent">When the command was written.</param>
+    /// <param name="FirstByte">When its response header arrived, null if it hasn't yet.</param>
+    /// <param name="Completed">When its final response was routed, null if it hasn't been yet.</param>
+    public record RequestTimeline(uint RequestId, CommandType CommandType, int QueueDepth, TimeSpan Sent,
+        TimeSpan? FirstByte, TimeSpan? Completed);
+    /// <summary>
     /// Type of data type that is available.
     /// </summary>
     public enum PerformanceDataType
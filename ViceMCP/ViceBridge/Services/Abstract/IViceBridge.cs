@@ -26,10 +26,23 @@ public interface IViceBridge : IAsyncDisposable, IDisposable
     /// </summary>
     bool IsConnected { get; }
     /// <summary>
+    /// Gets emulator run state tracked from <see cref="StoppedResponse"/> and <see cref="ResumedResponse"/> broadcasts.
+    /// Reset to <see cref="EmulatorRunState.Unknown"/> whenever the connection changes.
+    /// </summary>
+    EmulatorRunState RunState { get; }
+    /// <summary>
     /// Gives access to performance statistics.
     /// </summary>
     IPerformanceProfiler PerformanceProfiler { get; }
     /// <summary>
+    /// Gives access to the command and response history.
+    /// </summary>
+    IMessagesHistory MessagesHistory { get; }
+    /// <summary>
+    /// Gets the shadow memory cache, null when <see cref="ViceConfiguration.UseShadowMemory"/> is off.
+    /// </summary>
+    ShadowMemoryCache? ShadowMemory { get; }
+    /// <summary>
     /// Starts the bridge.
     /// </summary>
     /// <param name="port">Port of the binary monitor. 6502 by default.</param>
@@ -50,9 +63,45 @@ public interface IViceBridge : IAsyncDisposable, IDisposable
     /// <param name="resumeOnStopped">When true, ExitCommand is sent if <see cref="StoppedResponse"/> is received
     /// during command execution.</param>
     /// <returns>An instance of passed in command.</returns>
+    /// <remarks>The command goes to the lane of the current <see cref="CommandScope"/>, or the default lane of its
+    /// type outside any scope.</remarks>
     T EnqueueCommand<T>(T command, bool resumeOnStopped = false)
         where T : IViceCommand;
     /// <summary>
+    /// Enqueues command for sending in the lane <paramref name="priority"/>.
+    /// </summary>
+    /// <typeparam name="T">Command type</typeparam>
+    /// <param name="command">An instance of <see cref="ViceCommand{TResponse}"/> subtype to enqueue.</param>
+    /// <param name="priority">Lane to wait in. Higher lanes are sent first, but reads don't overtake writes to their
+    /// range.</param>
+    /// <param name="resumeOnStopped">When true, ExitCommand is sent if <see cref="StoppedResponse"/> is received
+    /// during command execution.</param>
+    /// <param name="ct">Cancels the command while it is still queued, faulting its response with
+    /// <see cref="OperationCanceledException"/>.</param>
+    /// <returns>An instance of passed in command.</returns>
+    /// <exception cref="InvalidOperationException">Thrown when the lane is full.</exception>
+    T EnqueueCommand<T>(T command, CommandPriority priority, bool resumeOnStopped = false, CancellationToken ct = default)
+        where T : IViceCommand;
+    /// <summary>
+    /// Enqueues command for sending in the lane <paramref name="priority"/>, waiting for room when the lane is full.
+    /// </summary>
+    /// <inheritdoc cref="EnqueueCommand{T}(T, CommandPriority, bool, CancellationToken)"/>
+    ValueTask<T> EnqueueCommandAsync<T>(T command, CommandPriority priority, bool resumeOnStopped = false,
+        CancellationToken ct = default)
+        where T : IViceCommand;
+    /// <summary>
+    /// Enqueues command for sending, waiting for room when its lane is full.
+    /// </summary>
+    /// <inheritdoc cref="EnqueueCommand{T}(T, bool)"/>
+    ValueTask<T> EnqueueCommandAsync<T>(T command, bool resumeOnStopped = false)
+        where T : IViceCommand;
+    /// <summary>
+    /// Keeps VICE stopped between commands until the returned handle is disposed, for sequences such as tracing
+    /// that must not let the CPU run between two commands. Auto-resume happens once the last hold is released.
+    /// </summary>
+    /// <returns>A handle that releases the hold when disposed.</returns>
+    IDisposable HoldAutoResume();
+    /// <summary>
     /// Occurs when an unbound event arrived.
     /// </summary>
     /// <threadsafety>Can occur on any thread.</threadsafety>
@@ -63,6 +112,22 @@ public interface IViceBridge : IAsyncDisposable, IDisposable
     /// <threadsafety>Can occur on any thread.</threadsafety>
     event EventHandler<ConnectedChangedEventArgs>? ConnectedChanged;
     /// <summary>
+    /// Occurs when <see cref="RunState"/> changes.
+    /// </summary>
+    /// <threadsafety>Can occur on any thread.</threadsafety>
+    event EventHandler<RunStateChangedEventArgs>? RunStateChanged;
+    /// <summary>
+    /// Occurs when a memory write is enqueued, before any command enqueued after it is.
+    /// </summary>
+    /// <threadsafety>Can occur on any thread.</threadsafety>
+    event EventHandler<MemoryWritingEventArgs>? MemoryWriting;
+    /// <summary>
+    /// Waits until the binary monitor is connected and answers commands.
+    /// </summary>
+    /// <param name="ct">Bounds the wait.</param>
+    /// <returns>Emulator version info returned by the handshake.</returns>
+    Task<InfoResponse> WaitForReadyAsync(CancellationToken ct = default);
+    /// <summary>
     /// Waits for connection status change.
     /// </summary>
     /// <param name="ct"></param>
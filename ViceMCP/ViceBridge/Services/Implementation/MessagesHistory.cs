@@ -0,0 +1,347 @@
+using System.Buffers.Binary;
+using System.Collections.Immutable;
+using System.Diagnostics;
+using System.Text;
+using System.Text.Json;
+using ViceMCP.ViceBridge.Commands;
+using ViceMCP.ViceBridge.Responses;
+using ViceMCP.ViceBridge.Services.Abstract;
+
+namespace ViceMCP.ViceBridge.Services.Implementation
+{
+    /// <summary>
+    /// Fixed capacity message history. Once full, the oldest entries are overwritten.
+    /// </summary>
+    /// <remarks>
+    /// Entries live in a preallocated ring and only hold references to command and response objects that exist
+    /// anyway. Identifiers returned by <see cref="AddCommandAsync"/> keep increasing, so responses arriving for
+    /// an entry that has already been overwritten are ignored. Memory contents carried by responses are pooled
+    /// and are not valid after the response has been handled; exports therefore describe messages without their
+    /// payload.
+    /// </remarks>
+    /// <threadsafety>Thread safe.</threadsafety>
+    public class MessagesHistory : IMessagesHistory
+    {
+        /// <summary>
+        /// Default number of entries kept.
+        /// </summary>
+        public const int DefaultCapacity = 1024;
+        /// <summary>
+        /// Magic bytes that start a binary export.
+        /// </summary>
+        public static ReadOnlySpan<byte> BinaryMagic => "VMH1"u8;
+        /// <summary>
+        /// Size of a single entry record in a binary export.
+        /// </summary>
+        public const int BinaryEntrySize = 24;
+
+        private const ushort BinaryVersion = 1;
+        private const ushort NoName = ushort.MaxValue;
+
+        private readonly object _sync = new();
+        private readonly Entry[] _entries;
+        private long _startTimestamp = Stopwatch.GetTimestamp();
+        private long _nextId;
+
+        /// <summary>
+        /// Creates a history.
+        /// </summary>
+        /// <param name="capacity">
+        /// Number of most recent entries kept.
+        /// </param>
+        public MessagesHistory(int capacity = DefaultCapacity)
+        {
+            _entries = new Entry[Math.Max(1, capacity)];
+            for (int i = 0; i < _entries.Length; i++)
+            {
+                _entries[i] = new Entry();
+            }
+        }
+
+        /// <summary>
+        /// Maximum number of entries kept.
+        /// </summary>
+        public int Capacity => _entries.Length;
+
+        /// <summary>
+        /// Number of entries added since creation or <see cref="Start"/>, overwritten ones included.
+        /// </summary>
+        public long TotalCount
+        {
+            get { lock (_sync) { return _nextId; } }
+        }
+
+        /// <inheritdoc/>
+        public void Start()
+        {
+            lock (_sync)
+            {
+                foreach (var entry in _entries)
+                {
+                    entry.Clear();
+                }
+                _nextId = 0;
+                _startTimestamp = Stopwatch.GetTimestamp();
+            }
+        }
+
+        /// <inheritdoc/>
+        public ValueTask<int> AddCommandAsync(uint sequence, IViceCommand? command)
+        {
+            return new ValueTask<int>(Add(sequence, command, null));
+        }
+
+        /// <inheritdoc/>
+        public void UpdateWithResponse(int id, ViceResponse response)
+        {
+            lock (_sync)
+            {
+                if (TryGetEntry(id) is { } entry && entry.Response == null)
+                {
+                    entry.Response = response;
+                    entry.ElapsedTicks = ToTimeSpanTicks(Stopwatch.GetTimestamp() - entry.Timestamp);
+                }
+            }
+        }
+
+        /// <inheritdoc/>
+        public void UpdateWithLinkedResponse(int id, ViceResponse response)
+        {
+            lock (_sync)
+            {
+                if (TryGetEntry(id) is { } entry)
+                {
+                    entry.LinkedResponses = entry.LinkedResponses.Add(response);
+                }
+            }
+        }
+
+        /// <inheritdoc/>
+        public void AddsResponseOnly(ViceResponse response)
+        {
+            Add(null, null, response);
+        }
+
+        /// <summary>
+        /// Gets the entries currently kept, oldest first.
+        /// </summary>
+        /// <returns>
+        /// Entries where <see cref="CommunicationData.StartTime"/> is in <see cref="TimeSpan"/> ticks since
+        /// <see cref="Start"/> and <see cref="CommunicationData.Elapsed"/> is in <see cref="TimeSpan"/> ticks from
+        /// sending the command to receiving its response.
+        /// </returns>
+        public ImmutableArray<CommunicationData> GetEntries()
+        {
+            lock (_sync)
+            {
+                long first = Math.Max(0, _nextId - _entries.Length);
+                var builder = ImmutableArray.CreateBuilder<CommunicationData>((int)(_nextId - first));
+                for (long id = first; id < _nextId; id++)
+                {
+                    var entry = _entries[id % _entries.Length];
+                    builder.Add(new CommunicationData(entry.Sequence, entry.Command, entry.Response,
+                        ToTimeSpanTicks(entry.Timestamp - _startTimestamp), entry.ElapsedTicks, entry.LinkedResponses));
+                }
+                return builder.MoveToImmutable();
+            }
+        }
+
+        /// <summary>
+        /// Writes the entries as newline delimited JSON, one object per entry, oldest first.
+        /// </summary>
+        /// <param name="stream">
+        /// The stream to write to.
+        /// </param>
+        /// <param name="ct">
+        /// A cancellation token that can be used to cancel the operation.
+        /// </param>
+        /// <returns>
+        /// Number of entries written.
+        /// </returns>
+        public async Task<int> ExportNdjsonAsync(Stream stream, CancellationToken ct = default)
+        {
+            var entries = GetEntries();
+            var buffer = new MemoryStream();
+            await using var writer = new Utf8JsonWriter(buffer);
+            foreach (var entry in entries)
+            {
+                writer.Reset();
+                writer.WriteStartObject();
+                if (entry.Sequence is { } sequence)
+                {
+                    writer.WriteNumber("sequence", sequence);
+                }
+                if (entry.Command != null)
+                {
+                    writer.WriteString("command", entry.Command.CommandType.ToString());
+                }
+                if (entry.Response != null)
+                {
+                    writer.WriteString("response", ResponseName(entry.Response));
+                    writer.WriteString("error", entry.Response.ErrorCode.ToString());
+                }
+                writer.WriteNumber("start_us", entry.StartTime / TimeSpan.TicksPerMicrosecond);
+                if (entry.Elapsed is { } elapsed)
+                {
+                    writer.WriteNumber("elapsed_us", elapsed / TimeSpan.TicksPerMicrosecond);
+                }
+                if (entry.LinkedResponses.Length > 0)
+                {
+                    writer.WriteNumber("linked", entry.LinkedResponses.Length);
+                }
+                writer.WriteEndObject();
+                await writer.FlushAsync(ct);
+                buffer.WriteByte((byte)'\n');
+                // Written in batches so the target stream sees a few large writes
+                if (buffer.Length >= 64 * 1024)
+                {
+                    await FlushAsync(buffer, stream, ct);
+                }
+            }
+            await FlushAsync(buffer, stream, ct);
+            return entries.Length;
+        }
+
+        /// <summary>
+        /// Writes the entries in a compact binary format, oldest first.
+        /// </summary>
+        /// <remarks>
+        /// Little endian. Header: <see cref="BinaryMagic"/>, uint16 version, uint16 name count followed by the
+        /// response type names (uint8 length and UTF-8 bytes each), uint32 entry count. Each entry is
+        /// <see cref="BinaryEntrySize"/> bytes: int64 start in microseconds, int32 elapsed microseconds (-1 when
+        /// unanswered), uint32 sequence, uint8 flags (1 = command, 2 = response), uint8 command type,
+        /// uint8 error code, uint8 reserved, uint16 response name index (0xFFFF when none), uint16 number of
+        /// linked responses.
+        /// </remarks>
+        /// <param name="stream">
+        /// The stream to write to.
+        /// </param>
+        /// <param name="ct">
+        /// A cancellation token that can be used to cancel the operation.
+        /// </param>
+        /// <returns>
+        /// Number of entries written.
+        /// </returns>
+        public async Task<int> ExportBinaryAsync(Stream stream, CancellationToken ct = default)
+        {
+            var entries = GetEntries();
+            var names = new List<string>();
+            var nameIndexes = new Dictionary<Type, ushort>();
+            foreach (var response in entries.Select(e => e.Response).OfType<ViceResponse>())
+            {
+                if (!nameIndexes.ContainsKey(response.GetType()))
+                {
+                    nameIndexes[response.GetType()] = (ushort)names.Count;
+                    names.Add(ResponseName(response));
+                }
+            }
+
+            await stream.WriteAsync(BuildBinaryHeader(names, entries.Length), ct);
+            await stream.WriteAsync(BuildBinaryRecords(entries, nameIndexes), ct);
+            return entries.Length;
+        }
+
+        private static byte[] BuildBinaryRecords(ImmutableArray<CommunicationData> entries, Dictionary<Type, ushort> nameIndexes)
+        {
+            var records = new byte[entries.Length * BinaryEntrySize];
+            for (int i = 0; i < entries.Length; i++)
+            {
+                var entry = entries[i];
+                var record = records.AsSpan(i * BinaryEntrySize, BinaryEntrySize);
+                BinaryPrimitives.WriteInt64LittleEndian(record, entry.StartTime / TimeSpan.TicksPerMicrosecond);
+                BinaryPrimitives.WriteInt32LittleEndian(record[8..], entry.Elapsed is { } elapsed
+                    ? (int)Math.Min(elapsed / TimeSpan.TicksPerMicrosecond, int.MaxValue)
+                    : -1);
+                BinaryPrimitives.WriteUInt32LittleEndian(record[12..], entry.Sequence ?? 0);
+                record[16] = (byte)((entry.Command != null ? 1 : 0) | (entry.Response != null ? 2 : 0));
+                record[17] = (byte)(entry.Command?.CommandType ?? 0);
+                record[18] = (byte)(entry.Response?.ErrorCode ?? 0);
+                BinaryPrimitives.WriteUInt16LittleEndian(record[20..],
+                    entry.Response != null ? nameIndexes[entry.Response.GetType()] : NoName);
+                BinaryPrimitives.WriteUInt16LittleEndian(record[22..], (ushort)Math.Min(entry.LinkedResponses.Length, ushort.MaxValue));
+            }
+            return records;
+        }
+
+        private static byte[] BuildBinaryHeader(List<string> names, int entryCount)
+        {
+            var header = new MemoryStream();
+            Span<byte> scratch = stackalloc byte[4];
+            header.Write(BinaryMagic);
+            BinaryPrimitives.WriteUInt16LittleEndian(scratch, BinaryVersion);
+            header.Write(scratch[..2]);
+            BinaryPrimitives.WriteUInt16LittleEndian(scratch, (ushort)names.Count);
+            header.Write(scratch[..2]);
+            foreach (var name in names)
+            {
+                var bytes = Encoding.UTF8.GetBytes(name);
+                header.WriteByte((byte)bytes.Length);
+                header.Write(bytes);
+            }
+            BinaryPrimitives.WriteUInt32LittleEndian(scratch, (uint)entryCount);
+            header.Write(scratch);
+            return header.ToArray();
+        }
+
+        private int Add(uint? sequence, IViceCommand? command, ViceResponse? response)
+        {
+            lock (_sync)
+            {
+                // Ids wrap long after any entry they could refer to has been overwritten
+                int id = (int)(_nextId & int.MaxValue);
+                var entry = _entries[_nextId % _entries.Length];
+                entry.Id = id;
+                entry.Sequence = sequence;
+                entry.Command = command;
+                entry.Response = response;
+                entry.Timestamp = Stopwatch.GetTimestamp();
+                entry.ElapsedTicks = null;
+                entry.LinkedResponses = ImmutableArray<ViceResponse>.Empty;
+                _nextId++;
+                return id;
+            }
+        }
+
+        private Entry? TryGetEntry(int id)
+        {
+            var entry = _entries[id % _entries.Length];
+            return entry.Id == id && entry.Command != null ? entry : null;
+        }
+
+        private static long ToTimeSpanTicks(long timestampDelta) =>
+            (long)(timestampDelta * ((double)TimeSpan.TicksPerSecond / Stopwatch.Frequency));
+
+        private static string ResponseName(ViceResponse response)
+        {
+            var name = response.GetType().Name;
+            return name.EndsWith("Response", StringComparison.Ordinal) ? name[..^"Response".Length] : name;
+        }
+
+        private static async Task FlushAsync(MemoryStream buffer, Stream stream, CancellationToken ct)
+        {
+            await stream.WriteAsync(buffer.GetBuffer().AsMemory(0, (int)buffer.Length), ct);
+            buffer.SetLength(0);
+        }
+
+        private sealed class Entry
+        {
+            public int Id = -1;
+            public uint? Sequence;
+            public IViceCommand? Command;
+            public ViceResponse? Response;
+            public long Timestamp;
+            public long? ElapsedTicks;
+            public ImmutableArray<ViceResponse> LinkedResponses = ImmutableArray<ViceResponse>.Empty;
+
+            public void Clear()
+            {
+                Id = -1;
+                Sequence = null;
+                Command = null;
+                Response = null;
+                ElapsedTicks = null;
+                LinkedResponses = ImmutableArray<ViceResponse>.Empty;
+            }
+        }
+    }
+}
@@ -1,27 +1,71 @@
-﻿using System.Collections.Immutable;
+using System.Collections.Immutable;
+using ViceMCP.ViceBridge.Commands;
 using ViceMCP.ViceBridge.Services.Abstract;
 using System.Diagnostics;
 
 namespace ViceMCP.ViceBridge.Services.Implementation
 {
     /// <inheritdoc/>
+    /// <remarks>
+    /// Memory use is fixed: events and request timelines are kept in ring buffers that overwrite the oldest
+    /// entries, and latencies are aggregated into one <see cref="LatencyHistogram"/> pair per command type and one histogram of queue
+    /// waits per lane.
+    /// Recording takes no locks. <see cref="Clear"/> swaps in fresh buffers, so requests in flight at that
+    /// moment are not counted.
+    /// </remarks>
     /// <threadsafety>Thread safe.</threadsafety>
     public class PerformanceProfiler : IPerformanceProfiler
     {
-        private readonly object _sync = new();
-        private readonly Stopwatch _stopwatch = Stopwatch.StartNew();
-        private readonly List<PerformanceEvent> _events = new();
+        /// <summary>
+        /// Default number of events kept.
+        /// </summary>
+        public const int DefaultEventCapacity = 4096;
+        /// <summary>
+        /// Default number of request timelines kept.
+        /// </summary>
+        public const int DefaultRequestCapacity = 1024;
+
+        private readonly int _eventCapacity;
+        private readonly int _requestCapacity;
+        private State _state;
+
+        /// <summary>
+        /// Creates a profiler.
+        /// </summary>
+        /// <param name="eventCapacity">
+        /// Number of most recent events kept in <see cref="Events"/>.
+        /// </param>
+        /// <param name="requestCapacity">
+        /// Number of most recent request timelines kept. A request is only timed when it completes before
+        /// this many newer requests are sent.
+        /// </param>
+        public PerformanceProfiler(int eventCapacity = DefaultEventCapacity, int requestCapacity = DefaultRequestCapacity)
+        {
+            _eventCapacity = Math.Max(1, eventCapacity);
+            _requestCapacity = Math.Max(1, requestCapacity);
+            _state = new State(_eventCapacity, _requestCapacity);
+        }
+
         /// <inheritdoc/>
-        public long Ticks => _stopwatch.ElapsedMilliseconds;
+        public long Ticks => (long)Stopwatch.GetElapsedTime(Volatile.Read(ref _state).StartTimestamp).TotalMilliseconds;
         /// <inheritdoc/>
         public ImmutableArray<PerformanceEvent> Events
         {
             get
             {
-                lock (_sync)
+                var state = Volatile.Read(ref _state);
+                long count = Interlocked.Read(ref state.EventCount);
+                long first = Math.Max(0, count - _eventCapacity);
+                var builder = ImmutableArray.CreateBuilder<PerformanceEvent>((int)(count - first));
+                for (long i = first; i < count; i++)
                 {
-                    return [.._events];
+                    // A slot is null while the event claiming it is still being stored
+                    if (Volatile.Read(ref state.Events[i % _eventCapacity]) is { } e)
+                    {
+                        builder.Add(e);
+                    }
                 }
+                return builder.ToImmutable();
             }
         }
         /// <inheritdoc/>
@@ -29,19 +73,230 @@ namespace ViceMCP.ViceBridge.Services.Implementation
         /// <inheritdoc/>
         public void Add(PerformanceEvent e)
         {
-            lock (_sync)
+            var state = Volatile.Read(ref _state);
+            long index = Interlocked.Increment(ref state.EventCount) - 1;
+            Volatile.Write(ref state.Events[index % _eventCapacity], e);
+        }
+        /// <inheritdoc/>
+        public void Clear()
+        {
+            Interlocked.Exchange(ref _state, new State(_eventCapacity, _requestCapacity));
+        }
+        /// <inheritdoc/>
+        public void RequestSent(uint requestId, CommandType commandType, int bytes, int queueDepth)
+        {
+            var state = Volatile.Read(ref _state);
+            var slot = state.Requests[requestId % _requestCapacity];
+            // Unpublish while the slot is rewritten so readers don't mix two requests
+            Volatile.Write(ref slot.RequestId, RequestSlot.Empty);
+            slot.CommandType = commandType;
+            slot.BytesSent = bytes;
+            slot.BytesReceived = 0;
+            slot.QueueDepth = queueDepth;
+            slot.FirstByte = 0;
+            slot.Completed = 0;
+            slot.Sent = Stopwatch.GetTimestamp();
+            Volatile.Write(ref slot.RequestId, requestId);
+
+            Interlocked.Increment(ref state.CommandsSent);
+            Interlocked.Add(ref state.BytesSent, bytes);
+            Interlocked.Add(ref state.QueueDepthSum, queueDepth);
+            int max = Volatile.Read(ref state.MaxQueueDepth);
+            while (queueDepth > max)
             {
-                _events.Add(e);
+                int previous = Interlocked.CompareExchange(ref state.MaxQueueDepth, queueDepth, max);
+                if (previous == max)
+                {
+                    break;
+                }
+                max = previous;
             }
         }
         /// <inheritdoc/>
-        public void Clear()
+        public void ResponseStarted(uint requestId)
+        {
+            if (TryGetSlot(Volatile.Read(ref _state), requestId) is { } slot && Volatile.Read(ref slot.FirstByte) == 0)
+            {
+                Interlocked.CompareExchange(ref slot.FirstByte, Stopwatch.GetTimestamp(), 0);
+            }
+        }
+        /// <inheritdoc/>
+        public void ResponseReceived(uint requestId, int bytes)
+        {
+            var state = Volatile.Read(ref _state);
+            Interlocked.Add(ref state.BytesReceived, bytes);
+            if (TryGetSlot(state, requestId) is { } slot)
+            {
+                Interlocked.Add(ref slot.BytesReceived, bytes);
+            }
+        }
+        /// <inheritdoc/>
+        public void RequestCompleted(uint requestId)
+        {
+            var state = Volatile.Read(ref _state);
+            if (TryGetSlot(state, requestId) is not { } slot)
+            {
+                return;
+            }
+            long now = Stopwatch.GetTimestamp();
+            if (Interlocked.CompareExchange(ref slot.Completed, now, 0) != 0)
+            {
+                return;
+            }
+            long firstByte = Volatile.Read(ref slot.FirstByte);
+            if (firstByte == 0)
+            {
+                firstByte = now;
+            }
+
+            var counters = state.GetCommandCounters(slot.CommandType);
+            counters.FirstByte.Record(ToMicroseconds(firstByte - slot.Sent));
+            counters.Complete.Record(ToMicroseconds(now - slot.Sent));
+            Interlocked.Add(ref counters.BytesSent, slot.BytesSent);
+            Interlocked.Add(ref counters.BytesReceived, Interlocked.Read(ref slot.BytesReceived));
+            Interlocked.Increment(ref state.CommandsCompleted);
+        }
+        /// <inheritdoc/>
+        public void CommandDequeued(CommandPriority priority, TimeSpan wait)
+        {
+            Volatile.Read(ref _state).LaneWaits[(int)priority].Record((long)wait.TotalMicroseconds);
+        }
+        /// <inheritdoc/>
+        public PerformanceStatistics GetStatistics()
+        {
+            var state = Volatile.Read(ref _state);
+            long sent = Interlocked.Read(ref state.CommandsSent);
+            var commands = ImmutableArray.CreateBuilder<CommandStatistics>();
+            for (int i = 0; i < state.Commands.Length; i++)
+            {
+                if (Volatile.Read(ref state.Commands[i]) is { } counters && counters.Complete.Count > 0)
+                {
+                    commands.Add(new CommandStatistics((CommandType)i, counters.Complete.Count,
+                        Interlocked.Read(ref counters.BytesSent), Interlocked.Read(ref counters.BytesReceived),
+                        Summarize(counters.FirstByte), Summarize(counters.Complete)));
+                }
+            }
+
+            return new PerformanceStatistics(
+                Stopwatch.GetElapsedTime(state.StartTimestamp),
+                sent,
+                Interlocked.Read(ref state.CommandsCompleted),
+                Interlocked.Read(ref state.BytesSent),
+                Interlocked.Read(ref state.BytesReceived),
+                sent > 0 ? (double)Interlocked.Read(ref state.QueueDepthSum) / sent : 0,
+                Volatile.Read(ref state.MaxQueueDepth),
+                commands.ToImmutable(),
+                GetTimelines(state),
+                [..state.LaneWaits
+                    .Select((histogram, lane) => (Histogram: histogram, Lane: (CommandPriority)lane))
+                    .Where(x => x.Histogram.Count > 0)
+                    .Select(x => new LaneStatistics(x.Lane, x.Histogram.Count, Summarize(x.Histogram)))]);
+        }
+
+        private RequestSlot? TryGetSlot(State state, uint requestId)
+        {
+            var slot = state.Requests[requestId % _requestCapacity];
+            return Volatile.Read(ref slot.RequestId) == requestId ? slot : null;
+        }
+
+        private static ImmutableArray<RequestTimeline> GetTimelines(State state)
+        {
+            var timelines = new List<RequestTimeline>(state.Requests.Length);
+            foreach (var slot in state.Requests)
+            {
+                long requestId = Volatile.Read(ref slot.RequestId);
+                if (requestId == RequestSlot.Empty)
+                {
+                    continue;
+                }
+                var timeline = new RequestTimeline((uint)requestId, slot.CommandType, slot.QueueDepth,
+                    ToElapsed(state, slot.Sent), ToElapsedOrNull(state, Volatile.Read(ref slot.FirstByte)),
+                    ToElapsedOrNull(state, Volatile.Read(ref slot.Completed)));
+                // Skip slots reused while they were being read
+                if (Volatile.Read(ref slot.RequestId) == requestId)
+                {
+                    timelines.Add(timeline);
+                }
+            }
+            timelines.Sort((a, b) => a.Sent.CompareTo(b.Sent));
+            return [..timelines];
+        }
+
+        private static LatencySummary Summarize(LatencyHistogram histogram) => new(
+            TimeSpan.FromMicroseconds(histogram.GetValueAtPercentile(50)),
+            TimeSpan.FromMicroseconds(histogram.GetValueAtPercentile(99)),
+            TimeSpan.FromMicroseconds(histogram.Max),
+            TimeSpan.FromMicroseconds(histogram.Mean));
+
+        private static long ToMicroseconds(long timestampDelta) => timestampDelta * 1_000_000 / Stopwatch.Frequency;
+
+        private static TimeSpan ToElapsed(State state, long timestamp) =>
+            TimeSpan.FromMicroseconds(ToMicroseconds(timestamp - state.StartTimestamp));
+
+        private static TimeSpan? ToElapsedOrNull(State state, long timestamp) =>
+            timestamp == 0 ? null : ToElapsed(state, timestamp);
+
+        /// <summary>
+        /// Everything collected since creation or the last <see cref="Clear"/>.
+        /// </summary>
+        private sealed class State
         {
-            lock (_sync)
+            public readonly long StartTimestamp = Stopwatch.GetTimestamp();
+            public readonly PerformanceEvent?[] Events;
+            public readonly RequestSlot[] Requests;
+            public readonly CommandCounters?[] Commands = new CommandCounters?[256];
+            public readonly LatencyHistogram[] LaneWaits =
+                Enum.GetValues<CommandPriority>().Select(_ => new LatencyHistogram()).ToArray();
+            public long EventCount;
+            public long CommandsSent;
+            public long CommandsCompleted;
+            public long BytesSent;
+            public long BytesReceived;
+            public long QueueDepthSum;
+            public int MaxQueueDepth;
+
+            public State(int eventCapacity, int requestCapacity)
             {
-                _events.Clear();
-                _stopwatch.Restart();
+                Events = new PerformanceEvent?[eventCapacity];
+                Requests = new RequestSlot[requestCapacity];
+                for (int i = 0; i < Requests.Length; i++)
+                {
+                    Requests[i] = new RequestSlot();
+                }
             }
+
+            public CommandCounters GetCommandCounters(CommandType commandType)
+            {
+                ref var counters = ref Commands[(byte)commandType];
+                return Volatile.Read(ref counters)
+                    ?? Interlocked.CompareExchange(ref counters, new CommandCounters(), null)
+                    ?? Volatile.Read(ref counters)!;
+            }
+        }
+
+        /// <summary>
+        /// Timeline of a request, reused when a request ID maps to the same slot.
+        /// </summary>
+        private sealed class RequestSlot
+        {
+            public const long Empty = -1;
+
+            public long RequestId = Empty;
+            public CommandType CommandType;
+            public int BytesSent;
+            public long BytesReceived;
+            public int QueueDepth;
+            public long Sent;
+            public long FirstByte;
+            public long Completed;
+        }
+
+        private sealed class CommandCounters
+        {
+            public readonly LatencyHistogram FirstByte = new();
+            public readonly LatencyHistogram Complete = new();
+            public long BytesSent;
+            public long BytesReceived;
         }
     }
 }
@@ -6,7 +6,10 @@ using ViceMCP.ViceBridge.Exceptions;
 using ViceMCP.ViceBridge.Responses;
 using ViceMCP.ViceBridge.Services.Abstract;
 using System.Buffers;
-using System.Net.NetworkInformation;
+using System.Buffers.Binary;
+using System.Diagnostics;
+using System.Diagnostics.CodeAnalysis;
+using System.IO.Pipelines;
 using System.Net.Sockets;
 
 namespace ViceMCP.ViceBridge.Services.Implementation
@@ -17,26 +20,77 @@ namespace ViceMCP.ViceBridge.Services.Implementation
     /// </summary>
     public sealed class ViceBridge : IViceBridge
     {
+        /// <summary>
+        /// Maximum time VICE may stay silent while requests are in flight before the connection is dropped.
+        /// </summary>
+        private static readonly TimeSpan ResponseTimeout = TimeSpan.FromSeconds(5);
+        /// <summary>
+        /// How often the connection watchdog checks for <see cref="ResponseTimeout"/>.
+        /// </summary>
+        private static readonly TimeSpan WatchdogPeriod = TimeSpan.FromSeconds(1);
+        /// <summary>
+        /// Wait before the first reconnection attempt. Doubles after each failed attempt up to
+        /// <see cref="MaxConnectRetryDelay"/> and starts over once a connection is established.
+        /// </summary>
+        private static readonly TimeSpan InitialConnectRetryDelay = TimeSpan.FromMilliseconds(10);
+        /// <summary>
+        /// Longest wait between connection attempts.
+        /// </summary>
+        private static readonly TimeSpan MaxConnectRetryDelay = TimeSpan.FromMilliseconds(500);
+        /// <summary>
+        /// Size of the response header: STX, API version, body length, response type, error code and request ID.
+        /// </summary>
+        private const int ResponseHeaderLength = 12;
+        /// <summary>
+        /// Segment size of the receive pipe, large enough to hold a 64KB memory read in a single segment.
+        /// </summary>
+        private const int ReceiveBufferSize = 64 * 1024;
+
         private readonly ILogger<ViceBridge> _logger;
         private readonly ResponseBuilder _responseBuilder;
-        private readonly ArrayPool<byte> _byteArrayPool = ArrayPool<byte>.Shared;
-        private readonly ConcurrentQueue<PendingCommand> _commandQueue = new();
+        private readonly ViceConfiguration _configuration;
+        /// <summary>
+        /// One queue per <see cref="CommandPriority"/>, indexed by it.
+        /// </summary>
+        private readonly ConcurrentQueue<PendingCommand>[] _lanes =
+            Enum.GetValues<CommandPriority>().Select(_ => new ConcurrentQueue<PendingCommand>()).ToArray();
+        /// <summary>
+        /// Free places of each lane, null for the unbounded interactive lane.
+        /// </summary>
+        private readonly SemaphoreSlim?[] _laneRoom;
         private readonly SemaphoreSlim _commandAvailable = new(0);
+        private int _queuedCommands;
+        // Queued commands that change memory. A read sent while one waits may have overtaken it from a higher
+        // lane, its data predates the change and must not fill the shadow memory.
+        private int _queuedMemoryChanges;
+        // Queued memory writes, while there are none reads need not be checked against the lower lanes
+        private int _queuedWrites;
 
         private CancellationTokenSource? _connectionCts;
         private Task? _connectionTask;
         private Socket? _socket;
+        private readonly ConcurrentDictionary<uint, InFlightCommand> _inFlight = new();
+        private SemaphoreSlim? _inFlightSlots;
+        private InFlightCommand? _lastSent;
+        private volatile bool _autoResumePending;
+        private int _autoResumeHolds;
+        private long _lastProgressTicks;
+        private Exception? _connectionFault;
         private uint _currentRequestId;
         private bool _isConnected;
+        private EmulatorRunState _runState;
 
         public IPerformanceProfiler PerformanceProfiler { get; }
         public IMessagesHistory MessagesHistory { get; }
+        public ShadowMemoryCache? ShadowMemory { get; }
 
         public bool IsStarted => _connectionTask != null;
         public Task? RunnerTask => _connectionTask;
 
         public event EventHandler<ViceResponseEventArgs>? ViceResponse;
         public event EventHandler<ConnectedChangedEventArgs>? ConnectedChanged;
+        public event EventHandler<RunStateChangedEventArgs>? RunStateChanged;
+        public event EventHandler<MemoryWritingEventArgs>? MemoryWriting;
 
         /// <summary>
         /// Indicates whether the connection with the VICE server is currently established.
@@ -61,20 +115,42 @@ namespace ViceMCP.ViceBridge.Services.Implementation
                     {
                         _isConnected = value;
                         ConnectedChanged?.Invoke(this, new ConnectedChangedEventArgs(value));
+                        // Whatever was known about the CPU belongs to the previous connection
+                        SetRunState(EmulatorRunState.Unknown, null);
                     }
                 }
             }
         }
 
+        /// <summary>
+        /// Emulator run state as last reported by VICE.
+        /// </summary>
+        /// <remarks>
+        /// Driven by <see cref="StoppedResponse"/>, <see cref="JamResponse"/> and <see cref="ResumedResponse"/>
+        /// broadcasts and by successful <see cref="ExitCommand"/> responses. Any change triggers the
+        /// <see cref="RunStateChanged"/> event.
+        /// </remarks>
+        public EmulatorRunState RunState
+        {
+            get { lock (this) { return _runState; } }
+        }
+
         public bool IsRunning => IsConnected;
 
         public ViceBridge(ILogger<ViceBridge> logger, ResponseBuilder responseBuilder,
-            IPerformanceProfiler performanceProfiler, IMessagesHistory messagesHistory)
+            IPerformanceProfiler performanceProfiler, IMessagesHistory messagesHistory,
+            ViceConfiguration? configuration = null)
         {
             _logger = logger;
             _responseBuilder = responseBuilder;
+            _configuration = configuration ?? new ViceConfiguration();
             PerformanceProfiler = performanceProfiler;
             MessagesHistory = messagesHistory;
+            ShadowMemory = _configuration.UseShadowMemory ? new ShadowMemoryCache() : null;
+            int laneLimit = Math.Max(1, _configuration.MaxQueuedCommands);
+            _laneRoom = Enum.GetValues<CommandPriority>()
+                .Select(p => p == CommandPriority.Interactive ? null : new SemaphoreSlim(laneLimit))
+                .ToArray();
         }
 
         /// <summary>
@@ -147,13 +223,95 @@ namespace ViceMCP.ViceBridge.Services.Implementation
         /// <returns>
         /// The same command instance that was enqueued.
         /// </returns>
+        /// <remarks>
+        /// The command goes to the lane of the current <see cref="CommandScope"/>, or the default lane of its
+        /// type outside any scope, and is cancelled with the scope's token.
+        /// </remarks>
         /// <exception cref="InvalidOperationException">
-        /// Thrown if the bridge is not started when attempting to enqueue a command.
+        /// Thrown if the bridge is not started when attempting to enqueue a command, or its lane is full.
         /// </exception>
         /// <exception cref="ArgumentException">
         /// Thrown if the provided command contains validation errors.
         /// </exception>
         public T EnqueueCommand<T>(T command, bool resumeOnStopped = false) where T : IViceCommand
+        {
+            return EnqueueCommand(command, CommandScope.Priority ?? command.CommandType.DefaultPriority(),
+                resumeOnStopped, CommandScope.CancellationToken);
+        }
+
+        /// <summary>
+        /// Enqueues a command in a given lane.
+        /// </summary>
+        /// <remarks>
+        /// Cancelling <paramref name="ct"/> before the command is sent removes it from the queue and faults its
+        /// response with <see cref="OperationCanceledException"/>. Once sent, the command completes normally.
+        /// </remarks>
+        /// <exception cref="InvalidOperationException">
+        /// Thrown if the bridge is not started, or the lane holds <see cref="ViceConfiguration.MaxQueuedCommands"/>
+        /// commands already.
+        /// </exception>
+        /// <exception cref="ArgumentException">
+        /// Thrown if the provided command contains validation errors.
+        /// </exception>
+        public T EnqueueCommand<T>(T command, CommandPriority priority, bool resumeOnStopped = false,
+            CancellationToken ct = default) where T : IViceCommand
+        {
+            if (!PrepareEnqueue(command))
+            {
+                return command;
+            }
+            if (_laneRoom[(int)priority] is { } room && !room.Wait(0))
+            {
+                throw new InvalidOperationException(
+                    $"The {priority.ToString().ToLowerInvariant()} command queue is full ({_configuration.MaxQueuedCommands} commands)");
+            }
+            Enqueue(command, priority, resumeOnStopped, ct);
+            return command;
+        }
+
+        /// <summary>
+        /// Enqueues a command in a given lane, waiting for room when the lane is full.
+        /// </summary>
+        /// <remarks>
+        /// Producers of many commands, such as snapshot restores, batches and uploads, use it so a full lane slows
+        /// them down instead of failing them.
+        /// </remarks>
+        /// <exception cref="OperationCanceledException">
+        /// Thrown if <paramref name="ct"/> is cancelled while waiting for room, the command is not enqueued then.
+        /// </exception>
+        public async ValueTask<T> EnqueueCommandAsync<T>(T command, CommandPriority priority, bool resumeOnStopped = false,
+            CancellationToken ct = default) where T : IViceCommand
+        {
+            if (!PrepareEnqueue(command))
+            {
+                return command;
+            }
+            if (_laneRoom[(int)priority] is { } room)
+            {
+                await room.WaitAsync(ct);
+            }
+            Enqueue(command, priority, resumeOnStopped, ct);
+            return command;
+        }
+
+        /// <summary>
+        /// Enqueues a command in the lane of the current <see cref="CommandScope"/>, or the default lane of its type
+        /// outside any scope, waiting for room when the lane is full.
+        /// </summary>
+        /// <exception cref="OperationCanceledException">
+        /// Thrown if the scope is cancelled while waiting for room, the command is not enqueued then.
+        /// </exception>
+        public ValueTask<T> EnqueueCommandAsync<T>(T command, bool resumeOnStopped = false) where T : IViceCommand
+        {
+            return EnqueueCommandAsync(command, CommandScope.Priority ?? command.CommandType.DefaultPriority(),
+                resumeOnStopped, CommandScope.CancellationToken);
+        }
+
+        /// <summary>
+        /// Validates a command and lets the shadow memory and <see cref="MemoryWriting"/> subscribers see it.
+        /// </summary>
+        /// <returns>False when a read has been answered from shadow memory and must not be queued.</returns>
+        private bool PrepareEnqueue(IViceCommand command)
         {
             if (!IsStarted)
                 throw new InvalidOperationException("Bridge is not started");
@@ -162,15 +320,230 @@ namespace ViceMCP.ViceBridge.Services.Implementation
             if (errors.Length > 0)
                 throw new ArgumentException(string.Join(Environment.NewLine, errors));
 
-            _commandQueue.Enqueue(new PendingCommand(command, resumeOnStopped));
+            if (command is MemorySetCommand { MemoryContent.Size: > 0 } write)
+            {
+                MemoryWriting?.Invoke(this, new MemoryWritingEventArgs(write.MemSpace, write.BankId, write.StartAddress,
+                    (int)write.MemoryContent.Size));
+            }
+            if (ShadowMemory != null)
+            {
+                if (command is MemoryGetCommand read && TryReadShadowMemory(read))
+                {
+                    return false;
+                }
+                InvalidateShadowMemory(command);
+            }
+            return true;
+        }
+
+        /// <summary>
+        /// Adds a command, whose lane has room reserved for it, to the queue.
+        /// </summary>
+        private void Enqueue(IViceCommand command, CommandPriority priority, bool resumeOnStopped, CancellationToken ct)
+        {
+            Interlocked.Increment(ref _queuedCommands);
+            if (ChangesShadowMemory(command))
+            {
+                Interlocked.Increment(ref _queuedMemoryChanges);
+            }
+            if (command is MemorySetCommand)
+            {
+                Interlocked.Increment(ref _queuedWrites);
+            }
+            _lanes[(int)priority].Enqueue(new PendingCommand(command, resumeOnStopped, priority, ct));
             _commandAvailable.Release();
-            return command;
         }
 
+        /// <summary>
+        /// Takes the oldest command of the highest non-empty lane.
+        /// </summary>
+        /// <remarks>
+        /// A read never overtakes a write to its range queued in a lower lane: that lane is taken from instead, up to
+        /// and including the write, so the read sees the written bytes. Only the send loop dequeues.
+        /// </remarks>
+        private bool TryDequeue([NotNullWhen(true)] out PendingCommand? pending)
+        {
+            for (int lane = 0; lane < _lanes.Length; lane++)
+            {
+                if (!_lanes[lane].TryPeek(out var head))
+                {
+                    continue;
+                }
+                while (Volatile.Read(ref _queuedWrites) > 0
+                    && head.Command is MemoryGetCommand read
+                    && FindOverlappingWrite(read, lane + 1) is { } lower)
+                {
+                    lane = lower;
+                    _lanes[lane].TryPeek(out head!);
+                }
+                _lanes[lane].TryDequeue(out pending);
+                Interlocked.Decrement(ref _queuedCommands);
+                if (ChangesShadowMemory(pending!.Command))
+                {
+                    Interlocked.Decrement(ref _queuedMemoryChanges);
+                }
+                if (pending.Command is MemorySetCommand)
+                {
+                    Interlocked.Decrement(ref _queuedWrites);
+                }
+                _laneRoom[(int)pending.Priority]?.Release();
+                return true;
+            }
+            pending = null;
+            return false;
+        }
+
+        /// <summary>
+        /// Finds the highest lane from <paramref name="firstLane"/> down holding a write that overlaps
+        /// <paramref name="read"/> in any bank of its memspace, banks may alias the same memory.
+        /// </summary>
+        /// <returns>The lane, null when there is none.</returns>
+        private int? FindOverlappingWrite(MemoryGetCommand read, int firstLane)
+        {
+            for (int lane = firstLane; lane < _lanes.Length; lane++)
+            {
+                foreach (var pending in _lanes[lane])
+                {
+                    if (pending.Command is MemorySetCommand write
+                        && write.MemSpace == read.MemSpace
+                        && Overlaps(write, read.StartAddress, read.EndAddress))
+                    {
+                        return lane;
+                    }
+                }
+            }
+            return null;
+
+            // Writes running past $FFFF wrap around
+            static bool Overlaps(MemorySetCommand write, int start, int end)
+            {
+                int writeEnd = write.StartAddress + (int)write.MemoryContent.Size - 1;
+                return write.MemoryContent.Size > 0
+                    && ((start <= writeEnd && end >= write.StartAddress) || (writeEnd > 0xFFFF && start <= writeEnd - 0x10000));
+            }
+        }
+
+        private bool IsQueueEmpty => Volatile.Read(ref _queuedCommands) == 0;
+
+        /// <summary>
+        /// Keeps VICE stopped between commands until the returned handle is disposed.
+        /// </summary>
+        /// <remarks>
+        /// The auto-resume owed by commands completed while held is sent once the last hold is released and the
+        /// queue is idle.
+        /// </remarks>
+        /// <returns>
+        /// A handle that releases the hold when disposed.
+        /// </returns>
+        public IDisposable HoldAutoResume()
+        {
+            Interlocked.Increment(ref _autoResumeHolds);
+            return new AutoResumeHold(this);
+        }
+
+        /// <summary>
+        /// Releases a hold taken by <see cref="HoldAutoResume"/>, waking the send loop to resume when it was the last.
+        /// </summary>
+        private void ReleaseAutoResumeHold()
+        {
+            if (Interlocked.Decrement(ref _autoResumeHolds) == 0 && _autoResumePending)
+            {
+                _commandAvailable.Release();
+            }
+        }
+
+        /// <summary>
+        /// Completes a memory read from <see cref="ShadowMemory"/> when VICE is stopped and all of its pages are valid.
+        /// </summary>
+        /// <param name="read">
+        /// The read to serve.
+        /// </param>
+        /// <returns>
+        /// True when the command was completed from the cache.
+        /// </returns>
+        private bool TryReadShadowMemory(MemoryGetCommand read)
+        {
+            if (!IsShadowable(read))
+            {
+                return false;
+            }
+
+            int length = read.EndAddress - read.StartAddress + 1;
+            var buffer = BufferManager.GetBuffer((uint)length);
+            if (!ShadowMemory!.TryRead(read.MemSpace, read.BankId, read.StartAddress, read.EndAddress, buffer.Data))
+            {
+                buffer.Dispose();
+                return false;
+            }
+
+            _logger.LogDebug("Served memory ${Start:X4}-${End:X4} from shadow memory", read.StartAddress, read.EndAddress);
+            ((IViceCommand)read).SetResult(new MemoryGetResponse(ViceCommand.DefaultApiVersion, ErrorCode.OK, buffer));
+            return true;
+        }
+
+        /// <summary>
+        /// Invalidates the part of <see cref="ShadowMemory"/> a command is about to change.
+        /// </summary>
+        /// <remarks>
+        /// Runs when the command is enqueued, so that no read enqueued after it is served from the cache. Until it is
+        /// sent, reads don't fill the cache either, they may go out ahead of it from a higher lane.
+        /// Writes to the processor port ($00/$01), the I/O area ($D000-$DFFF) or the C128 MMU ($FF00-$FF04)
+        /// may switch banks and drop the whole memspace.
+        /// </remarks>
+        /// <param name="command">
+        /// The command being enqueued.
+        /// </param>
+        private void InvalidateShadowMemory(IViceCommand command)
+        {
+            if (command is MemorySetCommand write)
+            {
+                if (write.MemoryContent.Size == 0)
+                {
+                    return;
+                }
+                var end = (ushort)Math.Min(write.StartAddress + write.MemoryContent.Size - 1, ushort.MaxValue);
+                static bool Touches(ushort start, ushort end, int from, int to) => start <= to && end >= from;
+                if (Touches(write.StartAddress, end, 0x0000, 0x0001)
+                    || Touches(write.StartAddress, end, 0xD000, 0xDFFF)
+                    || Touches(write.StartAddress, end, 0xFF00, 0xFF04))
+                {
+                    ShadowMemory!.Invalidate(write.MemSpace);
+                }
+                else
+                {
+                    ShadowMemory!.Invalidate(write.MemSpace, write.StartAddress, end);
+                }
+            }
+            else if (!command.CommandType.PreservesMemory())
+            {
+                ShadowMemory!.Invalidate();
+            }
+        }
+
+        /// <summary>
+        /// Tells whether a command invalidates part of <see cref="ShadowMemory"/>, see <see cref="InvalidateShadowMemory"/>.
+        /// </summary>
+        private bool ChangesShadowMemory(IViceCommand command) =>
+            ShadowMemory != null && !command.CommandType.PreservesMemory();
+
+        /// <summary>
+        /// Tells whether a read may be served from or fill <see cref="ShadowMemory"/>: the cache is on, VICE is
+        /// known to be stopped and the read has no side effects.
+        /// </summary>
+        private bool IsShadowable(MemoryGetCommand read) =>
+            ShadowMemory != null
+            && read.SideEffects == 0
+            && read.EndAddress >= read.StartAddress
+            && RunState == EmulatorRunState.Stopped;
+
         /// <summary>
         /// Maintains a connection loop to the VICE emulator, attempting to connect and process commands
         /// while handling errors and disconnections.
         /// </summary>
+        /// <remarks>
+        /// Failed attempts are retried after <see cref="InitialConnectRetryDelay"/>, doubling up to
+        /// <see cref="MaxConnectRetryDelay"/>, so a starting VICE is picked up within milliseconds of listening.
+        /// </remarks>
         /// <param name="port">
         /// The port number to connect to the VICE emulator.
         /// </param>
@@ -182,27 +555,46 @@ namespace ViceMCP.ViceBridge.Services.Implementation
         /// </returns>
         private async Task ConnectionLoopAsync(int port, CancellationToken ct)
         {
+            var retryDelay = InitialConnectRetryDelay;
             while (!ct.IsCancellationRequested)
             {
                 try
                 {
                     await ConnectAsync(port, ct);
+                    retryDelay = InitialConnectRetryDelay;
                     await ProcessCommandsAsync(ct);
                 }
                 catch (OperationCanceledException) when (ct.IsCancellationRequested)
                 {
                     break;
                 }
+                catch (SocketException ex) when (!IsConnected)
+                {
+                    // Nothing listening yet, typically while VICE is starting up
+                    _logger.LogDebug("Could not connect to VICE on port {Port} ({Error}), retrying in {Delay} ms", port,
+                        ex.SocketErrorCode, retryDelay.TotalMilliseconds);
+                }
                 catch (Exception ex)
                 {
                     _logger.LogError(ex, "Connection error, will retry");
-                    IsConnected = false;
-                    await Task.Delay(TimeSpan.FromSeconds(1), ct);
                 }
                 finally
                 {
                     CloseSocket();
                 }
+
+                if (!ct.IsCancellationRequested)
+                {
+                    try
+                    {
+                        await Task.Delay(retryDelay, ct);
+                    }
+                    catch (OperationCanceledException)
+                    {
+                        break;
+                    }
+                    retryDelay = TimeSpan.FromTicks(Math.Min(retryDelay.Ticks * 2, MaxConnectRetryDelay.Ticks));
+                }
             }
         }
 
@@ -220,10 +612,11 @@ namespace ViceMCP.ViceBridge.Services.Implementation
         /// </returns>
         private async Task ConnectAsync(int port, CancellationToken ct)
         {
-            // Wait for VICE to start listening
-            await WaitForPort(port, ct);
-
-            _socket = new Socket(AddressFamily.InterNetwork, SocketType.Stream, ProtocolType.Tcp);
+            _socket = new Socket(AddressFamily.InterNetwork, SocketType.Stream, ProtocolType.Tcp)
+            {
+                // Pipelined commands are small writes, don't let Nagle hold them back waiting for ACKs
+                NoDelay = true,
+            };
             await _socket.ConnectAsync("localhost", port, ct);
 
             _logger.LogInformation("Connected to VICE on port {Port}", port);
@@ -231,10 +624,15 @@ namespace ViceMCP.ViceBridge.Services.Implementation
         }
 
         /// <summary>
-        /// Continuously processes incoming commands and data within the established connection loop.
-        /// Handles the execution of queued commands and monitors incoming data from the VICE emulator.
-        /// The method operates until the cancellation token signals termination or the socket connection is closed.
+        /// Runs the command pipeline for an established connection. A single receive loop routes every response
+        /// to its in-flight command by request ID, while the send loop keeps up to
+        /// <see cref="ViceConfiguration.PipelineDepth"/> commands outstanding on the socket.
+        /// The method operates until the cancellation token signals termination or either loop fails.
         /// </summary>
+        /// <remarks>
+        /// Neither loop uses per-operation timeouts. A single watchdog per connection drops the connection when
+        /// VICE stays silent for <see cref="ResponseTimeout"/> while requests are in flight.
+        /// </remarks>
         /// <param name="ct">
         /// A token to monitor for cancellation requests. If cancellation is requested, the method will gracefully exit.
         /// </param>
@@ -243,163 +641,358 @@ namespace ViceMCP.ViceBridge.Services.Implementation
         /// </returns>
         private async Task ProcessCommandsAsync(CancellationToken ct)
         {
-            var receiveBuffer = new byte[65536];
-            var receiveTask = Task.CompletedTask;
+            var socket = _socket!;
+            var depth = Math.Max(1, _configuration.PipelineDepth);
+            _inFlightSlots = new SemaphoreSlim(depth, depth);
+            _lastSent = null;
+            _autoResumePending = false;
+            _connectionFault = null;
+            MarkProgress();
+
+            using var connectionCts = CancellationTokenSource.CreateLinkedTokenSource(ct);
+            await using var watchdog = new Timer(_ => CheckResponseTimeout(connectionCts), null, WatchdogPeriod, WatchdogPeriod);
+            var receiveTask = ReceiveLoopAsync(socket, connectionCts.Token);
+            var sendTask = SendLoopAsync(socket, connectionCts.Token);
+            try
+            {
+                var completed = await Task.WhenAny(receiveTask, sendTask);
+                await completed;
+            }
+            catch (OperationCanceledException) when (_connectionFault is not null && !ct.IsCancellationRequested)
+            {
+                throw _connectionFault;
+            }
+            finally
+            {
+                await connectionCts.CancelAsync();
+                FailInFlightCommands(_connectionFault ?? new SocketDisconnectedException("Connection to VICE was closed"));
+                try { await Task.WhenAll(receiveTask, sendTask); }
+                catch { /* already reported by the loop that completed first */ }
+            }
+        }
+
+        /// <summary>
+        /// Dequeues commands and writes them to the socket without waiting for their responses, as long as a
+        /// pipeline slot is available.
+        /// </summary>
+        /// <remarks>
+        /// The next command is taken from the highest non-empty <see cref="CommandPriority"/> lane when a pipeline
+        /// slot is free. Commands of a lane are sent in queue order over a single stream and VICE processes them
+        /// sequentially, so a write followed by a read of the same range in one lane always observes the write. Commands that let the CPU run
+        /// (see <see cref="CommandTypeExtension.IsPipelineBarrier"/>) are sent only after the pipeline has drained
+        /// and nothing is sent after them until they are answered.
+        /// </remarks>
+        /// <param name="socket">
+        /// The connected socket.
+        /// </param>
+        /// <param name="ct">
+        /// A cancellation token that stops the loop.
+        /// </param>
+        /// <returns>
+        /// A task that completes when the loop is cancelled or faults.
+        /// </returns>
+        private async Task SendLoopAsync(Socket socket, CancellationToken ct)
+        {
+            while (!ct.IsCancellationRequested)
+            {
+                await _commandAvailable.WaitAsync(ct);
+                // Pick the command only once it can go out, so one that arrived meanwhile in a higher lane wins
+                await _inFlightSlots!.WaitAsync(ct);
+                _inFlightSlots.Release();
+                if (!TryDequeue(out var pending))
+                {
+                    // Woken without a command when the last auto-resume hold was released
+                    await ResumeWhenIdleAsync(socket, ct);
+                    continue;
+                }
+                if (!pending.TryTake())
+                {
+                    // Cancelled while queued, its response is already faulted
+                    if (IsQueueEmpty)
+                    {
+                        await ResumeWhenIdleAsync(socket, ct);
+                    }
+                    continue;
+                }
+                if (PerformanceProfiler.IsEnabled)
+                {
+                    PerformanceProfiler.CommandDequeued(pending.Priority, Stopwatch.GetElapsedTime(pending.EnqueuedAt));
+                }
+
+                try
+                {
+                    await SendPipelinedAsync(socket, pending.Command, triggersAutoResume: true, ct);
+                }
+                catch (Exception ex)
+                {
+                    pending.Command.SetException(ex);
+                    throw;
+                }
+
+                if (IsQueueEmpty)
+                {
+                    await ResumeWhenIdleAsync(socket, ct);
+                }
+            }
+        }
+
+        /// <summary>
+        /// Registers a command as in flight and writes it to the socket.
+        /// </summary>
+        /// <param name="socket">
+        /// The connected socket.
+        /// </param>
+        /// <param name="command">
+        /// The command to send.
+        /// </param>
+        /// <param name="triggersAutoResume">
+        /// True for commands issued by clients, false for commands the bridge issues on its own behalf.
+        /// </param>
+        /// <param name="ct">
+        /// A cancellation token that can be used to cancel the operation.
+        /// </param>
+        /// <returns>
+        /// The in-flight entry that completes when the response arrives.
+        /// </returns>
+        private async Task<InFlightCommand> SendPipelinedAsync(Socket socket, IViceCommand command, bool triggersAutoResume,
+            CancellationToken ct)
+        {
+            bool isBarrier = command.CommandType.IsPipelineBarrier();
+            if (isBarrier)
+            {
+                await WaitForCompletionAsync(_lastSent, ct);
+            }
+
+            // Slots are only exhausted while requests are in flight, which the connection watchdog covers
+            await _inFlightSlots!.WaitAsync(ct);
+
+            var requestId = NextRequestId();
+            var wireCommand = command;
+            int? shadowGeneration = null;
+            if (command is MemoryGetCommand read && IsShadowable(read) && Volatile.Read(ref _queuedMemoryChanges) == 0)
+            {
+                // Read whole pages so the shadow copy can mark them valid
+                shadowGeneration = ShadowMemory!.Generation;
+                wireCommand = new MemoryGetCommand(0, (ushort)(read.StartAddress & 0xFF00), (ushort)(read.EndAddress | 0x00FF),
+                    read.MemSpace, read.BankId);
+            }
+            // Recorded before sending, the response can be routed before the write returns
+            int historyId = await MessagesHistory.AddCommandAsync(requestId, command);
+            var inFlight = new InFlightCommand(command, requestId, triggersAutoResume, historyId, shadowGeneration);
+            if (_inFlight.IsEmpty)
+            {
+                // Silence before this point was idle time, not a late response
+                MarkProgress();
+            }
+            _inFlight[requestId] = inFlight;
+            try
+            {
+                await SendCommandAsync(socket, requestId, wireCommand, ct);
+            }
+            catch
+            {
+                if (_inFlight.TryRemove(requestId, out _))
+                {
+                    _inFlightSlots.Release();
+                }
+                throw;
+            }
+            _lastSent = inFlight;
+
+            if (isBarrier)
+            {
+                await WaitForCompletionAsync(inFlight, ct);
+            }
+            return inFlight;
+        }
+
+        /// <summary>
+        /// Sends a command on behalf of the bridge itself and waits for its response.
+        /// </summary>
+        /// <typeparam name="TResponse">
+        /// The response type of the command.
+        /// </typeparam>
+        /// <param name="socket">
+        /// The connected socket.
+        /// </param>
+        /// <param name="command">
+        /// The command to send.
+        /// </param>
+        /// <param name="ct">
+        /// A cancellation token that can be used to cancel the operation.
+        /// </param>
+        /// <returns>
+        /// The command response.
+        /// </returns>
+        private async Task<CommandResponse<TResponse>> SendInternalAsync<TResponse>(Socket socket, ViceCommand<TResponse> command,
+            CancellationToken ct)
+            where TResponse : ViceResponse
+        {
+            var inFlight = await SendPipelinedAsync(socket, command, triggersAutoResume: false, ct);
+            await WaitForCompletionAsync(inFlight, ct);
+            return await command.Response;
+        }
+
+        /// <summary>
+        /// Waits until the given in-flight command is answered. Because VICE answers in order, waiting for the
+        /// last sent command drains the whole pipeline.
+        /// </summary>
+        /// <param name="inFlight">
+        /// The in-flight command to wait for, or null when nothing was sent yet.
+        /// </param>
+        /// <param name="ct">
+        /// A cancellation token that can be used to cancel the operation.
+        /// </param>
+        /// <remarks>
+        /// There is no timeout here; the connection watchdog faults every in-flight command when VICE stops answering.
+        /// </remarks>
+        private async Task WaitForCompletionAsync(InFlightCommand? inFlight, CancellationToken ct)
+        {
+            if (inFlight is null || inFlight.Completed.Task.IsCompleted)
+            {
+                return;
+            }
+            await inFlight.Completed.Task.WaitAsync(ct);
+        }
+
+        /// <summary>
+        /// Records that the connection made progress, either because data arrived or because the pipeline
+        /// went from idle to busy.
+        /// </summary>
+        private void MarkProgress() => Volatile.Write(ref _lastProgressTicks, Environment.TickCount64);
+
+        /// <summary>
+        /// Watchdog callback. Cancels the connection when requests are in flight and nothing arrived for
+        /// <see cref="ResponseTimeout"/>.
+        /// </summary>
+        /// <param name="connectionCts">
+        /// The token source of the connection being watched.
+        /// </param>
+        private void CheckResponseTimeout(CancellationTokenSource connectionCts)
+        {
+            if (_inFlight.IsEmpty)
+            {
+                return;
+            }
+            var silence = TimeSpan.FromMilliseconds(Environment.TickCount64 - Volatile.Read(ref _lastProgressTicks));
+            if (silence < ResponseTimeout)
+            {
+                return;
+            }
 
-            while (!ct.IsCancellationRequested && _socket?.Connected == true)
+            _connectionFault = new TimeoutException(
+                $"No response from VICE for {silence.TotalSeconds:0.0}s with {_inFlight.Count} requests in flight");
+            _logger.LogWarning("{Message}, dropping connection", _connectionFault.Message);
+            try
             {
-                // Check for incoming data
-                if (receiveTask.IsCompleted && _socket.Available > 0)
-                {
-                    receiveTask = ProcessIncomingDataAsync(ct);
-                }
-
-                // Process commands with timeout
-                try
-                {
-                    using var timeoutCts = CancellationTokenSource.CreateLinkedTokenSource(ct);
-                    timeoutCts.CancelAfter(TimeSpan.FromMilliseconds(100));
-
-                    await _commandAvailable.WaitAsync(timeoutCts.Token);
-
-                    if (_commandQueue.TryDequeue(out var pending))
-                    {
-                        await ProcessCommandAsync(pending, ct);
-                    }
-                }
-                catch (OperationCanceledException) when (!ct.IsCancellationRequested)
-                {
-                    // Timeout is expected, just check for data and continue
-                }
+                connectionCts.Cancel();
+            }
+            catch (ObjectDisposedException)
+            {
+                // Connection already torn down
             }
-
-            await receiveTask; // Wait for any pending receive operation
         }
 
         /// <summary>
-        /// Processes an individual pending command by sending it to the VICE emulator,
-        /// waiting for a response, and handling any necessary post-processing such as auto-resume behavior.
+        /// Sends an <see cref="ExitCommand"/> once the pipeline is idle when a client command completed while
+        /// VICE is known to be stopped.
         /// </summary>
-        /// <param name="pending">
-        /// The pending command to be processed, including the command itself and whether auto-resume is enabled if the VICE emulator is stopped.
+        /// <remarks>
+        /// Resuming only when idle means a burst of pipelined commands costs a single exit instead of one per command.
+        /// </remarks>
+        /// <param name="socket">
+        /// The connected socket.
         /// </param>
         /// <param name="ct">
-        /// A cancellation token that can be used to propagate notification that the operation should be canceled.
+        /// A cancellation token that can be used to cancel the operation.
         /// </param>
-        /// <returns>
-        /// A task that represents the asynchronous operation of processing the command.
-        /// </returns>
-        private async Task ProcessCommandAsync(PendingCommand pending, CancellationToken ct)
+        private async Task ResumeWhenIdleAsync(Socket socket, CancellationToken ct)
         {
-            try
+            await WaitForCompletionAsync(_lastSent, ct);
+            if (!_autoResumePending || !IsQueueEmpty || Volatile.Read(ref _autoResumeHolds) > 0)
             {
-                // Send command
-                await SendCommandAsync(_socket!, _currentRequestId, pending.Command, ct);
+                return;
+            }
+            _autoResumePending = false;
 
-                // Wait for response
-                var response = await WaitForResponseAsync(_currentRequestId, ct);
+            if (await IsVicePausedAsync(socket, ct))
+            {
+                _logger.LogInformation("Auto-resume: VICE is paused, sending exit command");
+                var exitResponse = await SendInternalAsync(socket, new ExitCommand(), ct);
+                _logger.LogInformation("Auto-resume result: {Result} for exit command", exitResponse.ErrorCode);
+            }
+            else
+            {
+                _logger.LogDebug("Auto-resume: VICE is running");
+            }
+        }
 
-                // Always check if VICE needs to be resumed after successful commands
-                if (response.ErrorCode == ErrorCode.OK)
-                {
-                    // Skip for ExitCommand to avoid infinite loop
-                    var commandType = pending.Command.GetType().Name;
-                    if (commandType == "ExitCommand")
-                    {
-                        _logger.LogDebug("Skipping auto-resume check for ExitCommand");
-                    }
-                    else
+        /// <summary>
+        /// Decides whether VICE is paused from the tracked <see cref="RunState"/>.
+        /// </summary>
+        /// <remarks>
+        /// When the state is not known yet and <see cref="ViceConfiguration.UseJiffyClockResumeProbe"/> is set,
+        /// falls back to <see cref="ProbeJiffyClockAsync"/>. Otherwise no extra request is made.
+        /// </remarks>
+        private async ValueTask<bool> IsVicePausedAsync(Socket socket, CancellationToken ct)
+        {
+            switch (RunState)
+            {
+                case EmulatorRunState.Stopped:
+                    return true;
+                case EmulatorRunState.Running:
+                    return false;
+                default:
+                    if (!_configuration.UseJiffyClockResumeProbe)
                     {
-                        // Wait at least one jiffy (17ms) to ensure VICE has settled
-                        await Task.Delay(20, ct);
-                        
-                        // Check if VICE is paused using jiffy clock
-                        var isPaused = await IsVicePausedAsync(ct);
-                        
-                        if (isPaused)
-                        {
-                            _logger.LogInformation("Auto-resume: VICE is paused after {CommandType}, sending exit command", 
-                                commandType);
-                            
-                            var exitCommand = new ExitCommand();
-                            _currentRequestId++;
-                            await SendCommandAsync(_socket!, _currentRequestId, exitCommand, ct);
-                            var exitResponse = await WaitForResponseAsync(_currentRequestId, ct);
-
-                            _logger.LogInformation("Auto-resume result: {Result} for exit command", 
-                                exitResponse.ErrorCode);
-                        }
-                        else
-                        {
-                            _logger.LogDebug("Auto-resume: VICE is running after {CommandType}", 
-                                commandType);
-                        }
+                        return false;
                     }
-                }
-                else
-                {
-                    _logger.LogDebug("Skipping auto-resume: Command {CommandType} returned {ErrorCode}", 
-                        pending.Command.GetType().Name, response.ErrorCode);
-                }
-
-                _currentRequestId++;
-                pending.Command.SetResult(response);
-            }
-            catch (Exception ex)
-            {
-                pending.Command.SetException(ex);
-                throw;
+                    // Wait at least one jiffy (17ms) to ensure VICE has settled
+                    await Task.Delay(20, ct);
+                    return await ProbeJiffyClockAsync(socket, ct);
             }
         }
 
         /// <summary>
         /// Checks if VICE is paused by reading the jiffy clock twice
         /// </summary>
-        private async Task<bool> IsVicePausedAsync(CancellationToken ct)
+        private async Task<bool> ProbeJiffyClockAsync(Socket socket, CancellationToken ct)
         {
             try
             {
                 // Read jiffy clock at $A0-$A2
-                var readCmd1 = new MemoryGetCommand(0, 0x00A0, 0x00A2, MemSpace.MainMemory, 0);
-                _currentRequestId++;
-                await SendCommandAsync(_socket!, _currentRequestId, readCmd1, ct);
-                var response1 = await WaitForResponseAsync(_currentRequestId, ct) as MemoryGetResponse;
+                var response1 = await SendInternalAsync(socket, new MemoryGetCommand(0, 0x00A0, 0x00A2, MemSpace.MainMemory, 0), ct);
                 
-                if (response1?.Memory == null) return false;
+                if (response1.Response?.Memory == null) return false;
                 
                 var jiffy1 = new byte[3];
-                using (var buffer1 = response1.Memory.Value)
+                using (var buffer1 = response1.Response.Memory.Value)
                 {
-                    Array.Copy(buffer1.Data, jiffy1, 3);
+                    buffer1.Span[..3].CopyTo(jiffy1);
                 }
                 
                 // Small delay
                 await Task.Delay(50, ct);
                 
                 // Read again
-                var readCmd2 = new MemoryGetCommand(0, 0x00A0, 0x00A2, MemSpace.MainMemory, 0);
-                _currentRequestId++;
-                await SendCommandAsync(_socket!, _currentRequestId, readCmd2, ct);
-                var response2 = await WaitForResponseAsync(_currentRequestId, ct) as MemoryGetResponse;
+                var response2 = await SendInternalAsync(socket, new MemoryGetCommand(0, 0x00A0, 0x00A2, MemSpace.MainMemory, 0), ct);
                 
-                if (response2?.Memory == null) return false;
+                if (response2.Response?.Memory == null) return false;
                 
-                using (var buffer2 = response2.Memory.Value)
+                using (var buffer2 = response2.Response.Memory.Value)
                 {
                     // If jiffy clock hasn't changed, VICE is paused
-                    bool isPaused = jiffy1[0] == buffer2.Data[0] && 
-                                   jiffy1[1] == buffer2.Data[1] && 
-                                   jiffy1[2] == buffer2.Data[2];
+                    bool isPaused = buffer2.Span[..3].SequenceEqual(jiffy1);
                     
                     _logger.LogDebug("Jiffy clock check: {J1:X2}{J2:X2}{J3:X2} vs {B1:X2}{B2:X2}{B3:X2} - Paused: {IsPaused}",
                         jiffy1[0], jiffy1[1], jiffy1[2],
-                        buffer2.Data[0], buffer2.Data[1], buffer2.Data[2],
+                        buffer2.Span[0], buffer2.Span[1], buffer2.Span[2],
                         isPaused);
                     
                     return isPaused;
                 }
             }
-            catch (Exception ex)
+            catch (Exception ex) when (ex is not OperationCanceledException and not TimeoutException)
             {
                 _logger.LogWarning(ex, "Failed to check if VICE is paused");
                 return false;
@@ -407,164 +1000,297 @@ namespace ViceMCP.ViceBridge.Services.Implementation
         }
 
         /// <summary>
-        /// Waits asynchronously for a response corresponding to the specified request ID
-        /// or until the operation is canceled or times out.
+        /// Reads responses for as long as the connection lives and routes each one either to the in-flight command
+        /// with the matching request ID or, for broadcasts and stray responses, to <see cref="OnUnboundResponse"/>.
         /// </summary>
-        /// <param name="requestId">
-        /// The unique identifier of the request for which the response is being awaited.
+        /// <remarks>
+        /// The socket is drained through a <see cref="PipeReader"/>: every receive appends to the pipe and all
+        /// complete frames it holds are decoded in place, so several pipelined responses arriving together cost
+        /// a single read.
+        /// </remarks>
+        /// <param name="socket">
+        /// The connected socket.
         /// </param>
         /// <param name="ct">
-        /// A cancellation token that can be used to cancel the operation.
+        /// A cancellation token that stops the loop.
         /// </param>
         /// <returns>
-        /// A <see cref="ViceResponse"/> object containing the response details, if received successfully.
+        /// A task that completes when the loop is cancelled or the socket disconnects.
         /// </returns>
-        /// <exception cref="TimeoutException">
-        /// Thrown if the waiting operation exceeds the allotted timeout period.
-        /// </exception>
-        /// <exception cref="OperationCanceledException">
-        /// Thrown when the operation is canceled using the provided cancellation token.
-        /// </exception>
-        private async Task<ViceResponse> WaitForResponseAsync(uint requestId, CancellationToken ct)
+        private async Task ReceiveLoopAsync(Socket socket, CancellationToken ct)
         {
-            var startTime = DateTime.UtcNow;
-            var timeout = TimeSpan.FromSeconds(5);
-
-            // Special handling for CheckpointListCommand
-            var checkpointInfos = new List<CheckpointInfoResponse>();
-
-            while (!ct.IsCancellationRequested)
+            var reader = PipeReader.Create(new NetworkStream(socket, ownsSocket: false),
+                new StreamPipeReaderOptions(bufferSize: ReceiveBufferSize));
+            try
             {
-                // Check if we already have the response in our incoming data
-                var response = await TryReadResponseAsync(requestId, ct, checkpointInfos);
-                if (response != null)
+                while (true)
                 {
-                    // If this is a CheckpointListResponse, add collected infos
-                    if (response is CheckpointListResponse listResponse && checkpointInfos.Count > 0)
+                    var result = await reader.ReadAsync(ct);
+                    var buffer = result.Buffer;
+                    MarkProgress();
+
+                    while (TryReadResponse(ref buffer, out var response, out uint requestId))
                     {
-                        return listResponse with { Info = checkpointInfos.ToImmutableArray() };
+                        RouteResponse(response, requestId);
                     }
-                    return response;
-                }
+                    // Everything left is a partial frame, wait for more data before looking at it again
+                    reader.AdvanceTo(buffer.Start, buffer.End);
 
-                // Check timeout
-                if (DateTime.UtcNow - startTime > timeout)
-                    throw new TimeoutException($"Timeout waiting for response to request {requestId}");
-
-                // Wait for more data
-                await Task.Delay(10, ct);
+                    if (result.IsCompleted)
+                    {
+                        throw new SocketDisconnectedException("Socket disconnected while reading");
+                    }
+                }
+            }
+            finally
+            {
+                await reader.CompleteAsync();
             }
-
-            throw new OperationCanceledException();
         }
 
         /// <summary>
-        /// Asynchronously attempts to read a response from the VICE emulator and matches it to the specified target request ID.
-        /// If the response does not match the target request ID, it is handled as an unmatched response for another request or as a broadcast message.
+        /// Decodes one response frame from the start of the buffer when it is complete.
         /// </summary>
-        /// <param name="targetRequestId">
-        /// The unique identifier of the target request for which the response is being awaited.
+        /// <param name="buffer">
+        /// Received data. On success it is advanced past the decoded frame.
         /// </param>
-        /// <param name="ct">
-        /// A <see cref="CancellationToken"/> used to cancel the operation if needed.
+        /// <param name="response">
+        /// The decoded response.
         /// </param>
-        /// <param name="checkpointInfos">
-        /// An optional list used to collect intermediate <see cref="CheckpointInfoResponse"/> objects associated with the target request.
+        /// <param name="requestId">
+        /// The request ID carried by the response header.
         /// </param>
         /// <returns>
-        /// A <see cref="ViceResponse"/> object representing the matched response to the specified target request ID,
-        /// or null if no matching response is found or the operation is canceled.
+        /// True when a frame was decoded, false when the buffer holds only part of one.
         /// </returns>
-        private async Task<ViceResponse?> TryReadResponseAsync(uint targetRequestId, CancellationToken ct, List<CheckpointInfoResponse>? checkpointInfos = null)
+        private bool TryReadResponse(ref ReadOnlySequence<byte> buffer, [NotNullWhen(true)] out ViceResponse? response,
+            out uint requestId)
+        {
+            response = null;
+            requestId = 0;
+            if (buffer.Length < ResponseHeaderLength)
+            {
+                return false;
+            }
+
+            Span<byte> header = stackalloc byte[ResponseHeaderLength];
+            buffer.Slice(0, ResponseHeaderLength).CopyTo(header);
+            if (header[0] != Constants.STX)
+            {
+                throw new Exception("Not starting with STX");
+            }
+            long frameLength = ResponseHeaderLength + (long)_responseBuilder.GetResponseBodyLength(header);
+            uint headerRequestId = BinaryPrimitives.ReadUInt32LittleEndian(header[8..]);
+            PerformanceProfiler.ResponseStarted(headerRequestId);
+            if (buffer.Length < frameLength)
+            {
+                return false;
+            }
+            PerformanceProfiler.ResponseReceived(headerRequestId, (int)frameLength);
+
+            // The pipe reuses its segments after AdvanceTo, so memory payloads are copied once into their own pooled buffer
+            var body = buffer.Slice(ResponseHeaderLength, frameLength - ResponseHeaderLength);
+            (response, requestId) = _responseBuilder.Build(header, ViceCommand.DefaultApiVersion, body);
+            buffer = buffer.Slice(frameLength);
+            return true;
+        }
+
+        /// <summary>
+        /// Completes the in-flight command a response belongs to.
+        /// </summary>
+        /// <param name="response">
+        /// The decoded response.
+        /// </param>
+        /// <param name="requestId">
+        /// The request ID carried by the response header.
+        /// </param>
+        private void RouteResponse(ViceResponse response, uint requestId)
         {
-            if (_socket == null || _socket.Available < 12)
-                return null;
+            if (requestId == Constants.BroadcastRequestId || !_inFlight.TryGetValue(requestId, out var inFlight))
+            {
+                _logger.LogDebug("Received unmatched response {Type} for request {RequestId}", response.GetType().Name, requestId);
+                OnUnboundResponse(response);
+                return;
+            }
+
+            // Checkpoint info responses come before the list response and carry the same request ID
+            if (response is CheckpointInfoResponse info && inFlight.Command is CheckpointListCommand)
+            {
+                inFlight.CheckpointInfos.Add(info);
+                MessagesHistory.UpdateWithLinkedResponse(inFlight.HistoryId, info);
+                _logger.LogDebug("Collected CheckpointInfoResponse for request {RequestId}", requestId);
+                return;
+            }
+
+            if (!_inFlight.TryRemove(requestId, out _))
+            {
+                return;
+            }
+            _inFlightSlots?.Release();
+            PerformanceProfiler.RequestCompleted(requestId);
 
-            var (response, requestId) = await ReadResponseAsync(_socket, ct);
+            if (response is CheckpointListResponse listResponse && inFlight.CheckpointInfos.Count > 0)
+            {
+                response = listResponse with { Info = [..inFlight.CheckpointInfos] };
+            }
+            _logger.LogDebug("Found response for request {RequestId}: {Type}", requestId, response.GetType().Name);
+            MessagesHistory.UpdateWithResponse(inFlight.HistoryId, response);
 
-            if (requestId == targetRequestId)
+            if (response.ErrorCode == ErrorCode.OK)
             {
-                // Special handling for checkpoint info responses (they come before the list response)
-                if (response is CheckpointInfoResponse info && checkpointInfos != null)
+                if (inFlight.Command is ExitCommand)
                 {
-                    checkpointInfos.Add(info);
-                    MessagesHistory.AddsResponseOnly(response);
-                    _logger.LogDebug("Collected CheckpointInfoResponse for request {RequestId}", requestId);
-                    return null; // Keep collecting
+                    // VICE confirms with a ResumedResponse, no need to wait for it
+                    SetRunState(EmulatorRunState.Running, null);
+                    _autoResumePending = false;
                 }
-
-                _logger.LogDebug("Found response for request {RequestId}: {Type}", requestId, response.GetType().Name);
-                return response;
+                else if (inFlight.TriggersAutoResume)
+                {
+                    _autoResumePending = true;
+                }
+            }
+            else
+            {
+                _logger.LogDebug("Skipping auto-resume: Command {CommandType} returned {ErrorCode}",
+                    inFlight.Command.GetType().Name, response.ErrorCode);
             }
 
-            // It's a different response (broadcast or for another request)
-            _logger.LogDebug("Received unmatched response {Type} for request {RequestId}", response.GetType().Name, requestId);
-            
-            
-            MessagesHistory.AddsResponseOnly(response);
-            ViceResponse?.Invoke(this, new ViceResponseEventArgs(response));
+            if (inFlight.ShadowGeneration is { } generation && response is MemoryGetResponse { ErrorCode: ErrorCode.OK } pages)
+            {
+                response = CompleteShadowRead((MemoryGetCommand)inFlight.Command, generation, pages);
+            }
 
-            return null;
+            inFlight.Command.SetResult(response);
+            inFlight.Completed.TrySetResult();
         }
 
         /// <summary>
-        /// Processes incoming data asynchronously from the VICE emulator socket and handles responses.
+        /// Stores the pages read on behalf of <paramref name="read"/> in <see cref="ShadowMemory"/> and cuts out the
+        /// range that was actually requested.
         /// </summary>
-        /// <param name="ct">
-        /// A <see cref="CancellationToken"/> used to propagate notification that the operation should be canceled.
+        /// <param name="read">
+        /// The command as enqueued by the client.
+        /// </param>
+        /// <param name="generation">
+        /// The cache generation when the page-aligned read was sent.
+        /// </param>
+        /// <param name="pages">
+        /// The response to the page-aligned read. Disposed by this method.
         /// </param>
         /// <returns>
-        /// A <see cref="Task"/> representing the asynchronous operation.
+        /// The response for <paramref name="read"/>.
         /// </returns>
-        private async Task ProcessIncomingDataAsync(CancellationToken ct)
+        private MemoryGetResponse CompleteShadowRead(MemoryGetCommand read, int generation, MemoryGetResponse pages)
         {
-            while (_socket?.Available > 0)
+            using var data = pages.Memory ?? ManagedBuffer.Empty;
+            var pageStart = (ushort)(read.StartAddress & 0xFF00);
+            int offset = read.StartAddress - pageStart;
+            int length = read.EndAddress - read.StartAddress + 1;
+            if (data.Size < offset + length)
             {
-                try
-                {
-                    var (response, requestId) = await ReadResponseAsync(_socket, ct);
-                    _logger.LogDebug("Processing incoming {Type} for request {RequestId}", response.GetType().Name, requestId);
-                    
-                    
-                    MessagesHistory.AddsResponseOnly(response);
-                    ViceResponse?.Invoke(this, new ViceResponseEventArgs(response));
-                }
-                catch (Exception ex)
+                throw new InvalidOperationException($"Memory response of {data.Size} bytes is shorter than requested");
+            }
+
+            ShadowMemory!.Fill(generation, read.MemSpace, read.BankId, pageStart, data.Span);
+            return pages with { Memory = data.Slice(offset, length) };
+        }
+
+        /// <summary>
+        /// Faults every command still waiting for a response, typically because the connection went away.
+        /// </summary>
+        /// <param name="ex">
+        /// The exception to propagate to the waiting callers.
+        /// </param>
+        private void FailInFlightCommands(Exception ex)
+        {
+            foreach (var requestId in _inFlight.Keys)
+            {
+                if (_inFlight.TryRemove(requestId, out var inFlight))
                 {
-                    _logger.LogError(ex, "Error processing incoming data");
-                    break;
+                    inFlight.Command.SetException(ex);
+                    inFlight.Completed.TrySetException(ex);
                 }
             }
+            _lastSent = null;
         }
 
         /// <summary>
-        /// Reads a response from the specified socket, parsing the header and body to create a ViceResponse with its associated request ID.
+        /// Allocates the next request ID, skipping the ID reserved for broadcasts.
         /// </summary>
-        /// <param name="socket">
-        /// The socket from which the response data will be read.
-        /// </param>
-        /// <param name="ct">
-        /// The cancellation token used to cancel the asynchronous operation.
-        /// </param>
         /// <returns>
-        /// A tuple containing the parsed <see cref="ViceResponse"/> and the associated request ID.
+        /// A request ID unique among in-flight commands.
         /// </returns>
-        private async Task<(ViceResponse Response, uint RequestId)> ReadResponseAsync(Socket socket, CancellationToken ct)
+        private uint NextRequestId()
         {
-            using var headerBuffer = _byteArrayPool.GetBuffer(12);
-            await ReadExactBytesAsync(socket, headerBuffer.Data.AsMemory(0, 12), ct);
+            var requestId = _currentRequestId++;
+            if (requestId == Constants.BroadcastRequestId)
+            {
+                requestId = _currentRequestId++;
+            }
+            return requestId;
+        }
 
-            uint bodyLength = _responseBuilder.GetResponseBodyLength(headerBuffer.Data.AsSpan());
+        /// <summary>
+        /// Handles a response that is not bound to the awaited request: tracks run state, records it in history
+        /// and raises <see cref="ViceResponse"/>.
+        /// </summary>
+        /// <param name="response">
+        /// The unbound response, typically a broadcast.
+        /// </param>
+        private void OnUnboundResponse(ViceResponse response)
+        {
+            TrackRunState(response);
+            MessagesHistory.AddsResponseOnly(response);
+            ViceResponse?.Invoke(this, new ViceResponseEventArgs(response));
+        }
 
-            if (bodyLength > 0)
+        /// <summary>
+        /// Updates <see cref="RunState"/> from a broadcast response.
+        /// </summary>
+        /// <param name="response">
+        /// Any response; only <see cref="StoppedResponse"/>, <see cref="JamResponse"/> and
+        /// <see cref="ResumedResponse"/> affect the state.
+        /// </param>
+        internal void TrackRunState(ViceResponse response)
+        {
+            switch (response)
             {
-                using var bodyBuffer = _byteArrayPool.GetBuffer(bodyLength);
-                await ReadExactBytesAsync(socket, bodyBuffer.Data.AsMemory(0, (int)bodyLength), ct);
-                return _responseBuilder.Build(headerBuffer.Data.AsSpan(), ViceCommand.DefaultApiVersion,
-                    bodyBuffer.Data.AsSpan(0, (int)bodyLength));
+                case StoppedResponse stopped:
+                    SetRunState(EmulatorRunState.Stopped, stopped.ProgramCounterPosition);
+                    break;
+                case JamResponse jam:
+                    SetRunState(EmulatorRunState.Stopped, jam.ProgramCounterPosition);
+                    break;
+                case ResumedResponse resumed:
+                    SetRunState(EmulatorRunState.Running, resumed.ProgramCounterPosition);
+                    break;
             }
+        }
 
-            return _responseBuilder.Build(headerBuffer.Data.AsSpan(), ViceCommand.DefaultApiVersion, Array.Empty<byte>());
+        /// <summary>
+        /// Sets <see cref="RunState"/> and raises <see cref="RunStateChanged"/> when it differs.
+        /// </summary>
+        /// <param name="runState">
+        /// The new run state.
+        /// </param>
+        /// <param name="programCounter">
+        /// The program counter reported with the change, if any.
+        /// </param>
+        private void SetRunState(EmulatorRunState runState, ushort? programCounter)
+        {
+            if (runState != EmulatorRunState.Stopped)
+            {
+                // Memory may change as soon as the CPU runs
+                ShadowMemory?.Invalidate();
+            }
+            lock (this)
+            {
+                if (_runState != runState)
+                {
+                    _runState = runState;
+                    RunStateChanged?.Invoke(this, new RunStateChangedEventArgs(runState, programCounter));
+                }
+            }
         }
 
         /// <summary>
@@ -592,10 +1318,15 @@ namespace ViceMCP.ViceBridge.Services.Implementation
             var (buffer, length) = command.GetBinaryData(requestId);
             try
             {
+                if (PerformanceProfiler.IsEnabled)
+                {
+                    // Recorded before writing, the response can be routed before the write returns
+                    int inFlight = Math.Max(1, _configuration.PipelineDepth) - (_inFlightSlots?.CurrentCount ?? 0);
+                    PerformanceProfiler.RequestSent(requestId, command.CommandType, (int)length, inFlight + Volatile.Read(ref _queuedCommands));
+                }
                 await SendExactBytesAsync(socket, buffer.Data.AsMemory(0, (int)length), ct);
 
                 PerformanceProfiler.Add(new CommandSentEvent(command.GetType(), PerformanceProfiler.Ticks));
-                await MessagesHistory.AddCommandAsync(requestId, command);
             }
             finally
             {
@@ -603,39 +1334,6 @@ namespace ViceMCP.ViceBridge.Services.Implementation
             }
         }
 
-        /// <summary>
-        /// Reads a specified amount of bytes from the given socket into the provided buffer.
-        /// Continues reading until the buffer is completely filled or a disconnection occurs.
-        /// </summary>
-        /// <param name="socket">
-        /// The socket from which to read data.
-        /// </param>
-        /// <param name="buffer">
-        /// The memory buffer where the received data will be stored.
-        /// </param>
-        /// <param name="ct">
-        /// A cancellation token used to observe cancellation requests and abort the operation if needed.
-        /// </param>
-        /// <returns>
-        /// A task that represents the asynchronous read operation. Completes when the specified number
-        /// of bytes has been read into the buffer, or throws an exception if the socket disconnects prematurely.
-        /// </returns>
-        private async Task ReadExactBytesAsync(Socket socket, Memory<byte> buffer, CancellationToken ct)
-        {
-            int totalRead = 0;
-            while (totalRead < buffer.Length)
-            {
-                using var timeoutCts = CancellationTokenSource.CreateLinkedTokenSource(ct);
-                timeoutCts.CancelAfter(TimeSpan.FromSeconds(5));
-
-                int read = await socket.ReceiveAsync(buffer[totalRead..], SocketFlags.None, timeoutCts.Token);
-                if (read == 0)
-                    throw new SocketDisconnectedException("Socket disconnected while reading");
-
-                totalRead += read;
-            }
-        }
-
         /// <summary>
         /// Sends the exact number of bytes specified from the given data buffer to the provided socket.
         /// Ensures that all bytes are transmitted, or throws an exception if the socket disconnects during the operation.
@@ -668,32 +1366,6 @@ namespace ViceMCP.ViceBridge.Services.Implementation
             }
         }
 
-        /// <summary>
-        /// Waits for a specific port to become available by polling active TCP listeners.
-        /// </summary>
-        /// <param name="port">
-        /// The port number to monitor for availability.
-        /// </param>
-        /// <param name="ct">
-        /// The cancellation token used to observe cancellation requests.
-        /// </param>
-        /// <returns>
-        /// A task that completes when the specified port is available or when the cancellation token is triggered.
-        /// </returns>
-        private static async Task WaitForPort(int port, CancellationToken ct)
-        {
-            while (!ct.IsCancellationRequested)
-            {
-                var properties = IPGlobalProperties.GetIPGlobalProperties();
-                var listeners = properties.GetActiveTcpListeners();
-
-                if (listeners.Any(l => l.Port == port))
-                    return;
-
-                await Task.Delay(TimeSpan.FromMilliseconds(500), ct);
-            }
-        }
-
         /// <summary>
         /// Closes the currently active socket connection, terminating communication with the VICE emulator.
         /// Ensures the socket is properly shut down, closed, and disposed of to release system resources.
@@ -714,6 +1386,46 @@ namespace ViceMCP.ViceBridge.Services.Implementation
             IsConnected = false;
         }
 
+        /// <summary>
+        /// Waits until the binary monitor answers an <see cref="InfoCommand"/>.
+        /// </summary>
+        /// <remarks>
+        /// The command is queued like any other and is sent as soon as the connection is up. When the connection
+        /// drops before the answer arrives, for example because VICE accepted the connection before it was ready,
+        /// the command is issued again.
+        /// </remarks>
+        /// <param name="ct">
+        /// A cancellation token that bounds the wait.
+        /// </param>
+        /// <returns>
+        /// The emulator version info.
+        /// </returns>
+        public async Task<InfoResponse> WaitForReadyAsync(CancellationToken ct = default)
+        {
+            while (true)
+            {
+                ct.ThrowIfCancellationRequested();
+                var command = EnqueueCommand(new InfoCommand());
+                try
+                {
+                    var result = await command.Response.WaitAsync(ct);
+                    if (result.IsSuccess && result.Response != null)
+                    {
+                        return result.Response;
+                    }
+                    throw new InvalidOperationException($"VICE binary monitor answered with {result.ErrorCode}");
+                }
+                catch (SocketDisconnectedException)
+                {
+                    _logger.LogDebug("Connection dropped while waiting for VICE to answer, retrying");
+                }
+                catch (TimeoutException)
+                {
+                    _logger.LogDebug("VICE did not answer in time, retrying");
+                }
+            }
+        }
+
         /// <summary>
         /// Waits for a connection status change event to occur asynchronously.
         /// </summary>
@@ -768,9 +1480,94 @@ namespace ViceMCP.ViceBridge.Services.Implementation
 
         /// <summary>
         /// Represents a command queued for execution in the VICE emulator communication process.
-        /// Encapsulates the command to be executed and a flag indicating whether the command should
-        /// resume processing even if the bridge is in a stopped state.
+        /// Encapsulates the command to be executed, a flag indicating whether the command should
+        /// resume processing even if the bridge is in a stopped state, its lane and its cancellation.
+        /// </summary>
+        private sealed class PendingCommand
+        {
+            private const int Queued = 0;
+            private const int Taken = 1;
+            private const int Cancelled = 2;
+
+            private readonly CancellationToken _cancellationToken;
+            private readonly CancellationTokenRegistration _registration;
+            private int _state;
+
+            public PendingCommand(IViceCommand command, bool resumeOnStopped, CommandPriority priority,
+                CancellationToken ct)
+            {
+                Command = command;
+                ResumeOnStopped = resumeOnStopped;
+                Priority = priority;
+                EnqueuedAt = Stopwatch.GetTimestamp();
+                _cancellationToken = ct;
+                // Runs inline when the token is already cancelled
+                _registration = ct.Register(static state => ((PendingCommand)state!).Cancel(), this);
+            }
+
+            public IViceCommand Command { get; }
+            public bool ResumeOnStopped { get; }
+            public CommandPriority Priority { get; }
+            public long EnqueuedAt { get; }
+
+            /// <summary>
+            /// Claims the command for sending.
+            /// </summary>
+            /// <returns>False when it was cancelled first.</returns>
+            public bool TryTake()
+            {
+                bool taken = Interlocked.CompareExchange(ref _state, Taken, Queued) == Queued;
+                _registration.Dispose();
+                return taken;
+            }
+
+            private void Cancel()
+            {
+                if (Interlocked.CompareExchange(ref _state, Cancelled, Queued) == Queued)
+                {
+                    Command.SetException(new OperationCanceledException(_cancellationToken));
+                }
+            }
+        }
+
+        /// <summary>
+        /// Handle returned by <see cref="HoldAutoResume"/>, releases the hold once.
+        /// </summary>
+        private sealed class AutoResumeHold : IDisposable
+        {
+            private ViceBridge? _bridge;
+
+            public AutoResumeHold(ViceBridge bridge)
+            {
+                _bridge = bridge;
+            }
+
+            public void Dispose()
+            {
+                Interlocked.Exchange(ref _bridge, null)?.ReleaseAutoResumeHold();
+            }
+        }
+
+        /// <summary>
+        /// Represents a command that has been written to the socket and is waiting for its response.
         /// </summary>
-        private record PendingCommand(IViceCommand Command, bool ResumeOnStopped);
+        /// <param name="Command">The command sent.</param>
+        /// <param name="RequestId">The request ID the response will carry.</param>
+        /// <param name="TriggersAutoResume">Whether a successful response should schedule an auto-resume.</param>
+        /// <param name="HistoryId">Entry of the command in <see cref="MessagesHistory"/>.</param>
+        /// <param name="ShadowGeneration">Shadow memory generation when a page-aligned read was sent in place of
+        /// <paramref name="Command"/>, null otherwise.</param>
+        private sealed record InFlightCommand(IViceCommand Command, uint RequestId, bool TriggersAutoResume,
+            int HistoryId, int? ShadowGeneration = null)
+        {
+            /// <summary>
+            /// Completes once the response has been routed to <see cref="Command"/>.
+            /// </summary>
+            public TaskCompletionSource Completed { get; } = new(TaskCreationOptions.RunContinuationsAsynchronously);
+            /// <summary>
+            /// Checkpoint info responses collected for a <see cref="CheckpointListCommand"/>.
+            /// </summary>
+            public List<CheckpointInfoResponse> CheckpointInfos { get; } = new();
+        }
     }
 }
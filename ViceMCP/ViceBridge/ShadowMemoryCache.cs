@@ -0,0 +1,196 @@
+using System.Numerics;
+using ViceMCP.ViceBridge.Commands;
+
+namespace ViceMCP.ViceBridge
+{
+    /// <summary>
+    /// Shadow copy of emulator memory that is valid only while the CPU is stopped.
+    /// </summary>
+    /// <remarks>
+    /// Holds 64KB per memspace and bank with one validity bit per <see cref="PageSize"/> page. Pages become valid
+    /// when a read brings them in and are invalidated when the CPU resumes, the machine is reset or the bridge
+    /// writes to them. Every invalidation bumps <see cref="Generation"/> so that a read which was already on the
+    /// wire when memory changed cannot fill the cache with stale data.
+    /// </remarks>
+    /// <threadsafety>Class is thread safe.</threadsafety>
+    public sealed class ShadowMemoryCache
+    {
+        /// <summary>
+        /// Granularity of validity tracking in bytes.
+        /// </summary>
+        public const int PageSize = 256;
+        private const int PageCount = 0x10000 / PageSize;
+
+        private readonly object _sync = new();
+        private readonly Dictionary<(MemSpace MemSpace, ushort BankId), Space> _spaces = new();
+        private int _generation;
+        private long _hits;
+        private long _misses;
+
+        /// <summary>
+        /// Gets the invalidation counter. Pass the value read before sending a request to <see cref="Fill"/>.
+        /// </summary>
+        public int Generation
+        {
+            get { lock (_sync) { return _generation; } }
+        }
+
+        /// <summary>
+        /// Gets the number of reads served from the cache.
+        /// </summary>
+        public long Hits => Interlocked.Read(ref _hits);
+
+        /// <summary>
+        /// Gets the number of reads the cache could not serve.
+        /// </summary>
+        public long Misses => Interlocked.Read(ref _misses);
+
+        /// <summary>
+        /// Gets the number of pages currently valid across all memspaces and banks.
+        /// </summary>
+        public int ValidPages
+        {
+            get
+            {
+                lock (_sync)
+                {
+                    return _spaces.Values.Sum(s => s.Valid.Sum(BitOperations.PopCount));
+                }
+            }
+        }
+
+        /// <summary>
+        /// Copies a range to <paramref name="destination"/> when all of its pages are valid.
+        /// </summary>
+        /// <param name="memSpace">Memspace of the range.</param>
+        /// <param name="bankId">Bank of the range.</param>
+        /// <param name="start">First address.</param>
+        /// <param name="end">Last address, inclusive.</param>
+        /// <param name="destination">Receives <paramref name="end"/> - <paramref name="start"/> + 1 bytes on a hit.</param>
+        /// <returns>True on a hit, false otherwise.</returns>
+        public bool TryRead(MemSpace memSpace, ushort bankId, ushort start, ushort end, Span<byte> destination)
+        {
+            lock (_sync)
+            {
+                if (_spaces.TryGetValue((memSpace, bankId), out var space) && space.IsValid(start, end))
+                {
+                    space.Memory.AsSpan(start, end - start + 1).CopyTo(destination);
+                    Interlocked.Increment(ref _hits);
+                    return true;
+                }
+                Interlocked.Increment(ref _misses);
+                return false;
+            }
+        }
+
+        /// <summary>
+        /// Stores data read from VICE and marks every page it fully covers as valid.
+        /// </summary>
+        /// <param name="generation">Value of <see cref="Generation"/> when the read was sent. The data is dropped
+        /// when memory was invalidated since.</param>
+        /// <param name="memSpace">Memspace the data was read from.</param>
+        /// <param name="bankId">Bank the data was read from.</param>
+        /// <param name="start">Address of the first byte.</param>
+        /// <param name="data">The bytes read.</param>
+        public void Fill(int generation, MemSpace memSpace, ushort bankId, ushort start, ReadOnlySpan<byte> data)
+        {
+            int length = Math.Min(data.Length, 0x10000 - start);
+            lock (_sync)
+            {
+                if (generation != _generation)
+                {
+                    return;
+                }
+                if (!_spaces.TryGetValue((memSpace, bankId), out var space))
+                {
+                    space = new Space();
+                    _spaces.Add((memSpace, bankId), space);
+                }
+                data[..length].CopyTo(space.Memory.AsSpan(start));
+
+                int firstPage = (start + PageSize - 1) / PageSize;
+                int endPage = (start + length) / PageSize;
+                for (int page = firstPage; page < endPage; page++)
+                {
+                    space.Valid[page >> 6] |= 1UL << (page & 63);
+                }
+            }
+        }
+
+        /// <summary>
+        /// Invalidates the pages of a range in every bank of a memspace, banks may alias the same memory.
+        /// </summary>
+        /// <param name="memSpace">Memspace written to.</param>
+        /// <param name="start">First address written.</param>
+        /// <param name="end">Last address written, inclusive.</param>
+        public void Invalidate(MemSpace memSpace, ushort start, ushort end)
+        {
+            lock (_sync)
+            {
+                _generation++;
+                foreach (var (key, space) in _spaces)
+                {
+                    if (key.MemSpace != memSpace)
+                    {
+                        continue;
+                    }
+                    for (int page = start / PageSize; page <= end / PageSize; page++)
+                    {
+                        space.Valid[page >> 6] &= ~(1UL << (page & 63));
+                    }
+                }
+            }
+        }
+
+        /// <summary>
+        /// Invalidates every page of a memspace.
+        /// </summary>
+        /// <param name="memSpace">Memspace to invalidate.</param>
+        public void Invalidate(MemSpace memSpace) => Invalidate(memSpace, 0x0000, 0xFFFF);
+
+        /// <summary>
+        /// Invalidates all cached memory.
+        /// </summary>
+        public void Invalidate()
+        {
+            lock (_sync)
+            {
+                _generation++;
+                foreach (var space in _spaces.Values)
+                {
+                    Array.Clear(space.Valid);
+                }
+            }
+        }
+
+        /// <summary>
+        /// Resets <see cref="Hits"/> and <see cref="Misses"/>.
+        /// </summary>
+        public void ResetStatistics()
+        {
+            Interlocked.Exchange(ref _hits, 0);
+            Interlocked.Exchange(ref _misses, 0);
+        }
+
+        /// <summary>
+        /// Memory and validity bits of a single memspace and bank.
+        /// </summary>
+        private sealed class Space
+        {
+            public byte[] Memory { get; } = new byte[0x10000];
+            public ulong[] Valid { get; } = new ulong[PageCount / 64];
+
+            public bool IsValid(ushort start, ushort end)
+            {
+                for (int page = start / PageSize; page <= end / PageSize; page++)
+                {
+                    if ((Valid[page >> 6] & (1UL << (page & 63))) == 0)
+                    {
+                        return false;
+                    }
+                }
+                return true;
+            }
+        }
+    }
+}
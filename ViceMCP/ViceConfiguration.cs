@@ -16,9 +16,47 @@ public class ViceConfiguration
     public int BinaryMonitorPort { get; set; } = 6502;
     
     /// <summary>
-    /// Timeout in milliseconds to wait for VICE to start (default: 2000)
+    /// Maximum time in milliseconds to wait for the binary monitor of a started VICE to answer (default: 10000).
+    /// Startup completes as soon as it answers.
     /// </summary>
-    public int StartupTimeout { get; set; } = 2000;
+    public int StartupTimeout { get; set; } = 10000;
+    
+    /// <summary>
+    /// Probe the jiffy clock ($A0-$A2) to decide whether to auto-resume when the run state
+    /// has not yet been reported by VICE (default: false)
+    /// </summary>
+    public bool UseJiffyClockResumeProbe { get; set; }
+    
+    /// <summary>
+    /// Maximum number of commands in flight on the binary monitor connection (default: 8, 1 disables pipelining)
+    /// </summary>
+    public int PipelineDepth { get; set; } = 8;
+    
+    /// <summary>
+    /// Maximum number of commands waiting in each of the normal and bulk lanes of the bridge queue (default: 4096).
+    /// Interactive commands are never refused.
+    /// </summary>
+    public int MaxQueuedCommands { get; set; } = 4096;
+    
+    /// <summary>
+    /// Serve memory reads from a shadow copy while the CPU is stopped (default: false)
+    /// </summary>
+    public bool UseShadowMemory { get; set; }
+    
+    /// <summary>
+    /// Maximum number of emulator instances in the pool, instance n uses BinaryMonitorPort + n (default: 4)
+    /// </summary>
+    public int MaxInstances { get; set; } = 4;
+    
+    /// <summary>
+    /// Directory for snapshot_save files (default: /dev/shm when present, the temp directory otherwise)
+    /// </summary>
+    public string SnapshotDirectory { get; set; } = string.Empty;
+    
+    /// <summary>
+    /// Number of snapshots kept before the least recently used is dropped (default: 16)
+    /// </summary>
+    public int SnapshotCapacity { get; set; } = 16;
     
     /// <summary>
     /// Creates configuration from environment variables
@@ -48,6 +86,55 @@ public class ViceConfiguration
             config.StartupTimeout = timeout;
         }
         
+        // Get jiffy clock resume probe fallback from environment
+        var jiffyProbeStr = Environment.GetEnvironmentVariable("VICE_JIFFY_RESUME_PROBE");
+        if (!string.IsNullOrEmpty(jiffyProbeStr) && bool.TryParse(jiffyProbeStr, out var jiffyProbe))
+        {
+            config.UseJiffyClockResumeProbe = jiffyProbe;
+        }
+        
+        // Get pipeline depth from environment
+        var depthStr = Environment.GetEnvironmentVariable("VICE_PIPELINE_DEPTH");
+        if (!string.IsNullOrEmpty(depthStr) && int.TryParse(depthStr, out var depth) && depth > 0)
+        {
+            config.PipelineDepth = depth;
+        }
+        
+        // Get queue limit from environment
+        var maxQueuedStr = Environment.GetEnvironmentVariable("VICE_MAX_QUEUED_COMMANDS");
+        if (!string.IsNullOrEmpty(maxQueuedStr) && int.TryParse(maxQueuedStr, out var maxQueued) && maxQueued > 0)
+        {
+            config.MaxQueuedCommands = maxQueued;
+        }
+        
+        // Get shadow memory cache switch from environment
+        var shadowMemoryStr = Environment.GetEnvironmentVariable("VICE_SHADOW_MEMORY");
+        if (!string.IsNullOrEmpty(shadowMemoryStr) && bool.TryParse(shadowMemoryStr, out var shadowMemory))
+        {
+            config.UseShadowMemory = shadowMemory;
+        }
+        
+        // Get instance pool size from environment
+        var maxInstancesStr = Environment.GetEnvironmentVariable("VICE_MAX_INSTANCES");
+        if (!string.IsNullOrEmpty(maxInstancesStr) && int.TryParse(maxInstancesStr, out var maxInstances) && maxInstances > 0)
+        {
+            config.MaxInstances = maxInstances;
+        }
+        
+        // Get snapshot file directory from environment
+        var snapshotDir = Environment.GetEnvironmentVariable("VICE_SNAPSHOT_DIR");
+        if (!string.IsNullOrEmpty(snapshotDir))
+        {
+            config.SnapshotDirectory = snapshotDir;
+        }
+        
+        // Get number of snapshots kept from environment
+        var snapshotCapacityStr = Environment.GetEnvironmentVariable("VICE_SNAPSHOT_CAPACITY");
+        if (!string.IsNullOrEmpty(snapshotCapacityStr) && int.TryParse(snapshotCapacityStr, out var snapshotCapacity) && snapshotCapacity > 0)
+        {
+            config.SnapshotCapacity = snapshotCapacity;
+        }
+        
         return config;
     }
     
@@ -0,0 +1,310 @@
+using System.Collections.Concurrent;
+using System.Diagnostics;
+using ViceMCP.ViceBridge.Services.Abstract;
+
+namespace ViceMCP;
+
+/// <summary>
+/// Emulator instances tool calls are routed to. Instance 0 uses <see cref="ViceConfiguration.BinaryMonitorPort"/>
+/// and the bridge from DI, instance n uses port <c>BinaryMonitorPort + n</c> and a bridge of its own, created
+/// the first time the instance is used.
+/// </summary>
+/// <remarks>
+/// Calls without an explicit instance go to the selected instance (0 unless changed with <see cref="Select"/>).
+/// Leasing hands out instances nobody else holds so parallel workloads never share an emulator.
+/// </remarks>
+public sealed class ViceInstancePool : IAsyncDisposable
+{
+    private readonly ViceConfiguration _config;
+    private readonly Func<IViceBridge> _bridgeFactory;
+    private readonly List<ViceInstance> _instances = new();
+    private readonly object _lock = new();
+    private readonly ConcurrentDictionary<int, MemoryWatch> _watches = new();
+    private int _selected;
+    private int _lastWatchId;
+
+    /// <summary>
+    /// Creates a pool.
+    /// </summary>
+    /// <param name="primaryBridge">Bridge of instance 0, owned by the caller.</param>
+    /// <param name="config">Configuration providing the base port and <see cref="ViceConfiguration.MaxInstances"/>.</param>
+    /// <param name="bridgeFactory">Creates the bridges of the other instances, owned by the pool.</param>
+    public ViceInstancePool(IViceBridge primaryBridge, ViceConfiguration config, Func<IViceBridge>? bridgeFactory = null)
+    {
+        _config = config;
+        _bridgeFactory = bridgeFactory ?? (() => throw new InvalidOperationException("This pool has a single instance"));
+        _instances.Add(new ViceInstance(0, config.BinaryMonitorPort, primaryBridge));
+        Snapshots = new SnapshotStore(
+            string.IsNullOrEmpty(config.SnapshotDirectory) ? SnapshotStore.DefaultDirectory() : config.SnapshotDirectory,
+            config.SnapshotCapacity);
+    }
+
+    /// <summary>
+    /// Largest number of instances the pool creates.
+    /// </summary>
+    public int MaxInstances => Math.Max(1, _config.MaxInstances);
+
+    /// <summary>
+    /// Snapshots shared by all instances, one saved from an instance can be restored to any other.
+    /// </summary>
+    public SnapshotStore Snapshots { get; }
+
+    /// <summary>
+    /// Decoded pages shared by all instances, they are keyed by content so code loaded into several instances
+    /// is decoded once.
+    /// </summary>
+    public Disassembler Disassembler { get; } = new();
+
+    /// <summary>
+    /// Instances created so far, ordered by id.
+    /// </summary>
+    public IReadOnlyList<ViceInstance> Instances
+    {
+        get
+        {
+            lock (_lock)
+            {
+                return _instances.ToArray();
+            }
+        }
+    }
+
+    /// <summary>
+    /// Instance used by calls that don't name one.
+    /// </summary>
+    public ViceInstance Selected => Get(Volatile.Read(ref _selected));
+
+    /// <summary>
+    /// Gets an instance, creating it when needed.
+    /// </summary>
+    /// <exception cref="ArgumentException">Thrown when <paramref name="id"/> is outside the pool.</exception>
+    public ViceInstance Get(int id)
+    {
+        if (id < 0 || id >= MaxInstances)
+        {
+            throw new ArgumentException($"Instance {id} is outside the pool (0-{MaxInstances - 1}), raise VICE_MAX_INSTANCES for more");
+        }
+        lock (_lock)
+        {
+            while (_instances.Count <= id)
+            {
+                int next = _instances.Count;
+                _instances.Add(new ViceInstance(next, _config.BinaryMonitorPort + next, _bridgeFactory()));
+            }
+            return _instances[id];
+        }
+    }
+
+    /// <summary>
+    /// Routes calls that don't name an instance to <paramref name="id"/>.
+    /// </summary>
+    /// <exception cref="ArgumentException">Thrown when <paramref name="id"/> is outside the pool.</exception>
+    public ViceInstance Select(int id)
+    {
+        var instance = Get(id);
+        Volatile.Write(ref _selected, id);
+        return instance;
+    }
+
+    /// <summary>
+    /// Leases the first instance nobody holds, preferring ones with a running emulator.
+    /// </summary>
+    /// <param name="owner">Name of the workload holding the lease.</param>
+    /// <exception cref="InvalidOperationException">Thrown when all <see cref="MaxInstances"/> instances are leased.</exception>
+    public ViceInstance Lease(string owner)
+    {
+        lock (_lock)
+        {
+            var instance = _instances.FirstOrDefault(i => i.LeasedBy == null && i.IsEmulatorRunning)
+                ?? _instances.FirstOrDefault(i => i.LeasedBy == null);
+            if (instance == null)
+            {
+                if (_instances.Count >= MaxInstances)
+                {
+                    throw new InvalidOperationException($"All {MaxInstances} instances are leased");
+                }
+                instance = Get(_instances.Count);
+            }
+            instance.LeasedBy = owner;
+            instance.LeasedAt = DateTime.UtcNow;
+            return instance;
+        }
+    }
+
+    /// <summary>
+    /// Releases a lease.
+    /// </summary>
+    /// <param name="id">The leased instance.</param>
+    /// <param name="owner">When set, the lease is only released when held by this owner.</param>
+    /// <exception cref="InvalidOperationException">Thrown when the instance is not leased or leased by someone else.</exception>
+    public ViceInstance Release(int id, string? owner = null)
+    {
+        var instance = Get(id);
+        lock (_lock)
+        {
+            if (instance.LeasedBy == null)
+            {
+                throw new InvalidOperationException($"Instance {id} is not leased");
+            }
+            if (owner != null && instance.LeasedBy != owner)
+            {
+                throw new InvalidOperationException($"Instance {id} is leased by {instance.LeasedBy}");
+            }
+            instance.LeasedBy = null;
+            instance.LeasedAt = null;
+            return instance;
+        }
+    }
+
+    /// <summary>
+    /// Memory watches of all instances, ordered by id.
+    /// </summary>
+    public IReadOnlyList<MemoryWatch> Watches => _watches.Values.OrderBy(w => w.Id).ToArray();
+
+    /// <summary>
+    /// Starts watching memory of an instance.
+    /// </summary>
+    /// <exception cref="ArgumentException">Thrown when the watch has nothing to watch or no trigger to sample on.</exception>
+    public MemoryWatch AddWatch(ViceInstance instance, IReadOnlyList<(ushort Start, ushort End)> ranges, TimeSpan? interval,
+        bool onStop, int capacity = MemoryWatch.DefaultCapacity)
+    {
+        var watch = new MemoryWatch(Interlocked.Increment(ref _lastWatchId), instance.Id, instance.Bridge, ranges,
+            interval, onStop, capacity);
+        _watches[watch.Id] = watch;
+        return watch;
+    }
+
+    /// <summary>
+    /// Gets a memory watch.
+    /// </summary>
+    /// <exception cref="ArgumentException">Thrown when there is no watch with this id.</exception>
+    public MemoryWatch GetWatch(int id) =>
+        _watches.TryGetValue(id, out var watch) ? watch : throw new ArgumentException($"No memory watch with id {id}");
+
+    /// <summary>
+    /// Stops and removes a memory watch.
+    /// </summary>
+    /// <exception cref="ArgumentException">Thrown when there is no watch with this id.</exception>
+    public async Task<MemoryWatch> RemoveWatchAsync(int id)
+    {
+        if (!_watches.TryRemove(id, out var watch))
+        {
+            throw new ArgumentException($"No memory watch with id {id}");
+        }
+        await watch.DisposeAsync();
+        return watch;
+    }
+
+    public async ValueTask DisposeAsync()
+    {
+        foreach (var watch in _watches.Values)
+        {
+            await watch.DisposeAsync();
+        }
+        _watches.Clear();
+        Snapshots.Dispose();
+        foreach (var instance in Instances)
+        {
+            await instance.Uploader.DisposeAsync();
+        }
+        // Instance 0 belongs to the caller
+        foreach (var instance in Instances.Skip(1))
+        {
+            await instance.Bridge.DisposeAsync();
+        }
+    }
+}
+
+/// <summary>
+/// An emulator of the <see cref="ViceInstancePool"/> with its binary monitor port and bridge.
+/// </summary>
+public sealed class ViceInstance
+{
+    private readonly SemaphoreSlim _startLock = new(1, 1);
+    private bool _isStarted;
+    private DisplayFrame? _lastDisplay;
+
+    internal ViceInstance(int id, int port, IViceBridge bridge)
+    {
+        Id = id;
+        Port = port;
+        Bridge = bridge;
+        Uploader = new ProgramUploader(bridge);
+        StateReader = new MachineStateReader(bridge);
+    }
+
+    public int Id { get; }
+    public int Port { get; }
+    public IViceBridge Bridge { get; }
+    /// <summary>
+    /// Uploads programs loaded with <c>load_program</c>, remembering what it wrote for incremental reloads.
+    /// </summary>
+    public ProgramUploader Uploader { get; }
+    /// <summary>
+    /// Captures the machine state for <c>get_machine_state</c>, caching register and bank metadata per connection.
+    /// </summary>
+    public MachineStateReader StateReader { get; }
+
+    /// <summary>
+    /// Emulator started by <c>start_vice</c> for this instance, null when it was started elsewhere.
+    /// </summary>
+    public Process? Process { get; internal set; }
+    public string? EmulatorType { get; internal set; }
+    public string? LeasedBy { get; internal set; }
+    public DateTime? LeasedAt { get; internal set; }
+
+    public bool IsEmulatorRunning
+    {
+        get
+        {
+            try
+            {
+                return Process is { HasExited: false };
+            }
+            catch (InvalidOperationException)
+            {
+                return false;
+            }
+        }
+    }
+
+    /// <summary>
+    /// Starts the bridge once. Commands queue up until the connection is established.
+    /// </summary>
+    internal async Task EnsureBridgeStartedAsync()
+    {
+        if (_isStarted)
+        {
+            return;
+        }
+        await _startLock.WaitAsync();
+        try
+        {
+            if (!_isStarted)
+            {
+                Bridge.Start(Port);
+                _isStarted = true;
+            }
+        }
+        finally
+        {
+            _startLock.Release();
+        }
+    }
+
+    /// <summary>
+    /// Stores the latest display capture for the next diff and returns the previous one, which the caller disposes.
+    /// </summary>
+    internal DisplayFrame? ExchangeLastDisplay(DisplayFrame? frame) => Interlocked.Exchange(ref _lastDisplay, frame);
+
+    /// <summary>
+    /// Marks the emulator as gone after it quit.
+    /// </summary>
+    internal void EmulatorQuit()
+    {
+        _isStarted = false;
+        Uploader.Clear();
+        Process = null;
+        EmulatorType = null;
+    }
+}
@@ -1,6 +1,7 @@
 using System.Collections.Immutable;
 using System.ComponentModel;
 using System.Diagnostics;
+using System.Text;
 using System.Text.Json;
 using Microsoft.Extensions.DependencyInjection;
 using ModelContextProtocol.Server;
@@ -8,6 +9,7 @@ using ViceMCP.ViceBridge;
 using ViceMCP.ViceBridge.Commands;
 using ViceMCP.ViceBridge.Responses;
 using ViceMCP.ViceBridge.Services.Abstract;
+using ViceMCP.ViceBridge.Services.Implementation;
 using ViceMCP.ViceBridge.Shared;
 
 namespace ViceMCP;
@@ -15,23 +17,39 @@ namespace ViceMCP;
 [McpServerToolType]
 public class ViceTools
 {
-    private readonly IViceBridge _viceBridge;
+    private readonly ViceInstancePool _pool;
     private readonly ViceConfiguration _config;
-    private static bool _isStarted = false;
-    private static readonly SemaphoreSlim _startLock = new(1, 1);
+    // Instance this call is routed to, bound on first use so batch commands stay on the batch's instance
+    private ViceInstance? _instance;
+    // Small enough that encoding or writing a chunk overlaps with the reads still in flight
+    private const int ReadChunkSize = 0x1000;
+    private const string InstanceDescription = "Emulator instance from the pool (default: the selected instance, 0 unless changed with select_instance)";
 
     public ViceTools(IViceBridge viceBridge, ViceConfiguration config)
+        : this(new ViceInstancePool(viceBridge, config), config)
     {
-        _viceBridge = viceBridge;
+    }
+
+    [ActivatorUtilitiesConstructor]
+    public ViceTools(ViceInstancePool pool, ViceConfiguration config)
+    {
+        _pool = pool;
         _config = config;
     }
 
+    internal ViceInstancePool Pool => _pool;
+    internal ViceInstance Instance => _instance ??= _pool.Selected;
+    internal IViceBridge Bridge => Instance.Bridge;
+
     [McpServerTool(Name = "read_memory"), Description("Reads memory from VICE.")]
     public async Task<string> ReadMemory(
         [Description("Start address (hex, e.g., 0xc000)")] string startHex,
-        [Description("End address (hex, e.g., 0xc0ff)")] string endHex)
+        [Description("End address (hex, e.g., 0xc0ff)")] string endHex,
+        [Description("Output encoding: hex (default, 'A9-00-8D'), base64, rle (run-length hex, 'A9 00*250 60') or hexdump (16 bytes per line with ASCII, repeated lines collapsed to '*')")] string encoding = MemoryEncoder.Hex,
+        [Description(InstanceDescription)] int? instance = null,
+        CancellationToken cancellationToken = default)
     {
-        await EnsureStartedAsync();
+        await EnsureStartedAsync(instance);
         
         // Remove 0x prefix if present
         if (startHex.StartsWith("0x", StringComparison.OrdinalIgnoreCase))
@@ -41,50 +59,59 @@ public class ViceTools
             
         ushort start = Convert.ToUInt16(startHex, 16);
         ushort end = Convert.ToUInt16(endHex, 16);
-
-        var command = new MemoryGetCommand(0, start, end, MemSpace.MainMemory, 0);
-        var enqueued = _viceBridge.EnqueueCommand(command);
-        var result = await enqueued.Response;
         
-        if (result.IsSuccess && result.Response != null)
+        if (end < start)
         {
-            var memoryResponse = result.Response;
-            if (memoryResponse.Memory.HasValue)
+            throw new ArgumentException("End address must be greater than or equal to start address");
+        }
+
+        // Large reads yield to everything else
+        using var lane = CommandScope.Enter(end - start + 1 > ReadChunkSize ? CommandPriority.Bulk : CommandPriority.Normal,
+            cancellationToken);
+        var encoder = MemoryEncoder.Create(encoding, start, end - start + 1);
+        await foreach (var chunk in ReadMemoryChunksAsync(start, end))
+        {
+            using (chunk)
             {
-                using var buffer = memoryResponse.Memory.Value;
-                var bytes = new byte[buffer.Size];
-                Array.Copy(buffer.Data, bytes, buffer.Size);
-                return BitConverter.ToString(bytes);
+                encoder.Append(chunk.Span);
             }
-            throw new InvalidOperationException("No memory data returned");
         }
-        
-        throw new InvalidOperationException($"Failed to read memory: {result.ErrorCode}");
+        return encoder.Complete();
     }
 
     [McpServerTool(Name = "write_memory"), Description("Writes bytes to VICE memory.")]
     public async Task<string> WriteMemory(
         [Description("Start address (hex, e.g., 0xc000)")] string startHex,
-        [Description("Byte values (hex, e.g., DE AD BE EF)")] string dataHex)
+        [Description("Byte values (hex, e.g., DE AD BE EF)")] string dataHex,
+        [Description(InstanceDescription)] int? instance = null)
     {
-        await EnsureStartedAsync();
+        await EnsureStartedAsync(instance);
         
         // Remove 0x prefix if present
         if (startHex.StartsWith("0x", StringComparison.OrdinalIgnoreCase))
             startHex = startHex.Substring(2);
             
         ushort start = Convert.ToUInt16(startHex, 16);
-        var data = dataHex
-            .Split(' ', StringSplitOptions.RemoveEmptyEntries)
-            .Select(s => Convert.ToByte(s, 16))
-            .ToArray();
+        var values = dataHex.Split(' ', StringSplitOptions.RemoveEmptyEntries);
 
-        // Create a ManagedBuffer from the data
-        using var buffer = ViceMCP.ViceBridge.BufferManager.GetBuffer((uint)data.Length);
-        Array.Copy(data, buffer.Data, data.Length);
-        
-        var command = new MemorySetCommand(0, start, MemSpace.MainMemory, 0, buffer);
-        var enqueued = _viceBridge.EnqueueCommand(command, resumeOnStopped: true);
+        // Parse straight into the pooled buffer the command sends from
+        var buffer = BufferManager.GetBuffer((uint)values.Length);
+        try
+        {
+            for (int i = 0; i < values.Length; i++)
+            {
+                buffer.Data[i] = Convert.ToByte(values[i], 16);
+            }
+        }
+        catch
+        {
+            buffer.Dispose();
+            throw;
+        }
+
+        // The command owns the buffer and releases it once the write has been answered
+        using var command = new MemorySetCommand(0, start, MemSpace.MainMemory, 0, buffer);
+        var enqueued = Bridge.EnqueueCommand(command, resumeOnStopped: true);
         var result = await enqueued.Response;
         
         if (!result.IsSuccess)
@@ -92,40 +119,35 @@ public class ViceTools
             throw new InvalidOperationException($"Failed to write memory: {result.ErrorCode}");
         }
 
-        return $"Wrote {data.Length} bytes to ${start:X4}";
+        return $"Wrote {values.Length} bytes to ${start:X4}";
+    }
+    
+    private async Task EnsureStartedAsync(int? instance = null)
+    {
+        Route(instance);
+        // Commands queue up until the connection is established, no need to wait for it here
+        await Instance.EnsureBridgeStartedAsync();
     }
     
-    private async Task EnsureStartedAsync()
+    /// <summary>
+    /// Binds this call to <paramref name="instance"/>, or keeps the current binding when null.
+    /// </summary>
+    internal void Route(int? instance)
     {
-        if (!_isStarted)
+        if (instance is { } id)
         {
-            await _startLock.WaitAsync();
-            try
-            {
-                if (!_isStarted)
-                {
-                    _viceBridge.Start(_config.BinaryMonitorPort);
-                    _isStarted = true;
-                    
-                    // Give it a moment to connect
-                    await Task.Delay(500);
-                }
-            }
-            finally
-            {
-                _startLock.Release();
-            }
+            _instance = _pool.Get(id);
         }
     }
     
     
     [McpServerTool(Name = "get_registers"), Description("Gets CPU registers from VICE.")]
-    public async Task<string> GetRegisters()
+    public async Task<string> GetRegisters([Description(InstanceDescription)] int? instance = null)
     {
-        await EnsureStartedAsync();
+        await EnsureStartedAsync(instance);
         
         var command = new RegistersGetCommand(MemSpace.MainMemory);
-        var enqueued = _viceBridge.EnqueueCommand(command);
+        var enqueued = Bridge.EnqueueCommand(command);
         var result = await enqueued.Response;
         
         if (result.IsSuccess && result.Response != null)
@@ -142,12 +164,107 @@ public class ViceTools
         throw new InvalidOperationException($"Failed to get registers: {result.ErrorCode}");
     }
     
+    [McpServerTool(Name = "get_machine_state"), Description("Captures registers, zero page, stack, VIC-II, SID, CIAs, the text screen and checkpoints at one stop of the CPU, with the I/O registers decoded.")]
+    public async Task<string> GetMachineState(
+        [Description("Include the text screen (default: true)")] bool includeScreen = true,
+        [Description(InstanceDescription)] int? instance = null,
+        CancellationToken cancellationToken = default)
+    {
+        await EnsureStartedAsync(instance);
+        
+        var state = await Instance.StateReader.CaptureAsync(MachineStateReader.HasC64Io(Instance.EmulatorType), includeScreen,
+            cancellationToken);
+        
+        var result = new StringBuilder();
+        result.AppendLine($"Machine state: {state.Commands} commands in {state.Elapsed.TotalMilliseconds:F1} ms" +
+            (state.MetadataCached ? ", register and bank metadata cached" : ""));
+        result.AppendLine("Registers: " + string.Join(" ", state.Registers.Select(r =>
+            r.Bits > 8 ? $"{r.Name}=${r.Value:X4}" : $"{r.Name}=${r.Value:X2}")));
+        if (state.Register("FL") is { } flags)
+        {
+            result.AppendLine("Flags: " + new string("NV-BDIZC".Select((c, i) => (flags & (0x80 >> i)) != 0 ? c : '-').ToArray()));
+        }
+        if (state.Register("SP") is { } sp)
+        {
+            // Up to 16 bytes pushed, the most recent first
+            var pushed = state.Stack.Skip((sp & 0xFF) + 1).Take(16).Select(b => $"{b:X2}").ToList();
+            result.AppendLine($"Stack ($01{sp & 0xFF:X2}): {(pushed.Count == 0 ? "empty" : string.Join(" ", pushed))}");
+        }
+        result.AppendLine("Zero page:");
+        for (int row = 0; row < state.ZeroPage.Length; row += 32)
+        {
+            result.AppendLine($"  ${row:X2}: {string.Join(" ", state.ZeroPage.Skip(row).Take(32).Select(b => $"{b:X2}"))}");
+        }
+        
+        if (state.Vic is { } vic)
+        {
+            var mode = (vic.BitmapMode ? "bitmap" : "text") + (vic.MulticolorMode ? " multicolor" : "") + (vic.ExtendedColor ? " extended color" : "");
+            result.AppendLine($"VIC-II: bank ${vic.Bank:X4}, screen ${vic.ScreenAddress:X4}, charset ${vic.CharsetAddress:X4}, " +
+                $"bitmap ${vic.BitmapAddress:X4}; {mode} {vic.Columns}x{vic.Rows}, scroll {vic.ScrollX},{vic.ScrollY}; " +
+                $"display {(vic.DisplayEnabled ? "on" : "off")}; border {vic.BorderColor}, background {string.Join("/", vic.BackgroundColors)}; " +
+                $"raster {vic.RasterLine}; IRQ status ${vic.InterruptStatus:X2} mask ${vic.InterruptMask:X2}");
+            foreach (var sprite in vic.Sprites.Where(s => s.Enabled))
+            {
+                var options = new[] { (sprite.Multicolor, " multicolor"), (sprite.ExpandX, " 2x"), (sprite.ExpandY, " 2y"), (sprite.BehindBackground, " behind") };
+                result.AppendLine($"  Sprite {sprite.Number}: {sprite.X},{sprite.Y} color {sprite.Color}" +
+                    string.Concat(options.Where(o => o.Item1).Select(o => o.Item2)));
+            }
+        }
+        if (state.Sid is { } sid)
+        {
+            var filter = sid.FilterModes.IsEmpty ? "off" : string.Join("+", sid.FilterModes);
+            result.AppendLine($"SID: volume {sid.Volume}, filter {filter} cutoff ${sid.Cutoff:X3} resonance {sid.Resonance} " +
+                $"on voices [{string.Join(",", sid.FilteredVoices)}]{(sid.Voice3Off ? ", voice 3 off" : "")}");
+            for (int v = 0; v < sid.Voices.Length; v++)
+            {
+                var voice = sid.Voices[v];
+                var waveforms = voice.Waveforms.IsEmpty ? "no waveform" : string.Join("+", voice.Waveforms);
+                var options = new[] { (voice.Gate, " gate"), (voice.Sync, " sync"), (voice.Ring, " ring"), (voice.Test, " test") };
+                result.AppendLine($"  Voice {v + 1}: freq ${voice.Frequency:X4} pulse ${voice.PulseWidth:X3} {waveforms}" +
+                    string.Concat(options.Where(o => o.Item1).Select(o => o.Item2)) +
+                    $", ADSR {voice.Attack}/{voice.Decay}/{voice.Sustain}/{voice.Release}");
+            }
+        }
+        foreach (var (name, cia) in new[] { ("CIA 1", state.Cia1), ("CIA 2", state.Cia2) })
+        {
+            if (cia != null)
+            {
+                result.AppendLine($"{name}: port A ${cia.PortA:X2} (ddr ${cia.DirectionA:X2}), port B ${cia.PortB:X2} (ddr ${cia.DirectionB:X2}), " +
+                    $"timer A ${cia.TimerA:X4} {(cia.TimerARunning ? "running" : "stopped")}, " +
+                    $"timer B ${cia.TimerB:X4} {(cia.TimerBRunning ? "running" : "stopped")}, TOD {cia.TimeOfDay}, ICR ${cia.InterruptStatus:X2}");
+            }
+        }
+        
+        if (state.Screen is { } screen)
+        {
+            var lines = screen.Lines.Select(l => l.TrimEnd()).ToList();
+            while (lines.Count > 0 && lines[^1].Length == 0)
+            {
+                lines.RemoveAt(lines.Count - 1);
+            }
+            result.AppendLine($"Screen ${screen.Address:X4}:");
+            foreach (var line in lines)
+            {
+                result.AppendLine("  " + line);
+            }
+        }
+        
+        result.AppendLine(state.Checkpoints.IsEmpty
+            ? "Checkpoints: none"
+            : "Checkpoints: " + string.Join("; ", state.Checkpoints.Select(c =>
+                $"#{c.CheckpointNumber} {c.CpuOperation} ${c.StartAddress:X4}-${c.EndAddress:X4} " +
+                $"{(c.Enabled ? "enabled" : "disabled")}, {c.HitCount} hits")));
+        result.Append("Banks: " + string.Join(", ", state.Banks.Select(b => $"{b.BankId} {b.Name}")));
+        return result.ToString();
+    }
+    
     [McpServerTool(Name = "set_register"), Description("Sets a CPU register value.")]
     public async Task<string> SetRegister(
         [Description("Register name (e.g., A, X, Y, PC, SP)")] string registerName,
-        [Description("Value to set (hex, e.g., 0xFF)")] string valueHex)
+        [Description("Value to set (hex, e.g., 0xFF)")] string valueHex,
+        [Description(InstanceDescription)] int? instance = null)
     {
-        await EnsureStartedAsync();
+        await EnsureStartedAsync(instance);
         
         // Remove 0x prefix if present
         if (valueHex.StartsWith("0x", StringComparison.OrdinalIgnoreCase))
@@ -168,7 +285,7 @@ public class ViceTools
         
         var items = ImmutableArray.Create(new RegisterItem(registerId, value));
         var command = new RegistersSetCommand(MemSpace.MainMemory, items);
-        var enqueued = _viceBridge.EnqueueCommand(command, resumeOnStopped: true);
+        var enqueued = Bridge.EnqueueCommand(command, resumeOnStopped: true);
         var result = await enqueued.Response;
         
         if (!result.IsSuccess)
@@ -182,12 +299,13 @@ public class ViceTools
     [McpServerTool(Name = "step"), Description("Steps the CPU by one or more instructions.")]
     public async Task<string> Step(
         [Description("Number of instructions to step (default: 1)")] int count = 1,
-        [Description("Step over subroutines (default: false)")] bool stepOver = false)
+        [Description("Step over subroutines (default: false)")] bool stepOver = false,
+        [Description(InstanceDescription)] int? instance = null)
     {
-        await EnsureStartedAsync();
+        await EnsureStartedAsync(instance);
         
         var command = new AdvanceInstructionCommand(stepOver, (ushort)count);
-        var enqueued = _viceBridge.EnqueueCommand(command);
+        var enqueued = Bridge.EnqueueCommand(command);
         var result = await enqueued.Response;
         
         if (!result.IsSuccess)
@@ -198,13 +316,68 @@ public class ViceTools
         return $"Stepped {count} instruction(s)";
     }
     
+    [McpServerTool(Name = "trace"), Description("Traces execution instruction by instruction inside the server, recording registers and instruction bytes to a binary trace file, for up to count instructions or until an address or register condition is hit. Returns a summary with the hottest addresses and the last instructions.")]
+    public async Task<string> Trace(
+        [Description("Maximum number of instructions to trace, up to 1000000 (default: 1000)")] int count = 1000,
+        [Description("Stop before executing any of these addresses (hex, comma separated, e.g. 'c000,ea31')")] string? stopAt = null,
+        [Description("Stop when registers match, e.g. 'A==$00 && X>=10' or 'FL&$04' (registers A, X, Y, SP, PC, FL)")] string? condition = null,
+        [Description("Step over subroutines (default: false)")] bool stepOver = false,
+        [Description("Trace file path (default: a new file in the temp directory)")] string? filePath = null,
+        [Description(InstanceDescription)] int? instance = null,
+        CancellationToken cancellationToken = default)
+    {
+        await EnsureStartedAsync(instance);
+        using var lane = CommandScope.Enter(CommandPriority.Normal, cancellationToken);
+        
+        if (count < 1 || count > 1_000_000)
+        {
+            throw new ArgumentException("Count must be between 1 and 1000000");
+        }
+        
+        var stopAddresses = new HashSet<ushort>();
+        foreach (var address in (stopAt ?? "").Split(',', StringSplitOptions.TrimEntries | StringSplitOptions.RemoveEmptyEntries))
+        {
+            var hex = address.StartsWith("0x", StringComparison.OrdinalIgnoreCase) ? address.Substring(2) : address.TrimStart('$');
+            stopAddresses.Add(Convert.ToUInt16(hex, 16));
+        }
+        var stopCondition = string.IsNullOrWhiteSpace(condition) ? null : TraceCondition.Parse(condition);
+        filePath ??= Path.Combine(Path.GetTempPath(), $"vicemcp-trace-{DateTime.Now:yyyyMMdd-HHmmss-fff}.bin");
+        
+        var trace = await new InstructionTracer(Bridge).TraceAsync(filePath, count, stopAddresses, stopCondition, stepOver, cancellationToken);
+        
+        var result = new StringBuilder();
+        var perSecond = trace.Elapsed.TotalSeconds > 0 ? trace.Instructions / trace.Elapsed.TotalSeconds : 0;
+        result.AppendLine($"Traced {trace.Instructions} instruction(s) in {trace.Elapsed.TotalMilliseconds:F0} ms ({perSecond:F0}/s), stopped: {trace.StopReason}");
+        result.AppendLine($"Trace file: {trace.FilePath} ({InstructionTracer.HeaderSize + trace.Instructions * InstructionTracer.RecordSize} bytes, {InstructionTracer.RecordSize} byte records)");
+        result.AppendLine($"{trace.UniqueAddresses} distinct addresses, {trace.PageReads} page read(s) for decoding");
+        if (trace.Hot.Length > 0)
+        {
+            result.AppendLine("Hottest addresses:");
+            foreach (var (address, hits) in trace.Hot)
+            {
+                result.AppendLine($"  ${address:X4}: {hits}");
+            }
+        }
+        if (trace.Recent.Length > 0)
+        {
+            result.AppendLine("Last instructions:");
+            foreach (var line in trace.Recent)
+            {
+                result.AppendLine($"  {line}");
+            }
+        }
+        var final = trace.Final;
+        result.AppendLine($"Now at ${final.PC:X4}  A={final.A:X2} X={final.X:X2} Y={final.Y:X2} SP={final.SP:X2} FL={final.Flags:X2}");
+        return result.ToString().TrimEnd();
+    }
+    
     [McpServerTool(Name = "continue_execution"), Description("Continues execution after a breakpoint.")]
-    public async Task<string> ContinueExecution()
+    public async Task<string> ContinueExecution([Description(InstanceDescription)] int? instance = null)
     {
-        await EnsureStartedAsync();
+        await EnsureStartedAsync(instance);
         
         var command = new ExitCommand();
-        var enqueued = _viceBridge.EnqueueCommand(command);
+        var enqueued = Bridge.EnqueueCommand(command);
         var result = await enqueued.Response;
         
         if (!result.IsSuccess)
@@ -217,9 +390,10 @@ public class ViceTools
     
     [McpServerTool(Name = "reset"), Description("Resets the emulated machine.")]
     public async Task<string> Reset(
-        [Description("Reset mode: 'soft' or 'hard' (default: 'soft')")] string mode = "soft")
+        [Description("Reset mode: 'soft' or 'hard' (default: 'soft')")] string mode = "soft",
+        [Description(InstanceDescription)] int? instance = null)
     {
-        await EnsureStartedAsync();
+        await EnsureStartedAsync(instance);
         
         var resetMode = mode.ToLower() switch
         {
@@ -229,7 +403,8 @@ public class ViceTools
         };
         
         var command = new ResetCommand(resetMode);
-        var enqueued = _viceBridge.EnqueueCommand(command);
+        Instance.Uploader.Clear();
+        var enqueued = Bridge.EnqueueCommand(command);
         var result = await enqueued.Response;
         
         if (!result.IsSuccess)
@@ -241,7 +416,7 @@ public class ViceTools
         try
         {
             var continueCmd = new ExitCommand();
-            var continueEnqueued = _viceBridge.EnqueueCommand(continueCmd);
+            var continueEnqueued = Bridge.EnqueueCommand(continueCmd);
             var continueResult = await continueEnqueued.Response;
             if (continueResult.ErrorCode != ErrorCode.OK)
             {
@@ -257,12 +432,12 @@ public class ViceTools
     }
     
     [McpServerTool(Name = "get_info"), Description("Gets VICE emulator info.")]
-    public async Task<string> GetInfo()
+    public async Task<string> GetInfo([Description(InstanceDescription)] int? instance = null)
     {
-        await EnsureStartedAsync();
+        await EnsureStartedAsync(instance);
         
         var command = new InfoCommand();
-        var enqueued = _viceBridge.EnqueueCommand(command);
+        var enqueued = Bridge.EnqueueCommand(command);
         var result = await enqueued.Response;
         
         if (result.IsSuccess && result.Response != null)
@@ -275,12 +450,12 @@ public class ViceTools
     }
     
     [McpServerTool(Name = "ping"), Description("Pings the VICE emulator.")]
-    public async Task<string> Ping()
+    public async Task<string> Ping([Description(InstanceDescription)] int? instance = null)
     {
-        await EnsureStartedAsync();
+        await EnsureStartedAsync(instance);
         
         var command = new PingCommand();
-        var enqueued = _viceBridge.EnqueueCommand(command);
+        var enqueued = Bridge.EnqueueCommand(command);
         var result = await enqueued.Response;
         
         if (!result.IsSuccess)
@@ -290,14 +465,146 @@ public class ViceTools
 
         return "Pong! VICE is responding";
     }
-    
+
+    [McpServerTool(Name = "get_memory_cache_stats"), Description("Gets shadow memory cache statistics. While the CPU is stopped, memory reads are served from the cache when VICE_SHADOW_MEMORY=true.")]
+    public Task<string> GetMemoryCacheStats(
+        [Description("Reset hit/miss counters after reading them (default: false)")] bool reset = false,
+        [Description(InstanceDescription)] int? instance = null)
+    {
+        Route(instance);
+        
+        var cache = Bridge.ShadowMemory;
+        if (cache == null)
+        {
+            return Task.FromResult("Shadow memory cache is disabled. Set VICE_SHADOW_MEMORY=true to enable it.");
+        }
+
+        long hits = cache.Hits;
+        long misses = cache.Misses;
+        long total = hits + misses;
+        var hitRate = total > 0 ? 100.0 * hits / total : 0;
+        var stats = $"Hits: {hits}\nMisses: {misses}\nHit rate: {hitRate:F1}%\nValid pages: {cache.ValidPages}\nRun state: {Bridge.RunState}";
+        if (reset)
+        {
+            cache.ResetStatistics();
+        }
+        return Task.FromResult(stats);
+    }
+
+    [McpServerTool(Name = "get_performance_stats"), Description("Gets bridge performance statistics: per command latency percentiles (time to first response byte and to completion), queue depth, queue wait per priority lane and bytes sent/received.")]
+    public Task<string> GetPerformanceStats(
+        [Description("Reset statistics after reading them (default: false)")] bool reset = false,
+        [Description("Number of slowest recent requests to list (default: 5)")] int slowest = 5,
+        [Description(InstanceDescription)] int? instance = null)
+    {
+        Route(instance);
+        
+        var profiler = Bridge.PerformanceProfiler;
+        if (!profiler.IsEnabled)
+        {
+            return Task.FromResult("Performance profiling is disabled.");
+        }
+
+        var stats = profiler.GetStatistics();
+        if (reset)
+        {
+            profiler.Clear();
+        }
+
+        var sb = new StringBuilder();
+        sb.AppendLine($"Elapsed: {stats.Elapsed.TotalSeconds:F1}s");
+        sb.AppendLine($"Commands: {stats.CommandsSent} sent, {stats.CommandsCompleted} completed");
+        sb.AppendLine($"Bytes: {stats.BytesSent} sent, {stats.BytesReceived} received");
+        sb.AppendLine($"Queue depth at send: {stats.AverageQueueDepth:F1} average, {stats.MaxQueueDepth} max");
+        foreach (var lane in stats.Lanes)
+        {
+            sb.AppendLine($"Queue wait {lane.Priority.ToString().ToLowerInvariant()}: {lane.Count} commands, " +
+                $"p50 {Ms(lane.Wait.P50)}ms, p99 {Ms(lane.Wait.P99)}ms, max {Ms(lane.Wait.Max)}ms");
+        }
+        if (stats.Commands.Length == 0)
+        {
+            sb.Append("No completed commands");
+            return Task.FromResult(sb.ToString());
+        }
+
+        sb.AppendLine();
+        sb.AppendLine("Latency in ms     count | first byte p50    p99 |   complete p50    p99    max |  bytes out    bytes in");
+        foreach (var command in stats.Commands)
+        {
+            sb.AppendLine($"{command.CommandType,-16} {command.Count,6} | {Ms(command.FirstByte.P50),14} {Ms(command.FirstByte.P99),6} | " +
+                $"{Ms(command.Complete.P50),14} {Ms(command.Complete.P99),6} {Ms(command.Complete.Max),6} | {command.BytesSent,10} {command.BytesReceived,11}");
+        }
+
+        var slowestRequests = stats.RecentRequests
+            .Where(r => r.Completed.HasValue)
+            .OrderByDescending(r => r.Completed!.Value - r.Sent)
+            .Take(Math.Max(0, slowest))
+            .ToList();
+        if (slowestRequests.Count > 0)
+        {
+            sb.AppendLine();
+            sb.AppendLine("Slowest recent requests:");
+            foreach (var request in slowestRequests)
+            {
+                var firstByte = (request.FirstByte ?? request.Completed!.Value) - request.Sent;
+                var complete = request.Completed!.Value - request.Sent;
+                sb.AppendLine($"  #{request.RequestId} {request.CommandType} at {request.Sent.TotalSeconds:F3}s: " +
+                    $"first byte {Ms(firstByte)}ms, complete {Ms(complete)}ms, queue depth {request.QueueDepth}");
+            }
+        }
+        return Task.FromResult(sb.ToString().TrimEnd());
+
+        static string Ms(TimeSpan value) => value.TotalMilliseconds.ToString("F2");
+    }
+
+    [McpServerTool(Name = "export_message_history"), Description("Exports the recent command/response history with per-message latency for offline analysis of slow or stuck sessions.")]
+    public async Task<string> ExportMessageHistory(
+        [Description("Output file path")] string filePath,
+        [Description("File format: ndjson (default, one JSON object per message) or binary (compact fixed-size records)")] string format = "ndjson",
+        [Description(InstanceDescription)] int? instance = null)
+    {
+        Route(instance);
+        
+        if (Bridge.MessagesHistory is not MessagesHistory history)
+        {
+            return "Message history is disabled.";
+        }
+
+        bool binary = format.Trim().ToLowerInvariant() switch
+        {
+            "ndjson" or "json" => false,
+            "binary" or "bin" => true,
+            _ => throw new ArgumentException($"Unknown format '{format}', expected ndjson or binary"),
+        };
+
+        int count;
+        await using (var file = new FileStream(filePath, FileMode.Create, FileAccess.Write, FileShare.None, 4096, useAsync: true))
+        {
+            count = binary ? await history.ExportBinaryAsync(file) : await history.ExportNdjsonAsync(file);
+        }
+
+        var entries = history.GetEntries();
+        int pending = entries.Count(e => e.Command != null && e.Response == null);
+        var slowest = entries.Where(e => e.Elapsed.HasValue).MaxBy(e => e.Elapsed!.Value);
+        var summary = $"Exported {count} of {history.TotalCount} messages to {filePath} as {(binary ? "binary" : "NDJSON")}";
+        if (pending > 0)
+        {
+            summary += $"\n{pending} command(s) awaiting a response";
+        }
+        if (slowest != null)
+        {
+            summary += $"\nSlowest: {slowest.Command?.CommandType} #{slowest.Sequence} took {TimeSpan.FromTicks(slowest.Elapsed!.Value).TotalMilliseconds:F2}ms";
+        }
+        return summary;
+    }
+
     [McpServerTool(Name = "get_banks"), Description("Gets available memory banks.")]
-    public async Task<string> GetBanks()
+    public async Task<string> GetBanks([Description(InstanceDescription)] int? instance = null)
     {
-        await EnsureStartedAsync();
+        await EnsureStartedAsync(instance);
         
         var command = new BanksAvailableCommand();
-        var enqueued = _viceBridge.EnqueueCommand(command);
+        var enqueued = Bridge.EnqueueCommand(command);
         var result = await enqueued.Response;
         
         if (result.IsSuccess && result.Response != null)
@@ -319,9 +626,10 @@ public class ViceTools
         [Description("Start address (hex)")] string startHex,
         [Description("End address (hex, optional - same as start if not provided)")] string? endHex = null,
         [Description("Stop when hit (default: true)")] bool stopWhenHit = true,
-        [Description("Enabled (default: true)")] bool enabled = true)
+        [Description("Enabled (default: true)")] bool enabled = true,
+        [Description(InstanceDescription)] int? instance = null)
     {
-        await EnsureStartedAsync();
+        await EnsureStartedAsync(instance);
         
         // Remove 0x prefix if present
         if (startHex.StartsWith("0x", StringComparison.OrdinalIgnoreCase))
@@ -333,7 +641,7 @@ public class ViceTools
         ushort end = endHex != null ? Convert.ToUInt16(endHex, 16) : start;
         
         var command = new CheckpointSetCommand(start, end, stopWhenHit, enabled, CpuOperation.Exec, false);
-        var enqueued = _viceBridge.EnqueueCommand(command);
+        var enqueued = Bridge.EnqueueCommand(command);
         var result = await enqueued.Response;
         
         if (result.IsSuccess && result.Response != null)
@@ -346,12 +654,12 @@ public class ViceTools
     }
     
     [McpServerTool(Name = "list_checkpoints"), Description("Lists all checkpoints.")]
-    public async Task<string> ListCheckpoints()
+    public async Task<string> ListCheckpoints([Description(InstanceDescription)] int? instance = null)
     {
-        await EnsureStartedAsync();
+        await EnsureStartedAsync(instance);
         
         var command = new CheckpointListCommand();
-        var enqueued = _viceBridge.EnqueueCommand(command);
+        var enqueued = Bridge.EnqueueCommand(command);
         var result = await enqueued.Response;
         
         if (result.IsSuccess && result.Response != null)
@@ -377,12 +685,13 @@ public class ViceTools
     
     [McpServerTool(Name = "delete_checkpoint"), Description("Deletes a checkpoint.")]
     public async Task<string> DeleteCheckpoint(
-        [Description("Checkpoint number to delete")] uint checkpointNumber)
+        [Description("Checkpoint number to delete")] uint checkpointNumber,
+        [Description(InstanceDescription)] int? instance = null)
     {
-        await EnsureStartedAsync();
+        await EnsureStartedAsync(instance);
         
         var command = new CheckpointDeleteCommand(checkpointNumber);
-        var enqueued = _viceBridge.EnqueueCommand(command);
+        var enqueued = Bridge.EnqueueCommand(command);
         var result = await enqueued.Response;
         
         if (!result.IsSuccess)
@@ -396,12 +705,13 @@ public class ViceTools
     [McpServerTool(Name = "toggle_checkpoint"), Description("Enables or disables a checkpoint.")]
     public async Task<string> ToggleCheckpoint(
         [Description("Checkpoint number")] uint checkpointNumber,
-        [Description("Enable (true) or disable (false)")] bool enabled)
+        [Description("Enable (true) or disable (false)")] bool enabled,
+        [Description(InstanceDescription)] int? instance = null)
     {
-        await EnsureStartedAsync();
+        await EnsureStartedAsync(instance);
         
         var command = new CheckpointToggleCommand(checkpointNumber, enabled);
-        var enqueued = _viceBridge.EnqueueCommand(command);
+        var enqueued = Bridge.EnqueueCommand(command);
         var result = await enqueued.Response;
         
         if (!result.IsSuccess)
@@ -412,37 +722,123 @@ public class ViceTools
         return $"Checkpoint #{checkpointNumber} {(enabled ? "enabled" : "disabled")}";
     }
     
-    [McpServerTool(Name = "get_display"), Description("Gets the current display/screen as an image.")]
+    [McpServerTool(Name = "get_display"), Description("Captures the screen as a palette PNG, returned as a base64 data URI or saved to a file. Can crop the border, downscale, return only the tiles that changed since the previous capture and capture several frames in a row.")]
     public async Task<string> GetDisplay(
-        [Description("Use VIC display (true) or VICII/VDC (false) - default: true")] bool useVic = true)
+        [Description("Use VIC display (true) or VICII/VDC (false) - default: true")] bool useVic = true,
+        [Description("Crop to the inner screen area without the border (default: false)")] bool crop = false,
+        [Description("Downscale factor 1-8, keeps every nth pixel (default: 1)")] int scale = 1,
+        [Description("Return only the region of 8x8 tiles that changed since the previous capture of this instance (default: false)")] bool diff = false,
+        [Description("Number of frames to capture in a row, 1-50 (default: 1). Combine with diff to get only what moved")] int frames = 1,
+        [Description("Milliseconds the emulator runs between frames (default: 20, one PAL frame)")] int intervalMs = 20,
+        [Description("Save the PNG to this path instead of returning it, frame n of several goes to name_n.png")] string? filePath = null,
+        [Description(InstanceDescription)] int? instance = null)
     {
-        await EnsureStartedAsync();
+        await EnsureStartedAsync(instance);
         
-        var command = new DisplayGetCommand(useVic, ImageFormat.Indexed);
-        var enqueued = _viceBridge.EnqueueCommand(command);
-        var result = await enqueued.Response;
+        if (frames < 1 || frames > 50)
+        {
+            throw new ArgumentException("Frames must be between 1 and 50");
+        }
         
-        if (result.IsSuccess && result.Response != null)
+        var output = new StringBuilder();
+        var stopwatch = Stopwatch.StartNew();
+        for (int i = 0; i < frames; i++)
         {
-            var displayResponse = result.Response;
-            if (displayResponse.Image != null)
+            if (i > 0 && intervalMs > 0)
             {
-                using var image = displayResponse.Image.Value;
-                return $"Display captured: {displayResponse.InnerWidth}x{displayResponse.InnerHeight} ({displayResponse.BitsPerPixel} bpp)\nImage data: {image.Size} bytes";
+                await Task.Delay(intervalMs);
             }
-            throw new InvalidOperationException("No image data returned");
+            
+            var command = new DisplayGetCommand(useVic, ImageFormat.Indexed);
+            var result = await Bridge.EnqueueCommand(command).Response;
+            if (!result.IsSuccess || result.Response == null)
+            {
+                throw new InvalidOperationException($"Failed to get display: {result.ErrorCode}");
+            }
+            
+            using var displayResponse = result.Response;
+            if (displayResponse.Image is not { } image)
+            {
+                throw new InvalidOperationException("No image data returned");
+            }
+            if (i == 0)
+            {
+                output.AppendLine($"Display captured: {displayResponse.InnerWidth}x{displayResponse.InnerHeight} ({displayResponse.BitsPerPixel} bpp)");
+                output.AppendLine($"Image data: {image.Size} bytes");
+            }
+            
+            var frame = DisplayFrame.From(displayResponse, crop, scale);
+            // Taking the previous capture out while diffing keeps a concurrent call from disposing it under us
+            using var previous = Instance.ExchangeLastDisplay(null);
+            AppendDisplayFrame(output, frame, previous, diff, frames > 1 ? i : null, filePath);
+            Instance.ExchangeLastDisplay(frame)?.Dispose();
         }
         
-        throw new InvalidOperationException($"Failed to get display: {result.ErrorCode}");
+        if (frames > 1)
+        {
+            output.AppendLine($"Captured {frames} frames in {stopwatch.ElapsedMilliseconds} ms");
+        }
+        return output.ToString().TrimEnd();
+    }
+    
+    /// <summary>
+    /// Appends one frame of <see cref="GetDisplay"/>: the whole frame, or with <paramref name="diff"/> the
+    /// bounding box of the tiles that changed since <paramref name="previous"/>.
+    /// </summary>
+    private static void AppendDisplayFrame(StringBuilder output, DisplayFrame frame, DisplayFrame? previous, bool diff,
+        int? index, string? filePath)
+    {
+        var label = index is { } n ? $"Frame {n}: " : "";
+        int x = 0, y = 0, width = frame.Width, height = frame.Height;
+        if (diff && frame.IsComparableTo(previous))
+        {
+            var tiles = frame.ChangedTiles(previous!);
+            if (tiles.Count == 0)
+            {
+                output.AppendLine($"{label}No changes since previous capture");
+                return;
+            }
+            const int tile = DisplayFrame.TileSize;
+            x = tiles.Min(t => t.Column) * tile;
+            y = tiles.Min(t => t.Row) * tile;
+            width = Math.Min((tiles.Max(t => t.Column) + 1) * tile, frame.Width) - x;
+            height = Math.Min((tiles.Max(t => t.Row) + 1) * tile, frame.Height) - y;
+            int total = ((frame.Width + tile - 1) / tile) * ((frame.Height + tile - 1) / tile);
+            output.AppendLine($"{label}Changed tiles ({tile}x{tile}): {tiles.Count} of {total}, region x={x} y={y} {width}x{height}");
+            output.AppendLine($"  Tiles (column,row): {string.Join(" ", tiles.Take(100).Select(t => $"{t.Column},{t.Row}"))}{(tiles.Count > 100 ? " ..." : "")}");
+        }
+        else if (diff)
+        {
+            output.AppendLine($"{label}No previous capture of this size, returning the full image");
+        }
+        else if (index > 0 && frame.IsComparableTo(previous) && frame.Pixels.SequenceEqual(previous!.Pixels))
+        {
+            output.AppendLine($"{label}Same as previous frame");
+            return;
+        }
+        
+        var png = frame.ToPng(x, y, width, height);
+        if (filePath != null)
+        {
+            var path = index is { } number
+                ? Path.Combine(Path.GetDirectoryName(filePath) ?? "", $"{Path.GetFileNameWithoutExtension(filePath)}_{number}{(Path.HasExtension(filePath) ? Path.GetExtension(filePath) : ".png")}")
+                : filePath;
+            File.WriteAllBytes(path, png);
+            output.AppendLine($"{label}PNG {width}x{height} ({png.Length} bytes) saved to {path}");
+        }
+        else
+        {
+            output.AppendLine($"{label}PNG {width}x{height} ({png.Length} bytes): data:image/png;base64,{Convert.ToBase64String(png)}");
+        }
     }
     
     [McpServerTool(Name = "quit_vice"), Description("Quits the VICE emulator.")]
-    public async Task<string> QuitVice()
+    public async Task<string> QuitVice([Description(InstanceDescription)] int? instance = null)
     {
-        await EnsureStartedAsync();
+        await EnsureStartedAsync(instance);
         
         var command = new QuitCommand();
-        var enqueued = _viceBridge.EnqueueCommand(command);
+        var enqueued = Bridge.EnqueueCommand(command);
         var result = await enqueued.Response;
         
         if (!result.IsSuccess)
@@ -450,15 +846,18 @@ public class ViceTools
             throw new InvalidOperationException($"Failed to quit VICE: {result.ErrorCode}");
         }
 
-        _isStarted = false;
+        Instance.EmulatorQuit();
         return "VICE emulator quit";
     }
     
     [McpServerTool(Name = "start_vice"), Description("Starts a VICE emulator instance.")]
     public async Task<string> StartVice(
         [Description("Emulator type: x64sc (C64), x128 (C128), xvic (VIC20), xpet (PET), etc.")] string emulatorType = "x64sc",
-        [Description("Additional command line arguments")] string? arguments = null)
+        [Description("Additional command line arguments")] string? arguments = null,
+        [Description(InstanceDescription)] int? instance = null)
     {
+        Route(instance);
+        
         var validEmulators = new[] { "x64sc", "x64", "x128", "xvic", "xpet", "xplus4", "xcbm2", "xcbm5x0" };
         if (!validEmulators.Contains(emulatorType.ToLower()))
         {
@@ -481,7 +880,7 @@ public class ViceTools
         }
         
         // Start VICE with binary monitor enabled
-        var processArgs = $"-binarymonitor -binarymonitoraddress 127.0.0.1:{_config.BinaryMonitorPort}";
+        var processArgs = $"-binarymonitor -binarymonitoraddress 127.0.0.1:{Instance.Port}";
         if (!string.IsNullOrWhiteSpace(arguments))
         {
             processArgs += " " + arguments;
@@ -496,21 +895,53 @@ public class ViceTools
             RedirectStandardError = true
         };
         
+        var stopwatch = Stopwatch.StartNew();
         var process = Process.Start(startInfo);
         if (process == null)
         {
             throw new InvalidOperationException($"Failed to start {emulatorType}");
         }
         
-        // Give VICE time to start and open the binary monitor port
-        await Task.Delay(_config.StartupTimeout);
+        // Drain the redirected output so VICE never blocks on a full pipe, keep the last lines for errors
+        var errorOutput = new Queue<string>();
+        process.OutputDataReceived += (_, _) => { };
+        process.ErrorDataReceived += (_, e) =>
+        {
+            if (e.Data == null) return;
+            lock (errorOutput)
+            {
+                errorOutput.Enqueue(e.Data);
+                if (errorOutput.Count > 5) errorOutput.Dequeue();
+            }
+        };
+        process.BeginOutputReadLine();
+        process.BeginErrorReadLine();
+        
+        InfoResponse info;
+        try
+        {
+            info = await WaitForBinaryMonitorAsync(process);
+        }
+        catch (Exception ex) when (ex is InvalidOperationException or TimeoutException)
+        {
+            string lastErrors;
+            lock (errorOutput)
+            {
+                lastErrors = string.Join("\n", errorOutput);
+            }
+            throw new InvalidOperationException(string.IsNullOrEmpty(lastErrors)
+                ? $"{emulatorType} did not start: {ex.Message}"
+                : $"{emulatorType} did not start: {ex.Message}\n{lastErrors}", ex);
+        }
+        var readyAfter = stopwatch.ElapsedMilliseconds;
+        Instance.Process = process;
+        Instance.EmulatorType = emulatorType;
         
         // Resume execution since VICE starts paused when binary monitor is enabled
         try
         {
-            await EnsureStartedAsync();
             var continueCmd = new ExitCommand();
-            var continueEnqueued = _viceBridge.EnqueueCommand(continueCmd);
+            var continueEnqueued = Bridge.EnqueueCommand(continueCmd);
             var result = await continueEnqueued.Response;
             if (result.ErrorCode != ErrorCode.OK)
             {
@@ -522,16 +953,143 @@ public class ViceTools
             Console.Error.WriteLine($"Warning: Could not auto-resume execution: {ex.Message}");
         }
         
-        return $"Started {emulatorType} (PID: {process.Id}) with binary monitor on port {_config.BinaryMonitorPort}";
+        return $"Started {emulatorType} {info.Major}.{info.Minor}.{info.Build} (PID: {process.Id}) with binary monitor on port {Instance.Port}, ready in {readyAfter} ms";
+    }
+    
+    [McpServerTool(Name = "start_vice_pool"), Description("Starts emulators for pool instances 0 to count-1 in parallel, each with its own binary monitor port. Instances already running are kept.")]
+    public async Task<string> StartVicePool(
+        [Description("Number of instances (default: 2)")] int count = 2,
+        [Description("Emulator type: x64sc (C64), x128 (C128), xvic (VIC20), xpet (PET), etc.")] string emulatorType = "x64sc",
+        [Description("Additional command line arguments")] string? arguments = null)
+    {
+        if (count < 1 || count > _pool.MaxInstances)
+        {
+            throw new ArgumentException($"Count must be between 1 and {_pool.MaxInstances}");
+        }
+        
+        var starts = Enumerable.Range(0, count).Select(async id =>
+        {
+            var target = _pool.Get(id);
+            if (target.IsEmulatorRunning)
+            {
+                return $"Instance {id}: {target.EmulatorType} already running (PID: {target.Process!.Id}) on port {target.Port}";
+            }
+            try
+            {
+                return $"Instance {id}: " + await ForInstance(target).StartVice(emulatorType, arguments);
+            }
+            catch (Exception ex) when (ex is InvalidOperationException or FileNotFoundException)
+            {
+                return $"Instance {id}: failed, {ex.Message}";
+            }
+        });
+        
+        return string.Join("\n", await Task.WhenAll(starts));
+    }
+    
+    [McpServerTool(Name = "lease_instance"), Description("Leases an instance nobody else holds, starting its emulator when needed. Pass the returned instance to other tools and release it when done.")]
+    public async Task<string> LeaseInstance(
+        [Description("Name of the workload taking the lease")] string owner,
+        [Description("Emulator type to start when the instance isn't running (default: x64sc)")] string emulatorType = "x64sc",
+        [Description("Additional command line arguments for a started emulator")] string? arguments = null)
+    {
+        var leased = _pool.Lease(owner);
+        if (leased.IsEmulatorRunning)
+        {
+            return $"Leased instance {leased.Id} to {owner}: {leased.EmulatorType} on port {leased.Port}";
+        }
+        
+        try
+        {
+            var started = await ForInstance(leased).StartVice(emulatorType, arguments);
+            return $"Leased instance {leased.Id} to {owner}: {started}";
+        }
+        catch
+        {
+            _pool.Release(leased.Id, owner);
+            throw;
+        }
+    }
+    
+    [McpServerTool(Name = "release_instance"), Description("Releases a leased instance so it can be leased again.")]
+    public async Task<string> ReleaseInstance(
+        [Description("Leased instance")] int instance,
+        [Description("Only release when leased by this owner")] string? owner = null,
+        [Description("Quit the emulator instead of keeping it running for the next lease (default: false)")] bool quit = false)
+    {
+        var released = _pool.Release(instance, owner);
+        if (quit && released.IsEmulatorRunning)
+        {
+            await ForInstance(released).QuitVice();
+            return $"Released instance {instance} and quit its emulator";
+        }
+        return $"Released instance {instance}";
+    }
+    
+    [McpServerTool(Name = "select_instance"), Description("Routes calls that don't name an instance to the given instance.")]
+    public Task<string> SelectInstance(
+        [Description("Instance to use by default")] int instance)
+    {
+        var selected = _pool.Select(instance);
+        return Task.FromResult($"Selected instance {selected.Id} (port {selected.Port})");
+    }
+    
+    [McpServerTool(Name = "list_instances"), Description("Lists pool instances with their port, emulator and lease.")]
+    public Task<string> ListInstances()
+    {
+        var selected = _pool.Selected.Id;
+        var lines = _pool.Instances.Select(i =>
+        {
+            var emulator = i.IsEmulatorRunning ? $"{i.EmulatorType} (PID: {i.Process!.Id})" : "no emulator started";
+            var lease = i.LeasedBy != null ? $"leased by {i.LeasedBy} since {i.LeasedAt:HH:mm:ss}" : "free";
+            var marker = i.Id == selected ? " [selected]" : "";
+            var watch = i.Uploader.Watch is { } w
+                ? $", watching {Path.GetFileName(w.FilePath)} ({w.Reloads} reloads{(w.LastError != null ? $", last error: {w.LastError}" : "")})"
+                : "";
+            return $"Instance {i.Id}{marker}: port {i.Port}, {emulator}, {lease}{watch}";
+        });
+        return Task.FromResult(string.Join("\n", lines) + $"\nMax instances: {_pool.MaxInstances}");
+    }
+    
+    private ViceTools ForInstance(ViceInstance instance) => new(_pool, _config) { _instance = instance };
+    
+    /// <summary>
+    /// Waits until the binary monitor of a freshly started VICE answers, for at most
+    /// <see cref="ViceConfiguration.StartupTimeout"/>.
+    /// </summary>
+    /// <exception cref="InvalidOperationException">Thrown when the process exits first.</exception>
+    /// <exception cref="TimeoutException">Thrown when the binary monitor doesn't answer in time.</exception>
+    private async Task<InfoResponse> WaitForBinaryMonitorAsync(Process process)
+    {
+        await EnsureStartedAsync();
+        
+        using var timeout = new CancellationTokenSource(_config.StartupTimeout);
+        var ready = Bridge.WaitForReadyAsync(timeout.Token);
+        var exited = process.WaitForExitAsync(timeout.Token);
+        if (await Task.WhenAny(ready, exited) == exited && process.HasExited)
+        {
+            throw new InvalidOperationException($"process exited with code {process.ExitCode} before the binary monitor answered");
+        }
+        
+        try
+        {
+            return await ready;
+        }
+        catch (OperationCanceledException) when (timeout.IsCancellationRequested)
+        {
+            throw new TimeoutException($"binary monitor on port {Instance.Port} did not answer within {_config.StartupTimeout} ms");
+        }
     }
     
     [McpServerTool(Name = "copy_memory"), Description("Copies memory from source to destination.")]
     public async Task<string> CopyMemory(
         [Description("Source start address (hex)")] string sourceHex,
         [Description("Destination start address (hex)")] string destHex,
-        [Description("Number of bytes to copy")] int length)
+        [Description("Number of bytes to copy")] int length,
+        [Description(InstanceDescription)] int? instance = null)
     {
-        await EnsureStartedAsync();
+        await EnsureStartedAsync(instance);
+        using var lane = CommandScope.Enter(CommandPriority.Bulk);
         
         if (length <= 0 || length > 65536)
         {
@@ -550,21 +1108,16 @@ public class ViceTools
         
         // Read from source
         var readCommand = new MemoryGetCommand(0, source, endSource, MemSpace.MainMemory, 0);
-        var readResult = await _viceBridge.EnqueueCommand(readCommand).Response;
+        var readResult = await Bridge.EnqueueCommand(readCommand).Response;
         
         if (!readResult.IsSuccess || readResult.Response?.Memory == null)
         {
             throw new InvalidOperationException($"Failed to read source memory: {readResult.ErrorCode}");
         }
         
-        using var sourceBuffer = readResult.Response.Memory.Value;
-        
-        // Write to destination
-        var destBuffer = BufferManager.GetBuffer((uint)length);
-        Array.Copy(sourceBuffer.Data, 0, destBuffer.Data, 0, length);
-        
-        var writeCommand = new MemorySetCommand(0, dest, MemSpace.MainMemory, 0, destBuffer);
-        var writeResult = await _viceBridge.EnqueueCommand(writeCommand, resumeOnStopped: true).Response;
+        // Write to destination, the write takes over the bytes that were read without copying them
+        using var writeCommand = new MemorySetCommand(0, dest, MemSpace.MainMemory, 0, readResult.Response.Memory.Value);
+        var writeResult = await Bridge.EnqueueCommand(writeCommand, resumeOnStopped: true).Response;
         
         if (!writeResult.IsSuccess)
         {
@@ -578,9 +1131,11 @@ public class ViceTools
     public async Task<string> FillMemory(
         [Description("Start address (hex)")] string startHex,
         [Description("End address (hex)")] string endHex,
-        [Description("Fill pattern (hex bytes, e.g., 'FF' or 'AA 55')")] string pattern)
+        [Description("Fill pattern (hex bytes, e.g., 'FF' or 'AA 55')")] string pattern,
+        [Description(InstanceDescription)] int? instance = null)
     {
-        await EnsureStartedAsync();
+        await EnsureStartedAsync(instance);
+        using var lane = CommandScope.Enter(CommandPriority.Bulk);
         
         // Remove 0x prefix if present
         if (startHex.StartsWith("0x", StringComparison.OrdinalIgnoreCase))
@@ -615,8 +1170,8 @@ public class ViceTools
             buffer.Data[i] = patternBytes[i % patternBytes.Length];
         }
         
-        var command = new MemorySetCommand(0, start, MemSpace.MainMemory, 0, buffer);
-        var result = await _viceBridge.EnqueueCommand(command, resumeOnStopped: true).Response;
+        using var command = new MemorySetCommand(0, start, MemSpace.MainMemory, 0, buffer);
+        var result = await Bridge.EnqueueCommand(command, resumeOnStopped: true).Response;
         
         if (!result.IsSuccess)
         {
@@ -626,14 +1181,19 @@ public class ViceTools
         return $"Filled ${start:X4}-${end:X4} with pattern {string.Join(" ", patternBytes.Select(b => $"{b:X2}"))}";
     }
     
-    [McpServerTool(Name = "search_memory"), Description("Searches for a byte pattern in memory.")]
+    [McpServerTool(Name = "search_memory"), Description("Searches memory for one or more byte patterns with wildcards and masks.")]
     public async Task<string> SearchMemory(
         [Description("Start address (hex)")] string startHex,
         [Description("End address (hex)")] string endHex,
-        [Description("Search pattern (hex bytes, e.g., 'A9 00' for LDA #$00)")] string pattern,
-        [Description("Maximum results to return (default: 10)")] int maxResults = 10)
+        [Description("Search pattern (hex bytes, e.g., 'A9 00' for LDA #$00). '??' matches any byte, 'A?' a nibble, 'A9/F0' uses a mask. Separate several patterns with ';'")] string pattern,
+        [Description("Maximum results to return per pattern (default: 10)")] int maxResults = 10,
+        [Description("Memory space: main, drive8, drive9, drive10, drive11 or all (default: main)")] string memspace = "main",
+        [Description("Bank name or ID for main memory, or 'all' for every bank (default: 0)")] string bank = "0",
+        [Description(InstanceDescription)] int? instance = null,
+        CancellationToken cancellationToken = default)
     {
-        await EnsureStartedAsync();
+        await EnsureStartedAsync(instance);
+        using var lane = CommandScope.Enter(CommandPriority.Bulk, cancellationToken);
         
         // Remove 0x prefix if present
         if (startHex.StartsWith("0x", StringComparison.OrdinalIgnoreCase))
@@ -644,70 +1204,272 @@ public class ViceTools
         ushort start = Convert.ToUInt16(startHex, 16);
         ushort end = Convert.ToUInt16(endHex, 16);
         
-        // Parse search pattern
-        var searchBytes = pattern.Split(new[] { ' ', '-', ',' }, StringSplitOptions.RemoveEmptyEntries)
-            .Select(s => Convert.ToByte(s, 16))
-            .ToArray();
-            
-        if (searchBytes.Length == 0)
+        if (end < start)
         {
-            throw new ArgumentException("Search pattern must contain at least one byte");
+            throw new ArgumentException("End address must be greater than or equal to start address");
         }
         
-        // Read memory in chunks
-        var matches = new List<ushort>();
-        const int chunkSize = 4096;
+        var patterns = MemoryPattern.ParseMany(pattern);
+        var targets = await ResolveMemoryTargetsAsync(memspace, bank);
         
-        for (ushort addr = start; addr <= end && matches.Count < maxResults; )
+        // Every target is read in bulk up front, then scanned once per pattern
+        var reads = targets.Select(t => (Target: t, Block: ReadMemoryBlockAsync(start, end, t.MemSpace, t.BankId))).ToList();
+        var matches = patterns.ToDictionary(p => p, _ => new List<(MemoryTarget Target, int Address)>());
+        int scanned = 0;
+        try
         {
-            ushort chunkEnd = (ushort)Math.Min(addr + chunkSize - 1, end);
-            
-            var command = new MemoryGetCommand(0, addr, chunkEnd, MemSpace.MainMemory, 0);
-            var result = await _viceBridge.EnqueueCommand(command).Response;
-            
-            if (result.IsSuccess && result.Response?.Memory != null)
-            {
-                using var buffer = result.Response.Memory.Value;
-                var data = new byte[buffer.Size];
-                Array.Copy(buffer.Data, data, buffer.Size);
-                
-                // Search for pattern in chunk
-                for (int i = 0; i <= data.Length - searchBytes.Length && matches.Count < maxResults; i++)
+            for (; scanned < reads.Count; scanned++)
+            {
+                var (target, blockTask) = reads[scanned];
+                using var block = await blockTask;
+                foreach (var searchPattern in patterns)
                 {
-                    bool found = true;
-                    for (int j = 0; j < searchBytes.Length; j++)
+                    var found = matches[searchPattern];
+                    foreach (var offset in searchPattern.FindAll(block.Span, maxResults - found.Count))
                     {
-                        if (data[i + j] != searchBytes[j])
-                        {
-                            found = false;
-                            break;
-                        }
-                    }
-                    
-                    if (found)
-                    {
-                        matches.Add((ushort)(addr + i));
+                        found.Add((target, start + offset));
                     }
                 }
             }
-            
-            addr = (ushort)(chunkEnd + 1);
+        }
+        finally
+        {
+            // After a failure the reads behind it still complete, their blocks go back to the pool
+            foreach (var (_, blockTask) in reads.Skip(scanned + 1))
+            {
+                try
+                {
+                    (await blockTask).Dispose();
+                }
+                catch (Exception)
+                {
+                    // The first failure is the one reported
+                }
+            }
         }
         
-        if (matches.Count == 0)
+        if (matches.Values.All(m => m.Count == 0))
         {
             return $"Pattern not found in ${start:X4}-${end:X4}";
         }
         
-        var matchList = string.Join("\n", matches.Select(m => $"  ${m:X4}"));
-        return $"Found {matches.Count} match(es) for pattern {pattern}:\n{matchList}";
+        var sections = new List<string>();
+        foreach (var searchPattern in patterns)
+        {
+            var found = matches[searchPattern];
+            if (found.Count == 0)
+            {
+                sections.Add($"Pattern {searchPattern.Text} not found");
+                continue;
+            }
+            var matchList = string.Join("\n", found.Select(m => targets.Count > 1 ? $"  ${m.Address:X4} ({m.Target.Name})" : $"  ${m.Address:X4}"));
+            sections.Add($"Found {found.Count} match(es) for pattern {searchPattern.Text}:\n{matchList}");
+        }
+        return string.Join("\n", sections);
+    }
+    
+    /// <summary>
+    /// Reads a memory range as consecutive chunks of at most <see cref="ReadChunkSize"/> bytes. All chunks are
+    /// enqueued before the first one is awaited, so the caller consumes a chunk while the next ones are in flight.
+    /// </summary>
+    /// <returns>Pooled buffers holding exactly each chunk, to be disposed by the caller.</returns>
+    private async IAsyncEnumerable<ManagedBuffer> ReadMemoryChunksAsync(ushort start, ushort end)
+    {
+        var commands = new List<MemoryGetCommand>();
+        for (int addr = start; addr <= end; addr += ReadChunkSize)
+        {
+            ushort chunkEnd = (ushort)Math.Min(addr + ReadChunkSize - 1, end);
+            commands.Add(Bridge.EnqueueCommand(new MemoryGetCommand(0, (ushort)addr, chunkEnd, MemSpace.MainMemory, 0)));
+        }
+
+        foreach (var command in commands)
+        {
+            var result = await command.Response;
+            if (!result.IsSuccess || result.Response == null)
+            {
+                throw new InvalidOperationException($"Failed to read memory: {result.ErrorCode}");
+            }
+            if (result.Response.Memory is not { } memory)
+            {
+                throw new InvalidOperationException("No memory data returned");
+            }
+            int expected = command.EndAddress - command.StartAddress + 1;
+            if (memory.Size < expected)
+            {
+                memory.Dispose();
+                throw new InvalidOperationException($"Memory read returned {memory.Size} of {expected} bytes");
+            }
+            yield return memory;
+        }
+    }
+    
+    /// <summary>
+    /// Reads a memory range of any size with a single read. A full 64 KB read reports its length as zero,
+    /// which the response builder resolves from the body length.
+    /// </summary>
+    /// <returns>The pooled buffer of the response, holding exactly the range, to be disposed by the caller.</returns>
+    private async Task<ManagedBuffer> ReadMemoryBlockAsync(ushort start, ushort end, MemSpace memSpace = MemSpace.MainMemory, ushort bankId = 0)
+    {
+        var command = Bridge.EnqueueCommand(new MemoryGetCommand(0, start, end, memSpace, bankId));
+        var result = await command.Response;
+        if (!result.IsSuccess || result.Response?.Memory is not { } memory)
+        {
+            throw new InvalidOperationException($"Failed to read memory: {result.ErrorCode}");
+        }
+        int expected = end - start + 1;
+        if (memory.Size < expected)
+        {
+            memory.Dispose();
+            throw new InvalidOperationException($"Memory read returned {memory.Size} of {expected} bytes");
+        }
+        if (memory.Size == expected)
+        {
+            return memory;
+        }
+        using (memory)
+        {
+            return memory.Slice(0, expected);
+        }
+    }
+    
+    /// <summary>
+    /// Resolves memspace and bank tool parameters to the list of memories to operate on.
+    /// </summary>
+    private async Task<List<MemoryTarget>> ResolveMemoryTargetsAsync(string memspace, string bank)
+    {
+        MemSpace[] memSpaces = memspace.Trim().ToLowerInvariant() switch
+        {
+            "" or "main" => [MemSpace.MainMemory],
+            "drive8" => [MemSpace.Drive8],
+            "drive9" => [MemSpace.Drive9],
+            "drive10" => [MemSpace.Drive10],
+            "drive11" => [MemSpace.Drive11],
+            "all" => [MemSpace.MainMemory, MemSpace.Drive8, MemSpace.Drive9, MemSpace.Drive10, MemSpace.Drive11],
+            _ => throw new ArgumentException($"Unknown memspace '{memspace}', expected main, drive8-drive11 or all")
+        };
+        
+        var mainBanks = new List<(ushort Id, string Name)>();
+        if (ushort.TryParse(bank, out var bankId))
+        {
+            mainBanks.Add((bankId, $"bank {bankId}"));
+        }
+        else
+        {
+            var result = await Bridge.EnqueueCommand(new BanksAvailableCommand()).Response;
+            if (!result.IsSuccess || result.Response == null)
+            {
+                throw new InvalidOperationException($"Failed to get banks: {result.ErrorCode}");
+            }
+            var banks = result.Response.Banks
+                .Where(b => bank.Equals("all", StringComparison.OrdinalIgnoreCase) || b.Name.Equals(bank, StringComparison.OrdinalIgnoreCase))
+                .Select(b => (b.BankId, b.Name))
+                .ToList();
+            if (banks.Count == 0)
+            {
+                throw new ArgumentException($"Unknown bank '{bank}'. Available: {string.Join(", ", result.Response.Banks.Select(b => b.Name))}");
+            }
+            mainBanks.AddRange(banks);
+        }
+        
+        var targets = new List<MemoryTarget>();
+        foreach (var memSpace in memSpaces)
+        {
+            if (memSpace == MemSpace.MainMemory)
+            {
+                targets.AddRange(mainBanks.Select(b => new MemoryTarget(memSpace, b.Id, mainBanks.Count > 1 || memSpaces.Length > 1 ? $"main/{b.Name}" : "main")));
+            }
+            else
+            {
+                // Drive memspaces have no banks
+                targets.Add(new MemoryTarget(memSpace, 0, memSpace.ToString().ToLowerInvariant()));
+            }
+        }
+        return targets;
+    }
+    
+    private record MemoryTarget(MemSpace MemSpace, ushort BankId, string Name);
+    
+    [McpServerTool(Name = "disassemble"), Description("Disassembles memory in the syntax of VICE's monitor, including undocumented opcodes (marked with *).")]
+    public async Task<string> Disassemble(
+        [Description("Start address (hex)")] string startHex,
+        [Description("Last address an instruction may start at (hex, default: start + 0x3F)")] string? endHex = null,
+        [Description("CPU: 6502 (default, also for 6510 and 8502) or 65c02")] string cpu = "6502",
+        [Description("Mark instructions with execution checkpoints (default: true)")] bool showCheckpoints = true,
+        [Description(InstanceDescription)] int? instance = null,
+        CancellationToken cancellationToken = default)
+    {
+        await EnsureStartedAsync(instance);
+        
+        // Remove 0x prefix if present
+        if (startHex.StartsWith("0x", StringComparison.OrdinalIgnoreCase))
+            startHex = startHex.Substring(2);
+        if (endHex != null && endHex.StartsWith("0x", StringComparison.OrdinalIgnoreCase))
+            endHex = endHex.Substring(2);
+        
+        ushort start = Convert.ToUInt16(startHex, 16);
+        ushort end = endHex != null ? Convert.ToUInt16(endHex, 16) : (ushort)Math.Min(0xFFFF, start + 0x3F);
+        var variant = Mos6502.ParseCpu(cpu);
+        
+        if (end < start)
+        {
+            throw new ArgumentException("End address must be greater than or equal to start address");
+        }
+        
+        // Whole pages plus the operands reaching into the next one, so every page can come from the decode cache
+        var readEnd = (ushort)Math.Min(0xFFFF, (end | 0xFF) + 2);
+        using var lane = CommandScope.Enter(readEnd - start + 1 > ReadChunkSize ? CommandPriority.Bulk : CommandPriority.Normal,
+            cancellationToken);
+        var read = Bridge.EnqueueCommand(new MemoryGetCommand(0, start, readEnd, MemSpace.MainMemory, 0));
+        var checkpoints = showCheckpoints ? Bridge.EnqueueCommand(new CheckpointListCommand()) : null;
+        
+        var readResult = await read.Response;
+        if (!readResult.IsSuccess || readResult.Response?.Memory is not { } memory)
+        {
+            throw new InvalidOperationException($"Failed to read memory: {readResult.ErrorCode}");
+        }
+        Disassembly disassembly;
+        using (memory)
+        {
+            disassembly = _pool.Disassembler.Disassemble(start, end, memory.Span, variant);
+        }
+        
+        var execCheckpoints = ImmutableArray<CheckpointInfoResponse>.Empty;
+        if (checkpoints != null)
+        {
+            var checkpointsResult = await checkpoints.Response;
+            if (!checkpointsResult.IsSuccess || checkpointsResult.Response == null)
+            {
+                throw new InvalidOperationException($"Failed to list checkpoints: {checkpointsResult.ErrorCode}");
+            }
+            execCheckpoints = checkpointsResult.Response.Info.Where(c => c.CpuOperation.HasFlag(CpuOperation.Exec)).ToImmutableArray();
+        }
+        
+        var result = new StringBuilder();
+        result.AppendLine($"${start:X4}-${end:X4} ({cpu}): {disassembly.Instructions.Length} instructions, " +
+            $"{disassembly.CachedPages} of {disassembly.Pages} pages from the decode cache");
+        foreach (var instruction in disassembly.Instructions)
+        {
+            var hits = execCheckpoints.Where(c => c.StartAddress <= instruction.Address && instruction.Address <= c.EndAddress).ToList();
+            char marker = hits.Count == 0 ? ' ' : hits.Any(c => c.Enabled) ? '*' : '-';
+            var bytes = string.Join(" ", instruction.Bytes.Select(b => $"{b:X2}"));
+            var text = instruction.Illegal ? "*" + instruction.Text : instruction.Text;
+            result.Append($"{marker} {instruction.Address:X4}  {bytes,-8}  {text}");
+            if (hits.Count > 0)
+            {
+                result.Append($"{new string(' ', Math.Max(1, 16 - text.Length))}; {string.Join(",", hits.Select(c => $"#{c.CheckpointNumber}"))}");
+            }
+            result.AppendLine();
+        }
+        return result.ToString().TrimEnd();
     }
     
-    [McpServerTool(Name = "send_keys"), Description("Sends keyboard input to VICE.")]
+    [McpServerTool(Name = "send_keys"), Description("Sends keyboard input to VICE. Text longer than the keyboard buffer is typed one buffer full at a time, as fast as the machine takes it.")]
     public async Task<string> SendKeys(
-        [Description("Text to type (special keys use backslash escape, e.g., 'HELLO\\n' for HELLO + Return)")] string keys)
+        [Description("Text to type (special keys use backslash escape, e.g., 'HELLO\\n' for HELLO + Return)")] string keys,
+        [Description(InstanceDescription)] int? instance = null,
+        CancellationToken cancellationToken = default)
     {
-        await EnsureStartedAsync();
+        await EnsureStartedAsync(instance);
         
         // The KeyboardFeedCommand handles escape sequences internally
         // Common escape sequences:
@@ -715,24 +1477,26 @@ public class ViceTools
         // \t = Tab  
         // \\ = Backslash
         
-        var command = new KeyboardFeedCommand(keys);
-        var result = await _viceBridge.EnqueueCommand(command).Response;
+        var feeder = new KeyboardFeeder(Bridge, KeyboardProfile.ForEmulator(Instance.EmulatorType));
+        var result = await feeder.FeedAsync(keys, cancellationToken);
         
-        if (!result.IsSuccess)
+        if (result.Chunks == 1)
         {
-            throw new InvalidOperationException($"Failed to send keys: {result.ErrorCode}");
+            return $"Sent '{keys}' to keyboard buffer";
         }
-        
-        return $"Sent '{keys}' to keyboard buffer";
+        return $"Typed {result.Keys} keys in {result.Chunks} chunks of up to {feeder.Profile.BufferSize} ({feeder.Profile.Machine}) " +
+            $"in {result.Elapsed.TotalMilliseconds:F0} ms, {result.KeysPerSecond:F0} chars/s, {result.Reads} buffer reads";
     }
     
     [McpServerTool(Name = "compare_memory"), Description("Compares two memory regions.")]
     public async Task<string> CompareMemory(
         [Description("First region start address (hex)")] string addr1Hex,
         [Description("Second region start address (hex)")] string addr2Hex,
-        [Description("Number of bytes to compare")] int length)
+        [Description("Number of bytes to compare")] int length,
+        [Description(InstanceDescription)] int? instance = null)
     {
-        await EnsureStartedAsync();
+        await EnsureStartedAsync(instance);
+        using var lane = CommandScope.Enter(CommandPriority.Bulk);
         
         if (length <= 0 || length > 65536)
         {
@@ -754,29 +1518,34 @@ public class ViceTools
         var cmd1 = new MemoryGetCommand(0, addr1, end1, MemSpace.MainMemory, 0);
         var cmd2 = new MemoryGetCommand(0, addr2, end2, MemSpace.MainMemory, 0);
         
-        var result1 = await _viceBridge.EnqueueCommand(cmd1).Response;
-        var result2 = await _viceBridge.EnqueueCommand(cmd2).Response;
+        // Queue both reads before awaiting so they are pipelined
+        var enqueued1 = Bridge.EnqueueCommand(cmd1);
+        var enqueued2 = Bridge.EnqueueCommand(cmd2);
+        var result1 = await enqueued1.Response;
+        // Both responses are owned before either is checked, so a failed read still releases the other buffer
+        using var response1 = result1.Response;
+        var result2 = await enqueued2.Response;
+        using var response2 = result2.Response;
         
-        if (!result1.IsSuccess || result1.Response?.Memory == null)
+        if (!result1.IsSuccess || response1?.Memory is not { } buffer1)
         {
             throw new InvalidOperationException($"Failed to read first region: {result1.ErrorCode}");
         }
-        if (!result2.IsSuccess || result2.Response?.Memory == null)
+        if (!result2.IsSuccess || response2?.Memory is not { } buffer2)
         {
             throw new InvalidOperationException($"Failed to read second region: {result2.ErrorCode}");
         }
         
-        using var buffer1 = result1.Response.Memory.Value;
-        using var buffer2 = result2.Response.Memory.Value;
-        
         var differences = new List<string>();
         int diffCount = 0;
         
         for (int i = 0; i < length && diffCount < 10; i++)
         {
-            if (buffer1.Data[i] != buffer2.Data[i])
+            byte value1 = buffer1.Span[i];
+            byte value2 = buffer2.Span[i];
+            if (value1 != value2)
             {
-                differences.Add($"  ${addr1 + i:X4}: ${buffer1.Data[i]:X2} != ${addr2 + i:X4}: ${buffer2.Data[i]:X2}");
+                differences.Add($"  ${addr1 + i:X4}: ${value1:X2} != ${addr2 + i:X4}: ${value2:X2}");
                 diffCount++;
             }
         }
@@ -797,65 +1566,46 @@ public class ViceTools
         return result;
     }
     
-    [McpServerTool(Name = "load_program"), Description("Loads a PRG file into memory.")]
+    [McpServerTool(Name = "load_program"), Description("Loads a PRG file into memory. Loading again sends only the 256 byte pages that changed since the last load to this instance.")]
     public async Task<string> LoadProgram(
         [Description("Path to PRG file")] string filePath,
-        [Description("Override load address (hex, optional - uses PRG header if not specified)")] string? addressHex = null)
+        [Description("Override load address (hex, optional - uses PRG header if not specified)")] string? addressHex = null,
+        [Description("Send every page, e.g. after the program changed its own code or data (default: false)")] bool force = false,
+        [Description("Keep loading the file whenever it is rebuilt, until load_program is called again without watch (default: false)")] bool watch = false,
+        [Description(InstanceDescription)] int? instance = null,
+        CancellationToken cancellationToken = default)
     {
-        await EnsureStartedAsync();
+        await EnsureStartedAsync(instance);
         
         if (!File.Exists(filePath))
         {
             throw new FileNotFoundException($"PRG file not found: {filePath}");
         }
         
-        var prgData = await File.ReadAllBytesAsync(filePath);
-        
-        if (prgData.Length < 2)
-        {
-            throw new InvalidOperationException("PRG file too small - must contain at least load address");
-        }
-        
-        // Get load address from PRG header or override
-        ushort loadAddress;
-        int dataOffset;
-        
+        ushort? addressOverride = null;
         if (addressHex != null)
         {
             if (addressHex.StartsWith("0x", StringComparison.OrdinalIgnoreCase))
                 addressHex = addressHex.Substring(2);
-            loadAddress = Convert.ToUInt16(addressHex, 16);
-            dataOffset = 0; // Use entire file
-        }
-        else
-        {
-            // Read load address from first two bytes (little-endian)
-            loadAddress = (ushort)(prgData[0] | (prgData[1] << 8));
-            dataOffset = 2; // Skip address bytes
+            addressOverride = Convert.ToUInt16(addressHex, 16);
         }
         
-        int dataLength = prgData.Length - dataOffset;
+        var (loadAddress, image) = ProgramUploader.ParseProgram(await File.ReadAllBytesAsync(filePath, cancellationToken), addressOverride);
+        var upload = await Instance.Uploader.UploadAsync(loadAddress, image, force, cancellationToken);
         
-        if (dataLength <= 0)
+        var result = new StringBuilder();
+        result.Append($"Loaded {Path.GetFileName(filePath)} ({upload.Length} bytes) to ${upload.Address:X4}-${upload.EndAddress:X4}: ");
+        result.Append($"sent {upload.BytesSent} bytes in {upload.Writes} writes, {upload.PagesSent} of {upload.Pages} pages changed");
+        if (watch)
         {
-            throw new InvalidOperationException("No data to load after address bytes");
+            await Instance.Uploader.StartWatchAsync(filePath, addressOverride);
+            result.Append($"\nWatching {Path.GetFileName(filePath)}, rebuilds are loaded automatically");
         }
-        
-        // Create buffer with program data
-        var buffer = BufferManager.GetBuffer((uint)dataLength);
-        Array.Copy(prgData, dataOffset, buffer.Data, 0, dataLength);
-        
-        // Write to memory
-        var command = new MemorySetCommand(0, loadAddress, MemSpace.MainMemory, 0, buffer);
-        var result = await _viceBridge.EnqueueCommand(command, resumeOnStopped: true).Response;
-        
-        if (!result.IsSuccess)
+        else if (await Instance.Uploader.StopWatchAsync() is { } stopped)
         {
-            throw new InvalidOperationException($"Failed to load program: {result.ErrorCode}");
+            result.Append($"\nStopped watching {Path.GetFileName(stopped.FilePath)} after {stopped.Reloads} reloads");
         }
-        
-        var endAddress = loadAddress + dataLength - 1;
-        return $"Loaded {Path.GetFileName(filePath)} ({dataLength} bytes) to ${loadAddress:X4}-${endAddress:X4}";
+        return result.ToString();
     }
     
     [McpServerTool(Name = "save_memory"), Description("Saves a memory region to file.")]
@@ -863,9 +1613,13 @@ public class ViceTools
         [Description("Start address (hex)")] string startHex,
         [Description("End address (hex)")] string endHex,
         [Description("Output file path")] string filePath,
-        [Description("Save as PRG file with load address header (default: true)")] bool asPrg = true)
+        [Description("Save as PRG file with load address header (default: true), binary encoding only")] bool asPrg = true,
+        [Description("File encoding: binary (default), or hex, base64, rle or hexdump to save as text")] string encoding = "binary",
+        [Description(InstanceDescription)] int? instance = null,
+        CancellationToken cancellationToken = default)
     {
-        await EnsureStartedAsync();
+        await EnsureStartedAsync(instance);
+        using var lane = CommandScope.Enter(CommandPriority.Bulk, cancellationToken);
         
         // Remove 0x prefix if present
         if (startHex.StartsWith("0x", StringComparison.OrdinalIgnoreCase))
@@ -881,52 +1635,196 @@ public class ViceTools
             throw new ArgumentException("End address must be greater than or equal to start address");
         }
         
-        // Read memory
-        var command = new MemoryGetCommand(0, start, end, MemSpace.MainMemory, 0);
-        var result = await _viceBridge.EnqueueCommand(command).Response;
+        int length = end - start + 1;
+        bool binary = string.IsNullOrWhiteSpace(encoding) || encoding.Trim().Equals("binary", StringComparison.OrdinalIgnoreCase);
+        if (!binary)
+        {
+            var encoder = MemoryEncoder.Create(encoding, start, length);
+            await foreach (var chunk in ReadMemoryChunksAsync(start, end))
+            {
+                using (chunk)
+                {
+                    encoder.Append(chunk.Span);
+                }
+            }
+            await File.WriteAllTextAsync(filePath, encoder.Complete());
+            return $"Saved ${start:X4}-${end:X4} ({length} bytes) to {filePath} as {encoding.Trim().ToLowerInvariant()} text file";
+        }
         
-        if (!result.IsSuccess || result.Response?.Memory == null)
+        // Chunks are written to a temporary file as they arrive and moved into place once all of them are in,
+        // so any failure leaves neither a partial file nor a damaged earlier one behind
+        var temporaryPath = $"{filePath}.{Guid.NewGuid():N}.tmp";
+        try
         {
-            throw new InvalidOperationException($"Failed to read memory: {result.ErrorCode}");
+            await using (var file = new FileStream(temporaryPath, FileMode.CreateNew, FileAccess.Write, FileShare.None, 4096, useAsync: true))
+            {
+                if (asPrg)
+                {
+                    // PRG header with load address
+                    await file.WriteAsync(new[] { (byte)(start & 0xFF), (byte)(start >> 8) }, cancellationToken);
+                }
+                await foreach (var chunk in ReadMemoryChunksAsync(start, end).WithCancellation(cancellationToken))
+                {
+                    using (chunk)
+                    {
+                        await file.WriteAsync(chunk.Memory, cancellationToken);
+                    }
+                }
+            }
+            File.Move(temporaryPath, filePath, overwrite: true);
+        }
+        catch
+        {
+            File.Delete(temporaryPath);
+            throw;
+        }
+        
+        var fileType = asPrg ? "PRG" : "binary";
+        return $"Saved ${start:X4}-${end:X4} ({length} bytes) to {filePath} as {fileType} file";
+    }
+
+    [McpServerTool(Name = "snapshot_save"), Description("Saves the machine state under a name for snapshot_restore. A full snapshot is a VICE snapshot file of the whole machine; a memory-only snapshot keeps RAM and CPU registers and restores faster by writing back only the pages that changed. The least recently used snapshot is dropped beyond VICE_SNAPSHOT_CAPACITY.")]
+    public async Task<string> SnapshotSave(
+        [Description("Snapshot name, an existing snapshot with this name is replaced")] string name,
+        [Description("Capture only RAM and CPU registers, not I/O chips and drives (default: false)")] bool memoryOnly = false,
+        [Description(InstanceDescription)] int? instance = null,
+        CancellationToken cancellationToken = default)
+    {
+        await EnsureStartedAsync(instance);
+        using var lane = CommandScope.Enter(CommandPriority.Bulk, cancellationToken);
+
+        if (string.IsNullOrWhiteSpace(name))
+        {
+            throw new ArgumentException("Snapshot name must not be empty");
+        }
+
+        var stopwatch = Stopwatch.StartNew();
+        var snapshot = memoryOnly
+            ? await _pool.Snapshots.SaveMemoryAsync(Bridge, name)
+            : await _pool.Snapshots.SaveFullAsync(Bridge, name);
+
+        return $"Saved {(memoryOnly ? "memory-only" : "full")} snapshot '{name}' ({snapshot.SizeBytes} bytes) in {stopwatch.ElapsedMilliseconds} ms";
+    }
+
+    [McpServerTool(Name = "snapshot_restore"), Description("Restores a snapshot saved with snapshot_save, to this or any other instance.")]
+    public async Task<string> SnapshotRestore(
+        [Description("Snapshot name")] string name,
+        [Description(InstanceDescription)] int? instance = null,
+        CancellationToken cancellationToken = default)
+    {
+        await EnsureStartedAsync(instance);
+        using var lane = CommandScope.Enter(CommandPriority.Bulk, cancellationToken);
+
+        Instance.Uploader.Clear();
+        var result = await _pool.Snapshots.RestoreAsync(Bridge, name);
+
+        if (result.Snapshot.Kind == SnapshotKind.Full)
+        {
+            return $"Restored full snapshot '{name}' in {result.Elapsed.TotalMilliseconds:F0} ms";
+        }
+        return $"Restored memory-only snapshot '{name}' in {result.Elapsed.TotalMilliseconds:F0} ms: " +
+            $"{result.PagesWritten} of {result.PagesCompared} pages differed, wrote {result.BytesWritten} bytes";
+    }
+
+    [McpServerTool(Name = "list_snapshots"), Description("Lists saved snapshots, most recently used first.")]
+    public string ListSnapshots()
+    {
+        var snapshots = _pool.Snapshots.Snapshots;
+        if (snapshots.Count == 0)
+        {
+            return "No snapshots";
         }
+
+        var result = new StringBuilder();
+        result.AppendLine($"{snapshots.Count} of {_pool.Snapshots.Capacity} snapshots:");
+        foreach (var snapshot in snapshots)
+        {
+            var kind = snapshot.Kind == SnapshotKind.Full ? "full" : "memory-only";
+            result.AppendLine($"  {snapshot.Name}: {kind}, {snapshot.SizeBytes} bytes, saved {snapshot.CreatedAt:u}");
+        }
+        return result.ToString().TrimEnd();
+    }
+    
+    [McpServerTool(Name = "watch_memory"), Description("Watches memory ranges, sampling them at an interval and/or whenever the emulator stops, and queues only the bytes that changed. Read the changes with poll_memory_watch.")]
+    public async Task<string> WatchMemory(
+        [Description("Hex addresses or ranges separated by commas, e.g. 'c000-c0ff, d020, 00a0-00a2'")] string ranges,
+        [Description("Milliseconds between samples, 0 to sample only on stops (default: 100, minimum 10)")] int intervalMs = 100,
+        [Description("Also sample whenever the emulator stops, e.g. on a checkpoint (default: false)")] bool onStop = false,
+        [Description("Number of changes queued before the oldest are dropped (default: 1000)")] int capacity = MemoryWatch.DefaultCapacity,
+        [Description(InstanceDescription)] int? instance = null)
+    {
+        await EnsureStartedAsync(instance);
         
-        using var buffer = result.Response.Memory.Value;
+        if (intervalMs != 0 && intervalMs < 10)
+        {
+            throw new ArgumentException("Interval must be 0 or at least 10 ms");
+        }
         
-        // Prepare data to save
-        byte[] dataToSave;
-        if (asPrg)
+        var parsed = MemoryWatch.ParseRanges(ranges);
+        var watch = _pool.AddWatch(Instance, parsed, intervalMs > 0 ? TimeSpan.FromMilliseconds(intervalMs) : null, onStop, capacity);
+        try
         {
-            // Add PRG header with load address
-            dataToSave = new byte[buffer.Size + 2];
-            dataToSave[0] = (byte)(start & 0xFF);
-            dataToSave[1] = (byte)(start >> 8);
-            Array.Copy(buffer.Data, 0, dataToSave, 2, buffer.Size);
+            // Baseline the later samples are compared with
+            await watch.SampleAsync();
         }
-        else
+        catch
         {
-            // Raw binary
-            dataToSave = new byte[buffer.Size];
-            Array.Copy(buffer.Data, 0, dataToSave, 0, buffer.Size);
+            await _pool.RemoveWatchAsync(watch.Id);
+            throw;
         }
         
-        // Save to file
-        await File.WriteAllBytesAsync(filePath, dataToSave);
+        var trigger = (intervalMs > 0, onStop) switch
+        {
+            (true, true) => $"every {intervalMs} ms and on every stop",
+            (true, false) => $"every {intervalMs} ms",
+            _ => "on every stop"
+        };
+        return $"Watch {watch.Id} on instance {watch.InstanceId}: {watch.Ranges.Count} range(s), {watch.BytesPerSample} bytes in {watch.ReadsPerSample} read(s) per sample, {trigger}";
+    }
+    
+    [McpServerTool(Name = "poll_memory_watch"), Description("Returns the changes a memory watch saw since the last poll, oldest first, with the time and sample they were seen in.")]
+    public string PollMemoryWatch(
+        [Description("Watch id returned by watch_memory")] int id,
+        [Description("Maximum number of changes to return, the rest stay queued (default: 200)")] int max = 200)
+    {
+        var watch = _pool.GetWatch(id);
+        var changes = watch.Drain(Math.Max(1, max));
         
-        var fileType = asPrg ? "PRG" : "binary";
-        return $"Saved ${start:X4}-${end:X4} ({buffer.Size} bytes) to {filePath} as {fileType} file";
+        var result = new StringBuilder();
+        result.AppendLine($"Watch {watch.Id}: {changes.Count} change(s), {watch.Pending} still queued, {watch.Samples} samples, {watch.Dropped} dropped");
+        if (watch.Failures > 0)
+        {
+            result.AppendLine($"  {watch.Failures} failed sample(s), last: {watch.LastError}");
+        }
+        foreach (var change in changes)
+        {
+            result.AppendLine($"  {change.Timestamp:HH:mm:ss.fff} #{change.Sample} ${change.Address:X4}: {Convert.ToHexString(change.OldValues)} -> {Convert.ToHexString(change.NewValues)}");
+        }
+        return result.ToString().TrimEnd();
+    }
+    
+    [McpServerTool(Name = "stop_memory_watch"), Description("Stops a memory watch and drops its queued changes.")]
+    public async Task<string> StopMemoryWatch(
+        [Description("Watch id returned by watch_memory")] int id)
+    {
+        var watch = await _pool.RemoveWatchAsync(id);
+        return $"Watch {watch.Id} stopped after {watch.Samples} samples, {watch.ChangedBytes} changed bytes, {watch.Dropped} dropped";
     }
     
     [McpServerTool(Name = "execute_batch"), Description("Executes multiple VICE commands in a single batch operation. IMPORTANT: Always use this for multiple related operations (e.g., setting up screens, sprites, memory initialization) as it's significantly faster than individual commands - often 10x performance improvement. See batch_examples/ for JSON format.")]
     public async Task<string> ExecuteBatch(
         [Description("JSON array of command specifications")] string commandsJson,
-        [Description("Stop execution on first error (default: true)")] bool failFast = true)
+        [Description("Stop execution on first error (default: true)")] bool failFast = true,
+        [Description(InstanceDescription)] int? instance = null,
+        CancellationToken cancellationToken = default)
     {
-        await EnsureStartedAsync();
+        await EnsureStartedAsync(instance);
+        using var lane = CommandScope.Enter(CommandPriority.Bulk, cancellationToken);
         
         List<BatchCommandSpec> commands;
         try
         {
-            commands = JsonSerializer.Deserialize<List<BatchCommandSpec>>(commandsJson) ?? new List<BatchCommandSpec>();
+            commands = JsonSerializer.Deserialize(commandsJson, BatchJsonContext.Default.ListBatchCommandSpec) ?? new List<BatchCommandSpec>();
         }
         catch (JsonException ex)
         {
@@ -939,11 +1837,8 @@ public class ViceTools
         }
         
         var builder = new BatchCommandBuilder(this);
-        var response = await builder.ExecuteBatchAsync(commands, failFast);
+        var response = await builder.ExecuteBatchAsync(commands, failFast, cancellationToken);
         
-        return JsonSerializer.Serialize(response, new JsonSerializerOptions 
-        { 
-            WriteIndented = true 
-        });
+        return JsonSerializer.Serialize(response, BatchJsonContext.Default.BatchResponse);
     }
 }
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""Asyncio client for the VICE binary monitor.
+
+    import asyncio
+    from vicemon import ViceMonitorClient
+
+    async def main():
+        async with await ViceMonitorClient.connect("127.0.0.1", 6502) as client:
+            screen = await client.read_memory(0x0400, 1000)
+            await client.write_memory(0xC000, bytes(4096))
+
+    asyncio.run(main())
+"""
+
+from .client import MAX_MEMORY_CHUNK, EventStream, ViceMonitorClient
+from .protocol import (
+    BROADCAST_ID,
+    BankItem,
+    CheckpointInfo,
+    CommandType,
+    CpuOperation,
+    Display,
+    ErrorCode,
+    MemSpace,
+    MonitorEvent,
+    RegisterDescription,
+    ResetMode,
+    Response,
+    ResponseType,
+    ViceInfo,
+    ViceMonitorError,
+    hex_dump,
+)
+
+__all__ = [
+    "BROADCAST_ID",
+    "MAX_MEMORY_CHUNK",
+    "BankItem",
+    "CheckpointInfo",
+    "CommandType",
+    "CpuOperation",
+    "Display",
+    "ErrorCode",
+    "EventStream",
+    "MemSpace",
+    "MonitorEvent",
+    "RegisterDescription",
+    "ResetMode",
+    "Response",
+    "ResponseType",
+    "ViceInfo",
+    "ViceMonitorClient",
+    "ViceMonitorError",
+    "hex_dump",
+]
@@ -0,0 +1,380 @@
+"""Asyncio client for the VICE binary monitor.
+
+Replaces the blocking ``send_command`` helpers of the scripts in this directory. Requests are written as soon as they
+are made and matched to their responses by request ID, so many can be in flight on one connection. Frames with the
+broadcast ID (Stopped, Resumed, Jam, checkpoint hits) go to :meth:`ViceMonitorClient.events` subscribers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import struct
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+from .protocol import (
+    BROADCAST_ID,
+    RESPONSE_HEADER,
+    STX,
+    BankItem,
+    CheckpointInfo,
+    CommandType,
+    CpuOperation,
+    Display,
+    MemSpace,
+    MonitorEvent,
+    RegisterDescription,
+    ResetMode,
+    Response,
+    ResponseType,
+    ResourceType,
+    ViceInfo,
+    ViceMonitorError,
+    encode_header,
+    encode_string,
+    parse_banks,
+    parse_display,
+    parse_event,
+    parse_info,
+    parse_registers,
+    parse_registers_available,
+    parse_resource,
+)
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+# A memory get of the full 64 KB does not fit the 16 bit length of the reply
+MAX_MEMORY_CHUNK = 0x8000
+
+
+@dataclass
+class _Pending:
+    command: CommandType
+    future: asyncio.Future
+    # Checkpoint infos that precede the final checkpoint list frame
+    partial: List[Response] = field(default_factory=list)
+
+
+class ViceMonitorClient:
+    """One connection to a VICE binary monitor.
+
+    Use :meth:`connect` and close with :meth:`close` or ``async with``. All helpers are coroutines and can be awaited
+    concurrently; ``max_in_flight`` bounds how many requests are written before their responses arrive.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 max_in_flight: int = 64, event_queue_size: int = 256):
+        self._reader = reader
+        self._writer = writer
+        self._pending: Dict[int, _Pending] = {}
+        self._request_ids = itertools.cycle(range(1, BROADCAST_ID))
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._subscribers: Set[EventStream] = set()
+        self._event_queue_size = event_queue_size
+        self._closed: Optional[BaseException] = None
+        self._read_task = asyncio.get_running_loop().create_task(self._read_loop())
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = 6502, **kwargs) -> "ViceMonitorClient":
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer, **kwargs)
+
+    async def close(self) -> None:
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        await asyncio.gather(self._read_task, return_exceptions=True)
+
+    async def __aenter__(self) -> "ViceMonitorClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    # Transport
+
+    async def request(self, command: CommandType, *body: BytesLike) -> Response:
+        """Sends ``command`` with the concatenation of ``body`` parts and returns the final response frame.
+
+        The parts are written as they are, a large memoryview is not copied into a new buffer.
+        """
+        response, _ = await self._request(command, body)
+        return response
+
+    async def _request(self, command: CommandType, body: Iterable[BytesLike]):
+        if self._closed is not None:
+            raise ConnectionError("Connection to VICE is closed") from self._closed
+        body = list(body)
+        await self._in_flight.acquire()
+        try:
+            request_id = next(self._request_ids)
+            future = asyncio.get_running_loop().create_future()
+            self._pending[request_id] = _Pending(command, future)
+            length = sum(len(part) for part in body)
+            self._writer.writelines([encode_header(request_id, command, length), *body])
+            await self._writer.drain()
+            response, partial = await future
+        finally:
+            self._in_flight.release()
+        if response.error != 0:
+            raise ViceMonitorError(command, response.error)
+        return response, partial
+
+    async def _read_loop(self) -> None:
+        try:
+            while True:
+                header = await self._reader.readexactly(RESPONSE_HEADER.size)
+                stx, _, length, kind, error, request_id = RESPONSE_HEADER.unpack(header)
+                if stx != STX:
+                    raise ConnectionError(f"Lost framing, got 0x{stx:02x} instead of STX")
+                body = memoryview(await self._reader.readexactly(length)) if length else memoryview(b"")
+                self._dispatch(Response(kind, error, request_id, body))
+        except (asyncio.IncompleteReadError, ConnectionError, OSError) as error:
+            self._fail(error)
+        except asyncio.CancelledError:
+            self._fail(ConnectionError("Client closed"))
+            raise
+
+    def _dispatch(self, response: Response) -> None:
+        pending = self._pending.get(response.request_id)
+        if pending is None:
+            self._publish(parse_event(response))
+            return
+        if pending.command == CommandType.CHECKPOINT_LIST and response.type == ResponseType.CHECKPOINT_INFO:
+            pending.partial.append(response)
+            return
+        del self._pending[response.request_id]
+        if not pending.future.done():
+            pending.future.set_result((response, pending.partial))
+
+    def _fail(self, error: BaseException) -> None:
+        self._closed = error
+        for pending in self._pending.values():
+            if not pending.future.done():
+                pending.future.set_exception(ConnectionError("Connection to VICE lost"))
+        self._pending.clear()
+        for stream in self._subscribers:
+            stream.offer(None)
+
+    # Events
+
+    def events(self) -> "EventStream":
+        """Subscribes to broadcasts from the moment of the call until the stream or the connection closes.
+
+        Subscribe before sending the command that triggers the event you wait for::
+
+            with client.events() as events:
+                await client.exit()
+                stopped = await events.next(ResponseType.STOPPED, timeout=5)
+        """
+        stream = EventStream(self, self._event_queue_size)
+        self._subscribers.add(stream)
+        if self._closed is not None:
+            stream.offer(None)
+        return stream
+
+    def _publish(self, event: MonitorEvent) -> None:
+        for stream in self._subscribers:
+            stream.offer(event)
+
+    # Memory
+
+    async def memory_get(self, start: int, end: int, memspace: MemSpace = MemSpace.MAIN_MEMORY, bank: int = 0,
+                         side_effects: bool = False) -> memoryview:
+        """Reads ``start`` to ``end`` inclusive. The result is a view on the received frame."""
+        body = struct.pack("<BHHBH", side_effects, start, end, memspace, bank)
+        response = await self.request(CommandType.MEMORY_GET, body)
+        (length,) = struct.unpack_from("<H", response.body)
+        if length == 0 and len(response.body) > 2:
+            # The length wraps to 0 for a full 64 KB read
+            length = len(response.body) - 2
+        return response.body[2:2 + length]
+
+    async def memory_set(self, start: int, data: BytesLike, memspace: MemSpace = MemSpace.MAIN_MEMORY,
+                         bank: int = 0, side_effects: bool = False) -> None:
+        if not data:
+            return
+        header = struct.pack("<BHHBH", side_effects, start, start + len(data) - 1, memspace, bank)
+        await self.request(CommandType.MEMORY_SET, header, data)
+
+    async def read_memory(self, start: int, length: int, chunk: int = 0x4000, **kwargs) -> memoryview:
+        """Reads ``length`` bytes with all chunks in flight at once.
+
+        A read that fits one chunk returns the frame's view; larger reads are assembled into one buffer.
+        """
+        chunk = min(chunk, MAX_MEMORY_CHUNK)
+        if length <= chunk:
+            return await self.memory_get(start, start + length - 1, **kwargs)
+        result = bytearray(length)
+        view = memoryview(result)
+
+        async def fetch(offset: int) -> None:
+            size = min(chunk, length - offset)
+            view[offset:offset + size] = await self.memory_get(start + offset, start + offset + size - 1, **kwargs)
+
+        await asyncio.gather(*(fetch(offset) for offset in range(0, length, chunk)))
+        return view
+
+    async def write_memory(self, start: int, data: BytesLike, chunk: int = 0x4000, **kwargs) -> None:
+        """Writes ``data`` as slices of one view with all chunks in flight at once."""
+        view = memoryview(data).cast("B")
+        chunk = min(chunk, MAX_MEMORY_CHUNK)
+        await asyncio.gather(*(self.memory_set(start + offset, view[offset:offset + chunk], **kwargs)
+                               for offset in range(0, len(view), chunk)))
+
+    # Checkpoints
+
+    async def checkpoint_get(self, number: int) -> CheckpointInfo:
+        response = await self.request(CommandType.CHECKPOINT_GET, struct.pack("<I", number))
+        return CheckpointInfo.parse(response.body)
+
+    async def checkpoint_set(self, start: int, end: Optional[int] = None, stop_when_hit: bool = True,
+                             enabled: bool = True, operation: CpuOperation = CpuOperation.EXEC,
+                             temporary: bool = False) -> CheckpointInfo:
+        body = struct.pack("<HHBBBB", start, start if end is None else end, stop_when_hit, enabled, operation,
+                           temporary)
+        response = await self.request(CommandType.CHECKPOINT_SET, body)
+        return CheckpointInfo.parse(response.body)
+
+    async def checkpoint_delete(self, number: int) -> None:
+        await self.request(CommandType.CHECKPOINT_DELETE, struct.pack("<I", number))
+
+    async def checkpoint_list(self) -> List[CheckpointInfo]:
+        _, infos = await self._request(CommandType.CHECKPOINT_LIST, [])
+        return [CheckpointInfo.parse(info.body) for info in infos]
+
+    async def checkpoint_toggle(self, number: int, enabled: bool) -> None:
+        await self.request(CommandType.CHECKPOINT_TOGGLE, struct.pack("<IB", number, enabled))
+
+    async def condition_set(self, number: int, condition: str) -> None:
+        await self.request(CommandType.CONDITION_SET, struct.pack("<I", number), encode_string(condition))
+
+    # Registers
+
+    async def registers_get(self, memspace: MemSpace = MemSpace.MAIN_MEMORY) -> Dict[int, int]:
+        """Register id to value, see :meth:`registers_available` for the names."""
+        response = await self.request(CommandType.REGISTERS_GET, bytes([memspace]))
+        return parse_registers(response.body)
+
+    async def registers_set(self, values: Dict[int, int],
+                            memspace: MemSpace = MemSpace.MAIN_MEMORY) -> Dict[int, int]:
+        items = b"".join(struct.pack("<BBH", 3, register_id, value) for register_id, value in values.items())
+        response = await self.request(CommandType.REGISTERS_SET, struct.pack("<BH", memspace, len(values)), items)
+        return parse_registers(response.body)
+
+    async def registers_available(self, memspace: MemSpace = MemSpace.MAIN_MEMORY) -> List[RegisterDescription]:
+        response = await self.request(CommandType.REGISTERS_AVAILABLE, bytes([memspace]))
+        return parse_registers_available(response.body)
+
+    # Snapshots and resources
+
+    async def dump(self, path: str, save_rom: bool = False, save_disks: bool = False) -> None:
+        await self.request(CommandType.DUMP, bytes([save_rom, save_disks]), encode_string(path))
+
+    async def undump(self, path: str) -> int:
+        """Loads a snapshot and returns the program counter it restored."""
+        response = await self.request(CommandType.UNDUMP, encode_string(path))
+        (pc,) = struct.unpack_from("<H", response.body)
+        return pc
+
+    async def resource_get(self, name: str) -> Union[str, int]:
+        response = await self.request(CommandType.RESOURCE_GET, encode_string(name))
+        return parse_resource(response.body)
+
+    async def resource_set(self, name: str, value: Union[str, int]) -> None:
+        if isinstance(value, str):
+            typed = bytes([ResourceType.STRING]) + encode_string(name) + encode_string(value)
+        else:
+            typed = bytes([ResourceType.INTEGER]) + encode_string(name) + bytes([4]) + struct.pack("<i", value)
+        await self.request(CommandType.RESOURCE_SET, typed)
+
+    # Execution
+
+    async def advance_instructions(self, count: int = 1, step_over_subroutines: bool = False) -> None:
+        await self.request(CommandType.ADVANCE_INSTRUCTION, struct.pack("<BH", step_over_subroutines, count))
+
+    async def execute_until_return(self) -> None:
+        await self.request(CommandType.EXECUTE_UNTIL_RETURN)
+
+    async def keyboard_feed(self, text: str) -> None:
+        """Types PETSCII ``text``, use ``\\r`` for RETURN."""
+        await self.request(CommandType.KEYBOARD_FEED, encode_string(text))
+
+    async def exit(self) -> None:
+        """Resumes emulation."""
+        await self.request(CommandType.EXIT)
+
+    async def quit(self) -> None:
+        await self.request(CommandType.QUIT)
+
+    async def reset(self, mode: ResetMode = ResetMode.SOFT) -> None:
+        await self.request(CommandType.RESET, bytes([mode]))
+
+    async def autostart(self, path: str, run: bool = True, file_index: int = 0) -> None:
+        await self.request(CommandType.AUTOSTART, struct.pack("<BH", run, file_index), encode_string(path))
+
+    # Information
+
+    async def ping(self) -> None:
+        await self.request(CommandType.PING)
+
+    async def info(self) -> ViceInfo:
+        return parse_info((await self.request(CommandType.INFO)).body)
+
+    async def banks_available(self) -> List[BankItem]:
+        return parse_banks((await self.request(CommandType.BANKS_AVAILABLE)).body)
+
+    async def display_get(self, use_vic: bool = True) -> Display:
+        """Indexed 8 bit screen capture, ``pixels`` is a view on the received frame."""
+        response = await self.request(CommandType.DISPLAY_GET, bytes([use_vic, 0]))
+        return parse_display(response.body)
+
+
+class EventStream:
+    """Broadcasts for one subscriber, iterate with ``async for`` and close when done.
+
+    The queue is bounded; when the subscriber falls behind the oldest events are dropped and counted in ``dropped``.
+    """
+
+    def __init__(self, client: ViceMonitorClient, size: int):
+        self._client = client
+        self._queue: asyncio.Queue = asyncio.Queue(size)
+        self.dropped = 0
+
+    def offer(self, event: Optional[MonitorEvent]) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(event)
+
+    def close(self) -> None:
+        self._client._subscribers.discard(self)
+
+    def __enter__(self) -> "EventStream":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __aiter__(self) -> "EventStream":
+        return self
+
+    async def __anext__(self) -> MonitorEvent:
+        event = await self._queue.get()
+        if event is None:
+            # Keep the marker for later readers of a closed connection
+            self._queue.put_nowait(None)
+            raise StopAsyncIteration
+        return event
+
+    async def next(self, event_type: Optional[ResponseType] = None, timeout: Optional[float] = None) -> MonitorEvent:
+        """Returns the next event, of ``event_type`` if given, skipping others."""
+        async def first() -> MonitorEvent:
+            async for event in self:
+                if event_type is None or event.type == event_type:
+                    return event
+            raise ConnectionError("Connection to VICE lost")
+        return await asyncio.wait_for(first(), timeout)
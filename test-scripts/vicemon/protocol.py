@@ -0,0 +1,307 @@
+"""VICE binary monitor protocol: constants, command encoding and response parsing.
+
+Mirrors the types in ViceMCP/ViceBridge. All integers are little endian.
+
+Command:  STX(0x02) API(0x02) body_length:u32 request_id:u32 command:u8 body
+Response: STX(0x02) API(0x02) body_length:u32 response:u8 error:u8 request_id:u32 body
+"""
+
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import List, Optional, Union
+
+STX = 0x02
+API_VERSION = 0x02
+BROADCAST_ID = 0xFFFFFFFF
+COMMAND_HEADER = struct.Struct("<BBIIB")
+RESPONSE_HEADER = struct.Struct("<BBIBBI")
+MAX_STRING_LENGTH = 255
+
+
+class CommandType(IntEnum):
+    MEMORY_GET = 0x01
+    MEMORY_SET = 0x02
+    CHECKPOINT_GET = 0x11
+    CHECKPOINT_SET = 0x12
+    CHECKPOINT_DELETE = 0x13
+    CHECKPOINT_LIST = 0x14
+    CHECKPOINT_TOGGLE = 0x15
+    CONDITION_SET = 0x22
+    REGISTERS_GET = 0x31
+    REGISTERS_SET = 0x32
+    DUMP = 0x41
+    UNDUMP = 0x42
+    RESOURCE_GET = 0x51
+    RESOURCE_SET = 0x52
+    ADVANCE_INSTRUCTION = 0x71
+    KEYBOARD_FEED = 0x72
+    EXECUTE_UNTIL_RETURN = 0x73
+    PING = 0x81
+    BANKS_AVAILABLE = 0x82
+    REGISTERS_AVAILABLE = 0x83
+    DISPLAY_GET = 0x84
+    INFO = 0x85
+    EXIT = 0xAA
+    QUIT = 0xBB
+    RESET = 0xCC
+    AUTOSTART = 0xDD
+
+
+class ResponseType(IntEnum):
+    MEMORY_GET = 0x01
+    MEMORY_SET = 0x02
+    CHECKPOINT_INFO = 0x11
+    CHECKPOINT_LIST = 0x14
+    CHECKPOINT_TOGGLE = 0x15
+    CONDITION_SET = 0x22
+    REGISTER_INFO = 0x31
+    DUMP = 0x41
+    UNDUMP = 0x42
+    RESOURCE_GET = 0x51
+    RESOURCE_SET = 0x52
+    JAM = 0x61
+    STOPPED = 0x62
+    RESUMED = 0x63
+    ADVANCE_INSTRUCTION = 0x71
+    KEYBOARD_FEED = 0x72
+    EXECUTE_UNTIL_RETURN = 0x73
+    PING = 0x81
+    BANKS_AVAILABLE = 0x82
+    REGISTERS_AVAILABLE = 0x83
+    DISPLAY_GET = 0x84
+    INFO = 0x85
+    EXIT = 0xAA
+    QUIT = 0xBB
+    RESET = 0xCC
+    AUTOSTART = 0xDD
+
+
+class ErrorCode(IntEnum):
+    OK = 0x00
+    OBJECT_DOES_NOT_EXIST = 0x01
+    INVALID_MEM_SPACE = 0x02
+    INCORRECT_COMMAND_LENGTH = 0x80
+    INVALID_PARAMETER_VALUE = 0x81
+    UNKNOWN_API_VERSION = 0x82
+    UNKNOWN_COMMAND_TYPE = 0x83
+    GENERAL_FAILURE = 0x8F
+
+
+class MemSpace(IntEnum):
+    MAIN_MEMORY = 0x00
+    DRIVE8 = 0x01
+    DRIVE9 = 0x02
+    DRIVE10 = 0x03
+    DRIVE11 = 0x04
+
+
+class CpuOperation(IntEnum):
+    LOAD = 0x01
+    STORE = 0x02
+    EXEC = 0x04
+
+
+class ResetMode(IntEnum):
+    SOFT = 0x00
+    HARD = 0x01
+    DRIVE8 = 0x08
+    DRIVE9 = 0x09
+    DRIVE10 = 0x0A
+    DRIVE11 = 0x0B
+
+
+class ResourceType(IntEnum):
+    STRING = 0x00
+    INTEGER = 0x01
+
+
+class ViceMonitorError(Exception):
+    """VICE answered a command with an error code."""
+
+    def __init__(self, command: CommandType, error: int):
+        self.command = command
+        self.error = error
+        try:
+            name = ErrorCode(error).name
+        except ValueError:
+            name = f"0x{error:02x}"
+        super().__init__(f"{command.name} failed: {name}")
+
+
+@dataclass(frozen=True)
+class Response:
+    """One frame from VICE. ``body`` is a view on the received bytes, slicing it does not copy."""
+
+    type: int
+    error: int
+    request_id: int
+    body: memoryview
+
+
+@dataclass(frozen=True)
+class CheckpointInfo:
+    number: int
+    currently_hit: bool
+    start_address: int
+    end_address: int
+    stop_when_hit: bool
+    enabled: bool
+    operation: int
+    temporary: bool
+    hit_count: int
+    ignore_count: int
+    has_condition: bool
+
+    _STRUCT = struct.Struct("<IBHHBBBBIIB")
+
+    @classmethod
+    def parse(cls, body: memoryview) -> "CheckpointInfo":
+        (number, hit, start, end, stop, enabled, op, temporary,
+         hit_count, ignore_count, condition) = cls._STRUCT.unpack_from(body)
+        return cls(number, bool(hit), start, end, bool(stop), bool(enabled), op, bool(temporary),
+                   hit_count, ignore_count, bool(condition))
+
+
+@dataclass(frozen=True)
+class BankItem:
+    id: int
+    name: str
+
+
+@dataclass(frozen=True)
+class RegisterDescription:
+    id: int
+    bits: int
+    name: str
+
+
+@dataclass(frozen=True)
+class ViceInfo:
+    major: int
+    minor: int
+    build: int
+    revision: int
+    svn_version: int
+
+    @property
+    def version(self) -> str:
+        return f"{self.major}.{self.minor}.{self.build}.{self.revision}"
+
+
+@dataclass(frozen=True)
+class Display:
+    """Indexed 8 bit image. ``pixels`` is a view on the received frame."""
+
+    debug_width: int
+    debug_height: int
+    debug_offset_x: int
+    debug_offset_y: int
+    inner_width: int
+    inner_height: int
+    bits_per_pixel: int
+    pixels: memoryview
+
+
+@dataclass(frozen=True)
+class MonitorEvent:
+    """Broadcast sent without a request: Stopped, Resumed, Jam, a hit checkpoint or the registers after a stop."""
+
+    type: ResponseType
+    pc: Optional[int] = None
+    checkpoint: Optional[CheckpointInfo] = None
+    registers: Optional[dict] = None
+
+
+def encode_header(request_id: int, command: CommandType, body_length: int) -> bytes:
+    return COMMAND_HEADER.pack(STX, API_VERSION, body_length, request_id, command)
+
+
+def encode_string(text: Union[str, bytes]) -> bytes:
+    """Length prefixed ASCII string as used by dump, undump, resources, conditions and keyboard feed."""
+    data = text.encode("ascii") if isinstance(text, str) else bytes(text)
+    if len(data) > MAX_STRING_LENGTH:
+        raise ValueError(f"String longer than {MAX_STRING_LENGTH} bytes")
+    return bytes([len(data)]) + data
+
+
+def parse_registers(body: memoryview) -> dict:
+    """Register id to value."""
+    (count,) = struct.unpack_from("<H", body)
+    registers = {}
+    offset = 2
+    for _ in range(count):
+        size, register_id, value = struct.unpack_from("<BBH", body, offset)
+        registers[register_id] = value
+        offset += size + 1
+    return registers
+
+
+def parse_banks(body: memoryview) -> List[BankItem]:
+    (count,) = struct.unpack_from("<H", body)
+    banks = []
+    offset = 2
+    for _ in range(count):
+        size, bank_id, name_length = struct.unpack_from("<BHB", body, offset)
+        banks.append(BankItem(bank_id, bytes(body[offset + 4:offset + 4 + name_length]).decode("ascii")))
+        offset += size + 1
+    return banks
+
+
+def parse_registers_available(body: memoryview) -> List[RegisterDescription]:
+    (count,) = struct.unpack_from("<H", body)
+    registers = []
+    offset = 2
+    for _ in range(count):
+        size, register_id, bits, name_length = struct.unpack_from("<BBBB", body, offset)
+        name = bytes(body[offset + 4:offset + 4 + name_length]).decode("ascii")
+        registers.append(RegisterDescription(register_id, bits, name))
+        offset += size + 1
+    return registers
+
+
+def parse_display(body: memoryview) -> Display:
+    info_length, dw, dh, dx, dy, iw, ih, bpp, length = struct.unpack_from("<IHHHHHHBI", body)
+    start = info_length + 4
+    return Display(dw, dh, dx, dy, iw, ih, bpp, body[start:start + length])
+
+
+def parse_info(body: memoryview) -> ViceInfo:
+    if body[0] != 4 or body[5] != 4:
+        raise ValueError("Unexpected info layout")
+    major, minor, build, revision = body[1:5]
+    (svn,) = struct.unpack_from("<I", body, 6)
+    return ViceInfo(major, minor, build, revision, svn)
+
+
+def parse_resource(body: memoryview) -> Union[str, int]:
+    resource_type, length = body[0], body[1]
+    value = body[2:2 + length]
+    if resource_type == ResourceType.STRING:
+        return bytes(value).decode("ascii")
+    return int.from_bytes(value, "little", signed=True)
+
+
+def parse_event(response: Response) -> MonitorEvent:
+    kind = ResponseType(response.type)
+    if kind in (ResponseType.STOPPED, ResponseType.RESUMED, ResponseType.JAM):
+        (pc,) = struct.unpack_from("<H", response.body)
+        return MonitorEvent(kind, pc=pc)
+    if kind == ResponseType.CHECKPOINT_INFO:
+        return MonitorEvent(kind, checkpoint=CheckpointInfo.parse(response.body))
+    if kind == ResponseType.REGISTER_INFO:
+        return MonitorEvent(kind, registers=parse_registers(response.body))
+    return MonitorEvent(kind)
+
+
+def hex_dump(data, prefix: str = "") -> str:
+    """The scripts' hex dump, returned instead of printed."""
+    lines = []
+    for i in range(0, len(data), 16):
+        chunk = bytes(data[i:i + 16])
+        hex_part = " ".join(f"{b:02x}" for b in chunk)
+        ascii_part = "".join(chr(b) if 32 <= b < 127 else "." for b in chunk)
+        lines.append(f"{prefix}{i:04x}: {hex_part:<48} {ascii_part}")
+    return "\n".join(lines)
@@ -0,0 +1,76 @@
+"""Round trips of :class:`ViceMonitorClient` against a minimal monitor served on localhost.
+
+Run from ``test-scripts`` with ``python -m unittest vicemon.test_client`` or ``python -m pytest vicemon``.
+"""
+
+import asyncio
+import struct
+import unittest
+
+from .client import ViceMonitorClient
+from .protocol import API_VERSION, COMMAND_HEADER, RESPONSE_HEADER, STX, CommandType, ResponseType
+
+
+class FakeMonitor:
+    """Answers memory gets from 64 KB of main memory, like VICE with a 16 bit length that wraps to 0."""
+
+    def __init__(self):
+        self.memory = bytearray(i * 7 & 0xFF for i in range(0x10000))
+        self._server = None
+
+    async def start(self) -> int:
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                _, _, length, request_id, command = COMMAND_HEADER.unpack(await reader.readexactly(COMMAND_HEADER.size))
+                body = await reader.readexactly(length)
+                assert command == CommandType.MEMORY_GET
+                _, start, end, _, _ = struct.unpack("<BHHBH", body)
+                data = self.memory[start:end + 1]
+                answer = struct.pack("<H", len(data) & 0xFFFF) + data
+                writer.write(RESPONSE_HEADER.pack(STX, API_VERSION, len(answer), ResponseType.MEMORY_GET, 0, request_id))
+                writer.write(answer)
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            pass
+        finally:
+            writer.close()
+
+
+class MemoryGetTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.monitor = FakeMonitor()
+        port = await self.monitor.start()
+        self.client = await ViceMonitorClient.connect("127.0.0.1", port)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.monitor.stop()
+
+    async def test_range_is_returned_as_read(self):
+        data = await self.client.memory_get(0xC000, 0xC00F)
+
+        self.assertEqual(bytes(data), self.monitor.memory[0xC000:0xC010])
+
+    async def test_full_memory_is_returned_although_its_length_wraps_to_zero(self):
+        data = await self.client.memory_get(0x0000, 0xFFFF)
+
+        self.assertEqual(len(data), 0x10000)
+        self.assertEqual(bytes(data), self.monitor.memory)
+
+    async def test_concurrent_reads_get_their_own_answers(self):
+        first, full = await asyncio.gather(self.client.memory_get(0x0400, 0x0401), self.client.memory_get(0x0000, 0xFFFF))
+
+        self.assertEqual(bytes(first), self.monitor.memory[0x0400:0x0402])
+        self.assertEqual(len(full), 0x10000)
+
+
+if __name__ == "__main__":
+    unittest.main()